@@ -14,6 +14,13 @@ class OrderStatus(Enum):
     CANCELLED = "CANCELLED"
     REJECTED = "REJECTED"
 
+class OrderEventType(Enum):
+    NEW = "NEW"
+    PARTIALLY_FILLED = "PARTIALLY_FILLED"
+    EXECUTED = "EXECUTED"
+    CANCELLED = "CANCELLED"
+    REJECTED = "REJECTED"
+
 class MarketType(Enum):
     STOCKS = "ACCIONES"
     CEDEARS = "CEDEARS"
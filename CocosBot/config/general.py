@@ -1,3 +1,33 @@
+import os
+
 DEFAULT_TIMEOUT = 10000
 MAX_RETRIES = 3
-RETRY_DELAY = 1000
\ No newline at end of file
+RETRY_DELAY = 1000
+# Motor de esperas
+WAIT_POLL_INTERVAL = 500  # ms entre evaluaciones de esperas fuera del navegador
+TYPING_DELAY = 50  # ms entre teclas en fill_input_with_delay
+INPUT_VALUE_TIMEOUT = WAIT_POLL_INTERVAL  # ms que fill_input_with_delay espera el valor antes de reescribir lento
+TWO_FACTOR_MAIL_TIMEOUT = 60000  # ms máximos esperando el correo con el código 2FA
+TWO_FACTOR_SENDER = "no-reply@cocos.capital"  # Remitente de los correos con el código 2FA
+CODE_ENTRY_TIMEOUT = 2000  # ms máximos para que las casillas del código 2FA reflejen lo tipeado
+MAIL_WATCHER_TIMEOUT = 10000  # ms máximos esperando la conexión IMAP antes de enviar el login
+# Sesión
+TOKEN_REFRESH_MARGIN = 120  # s antes del vencimiento del access token en que se renueva
+TOKEN_REFRESH_RETRY = 30  # s entre reintentos si la renovación falla
+# Pool de páginas
+PAGE_POOL_SIZE = 4  # páginas (contextos) para lecturas en paralelo
+# Maestro de instrumentos
+INSTRUMENT_MASTER_TTL = 86400  # s tras los cuales se vuelve a pedir la lista de un mercado
+# Streaming de cotizaciones
+QUOTE_QUEUE_SIZE = 10000  # ticks en espera antes de descartar los más viejos
+QUOTE_RECONNECT_DELAY = 5000  # ms sin feed abierto antes de recargar la página para reconectar
+QUOTE_MAX_RECONNECTS = 5  # recargas seguidas sin recibir ticks antes de cortar el stream
+# Seguimiento de órdenes
+ORDER_WATCH_INTERVAL = 500  # ms entre lecturas de las órdenes en OrderWatcher
+ORDER_WATCH_NAVIGATION_INTERVAL = 30000  # ms mínimos entre lecturas sin direct_api (cada una navega)
+CANCEL_CONCURRENCY = 8  # cancelaciones simultáneas por API en cancel_all
+# Instrumentación
+TRACE_BUFFER_SIZE = 1000  # trazas completas que conserva el tracer para exportar
+# Logging
+STEP_LOG_LEVEL = os.environ.get("COCOSBOT_STEP_LOG_LEVEL", "DEBUG")  # nivel de los logs por paso de la UI (clics, inputs, esperas)
+LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s: %(message)s"  # formato de configure_logging
@@ -0,0 +1,42 @@
+# Perfiles de bloqueo de recursos de red
+#
+# resource_types: tipos de recurso de Playwright que se abortan siempre.
+# blocked_domains: dominios (y subdominios) que se abortan siempre.
+# allowed_domains: dominios propios que nunca se bloquean por dominio.
+BLOCK_PROFILES = {
+    # Preset para las páginas que usan los servicios: sólo hacen falta los
+    # scripts/estilos de app.cocos.capital y los XHR de api.cocos.capital.
+    "services": {
+        "resource_types": ["image", "media", "font"],
+        "blocked_domains": [
+            "google-analytics.com",
+            "googletagmanager.com",
+            "doubleclick.net",
+            "facebook.net",
+            "facebook.com",
+            "hotjar.com",
+            "segment.io",
+            "segment.com",
+            "intercom.io",
+            "intercomcdn.com",
+            "mixpanel.com",
+            "amplitude.com",
+            "clarity.ms",
+            "sentry.io",
+        ],
+        "allowed_domains": ["app.cocos.capital", "api.cocos.capital"],
+    },
+}
+
+# Tamaño estimado (bytes) por tipo de recurso, para reportar el ahorro de los
+# requests abortados (su tamaño real no se conoce porque nunca se descargan).
+ESTIMATED_RESOURCE_BYTES = {
+    "image": 40_000,
+    "media": 250_000,
+    "font": 35_000,
+    "script": 60_000,
+    "stylesheet": 20_000,
+    "xhr": 3_000,
+    "fetch": 3_000,
+    "other": 5_000,
+}
@@ -4,6 +4,7 @@ LOGIN_SELECTORS = {
     "password_input": 'input[type="password"]',
     "submit_button": 'button[type="submit"]',
     "two_factor_container": 'input#input0',
+    "two_factor_digit": 'input#input{index}',
     "save_device_button": 'button:has-text("Sí, guardar como dispositivo seguro")',
     "logout_button": 'svg.lucide-log-out',
 }
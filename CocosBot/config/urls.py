@@ -1,6 +1,8 @@
-# URLs Base
-WEB_APP_ROOT = "https://app.cocos.capital"
-API_ROOT = "https://api.cocos.capital/api"
+import os
+
+# URLs Base (las variables de entorno permiten apuntar a un servidor local, p. ej. el de los benchmarks)
+WEB_APP_ROOT = os.environ.get("COCOSBOT_WEB_APP_ROOT", "https://app.cocos.capital").rstrip("/")
+API_ROOT = os.environ.get("COCOSBOT_API_ROOT", "https://api.cocos.capital/api").rstrip("/")
 
 # URLs de la Web App
 WEB_APP_URLS = {
@@ -22,10 +24,12 @@ WEB_APP_URLS = {
 # URLs de la API
 API_URLS = {
     "auth_token": f"{API_ROOT}/auth/v1/token?grant_type=password",
+    "auth_refresh": f"{API_ROOT}/auth/v1/token?grant_type=refresh_token",
     "account_tier": f"{API_ROOT}/v1/users/account-tier",
     "academy": f"{API_ROOT}/v1/home/academy",
     "markets_schedule": f"{API_ROOT}/v1/markets/schedule",
     "markets_tickers": f"{API_ROOT}/v1/markets/tickers",
+    "markets_list": f"{API_ROOT}/v1/markets/tickers/?instrument_type=",
     "mep_prices": f"{API_ROOT}/v1/usd/prices",
     "orders": f"{API_ROOT}/orders",
     "portfolio_data": f"{API_ROOT}/portfolio?currency=ARS&from=BROKER",
@@ -34,4 +38,5 @@ API_URLS = {
     "user_data": f"{API_ROOT}/v2/users/me",
 }
 
-
+# Endpoints que la web app pide al cargar el dashboard
+DASHBOARD_API_KEYS = ("user_data", "account_tier", "markets_schedule", "academy")
@@ -0,0 +1,216 @@
+import http.client
+import json
+import threading
+import time
+from typing import Optional, Dict, Any, List
+from urllib.parse import urlsplit
+from CocosBot.config.general import DEFAULT_TIMEOUT
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Headers de la web app que se reenvían en las llamadas directas
+API_AUTH_HEADERS = ("authorization", "apikey")
+
+# Métodos que se pueden reintentar sin riesgo de duplicar una operación
+IDEMPOTENT_METHODS = ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+
+# Segundos de inactividad tras los cuales no se reutiliza una conexión para un
+# request no idempotente (el servidor pudo haberla cerrado y no se reintenta).
+KEEPALIVE_IDLE_LIMIT = 15
+
+
+class ApiClient:
+    """
+    Cliente HTTP directo contra la API de Cocos Capital.
+
+    Reutiliza la sesión del navegador (token bearer, headers propios de la web app
+    y cookies) para llamar a los endpoints de API_URLS sin navegar. Mantiene una
+    conexión keep-alive por host y por hilo.
+    """
+
+    def __init__(self, timeout: int = DEFAULT_TIMEOUT):
+        """
+        Inicializa el cliente.
+
+        Args:
+            timeout: Tiempo máximo por request en ms.
+        """
+        self.timeout = timeout
+        self.headers: Dict[str, str] = {}
+        self.cookies: List[Dict[str, Any]] = []
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: List[http.client.HTTPConnection] = []
+
+    @property
+    def is_authenticated(self) -> bool:
+        """True si ya se capturó un token bearer."""
+        return "authorization" in self.headers
+
+    def update_headers(self, headers: Dict[str, str]) -> None:
+        """
+        Guarda los headers de autenticación de un request de la web app.
+
+        Args:
+            headers: Headers del request interceptado.
+        """
+        captured = {
+            name.lower(): value for name, value in headers.items()
+            if name.lower() in API_AUTH_HEADERS or name.lower().startswith("x-")
+        }
+        if captured:
+            self.headers.update(captured)
+
+    def set_cookies(self, cookies: List[Dict[str, Any]]) -> None:
+        """
+        Guarda las cookies del contexto del navegador.
+
+        Args:
+            cookies: Lista de cookies en el formato de BrowserContext.cookies().
+        """
+        self.cookies = list(cookies or [])
+
+    def get_json(self, url: str) -> Any:
+        """Realiza un GET y devuelve el cuerpo JSON."""
+        return self.request("GET", url)
+
+    def post_json(self, url: str, payload: Any) -> Any:
+        """Realiza un POST con cuerpo JSON y devuelve el cuerpo JSON."""
+        return self.request("POST", url, payload)
+
+    def delete(self, url: str) -> Any:
+        """Realiza un DELETE y devuelve el cuerpo JSON (si lo hay)."""
+        return self.request("DELETE", url)
+
+    def request(self, method: str, url: str, payload: Any = None) -> Any:
+        """
+        Ejecuta un request reutilizando la conexión keep-alive del host.
+
+        Args:
+            method: Método HTTP.
+            url: URL absoluta del endpoint.
+            payload: Cuerpo a serializar como JSON (opcional).
+
+        Returns:
+            Any: Cuerpo de la respuesta decodificado, o None si está vacío.
+
+        Raises:
+            ApiClientError: Si la respuesta no es 2xx, el cuerpo no es JSON o
+                falla la conexión (incluido un timeout).
+
+        Los métodos no idempotentes (POST) no se reintentan ante un error de
+        conexión, para no duplicar operaciones; en su lugar, se evita reutilizar
+        conexiones inactivas hace más de KEEPALIVE_IDLE_LIMIT segundos.
+        """
+        parts = urlsplit(url)
+        path = parts.path or "/"
+        if parts.query:
+            path = f"{path}?{parts.query}"
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = self._build_headers(parts.hostname or "", body is not None)
+
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        if not idempotent and self._idle_time(parts.scheme, parts.netloc) > KEEPALIVE_IDLE_LIMIT:
+            self._drop_connection(parts.scheme, parts.netloc)
+
+        # Un reintento con conexión nueva si el servidor cerró la keep-alive
+        attempts = 2 if idempotent else 1
+        for attempt in range(attempts):
+            conn = self._get_connection(parts.scheme, parts.netloc)
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                raw = response.read()
+                self._local.last_used[(parts.scheme, parts.netloc)] = time.monotonic()
+                break
+            except (http.client.HTTPException, OSError) as e:
+                # La conexión quedó a medio usar: se descarta para que el próximo
+                # request del hilo no herede un CannotSendRequest/ResponseNotReady.
+                self._drop_connection(parts.scheme, parts.netloc)
+                # Sólo un cierre de la keep-alive justifica reintentar (no un timeout)
+                stale = isinstance(e, (http.client.HTTPException, ConnectionError))
+                if attempt == attempts - 1 or not stale:
+                    raise ApiClientError(f"Error de conexión con {url}: {e or type(e).__name__}") from e
+
+        if response.will_close:
+            self._drop_connection(parts.scheme, parts.netloc)
+
+        if not 200 <= response.status < 300:
+            raise ApiClientError(f"Respuesta {response.status} de {url}", status=response.status)
+        if not raw:
+            return None
+        try:
+            return json.loads(raw)
+        except ValueError as e:
+            raise ApiClientError(f"Respuesta no JSON de {url}: {e}", status=response.status) from e
+
+    def close(self) -> None:
+        """Cierra todas las conexiones abiertas."""
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+    def close_thread_connections(self) -> None:
+        """Cierra las conexiones del hilo actual (p. ej. antes de que el hilo termine)."""
+        for scheme, netloc in list(getattr(self._local, "pool", {})):
+            self._drop_connection(scheme, netloc)
+
+    def _build_headers(self, host: str, has_body: bool) -> Dict[str, str]:
+        """Arma los headers del request con la sesión capturada."""
+        headers = {"Accept": "application/json", "Connection": "keep-alive"}
+        headers.update(self.headers)
+        cookie = "; ".join(
+            f"{c['name']}={c['value']}" for c in self.cookies
+            if self._domain_matches(host, c.get("domain", "").lstrip("."))
+        )
+        if cookie:
+            headers["Cookie"] = cookie
+        if has_body:
+            headers["Content-Type"] = "application/json"
+        return headers
+
+    @staticmethod
+    def _domain_matches(host: str, domain: str) -> bool:
+        """True si la cookie del dominio domain corresponde al host (el mismo o un subdominio)."""
+        return host == domain or host.endswith("." + domain)
+
+    def _get_connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        """Devuelve la conexión keep-alive del hilo actual para el host."""
+        pool = getattr(self._local, "pool", None)
+        if pool is None:
+            pool = self._local.pool = {}
+            self._local.last_used = {}
+        conn = pool.get((scheme, netloc))
+        if conn is None:
+            conn_class = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = conn_class(netloc, timeout=self.timeout / 1000)
+            pool[(scheme, netloc)] = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _idle_time(self, scheme: str, netloc: str) -> float:
+        """Segundos desde el último uso de la conexión del hilo actual (0 si no hay)."""
+        last_used = getattr(self._local, "last_used", {}).get((scheme, netloc))
+        return time.monotonic() - last_used if last_used is not None else 0.0
+
+    def _drop_connection(self, scheme: str, netloc: str) -> None:
+        """Descarta la conexión del hilo actual para el host."""
+        pool = getattr(self._local, "pool", {})
+        conn = pool.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+
+
+class ApiClientError(Exception):
+    """Error en una llamada directa a la API."""
+
+    def __init__(self, message: str, status: Optional[int] = None):
+        super().__init__(message)
+        self.status = status
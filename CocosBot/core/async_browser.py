@@ -0,0 +1,454 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Optional, Dict, Any
+from CocosBot.config.general import DEFAULT_TIMEOUT, TYPING_DELAY, INPUT_VALUE_TIMEOUT, CODE_ENTRY_TIMEOUT, STEP_LOG_LEVEL
+from CocosBot.config.urls import API_ROOT, API_URLS
+from CocosBot.core.api_client import ApiClient, ApiClientError
+from CocosBot.core.browser import PlaywrightBrowser
+from CocosBot.core.instruments import InstrumentMaster, DEFAULT_INSTRUMENTS_PATH, market_of
+from CocosBot.core.log_setup import level_of
+from CocosBot.core.page_pool import AsyncPagePool
+from CocosBot.core.session_tokens import TokenManager, TOKEN_ENDPOINT
+from CocosBot.core.tracing import Tracer
+from CocosBot.core.traffic_archive import TrafficArchive, TrafficRecorder, ReplayRouter
+from CocosBot.core.waits import AsyncWaitEngine, LEGACY_SLEEPS
+import logging
+logger = logging.getLogger(__name__)
+
+
+def async_playwright():
+    """Importa Playwright recién en start() (ver browser.sync_playwright)."""
+    from playwright.async_api import async_playwright as playwright_context
+    return playwright_context()
+
+
+class AsyncPlaywrightBrowser:
+    """
+    Contraparte asíncrona de PlaywrightBrowser sobre playwright.async_api.
+
+    Las operaciones de formulario usan la página principal (self.page); fetch_data
+    abre por defecto una página temporal en el mismo contexto, de modo que varias
+    lecturas pueden correr en paralelo con asyncio.gather compartiendo la sesión.
+    """
+
+    def __init__(self, headless=False, direct_api=False, storage_state=None, page_pool_size=None,
+                 instrument_master=False, tracing=True, record=None, replay=None, step_log_level=STEP_LOG_LEVEL):
+        """
+        Configura el navegador. El arranque ocurre en start() o al entrar en 'async with'.
+
+        Args:
+            headless: Si True, ejecuta el navegador en modo headless (sin UI).
+            direct_api: Si True, fetch_data llama a la API directamente con la sesión
+                capturada del navegador y sólo navega si la llamada falla.
+            storage_state: Ruta opcional a un archivo de sesión guardado con
+                save_storage_state. Si existe, se restauran cookies y localStorage.
+            page_pool_size: Si se indica, las lecturas reutilizan hasta esa cantidad de
+                páginas del contexto (y esperan turno si están todas en uso) en lugar
+                de abrir una página temporal por llamada.
+            instrument_master: Si True (o una ruta), carga el maestro de instrumentos
+                y lo alimenta con las listas de mercado (ver PlaywrightBrowser).
+            tracing: Si True, mide cada operación y sus etapas en self.tracer (ver Tracer).
+            record: Ruta de un archivo (.har o .jsonl) donde grabar el tráfico a la API
+                (ver PlaywrightBrowser).
+            replay: Ruta de un archivo grabado con record para responder la API desde él.
+            step_log_level: Nivel de los logs de cada paso de la UI (ver PlaywrightBrowser).
+        """
+        self.tracer = Tracer(enabled=tracing)
+        self.step_log_level = level_of(step_log_level)
+        self.recorder = TrafficRecorder(record) if record else None
+        self.replay = ReplayRouter(TrafficArchive.load(replay)) if replay else None
+        self.headless = headless
+        self.storage_state = storage_state
+        self.session_restored = bool(storage_state) and os.path.exists(storage_state)
+        self.api_client = ApiClient() if direct_api else None
+        self.tokens = TokenManager(self.api_client)
+        self.page_pool_size = page_pool_size
+        self.page_pool: Optional[AsyncPagePool] = None
+        self.instruments: Optional[InstrumentMaster] = None
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+        self.waits = None
+        if instrument_master:
+            self.enable_instrument_master(DEFAULT_INSTRUMENTS_PATH if instrument_master is True else instrument_master)
+
+    async def start(self):
+        """Inicia Playwright, el navegador, el contexto y la página principal."""
+        if self.page is not None:
+            return self
+        self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.launch(headless=self.headless)
+        if self.session_restored:
+            self.context = await self.browser.new_context(storage_state=self.storage_state)
+            logger.info("Sesión restaurada desde %s", self.storage_state)
+        else:
+            self.context = await self.browser.new_context()
+        if self.api_client:
+            self.context.on("request", self._capture_api_headers)
+        self.context.on("response", self._observe_tokens)
+        if self.instruments is not None:
+            self.context.on("response", self._observe_instruments)
+        if self.recorder:
+            self.context.on("response", self.recorder.observe_async)
+        if self.replay:
+            await self.replay.install_async(self.context)
+        self.page = await self.context.new_page()
+        self.waits = AsyncWaitEngine(self.page)
+        if self.page_pool_size:
+            self.page_pool = AsyncPagePool(self.context, self.page_pool_size)
+        logger.info("Navegador y página iniciados.")
+        return self
+
+    async def __aenter__(self):
+        """Método para usar la clase con 'async with'."""
+        return await self.start()
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Cierra el navegador al salir del bloque 'async with'."""
+        await self.close_browser()
+
+    async def close_browser(self):
+        """Cierra el navegador y el contexto Playwright."""
+        if getattr(self, '_closed', False) or self.browser is None:
+            return
+        self._closed = True
+        self.tokens.stop()
+        if self.page_pool:
+            logger.info("Uso del pool de páginas: %s", self.page_pool.stats())
+            await self.page_pool.close()
+        if self.api_client:
+            self.api_client.close()
+        if self.recorder:
+            self.recorder.close()
+        if self.replay:
+            logger.info("Uso del replay: %s", self.replay.stats())
+        await self.browser.close()
+        await self.playwright.stop()
+        logger.info("Navegador cerrado.")
+
+    async def save_storage_state(self, path):
+        """
+        Guarda el estado de la sesión (cookies y localStorage) en un archivo.
+
+        Args:
+            path: Ruta del archivo de sesión.
+        """
+        await self.context.storage_state(path=path)
+        os.chmod(path, 0o600)
+        logger.info("Sesión guardada en %s", path)
+
+    async def go_to(self, url, log_message=None):
+        """
+        Navega a una URL específica.
+
+        Args:
+            url: URL de destino.
+            log_message: Mensaje opcional para logging.
+        """
+        with self.tracer.span("go_to", url=url):
+            await self.page.goto(url)
+        logger.log(self.step_log_level, "Navegado a %s", url)
+
+    async def wait_for_element(self, selector, log_message=None, timeout=None):
+        """
+        Espera a que un elemento sea visible en la página.
+
+        Args:
+            selector: Selector CSS del elemento.
+            log_message: Mensaje opcional para logging.
+            timeout: Tiempo máximo de espera en ms (usa DEFAULT_TIMEOUT si no se especifica).
+        """
+        timeout = timeout or DEFAULT_TIMEOUT
+        with self.tracer.span("wait_for_element", selector=selector):
+            await self.page.wait_for_selector(selector, timeout=timeout, state="visible")
+        logger.log(self.step_log_level, "Elemento encontrado: %s", selector)
+        if log_message:
+            logger.info(log_message)
+
+    async def click_element(self, selector, log_message=None, timeout=None):
+        """
+        Espera a que un elemento sea visible y hace clic en él.
+
+        Args:
+            selector: Selector CSS del elemento.
+            log_message: Mensaje opcional para logging.
+            timeout: Tiempo máximo de espera en ms.
+        """
+        await self.wait_for_element(selector, timeout=timeout)
+        await self.page.click(selector)
+        logger.log(self.step_log_level, "Clic en el elemento: %s", selector)
+        if log_message:
+            logger.info(log_message)
+
+    async def fill_input(self, selector, value, log_message=None, timeout=None):
+        """
+        Espera a que un input sea visible y lo llena con un valor.
+
+        Args:
+            selector: Selector CSS del input.
+            value: Valor a ingresar.
+            log_message: Mensaje opcional para logging.
+            timeout: Tiempo máximo de espera en ms.
+        """
+        await self.wait_for_element(selector, timeout=timeout)
+        await self.page.fill(selector, value)
+        logger.log(self.step_log_level, "Input %s llenado.", selector)
+        if log_message:
+            logger.info(log_message)
+
+    async def fill_input_with_delay(self, selector, value, log_message=None, timeout=None, delay=TYPING_DELAY / 1000):
+        """
+        Llena un input tecla por tecla y espera a que la web app refleje el valor.
+
+        Si el valor no queda bien escrito a los INPUT_VALUE_TIMEOUT ms, se reescribe con el
+        retraso anterior de 0.4 s por tecla.
+
+        Args:
+            selector (str): Selector del input.
+            value (str): Valor a ingresar.
+            log_message (str): Mensaje opcional para log.
+            timeout (int): Tiempo máximo para esperar el elemento.
+            delay (float): Tiempo en segundos entre cada tecla.
+        """
+        await self.wait_for_element(selector, timeout=timeout)
+        input_element = self.page.locator(selector)
+        start = time.monotonic()
+        await input_element.fill("")
+        await input_element.type(value, delay=delay * 1000)
+        try:
+            await self.waits.input_value(selector, value, timeout=INPUT_VALUE_TIMEOUT)
+        except TimeoutError:
+            logger.warning("El input %s no reflejó el valor, reescribiendo más lento.", selector)
+            await input_element.fill("")
+            await input_element.type(value, delay=LEGACY_SLEEPS["typing_per_char"] * 1000)
+        self.waits.report.record("typing", time.monotonic() - start,
+                                 LEGACY_SLEEPS["typing_per_char"] * len(value))
+        logger.log(self.step_log_level, "Input %s llenado.", selector)
+        if log_message:
+            logger.info(log_message)
+
+    async def type_code(self, selector, code, last_selector, log_message=None, timeout=CODE_ENTRY_TIMEOUT):
+        """
+        Escribe un código repartido en varias casillas con una sola secuencia de teclado.
+
+        Ver PlaywrightBrowser.type_code.
+
+        Raises:
+            TimeoutError: Si la última casilla no recibió su carácter.
+        """
+        await self.page.focus(selector)
+        await self.page.keyboard.type(code)
+        await self.waits.input_value(last_selector, code[-1], timeout=timeout)
+        logger.log(self.step_log_level, "Código ingresado desde %s.", selector)
+        if log_message:
+            logger.info(log_message)
+
+    async def take_screenshot(self, filename="screenshot.png"):
+        """
+        Toma una captura de pantalla de la página actual.
+
+        Args:
+            filename: Nombre del archivo donde guardar la captura (default: screenshot.png).
+        """
+        await self.page.screenshot(path=filename)
+        logger.info("Captura de pantalla guardada en: %s", filename)
+
+    async def process_response(self, response, success_message=None):
+        """
+        Procesa una respuesta interceptada por Playwright.
+
+        Args:
+            response: La respuesta interceptada por Playwright.
+            success_message (str): Mensaje opcional que se registra en caso de éxito.
+
+        Returns:
+            dict: El contenido JSON de la respuesta si es exitosa, de lo contrario, None.
+        """
+        try:
+            if response.status == 200:
+                data = await response.json()
+                if success_message:
+                    logger.info(success_message)
+                return data
+            logger.error("Error en la solicitud interceptada: %s", response.status)
+            return None
+        except Exception as e:
+            logger.error("Error al procesar la respuesta: %s", e)
+            return None
+
+    async def search_and_select(self, search_input_selector, search_term, list_item_selector, log_message):
+        """
+        Busca un término en un campo y selecciona el ítem correspondiente de una lista.
+
+        Args:
+            search_input_selector (str): Selector del campo de búsqueda.
+            search_term (str): Término a buscar.
+            list_item_selector (str): Selector del ítem a seleccionar.
+            log_message (str): Mensaje de registro para la acción.
+        """
+        await self.fill_input(search_input_selector, search_term, f"Ingresando '{search_term}' en el campo de búsqueda.")
+        await self.click_element(list_item_selector.format(search_term), log_message)
+
+    def _capture_api_headers(self, request):
+        """
+        Callback de Playwright que guarda los headers de autenticación de la web app.
+
+        Args:
+            request: Objeto Request de Playwright.
+        """
+        if request.url.startswith(API_ROOT):
+            headers = request.headers
+            if self.tokens.is_stale(headers.get("authorization")):
+                headers = {name: value for name, value in headers.items() if name.lower() != "authorization"}
+            self.api_client.update_headers(headers)
+
+    async def _observe_tokens(self, response):
+        """
+        Callback de Playwright que pasa a TokenManager los tokens emitidos por la API.
+
+        Args:
+            response: Objeto Response de Playwright.
+        """
+        if TOKEN_ENDPOINT not in response.url or response.status != 200:
+            return
+        try:
+            self.tokens.update(await response.json())
+        except Exception as e:
+            logger.debug("No se pudo leer la respuesta de tokens: %s", e)
+
+    def enable_instrument_master(self, path: Optional[str] = DEFAULT_INSTRUMENTS_PATH) -> InstrumentMaster:
+        """
+        Activa el maestro de instrumentos (ver PlaywrightBrowser.enable_instrument_master).
+
+        Si el navegador ya arrancó, empieza a observar las listas de mercado del contexto.
+        """
+        if self.instruments is None:
+            self.instruments = InstrumentMaster(path)
+            if self.context is not None:
+                self.context.on("response", self._observe_instruments)
+        return self.instruments
+
+    async def _observe_instruments(self, response):
+        """
+        Callback de Playwright que incorpora al maestro las listas de mercado.
+
+        Args:
+            response: Objeto Response de Playwright.
+        """
+        if API_URLS["markets_list"] not in response.url or response.status != 200:
+            return
+        market = market_of(response.url)
+        if market is None:
+            return
+        try:
+            self.instruments.update(market, await response.json())
+        except Exception as e:
+            logger.debug("No se pudo leer la lista de mercado %s: %s", response.url, e)
+
+    async def capture_api_session(self) -> bool:
+        """
+        Copia las cookies del contexto al cliente directo de API.
+
+        Returns:
+            bool: True si el modo directo quedó listo para usarse.
+        """
+        if not self.api_client:
+            return False
+        self.api_client.set_cookies(await self.context.cookies())
+        return self.api_client.is_authenticated
+
+    async def _fetch_direct(self, request_url: str):
+        """
+        Llama al endpoint con el cliente de API en un hilo aparte.
+
+        Returns:
+            tuple: (True, datos) si la llamada fue exitosa, (False, None) si hay que
+            volver a la intercepción.
+        """
+        try:
+            with self.tracer.span("api_request", url=request_url):
+                data = await asyncio.to_thread(self.api_client.get_json, request_url)
+            logger.info("Respuesta directa de la API: URL=%s", request_url)
+            return True, data
+        except (ApiClientError, OSError) as e:
+            logger.warning("Falló la llamada directa a %s, usando intercepción: %s", request_url, e)
+            return False, None
+
+    _handle_data = PlaywrightBrowser._handle_data
+    _fetch_replay = PlaywrightBrowser._fetch_replay
+
+    async def fetch_data(self, request_url: str, navigation_url: str, process_response=None,
+                         timeout: int = DEFAULT_TIMEOUT, page=None) -> Optional[Dict[str, Any]]:
+        """
+        Intercepta un request específico y procesa su respuesta.
+
+        Args:
+            request_url: URL del request a interceptar.
+            navigation_url: URL a la que navegar para disparar el request.
+            process_response: Función opcional para procesar la respuesta antes de retornarla.
+            timeout: Tiempo máximo de espera en ms.
+            page: Página a usar. Si no se indica, se toma una de page_slot() (del pool
+                o temporal) para no competir con otras llamadas concurrentes.
+
+        Returns:
+            Optional[Dict[str, Any]]: Datos de la respuesta procesados o None si falla.
+        """
+        if self.replay:
+            return self._fetch_replay(request_url, process_response)
+
+        if self.api_client and self.api_client.is_authenticated:
+            ok, data = await self._fetch_direct(request_url)
+            if ok:
+                return self._handle_data(data, request_url, process_response)
+
+        if page is None:
+            try:
+                async with self.page_slot() as page:
+                    return await self._intercept(page, request_url, navigation_url, process_response, timeout)
+            except Exception as e:
+                logger.error("Error general en fetch_data: %s", e)
+                return None
+        return await self._intercept(page, request_url, navigation_url, process_response, timeout)
+
+    @asynccontextmanager
+    async def page_slot(self):
+        """
+        Página para una lectura concurrente: una del pool si está activo (esperando
+        turno si están todas en uso) o una página temporal que se cierra al salir.
+        """
+        if self.page_pool:
+            async with self.page_pool.page() as page:
+                yield page
+            return
+        page = await self.context.new_page()
+        try:
+            yield page
+        finally:
+            await page.close()
+
+    async def _intercept(self, page, request_url, navigation_url, process_response, timeout):
+        """Navega en page y devuelve los datos procesados de la respuesta de request_url."""
+        try:
+            with self.tracer.span("expect_response", url=request_url):
+                async with page.expect_response(request_url, timeout=timeout) as response_info:
+                    logger.log(self.step_log_level, "Esperando la respuesta de %s...", request_url)
+                    with self.tracer.span("go_to", url=navigation_url):
+                        await page.goto(navigation_url)
+                response = await response_info.value
+
+            if response.status != 200:
+                logger.warning("Respuesta no exitosa. Estado: %s", response.status)
+                return None
+            try:
+                with self.tracer.span("response.json"):
+                    data = await response.json()
+            except Exception as e:
+                logger.error("No se pudo decodificar el JSON de la respuesta: %s", e)
+                return None
+            return self._handle_data(data, request_url, process_response)
+        except Exception as e:
+            logger.error("Error general en fetch_data: %s", e)
+            return None
@@ -0,0 +1,166 @@
+import os
+from CocosBot.core.async_browser import AsyncPlaywrightBrowser
+from typing import Optional, Dict, Any, Iterable, List, Union
+from CocosBot.config.enums import Currency
+from CocosBot.config.general import STEP_LOG_LEVEL
+from CocosBot.config.enums import OrderOperation, MarketType
+from CocosBot.core.instruments import Instrument
+from CocosBot.core.market_snapshot import MarketSnapshot
+from CocosBot.core.order_watcher import AsyncOrderWatcher
+from CocosBot.core.quote_stream import AsyncQuoteStream
+from CocosBot.core.tracing import traced_methods
+from CocosBot.services.async_auth import AsyncAuthService
+from CocosBot.services.async_market import AsyncMarketService
+from CocosBot.services.async_user import AsyncUserService
+from CocosBot.utils.validators import validate_credentials
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+@traced_methods
+class AsyncCocosCapital(AsyncPlaywrightBrowser):
+    """
+    Cliente asíncrono para interactuar con Cocos Capital.
+
+    Misma interfaz que CocosCapital, pero con métodos awaitables sobre
+    playwright.async_api. Las lecturas abren páginas temporales en el contexto
+    de la sesión, así que pueden combinarse con asyncio.gather y correr junto a
+    una orden en curso; varias cuentas pueden convivir en el mismo event loop.
+
+    Example:
+        async with AsyncCocosCapital("user@example.com", "password", "gmail_user", "gmail_pass") as cocos:
+            await cocos.login()
+            portfolio, orders = await asyncio.gather(cocos.get_portfolio_data(), cocos.get_orders())
+    """
+    def __init__(self, username, password, gmail_user, gmail_app_pass, headless=False, direct_api=False,
+                 session_file=None, page_pool_size=None, instrument_master=False, tracing=True,
+                 record=None, replay=None, step_log_level=STEP_LOG_LEVEL):
+        super().__init__(headless, direct_api=direct_api, storage_state=session_file,
+                         page_pool_size=page_pool_size, instrument_master=instrument_master, tracing=tracing,
+                         record=record, replay=replay, step_log_level=step_log_level)
+        validate_credentials([username, password, gmail_user, gmail_app_pass])
+        self.auth = AsyncAuthService(self)
+        self.market = AsyncMarketService(self)
+        self.user = AsyncUserService(self)
+        self.username = username
+        self.password = password
+        self.gmail_user = gmail_user
+        self.gmail_app_pass = gmail_app_pass
+        self.session_file = session_file
+
+    # Métodos de Autenticación
+    async def login(self) -> bool:
+        """
+        Realiza el login usando el servicio de autenticación.
+
+        Si hay una sesión restaurada y sigue siendo válida, no se repite el login.
+        En modo replay no hace falta sesión.
+        """
+        if self.replay:
+            logger.info("Modo replay: se omite el login.")
+            return True
+        if self.session_restored and await self.auth.is_session_valid():
+            await self.capture_api_session()
+            return True
+        result = await self.auth.login(self.username, self.password, self.gmail_user, self.gmail_app_pass)
+        if self.session_file:
+            await self.auth.save_session(self.session_file)
+        return result
+
+    async def logout(self) -> bool:
+        """Realiza el logout usando el servicio de autenticación y descarta la sesión guardada."""
+        result = await self.auth.logout()
+        if self.session_file and os.path.exists(self.session_file):
+            os.remove(self.session_file)
+        return result
+
+    # Métodos de Usuario y Cuenta
+    async def get_user_data(self) -> Optional[Dict[str, Any]]:
+        """Obtiene los datos del usuario."""
+        return await self.user.get_user_data()
+
+    async def get_account_tier(self) -> Optional[Dict[str, Any]]:
+        """Obtiene el nivel de cuenta del usuario."""
+        return await self.user.get_account_tier()
+
+    async def get_portfolio_data(self) -> Optional[Dict[str, Any]]:
+        """Obtiene los datos del portafolio del usuario."""
+        return await self.user.get_portfolio_data()
+
+    async def fetch_portfolio_balance(self) -> Optional[float]:
+        """Obtiene el balance total del portafolio."""
+        return await self.user.get_portfolio_balance()
+
+    async def get_linked_accounts(self, amount: float = 5000, currency: Currency = Currency.ARS) -> Optional[Dict[str, Any]]:
+        """Obtiene información de las cuentas vinculadas del usuario."""
+        return await self.user.get_linked_accounts(amount, currency)
+
+    async def get_academy_data(self) -> Optional[Dict[str, Any]]:
+        """Obtiene los datos de la sección de Academia desde la API."""
+        return await self.user.get_academy_data()
+
+    # Métodos de Mercado y Operaciones
+    async def create_order(self, ticker: str, operation: Union[str, OrderOperation], amount: float,
+                           limit: Optional[float] = None) -> bool:
+        """Crea una orden usando el servicio de mercado."""
+        return await self.market.create_order(ticker, operation, amount, limit)
+
+    async def submit_order(self, ticker: str, operation: Union[str, OrderOperation], amount: float,
+                           limit: Optional[float] = None, segment: str = "C") -> Dict[str, Any]:
+        """Envía una orden por la API (con la UI como alternativa) y devuelve id y latencia."""
+        return await self.market.submit_order(ticker, operation, amount, limit, segment)
+
+    async def get_ticker_info(self, ticker: str, ticker_type: Union[str, MarketType, None] = None,
+                              segment: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Obtiene la información de un ticker (tipo y segmento del maestro si no se indican)."""
+        return await self.market.get_ticker_info(ticker, ticker_type, segment)
+
+    async def get_market_snapshot(self, market_type: Union[str, MarketType]) -> Optional[MarketSnapshot]:
+        """Obtiene las cotizaciones de todo un mercado con una sola lectura."""
+        return await self.market.get_market_snapshot(market_type)
+
+    async def stream_quotes(self, tickers: Iterable[str], market_type: Union[str, MarketType, None] = None,
+                            **kwargs) -> AsyncQuoteStream:
+        """Abre un stream de cotizaciones en tiempo real para los tickers indicados."""
+        return await self.market.stream_quotes(tickers, market_type, **kwargs)
+
+    async def refresh_instruments(self, force: bool = False) -> List[str]:
+        """Actualiza el maestro de instrumentos con los mercados desactualizados."""
+        return await self.market.refresh_instruments(force)
+
+    def lookup_instrument(self, ticker: str) -> Optional[Instrument]:
+        """Busca un ticker en el maestro de instrumentos (sin navegar, no es awaitable)."""
+        return self.market.lookup_instrument(ticker)
+
+    def search_instruments(self, prefix: str, limit: Optional[int] = 20) -> List[Instrument]:
+        """Busca tickers por prefijo en el maestro de instrumentos (no es awaitable)."""
+        return self.market.search_instruments(prefix, limit)
+
+    async def get_market_schedule(self) -> Optional[Dict[str, Any]]:
+        """Obtiene los horarios del mercado."""
+        return await self.market.get_market_schedule()
+
+    async def get_orders(self) -> Optional[Dict[str, Any]]:
+        """Obtiene las órdenes del usuario desde la API."""
+        return await self.market.get_orders()
+
+    async def watch_orders(self, **kwargs) -> AsyncOrderWatcher:
+        """Empieza a seguir las órdenes del usuario y emite sólo sus cambios."""
+        return await self.market.watch_orders(**kwargs)
+
+    async def cancel_order(self, order_id: Union[int, str, float, None] = None, quantity: Optional[int] = None,
+                           amount: Optional[float] = None) -> bool:
+        """Cancela una orden por id (o, en la forma anterior, por monto y cantidad)."""
+        if quantity is not None:
+            return await self.market.cancel_order(amount if amount is not None else order_id, quantity)
+        return await self.market.cancel_order(order_id)
+
+    async def cancel_all(self, ticker: Optional[str] = None,
+                         side: Union[str, OrderOperation, None] = None) -> List[Dict[str, Any]]:
+        """Cancela por API todas las órdenes pendientes que coinciden."""
+        return await self.market.cancel_all(ticker, side)
+
+    async def get_mep_value(self) -> Optional[Dict[str, Any]]:
+        """Obtiene el valor DOLAR MEP."""
+        return await self.market.get_mep_value()
@@ -1,10 +1,34 @@
-from playwright.sync_api import sync_playwright
-from typing import Optional, Dict, Any
-from CocosBot.config.general import DEFAULT_TIMEOUT
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Hashable, List
+from CocosBot.config.general import (
+    DEFAULT_TIMEOUT, TYPING_DELAY, INPUT_VALUE_TIMEOUT, CODE_ENTRY_TIMEOUT, PAGE_POOL_SIZE, STEP_LOG_LEVEL,
+)
+from CocosBot.config.urls import API_ROOT
+from CocosBot.core.api_client import ApiClient, ApiClientError
+from CocosBot.core.response_dispatcher import ResponseDispatcher
+from CocosBot.core.response_cache import ResponseCache, DEFAULT_CACHE_SIZE
+from CocosBot.core.network_filter import ResourceBlocker
+from CocosBot.core.instruments import InstrumentMaster, DEFAULT_INSTRUMENTS_PATH
+from CocosBot.core.log_setup import level_of, mask
+from CocosBot.core.page_pool import PagePool, PooledPage, FetchRequest
+from CocosBot.core.session_tokens import TokenManager
+from CocosBot.core.tracing import Tracer
+from CocosBot.core.traffic_archive import TrafficArchive, TrafficRecorder, ReplayRouter
+from CocosBot.core.waits import WaitEngine, LEGACY_SLEEPS
 import logging
-logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
-import time
+
+
+def sync_playwright():
+    """
+    Importa Playwright recién al lanzar el navegador: importarlo cuesta más de
+    100 ms y no hace falta para construir los objetos ni para leer del cache.
+    """
+    from playwright.sync_api import sync_playwright as playwright_context
+    return playwright_context()
+
 
 class PlaywrightBrowser:
     """
@@ -12,19 +36,125 @@ class PlaywrightBrowser:
     
     Proporciona métodos de alto nivel para interactuar con páginas web,
     manejar elementos, interceptar requests, y procesar respuestas.
+
+    Chromium se lanza recién al primer uso de page, browser o playwright (o al
+    llamar a start()): construir el objeto es instantáneo y las lecturas que salen
+    del cache o del archivo de replay no abren el navegador.
     """
 
-    def __init__(self, headless=False):
+    def __init__(self, headless=False, direct_api=False, storage_state=None, response_cache=False,
+                 block_profile=None, page_pool_size=PAGE_POOL_SIZE, instrument_master=False, tracing=True,
+                 record=None, replay=None, step_log_level=STEP_LOG_LEVEL):
         """
         Inicializa el navegador Playwright.
         
         Args:
             headless: Si True, ejecuta el navegador en modo headless (sin UI).
+            direct_api: Si True, fetch_data llama a la API directamente con la sesión
+                capturada del navegador y sólo navega si la llamada falla.
+            storage_state: Ruta opcional a un archivo de sesión guardado con
+                save_storage_state. Si existe, se restauran cookies y localStorage.
+            response_cache: Si True, guarda pasivamente cada respuesta JSON de la API
+                (ver enable_response_cache).
+            block_profile: Perfil de bloqueo de recursos: nombre de un preset de
+                BLOCK_PROFILES (p. ej. "services") o un diccionario propio. Si es
+                None no se bloquea nada.
+            page_pool_size: Cantidad de páginas (cada una en su contexto) que usa
+                fetch_parallel para leer en paralelo. Se crean al primer uso.
+            instrument_master: Si True, carga el maestro de instrumentos de
+                DEFAULT_INSTRUMENTS_PATH y lo alimenta con las listas de mercado que
+                reciba la página; con una ruta, usa ese archivo (ver enable_instrument_master).
+            tracing: Si True, mide cada operación y sus etapas en self.tracer (ver Tracer).
+            record: Ruta de un archivo (.har o .jsonl) donde grabar el tráfico a la API
+                de la sesión (ver TrafficRecorder).
+            replay: Ruta de un archivo grabado con record. Los requests a la API se
+                responden desde el archivo y fetch_data no navega (ver ReplayRouter).
+            step_log_level: Nivel (número o nombre) de los logs de cada paso de la UI:
+                navegación, clics, inputs llenados y esperas.
+        """
+        self.tracer = Tracer(enabled=tracing)
+        self.step_log_level = level_of(step_log_level)
+        self.headless = headless
+        self.storage_state = storage_state
+        self._playwright = None
+        self._browser = None
+        self._page = None
+        self.session_restored = bool(storage_state) and os.path.exists(storage_state)
+        self.resource_blocker = ResourceBlocker(block_profile) if block_profile else None
+        self.dispatcher = ResponseDispatcher()
+        self.waits = WaitEngine(None, self.dispatcher)
+        self.api_client = ApiClient() if direct_api else None
+        self.tokens = TokenManager(self.api_client)
+        self.dispatcher.add_observer(self.tokens.observe)
+        self.recorder = TrafficRecorder(record) if record else None
+        if self.recorder:
+            self.dispatcher.add_observer(self.recorder.observe)
+        self.replay = ReplayRouter(TrafficArchive.load(replay)) if replay else None
+        self.response_cache = None
+        if response_cache:
+            self.enable_response_cache()
+        self.page_pool_size = page_pool_size
+        self.page_pool: Optional[PagePool] = None
+        self.instruments: Optional[InstrumentMaster] = None
+        if instrument_master:
+            self.enable_instrument_master(DEFAULT_INSTRUMENTS_PATH if instrument_master is True else instrument_master)
+
+    @property
+    def started(self) -> bool:
+        """True si Chromium ya se lanzó."""
+        return self._page is not None
+
+    @property
+    def playwright(self):
+        """Instancia de Playwright (lanza el navegador si todavía no se lanzó)."""
+        self.start()
+        return self._playwright
+
+    @property
+    def browser(self):
+        """Browser de Playwright (lo lanza si todavía no se lanzó)."""
+        self.start()
+        return self._browser
+
+    @property
+    def page(self):
+        """Página principal (lanza el navegador si todavía no se lanzó)."""
+        self.start()
+        return self._page
+
+    def start(self) -> "PlaywrightBrowser":
         """
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=headless)
-        self.page = self.browser.new_page()
+        Lanza Chromium y abre la página principal, si no se hizo antes.
+
+        Se llama sola al primer uso de page; llamarla explícitamente sirve para
+        pagar el arranque en un momento elegido (p. ej. al iniciar un daemon).
+
+        Returns:
+            PlaywrightBrowser: La misma instancia, para encadenar.
+        """
+        if self._page is not None:
+            return self
+        if getattr(self, '_closed', False):
+            raise RuntimeError("El navegador ya fue cerrado.")
+        with self.tracer.span("browser_start", headless=self.headless):
+            self._playwright = sync_playwright().start()
+            self._browser = self._playwright.chromium.launch(headless=self.headless)
+            if self.session_restored:
+                page = self._browser.new_page(storage_state=self.storage_state)
+                logger.info("Sesión restaurada desde %s", self.storage_state)
+            else:
+                page = self._browser.new_page()
+            if self.resource_blocker:
+                self.resource_blocker.install(page)
+            self.dispatcher.attach(page)
+            self.waits.page = page
+            if self.api_client:
+                page.on("request", self._capture_api_headers)
+            if self.replay:
+                self.replay.install(page)
+            self._page = page
         logger.info("Navegador y página iniciados.")
+        return self
 
     def __enter__(self):
         """Método para usar la clase con 'with'."""
@@ -39,10 +169,39 @@ class PlaywrightBrowser:
         if getattr(self, '_closed', False):
             return
         self._closed = True
-        self.browser.close()
-        self.playwright.stop()
+        if self.resource_blocker:
+            logger.info("Recursos bloqueados en la sesión: %s", self.resource_blocker.stats())
+        self.tokens.stop()
+        if self.page_pool:
+            logger.info("Uso del pool de páginas: %s", self.page_pool.stats())
+            self.page_pool.close()
+        if self.api_client:
+            self.api_client.close()
+        if self.recorder:
+            self.recorder.close()
+        if self.replay:
+            logger.info("Uso del replay: %s", self.replay.stats())
+        if self._page is None:
+            logger.info("Cerrado sin haber lanzado el navegador.")
+            return
+        self._browser.close()
+        self._playwright.stop()
         logger.info("Navegador cerrado.")
 
+    def save_storage_state(self, path):
+        """
+        Guarda el estado de la sesión (cookies y localStorage) en un archivo.
+
+        El archivo contiene tokens de sesión, por lo que se deja legible sólo
+        por el usuario actual.
+
+        Args:
+            path: Ruta del archivo de sesión.
+        """
+        self.page.context.storage_state(path=path)
+        os.chmod(path, 0o600)
+        logger.info("Sesión guardada en %s", path)
+
     def go_to(self, url, log_message=None):
         """
         Navega a una URL específica.
@@ -51,8 +210,9 @@ class PlaywrightBrowser:
             url: URL de destino.
             log_message: Mensaje opcional para logging.
         """
-        self.page.goto(url)
-        logger.info(f"Navegado a {url}")
+        with self.tracer.span("go_to", url=url):
+            self.page.goto(url)
+        logger.log(self.step_log_level, "Navegado a %s", url)
 
     def wait_for_element(self, selector, log_message=None, timeout=None):
         """
@@ -64,8 +224,9 @@ class PlaywrightBrowser:
             timeout: Tiempo máximo de espera en ms (usa DEFAULT_TIMEOUT si no se especifica).
         """
         timeout = timeout or DEFAULT_TIMEOUT
-        self.page.wait_for_selector(selector, timeout=timeout, state="visible")
-        logger.info(f"Elemento encontrado: {selector}")
+        with self.tracer.span("wait_for_element", selector=selector):
+            self.page.wait_for_selector(selector, timeout=timeout, state="visible")
+        logger.log(self.step_log_level, "Elemento encontrado: %s", selector)
         if log_message:
             logger.info(log_message)
 
@@ -78,13 +239,13 @@ class PlaywrightBrowser:
             log_message: Mensaje opcional para logging.
             timeout: Tiempo máximo de espera en ms.
         """
-        self.wait_for_element(selector, timeout)
+        self.wait_for_element(selector, timeout=timeout)
         self.page.click(selector)
-        logger.info(f"Clic en el elemento: {selector}")
+        logger.log(self.step_log_level, "Clic en el elemento: %s", selector)
         if log_message:
             logger.info(log_message)
 
-    def fill_input(self, selector, value, log_message=None, timeout=None):
+    def fill_input(self, selector, value, log_message=None, timeout=None, sensitive=False):
         """
         Espera a que un input sea visible y lo llena con un valor.
         
@@ -93,14 +254,16 @@ class PlaywrightBrowser:
             value: Valor a ingresar.
             log_message: Mensaje opcional para logging.
             timeout: Tiempo máximo de espera en ms.
+            sensitive: Si True, el valor no aparece en los logs (contraseñas, códigos).
         """
-        self.wait_for_element(selector, timeout)
+        self.wait_for_element(selector, timeout=timeout)
         self.page.fill(selector, value)
-        logger.info(f"Input {selector} llenado con el valor: {value}")
+        logger.log(self.step_log_level, "Input %s llenado con el valor: %s",
+                   selector, mask(value) if sensitive else value)
         if log_message:
             logger.info(log_message)
 
-    def fill_input_with_events(self, selector, value, log_message=None, timeout=None):
+    def fill_input_with_events(self, selector, value, log_message=None, timeout=None, sensitive=False):
         """
         Espera a que un input sea visible, lo llena con un valor y simula eventos adicionales para su procesamiento.
 
@@ -109,23 +272,27 @@ class PlaywrightBrowser:
             value (str): Valor a ingresar.
             log_message (str): Mensaje opcional para el log.
             timeout (int): Tiempo máximo de espera para encontrar el elemento.
+            sensitive (bool): Si True, el valor no aparece en los logs.
         """
-        self.wait_for_element(selector, timeout)
+        self.wait_for_element(selector, timeout=timeout)
         self.page.fill(selector, value)
-        logger.info(f"Input {selector} llenado con el valor: {value}")
+        logger.log(self.step_log_level, "Input %s llenado con el valor: %s",
+                   selector, mask(value) if sensitive else value)
         if log_message:
             logger.info(log_message)
 
         # Simular un evento 'Enter' y 'Blur'
         self.page.keyboard.press("Enter")  # Simula que el usuario presiona Enter
         self.page.locator(selector).evaluate("el => el.blur()")  # Simula pérdida de foco (blur)
-        logger.info(f"Eventos adicionales simulados para el selector: {selector}")
-
-    import time
+        logger.log(self.step_log_level, "Eventos adicionales simulados para el selector: %s", selector)
 
-    def fill_input_with_delay(self, selector, value, log_message=None, timeout=None, delay=0.4):
+    def fill_input_with_delay(self, selector, value, log_message=None, timeout=None, delay=TYPING_DELAY / 1000,
+                              sensitive=False):
         """
-        Llena un input carácter por carácter con un retraso entre cada tecla.
+        Llena un input tecla por tecla y espera a que la web app refleje el valor.
+
+        Si el valor no queda bien escrito a los INPUT_VALUE_TIMEOUT ms (la máscara
+        del input perdió teclas), se reescribe con el retraso anterior de 0.4 s por tecla.
 
         Args:
             selector (str): Selector del input.
@@ -133,21 +300,51 @@ class PlaywrightBrowser:
             log_message (str): Mensaje opcional para log.
             timeout (int): Tiempo máximo para esperar el elemento.
             delay (float): Tiempo en segundos entre cada tecla.
-
+            sensitive (bool): Si True, el valor no aparece en los logs.
         """
-        self.wait_for_element(selector, timeout)
+        self.wait_for_element(selector, timeout=timeout)
         input_element = self.page.locator(selector)
+        start = time.monotonic()
 
         # Limpiar el campo antes de escribir
         input_element.fill("")
-        logger.info(f"Input {selector} limpiado.")
+        logger.log(self.step_log_level, "Input %s limpiado.", selector)
 
-        # Escribir carácter por carácter con retraso
-        for char in value:
-            input_element.type(char)
-            time.sleep(delay)
+        input_element.type(value, delay=delay * 1000)
+        try:
+            self.waits.input_value(selector, value, timeout=INPUT_VALUE_TIMEOUT)
+        except TimeoutError:
+            logger.warning("El input %s no reflejó el valor, reescribiendo más lento.", selector)
+            input_element.fill("")
+            input_element.type(value, delay=LEGACY_SLEEPS["typing_per_char"] * 1000)
+        self.waits.report.record("typing", time.monotonic() - start,
+                                 LEGACY_SLEEPS["typing_per_char"] * len(value))
+
+        logger.log(self.step_log_level, "Input %s llenado con el valor: %s",
+                   selector, mask(value) if sensitive else value)
+        if log_message:
+            logger.info(log_message)
 
-        logger.info(f"Input {selector} llenado con el valor: {value}")
+    def type_code(self, selector, code, last_selector, log_message=None, timeout=CODE_ENTRY_TIMEOUT):
+        """
+        Escribe un código repartido en varias casillas (p. ej. el 2FA) con una sola
+        secuencia de teclado: hace foco en la primera casilla y la web app avanza el
+        foco en cada tecla.
+
+        Args:
+            selector (str): Selector de la primera casilla.
+            code (str): Código a ingresar.
+            last_selector (str): Selector de la última casilla, para confirmar el ingreso.
+            log_message (str): Mensaje opcional para log.
+            timeout (int): Tiempo máximo en ms para que la última casilla refleje su carácter.
+
+        Raises:
+            TimeoutError: Si la última casilla no recibió su carácter.
+        """
+        self.page.focus(selector)
+        self.page.keyboard.type(code)
+        self.waits.input_value(last_selector, code[-1], timeout=timeout)
+        logger.log(self.step_log_level, "Código ingresado desde %s.", selector)
         if log_message:
             logger.info(log_message)
 
@@ -162,9 +359,9 @@ class PlaywrightBrowser:
         Returns:
             str: Contenido de texto del elemento.
         """
-        self.wait_for_element(selector, timeout)
+        self.wait_for_element(selector, timeout=timeout)
         text = self.page.text_content(selector)
-        logger.info(f"Contenido de texto del elemento {selector}: {text}")
+        logger.log(self.step_log_level, "Contenido de texto del elemento %s: %s", selector, text)
         return text
 
     def take_screenshot(self, filename="screenshot.png"):
@@ -175,7 +372,7 @@ class PlaywrightBrowser:
             filename: Nombre del archivo donde guardar la captura (default: screenshot.png).
         """
         self.page.screenshot(path=filename)
-        logger.info(f"Captura de pantalla guardada en: {filename}")
+        logger.info("Captura de pantalla guardada en: %s", filename)
 
 
     def process_response(self, response, success_message=None):
@@ -196,12 +393,13 @@ class PlaywrightBrowser:
                     logger.info(success_message)
                 return data
             else:
-                logger.error(f"Error en la solicitud interceptada: {response.status}")
-                logger.debug(f"Encabezados de respuesta: {response.headers}")
-                logger.debug(f"Cuerpo de respuesta: {response.text()}")
+                logger.error("Error en la solicitud interceptada: %s", response.status)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug("Encabezados de respuesta: %s", response.headers)
+                    logger.debug("Cuerpo de respuesta: %s", response.text())
                 return None
         except Exception as e:
-            logger.error(f"Error al procesar la respuesta: {e}")
+            logger.error("Error al procesar la respuesta: %s", e)
             return None
 
     def search_and_select(self, search_input_selector, search_term, list_item_selector, log_message):
@@ -217,65 +415,345 @@ class PlaywrightBrowser:
         self.fill_input(search_input_selector, search_term, f"Ingresando '{search_term}' en el campo de búsqueda.")
         self.click_element(list_item_selector.format(search_term), log_message)
 
+    def enable_response_cache(self, max_entries: int = DEFAULT_CACHE_SIZE) -> ResponseCache:
+        """
+        Activa el cache pasivo: cada respuesta JSON exitosa de la API que reciba la
+        página (incluidos los requests que la web app hace en segundo plano) queda
+        guardada con su timestamp, y fetch_data(max_age=...) puede responder desde ahí.
+
+        Args:
+            max_entries: Cantidad máxima de URLs guardadas (desalojo LRU).
+
+        Returns:
+            ResponseCache: El cache activo.
+        """
+        if self.response_cache is None:
+            self.response_cache = ResponseCache(max_entries)
+            self.dispatcher.add_observer(self._record_response)
+        return self.response_cache
+
+    def enable_instrument_master(self, path: Optional[str] = DEFAULT_INSTRUMENTS_PATH) -> InstrumentMaster:
+        """
+        Activa el maestro de instrumentos: lo carga del archivo y registra un
+        observador que incorpora cada lista de mercado que reciba la página.
+
+        Args:
+            path: Archivo del maestro (None para mantenerlo sólo en memoria).
+
+        Returns:
+            InstrumentMaster: El maestro activo.
+        """
+        if self.instruments is None:
+            self.instruments = InstrumentMaster(path)
+            self.dispatcher.add_observer(self.instruments.observe)
+        return self.instruments
+
+    def _record_response(self, response):
+        """
+        Observador del dispatcher que guarda las respuestas JSON de la API en el cache.
+
+        Args:
+            response: Objeto Response de Playwright.
+        """
+        if response.status != 200 or not response.url.startswith(API_ROOT):
+            return
+        if "json" not in response.headers.get("content-type", ""):
+            return
+        self.response_cache.put(response.url, response.json())
+
+    def _capture_api_headers(self, request):
+        """
+        Callback de Playwright que guarda los headers de autenticación de la web app.
+
+        No reemplaza un token renovado por TokenManager con el más viejo que la web
+        app pueda seguir enviando.
+
+        Args:
+            request: Objeto Request de Playwright.
+        """
+        if request.url.startswith(API_ROOT):
+            headers = request.headers
+            if self.tokens.is_stale(headers.get("authorization")):
+                headers = {name: value for name, value in headers.items() if name.lower() != "authorization"}
+            self.api_client.update_headers(headers)
+
+    def capture_api_session(self) -> bool:
+        """
+        Copia las cookies del contexto al cliente directo de API.
+
+        Se llama al terminar el login; el token bearer se captura de los requests
+        que la web app hace a la API.
+
+        Returns:
+            bool: True si el modo directo quedó listo para usarse.
+        """
+        if not self.api_client:
+            return False
+        self.api_client.set_cookies(self.page.context.cookies())
+        if self.api_client.is_authenticated:
+            logger.info("Sesión de API capturada para el modo directo.")
+        else:
+            logger.warning("Todavía no se capturó el token de la API; se usará la intercepción.")
+        return self.api_client.is_authenticated
+
+    def _fetch_direct(self, request_url: str):
+        """
+        Llama al endpoint directamente con el cliente de API.
+
+        Args:
+            request_url: URL del endpoint.
+
+        Returns:
+            tuple: (True, datos) si la llamada fue exitosa, (False, None) si hay que
+            volver a la intercepción.
+        """
+        try:
+            with self.tracer.span("api_request", url=request_url):
+                data = self.api_client.get_json(request_url)
+            logger.info("Respuesta directa de la API: URL=%s", request_url)
+            if self.response_cache is not None and data is not None:
+                self.response_cache.put(request_url, data)
+            return True, data
+        except (ApiClientError, OSError) as e:
+            logger.warning("Falló la llamada directa a %s, usando intercepción: %s", request_url, e)
+            return False, None
+
+    def _fetch_replay(self, request_url: str, process_response=None):
+        """
+        Responde una lectura con la siguiente respuesta grabada en el archivo de replay.
+
+        Returns:
+            Datos procesados, o None si el request no se grabó o no fue exitoso.
+        """
+        with self.tracer.span("replay", url=request_url):
+            entry = self.replay.lookup(request_url)
+        if entry is None or entry.status != 200:
+            return None
+        return self._handle_data(entry.body, request_url, process_response)
+
+    def _handle_data(self, data, request_url: str, process_response=None):
+        """
+        Aplica el post-procesamiento común a los datos obtenidos de la API.
+
+        Args:
+            data: Cuerpo JSON decodificado.
+            request_url: URL del request (para logging).
+            process_response: Función opcional para procesar los datos.
+
+        Returns:
+            Datos procesados o None si la respuesta vino vacía.
+        """
+        logger.debug("Contenido de la respuesta (JSON): %s", data)
+        if not data:
+            logger.info("No se encontraron datos en la respuesta para %s.", request_url)
+            return None
+        if process_response:
+            with self.tracer.span("process_response"):
+                return process_response(data)
+        return data
+
+    def _read_response(self, response, request_url: str, process_response=None):
+        """
+        Decodifica una respuesta interceptada y aplica el post-procesamiento común.
+
+        Args:
+            response: Objeto Response de Playwright.
+            request_url: URL del request (para logging).
+            process_response: Función opcional para procesar los datos.
+
+        Returns:
+            Datos procesados o None si la respuesta no es exitosa o está vacía.
+        """
+        if response and response.status == 200:
+            try:
+                with self.tracer.span("response.json"):
+                    data = response.json()
+            except Exception as e:
+                logger.error("No se pudo decodificar el JSON de la respuesta: %s", e)
+                return None
+            return self._handle_data(data, request_url, process_response)
+        logger.warning("Respuesta no exitosa o nula. Estado: %s", getattr(response, 'status', 'Desconocido'))
+        return None
+
     def fetch_data(self, request_url: str, navigation_url: str, process_response=None,
-                   timeout: int = DEFAULT_TIMEOUT) -> Optional[Dict[str, Any]]:
+                   timeout: int = DEFAULT_TIMEOUT, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Intercepta un request específico y procesa su respuesta.
+
+        En modo directo (direct_api=True) primero llama al endpoint con la sesión
+        capturada y sólo navega a navigation_url si esa llamada falla.
         
+        En modo replay la respuesta sale del archivo grabado, sin navegar.
+
         Args:
             request_url: URL del request a interceptar.
             navigation_url: URL a la que navegar para disparar el request.
             process_response: Función opcional para procesar la respuesta antes de retornarla.
             timeout: Tiempo máximo de espera en ms.
+            max_age: Antigüedad máxima en segundos aceptada desde el cache pasivo. Si el
+                cache está activo y tiene una respuesta más reciente, no se navega.
             
         Returns:
             Optional[Dict[str, Any]]: Datos de la respuesta procesados o None si falla.
         """
+        if max_age is not None and self.response_cache is not None:
+            hit, data = self.response_cache.get(request_url, max_age)
+            if hit:
+                logger.info("Respuesta de %s obtenida del cache.", request_url)
+                return self._handle_data(data, request_url, process_response)
+
+        if self.replay:
+            return self._fetch_replay(request_url, process_response)
+
+        if self.api_client and self.api_client.is_authenticated:
+            ok, data = self._fetch_direct(request_url)
+            if ok:
+                return self._handle_data(data, request_url, process_response)
+
         try:
-            self.go_to(navigation_url)
+            with self.dispatcher.expect(request_url) as waiter:
+                self.go_to(navigation_url)
+                logger.log(self.step_log_level, "Esperando la respuesta de %s...", request_url)
+                with self.tracer.span("expect_response", url=request_url):
+                    response = waiter.wait(timeout)
 
-            # Registrar respuestas generales mientras esperamos una específica
-            def handle_response(response):
-                """
-                Callback de Playwright para interceptar y logear respuestas HTTP.
-                
-                Args:
-                    response: Objeto Response de Playwright.
-                    
-                Returns:
-                    Response si la URL coincide con request_url, sino None.
-                """
-                if request_url in response.url:
-                    logger.info(f"Respuesta interceptada: URL={response.url}, Estado={response.status}")
-                    return response
-
-            self.page.on("response", handle_response)
-
-            with self.page.expect_response(request_url, timeout=timeout) as response_info:
-                logger.info(f"Esperando la respuesta de {request_url}...")
-                response = response_info.value
-
-            # Procesar respuesta
-            if response and response.status == 200:
-                try:
-                    data = response.json()
-                    logger.debug("Contenido de la respuesta (JSON): %s", data)
-                    if not data:
-                        logger.info(f"No se encontraron datos en la respuesta para {request_url}.")
-                        return None
-                    if process_response:
-                        return process_response(data)
-                    return data
-                except Exception as e:
-                    logger.error("No se pudo decodificar el JSON de la respuesta: %s", e)
-                    return None
-            else:
-                logger.warning(f"Respuesta no exitosa o nula. Estado: {getattr(response, 'status', 'Desconocido')}")
-                return None
+            return self._read_response(response, request_url, process_response)
 
         except TimeoutError:
-            logger.info(f"No se encontraron datos para {request_url} antes del timeout.")
+            logger.info("No se encontraron datos para %s antes del timeout.", request_url)
             return None
         except Exception as e:
-            logger.error(f"Error general en fetch_data: {e}")
+            logger.error("Error general en fetch_data: %s", e)
             return None
+
+    def fetch_many(self, navigation_url: str, request_urls: List[str],
+                   timeout: int = DEFAULT_TIMEOUT) -> Dict[str, Any]:
+        """
+        Obtiene varios endpoints que la web app pide al cargar una misma página,
+        con una sola navegación.
+
+        En modo directo, los endpoints que responden por la API no esperan la
+        navegación; sólo los que fallan se interceptan.
+        En modo replay todos salen del archivo grabado.
+
+        Args:
+            navigation_url: URL a la que navegar para disparar los requests.
+            request_urls: URLs de los requests a interceptar.
+            timeout: Tiempo máximo de espera en ms para el conjunto de respuestas.
+
+        Returns:
+            Dict[str, Any]: Datos por URL de request; None para las que fallaron o no llegaron.
+        """
+        if self.replay:
+            return {request_url: self._fetch_replay(request_url) for request_url in request_urls}
+        results: Dict[str, Any] = {}
+        pending = list(request_urls)
+        if self.api_client and self.api_client.is_authenticated:
+            for request_url in request_urls:
+                ok, data = self._fetch_direct(request_url)
+                if ok:
+                    results[request_url] = self._handle_data(data, request_url)
+                    pending.remove(request_url)
+        if not pending:
+            return results
+
+        waiters = [self.dispatcher.expect(request_url) for request_url in pending]
+        try:
+            self.go_to(navigation_url)
+            if not self.dispatcher.wait_all(waiters, timeout):
+                logger.info("No llegaron todas las respuestas antes del timeout.")
+            for waiter in waiters:
+                results[waiter.pattern] = self._read_response(waiter.response, waiter.pattern) if waiter.done else None
+        except Exception as e:
+            logger.error("Error general en fetch_many: %s", e)
+            results.update({request_url: None for request_url in pending})
+        finally:
+            for waiter in waiters:
+                self.dispatcher.discard(waiter)
+        return results
+
+    def enable_page_pool(self, size: Optional[int] = None) -> PagePool:
+        """
+        Crea el pool de páginas de fetch_parallel (si no existe).
+
+        Cada página vive en su propio BrowserContext creado con el storage state
+        de la sesión del navegador, así que debe usarse después del login.
+
+        Args:
+            size: Cantidad de páginas (por defecto, page_pool_size).
+
+        Returns:
+            PagePool: El pool activo.
+        """
+        if self.page_pool is None:
+            self.page_pool = PagePool(self.browser, self.page.context.storage_state,
+                                      size or self.page_pool_size, setup=self._setup_pool_page)
+        return self.page_pool
+
+    def _setup_pool_page(self, pooled: PooledPage) -> None:
+        """Aplica a una página del pool el bloqueo de recursos y los observadores de la principal."""
+        if self.resource_blocker:
+            self.resource_blocker.install(pooled.page)
+        if self.recorder:
+            pooled.dispatcher.add_observer(self.recorder.observe)
+        if self.response_cache is not None:
+            pooled.dispatcher.add_observer(self._record_response)
+        if self.instruments is not None:
+            pooled.dispatcher.add_observer(self.instruments.observe)
+        pooled.dispatcher.add_observer(self.tokens.observe)
+
+    def fetch_parallel(self, requests: Dict[Hashable, FetchRequest],
+                       timeout: int = DEFAULT_TIMEOUT) -> Dict[Hashable, Any]:
+        """
+        Ejecuta varias lecturas a la vez.
+
+        En modo directo las llamadas a la API corren en paralelo en hilos (una
+        conexión keep-alive por hilo); las que fallan, o todas si no hay modo
+        directo, se reparten entre las páginas del pool, que navegan en paralelo.
+        En modo replay todas salen del archivo grabado.
+
+        Example:
+            cocos.fetch_parallel({
+                "portfolio": cocos.user.portfolio_request(),
+                "orders": cocos.market.orders_request(),
+                "GGAL": cocos.market.ticker_request("GGAL", MarketType.STOCKS),
+            })
+
+        Args:
+            requests: Lecturas por clave.
+            timeout: Tiempo máximo en ms por lectura.
+
+        Returns:
+            Dict[Hashable, Any]: Datos procesados por clave; None para las que fallaron.
+        """
+        if self.replay:
+            return {key: self._fetch_replay(request.request_url, request.process_response)
+                    for key, request in requests.items()}
+        results: Dict[Hashable, Any] = {}
+        pending = dict(requests)
+        if self.api_client and self.api_client.is_authenticated and pending:
+            with ThreadPoolExecutor(max_workers=min(len(pending), self.page_pool_size)) as executor:
+                futures = {key: executor.submit(self._get_direct, request.request_url)
+                           for key, request in pending.items()}
+            for key, future in futures.items():
+                ok, data = future.result()
+                if ok:
+                    request = pending.pop(key)
+                    if self.response_cache is not None and data is not None:
+                        self.response_cache.put(request.request_url, data)
+                    results[key] = self._handle_data(data, request.request_url, request.process_response)
+        if not pending:
+            return results
+
+        responses = self.enable_page_pool().run(pending, timeout)
+        for key, request in pending.items():
+            results[key] = self._read_response(responses.get(key), request.request_url, request.process_response)
+        return results
+
+    def _get_direct(self, request_url: str):
+        """Versión de _fetch_direct segura para hilos: no toca el cache."""
+        try:
+            return True, self.api_client.get_json(request_url)
+        except (ApiClientError, OSError) as e:
+            logger.warning("Falló la llamada directa a %s, usando el pool de páginas: %s", request_url, e)
+            return False, None
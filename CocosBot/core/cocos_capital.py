@@ -1,7 +1,15 @@
+import os
 from CocosBot.core.browser import PlaywrightBrowser
-from typing import Optional, Dict, Any, Union
+from typing import Optional, Dict, Any, Iterable, List, Union
 from CocosBot.config.enums import Currency
+from CocosBot.config.urls import WEB_APP_URLS, API_URLS, DASHBOARD_API_KEYS
+from CocosBot.config.general import PAGE_POOL_SIZE, STEP_LOG_LEVEL
 from CocosBot.config.enums import OrderOperation, MarketType
+from CocosBot.core.instruments import Instrument
+from CocosBot.core.market_snapshot import MarketSnapshot
+from CocosBot.core.order_watcher import OrderWatcher
+from CocosBot.core.quote_stream import QuoteStream
+from CocosBot.core.tracing import traced_methods
 from CocosBot.services.auth import AuthService
 from CocosBot.services.market import MarketService
 from CocosBot.services.user import UserService
@@ -11,6 +19,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 
+@traced_methods
 class CocosCapital(PlaywrightBrowser):
     """
     Cliente principal para interactuar con Cocos Capital.
@@ -19,6 +28,32 @@ class CocosCapital(PlaywrightBrowser):
     disponibles en Cocos Capital, delegando las funcionalidades específicas
     a servicios especializados.
 
+    Si se indica session_file, la sesión se guarda después del login y se
+    reutiliza en las próximas ejecuciones mientras siga siendo válida, evitando
+    el formulario de login y el 2FA.
+
+    Con response_cache=True, los métodos de lectura aceptan max_age (segundos) y
+    responden sin navegar si la web app ya recibió esos datos hace menos tiempo.
+
+    fetch_parallel ejecuta varias lecturas a la vez en un pool de hasta
+    page_pool_size páginas que comparten la sesión autenticada.
+
+    Con instrument_master=True, el maestro de instrumentos en disco permite
+    llamar a get_ticker_info sin indicar el tipo de mercado y buscar tickers sin
+    navegar (refresh_instruments lo actualiza una vez por día).
+
+    Cada método público se mide como una operación en self.tracer, con sus
+    etapas (navegación, esperas, decodificación) como spans anidados; ver
+    tracer.summary(), tracer.to_prometheus() y tracer.export_jsonl().
+
+    Con record="sesion.jsonl" (o .har) se graba el tráfico a la API de una sesión
+    real; con replay= esa grabación responde la API sin red y las lecturas no
+    navegan, para tests y backfills deterministas.
+
+    Chromium se lanza recién en la primera operación que necesita el navegador
+    (ver PlaywrightBrowser.start): construir el cliente no abre nada y, en modo
+    replay o con datos en el cache, puede no abrirse nunca.
+
     Example:
         cocos = CocosCapital("user@example.com", "password", "gmail_user", "gmail_pass")
         if cocos.login():
@@ -26,9 +61,15 @@ class CocosCapital(PlaywrightBrowser):
             print(user_data)
             cocos.logout()
     """
-    def __init__(self, username, password, gmail_user, gmail_app_pass, headless=False):
-        super().__init__(headless)
+    def __init__(self, username, password, gmail_user, gmail_app_pass, headless=False, direct_api=False,
+                 session_file=None, response_cache=False, block_profile=None, page_pool_size=PAGE_POOL_SIZE,
+                 instrument_master=False, tracing=True, record=None, replay=None,
+                 step_log_level=STEP_LOG_LEVEL):
         validate_credentials([username, password, gmail_user, gmail_app_pass])
+        super().__init__(headless, direct_api=direct_api, storage_state=session_file,
+                         response_cache=response_cache, block_profile=block_profile,
+                         page_pool_size=page_pool_size, instrument_master=instrument_master, tracing=tracing,
+                         record=record, replay=replay, step_log_level=step_log_level)
         self.auth = AuthService(self)
         self.market = MarketService(self)
         self.user = UserService(self)
@@ -36,32 +77,50 @@ class CocosCapital(PlaywrightBrowser):
         self.password = password
         self.gmail_user = gmail_user
         self.gmail_app_pass = gmail_app_pass
+        self.session_file = session_file
 
     # Métodos de Autenticación
     def login(self) -> bool:
-        """Realiza el login usando el servicio de autenticación."""
-        return self.auth.login(self.username, self.password, self.gmail_user, self.gmail_app_pass)
+        """
+        Realiza el login usando el servicio de autenticación.
+
+        Si hay una sesión restaurada y sigue siendo válida, no se repite el login.
+        En modo replay no hace falta sesión.
+        """
+        if self.replay:
+            logger.info("Modo replay: se omite el login.")
+            return True
+        if self.session_restored and self.auth.is_session_valid():
+            self.capture_api_session()
+            return True
+        result = self.auth.login(self.username, self.password, self.gmail_user, self.gmail_app_pass)
+        if self.session_file:
+            self.auth.save_session(self.session_file)
+        return result
 
     def logout(self) -> bool:
-        """Realiza el logout usando el servicio de autenticación."""
-        return self.auth.logout()
+        """Realiza el logout usando el servicio de autenticación y descarta la sesión guardada."""
+        result = self.auth.logout()
+        if self.session_file and os.path.exists(self.session_file):
+            os.remove(self.session_file)
+        return result
 
     # Métodos de Usuario y Cuenta
-    def get_user_data(self) -> Optional[Dict[str, Any]]:
+    def get_user_data(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """Obtiene los datos del usuario."""
-        return self.user.get_user_data()
+        return self.user.get_user_data(max_age=max_age)
 
-    def get_account_tier(self) -> Optional[Dict[str, Any]]:
+    def get_account_tier(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """Obtiene el nivel de cuenta del usuario."""
-        return self.user.get_account_tier()
+        return self.user.get_account_tier(max_age=max_age)
 
-    def get_portfolio_data(self) -> Optional[Dict[str, Any]]:
+    def get_portfolio_data(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """Obtiene los datos del portafolio del usuario."""
-        return self.user.get_portfolio_data()
+        return self.user.get_portfolio_data(max_age=max_age)
 
-    def fetch_portfolio_balance(self) -> Optional[float]:
+    def fetch_portfolio_balance(self, max_age: Optional[float] = None) -> Optional[float]:
         """Obtiene el balance total del portafolio."""
-        return self.user.get_portfolio_balance()
+        return self.user.get_portfolio_balance(max_age=max_age)
 
     def get_linked_accounts(self, amount: float = 5000, currency: Currency = Currency.ARS) -> Optional[Dict[str, Any]]:
         """
@@ -76,9 +135,21 @@ class CocosCapital(PlaywrightBrowser):
         """
         return self.user.get_linked_accounts(amount, currency)
 
-    def get_academy_data(self) -> Optional[Dict[str, Any]]:
+    def get_academy_data(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """Obtiene los datos de la sección de Academia desde la API."""
-        return self.user.get_academy_data()
+        return self.user.get_academy_data(max_age=max_age)
+
+    def snapshot(self) -> Dict[str, Optional[Any]]:
+        """
+        Obtiene en una sola carga del dashboard los datos del usuario, el nivel de
+        cuenta, los horarios del mercado y la Academia.
+
+        Returns:
+            Dict[str, Optional[Any]]: Datos por clave de API_URLS (user_data,
+            account_tier, markets_schedule, academy); None si alguno falló.
+        """
+        results = self.fetch_many(WEB_APP_URLS["dashboard"], [API_URLS[key] for key in DASHBOARD_API_KEYS])
+        return {key: results.get(API_URLS[key]) for key in DASHBOARD_API_KEYS}
 
     # Métodos de Mercado y Operaciones
     def create_order(self, ticker: str, operation: Union[str, OrderOperation], amount: float,
@@ -86,22 +157,62 @@ class CocosCapital(PlaywrightBrowser):
         """Crea una orden usando el servicio de mercado."""
         return self.market.create_order(ticker, operation, amount, limit)
 
-    def get_ticker_info(self, ticker: str, ticker_type: Union[str, MarketType], segment: str = "C") -> Optional[Dict[str, Any]]:
-        """Obtiene la información de un ticker."""
+    def submit_order(self, ticker: str, operation: Union[str, OrderOperation], amount: float,
+                     limit: Optional[float] = None, segment: str = "C") -> Dict[str, Any]:
+        """Envía una orden por la API (con la UI como alternativa) y devuelve id y latencia."""
+        return self.market.submit_order(ticker, operation, amount, limit, segment)
+
+    def get_ticker_info(self, ticker: str, ticker_type: Union[str, MarketType, None] = None,
+                        segment: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Obtiene la información de un ticker (tipo y segmento del maestro si no se indican)."""
         return self.market.get_ticker_info(ticker, ticker_type, segment)
 
-    def get_market_schedule(self) -> Optional[Dict[str, Any]]:
+    def get_market_snapshot(self, market_type: Union[str, MarketType],
+                            max_age: Optional[float] = None) -> Optional[MarketSnapshot]:
+        """Obtiene las cotizaciones de todo un mercado con una sola lectura."""
+        return self.market.get_market_snapshot(market_type, max_age=max_age)
+
+    def stream_quotes(self, tickers: Iterable[str], market_type: Union[str, MarketType, None] = None,
+                      **kwargs) -> QuoteStream:
+        """Abre un stream de cotizaciones en tiempo real para los tickers indicados."""
+        return self.market.stream_quotes(tickers, market_type, **kwargs)
+
+    def refresh_instruments(self, force: bool = False) -> List[str]:
+        """Actualiza el maestro de instrumentos con los mercados desactualizados."""
+        return self.market.refresh_instruments(force)
+
+    def lookup_instrument(self, ticker: str) -> Optional[Instrument]:
+        """Busca un ticker en el maestro de instrumentos."""
+        return self.market.lookup_instrument(ticker)
+
+    def search_instruments(self, prefix: str, limit: Optional[int] = 20) -> List[Instrument]:
+        """Busca tickers por prefijo en el maestro de instrumentos."""
+        return self.market.search_instruments(prefix, limit)
+
+    def get_market_schedule(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """Obtiene los horarios del mercado."""
-        return self.market.get_market_schedule()
+        return self.market.get_market_schedule(max_age=max_age)
 
-    def get_orders(self) -> Optional[Dict[str, Any]]:
+    def get_orders(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """Obtiene las órdenes del usuario desde la API."""
-        return self.market.get_orders()
+        return self.market.get_orders(max_age=max_age)
+
+    def watch_orders(self, **kwargs) -> OrderWatcher:
+        """Empieza a seguir las órdenes del usuario y emite sólo sus cambios."""
+        return self.market.watch_orders(**kwargs)
+
+    def cancel_order(self, order_id: Union[int, str, float, None] = None, quantity: Optional[int] = None,
+                     amount: Optional[float] = None) -> bool:
+        """Cancela una orden por id (o, en la forma anterior, por monto y cantidad)."""
+        if quantity is not None:
+            return self.market.cancel_order(amount if amount is not None else order_id, quantity)
+        return self.market.cancel_order(order_id)
 
-    def cancel_order(self, amount: float, quantity: int) -> bool:
-        """Cancela una orden usando el servicio de mercado."""
-        return self.market.cancel_order(amount, quantity)
+    def cancel_all(self, ticker: Optional[str] = None,
+                   side: Union[str, OrderOperation, None] = None) -> List[Dict[str, Any]]:
+        """Cancela por API todas las órdenes pendientes que coinciden."""
+        return self.market.cancel_all(ticker, side)
 
-    def get_mep_value(self) -> Optional[Dict[str, Any]]:
+    def get_mep_value(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """Obtiene el valor DOLAR MEP."""
-        return self.market.get_mep_value()
\ No newline at end of file
+        return self.market.get_mep_value(max_age=max_age)
\ No newline at end of file
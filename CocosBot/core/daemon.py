@@ -0,0 +1,475 @@
+"""
+Daemon que mantiene un CocosCapital logueado y atiende llamadas JSON-RPC 2.0
+por un socket Unix local.
+
+Evita pagar el arranque de Chromium, el login y el 2FA en cada invocación de
+un cliente (p. ej. una CLI): el cliente sólo abre el socket y manda una línea JSON.
+
+Uso:
+    COCOS_USERNAME=... COCOS_PASSWORD=... GMAIL_USER=... GMAIL_APP_PASS=... \\
+        python -m CocosBot.core.daemon serve
+    python -m CocosBot.core.daemon call get_portfolio_data
+    python -m CocosBot.core.daemon call create_order '["GGAL", "BUY", 1000]'
+"""
+import argparse
+import inspect
+import json
+import os
+import queue
+import socket
+import socketserver
+import sys
+import threading
+import time
+from concurrent.futures import Future, wait
+from typing import Any, Callable, Dict, Optional
+from CocosBot.core.log_setup import configure_logging
+
+import logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_SOCKET_PATH = os.path.join(os.path.expanduser("~"), ".cocosbot", "daemon.sock")
+
+# Tiempo máximo (s) que un cliente espera el resultado de una llamada
+DEFAULT_REQUEST_TIMEOUT = 120
+
+# Intervalo (s) con el que el worker bombea eventos de Playwright mientras no hay pedidos
+IDLE_PUMP_INTERVAL = 1.0
+
+# Métodos de la fachada CocosCapital expuestos por RPC
+RPC_METHODS = (
+    "get_user_data",
+    "get_account_tier",
+    "get_portfolio_data",
+    "fetch_portfolio_balance",
+    "get_linked_accounts",
+    "get_academy_data",
+    "snapshot",
+    "create_order",
+    "submit_order",
+    "get_ticker_info",
+    "get_market_snapshot",
+    "refresh_instruments",
+    "lookup_instrument",
+    "search_instruments",
+    "get_market_schedule",
+    "get_orders",
+    "cancel_order",
+    "cancel_all",
+    "get_mep_value",
+    "logout",
+)
+
+# Códigos de error JSON-RPC 2.0
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+SERVER_ERROR = -32000
+# La llamada venció en la cola y se canceló: no se ejecutó y se puede reintentar
+REQUEST_TIMEOUT = -32001
+# La llamada venció mientras se ejecutaba: sigue corriendo y su resultado es
+# incierto (p. ej. una orden que puede crearse igual); no reintentar a ciegas
+OUTCOME_UNKNOWN = -32002
+
+
+class DaemonError(Exception):
+    """Error devuelto por el daemon o al comunicarse con él."""
+
+    def __init__(self, message: str, code: Optional[int] = None, data: Any = None):
+        super().__init__(message)
+        self.code = code
+        self.data = data
+
+
+class _RpcHandler(socketserver.StreamRequestHandler):
+    """Atiende una conexión: una línea JSON por pedido, una línea JSON por respuesta."""
+
+    def handle(self):
+        for line in self.rfile:
+            if not line.strip():
+                continue
+            response = self.server.cocos_daemon.handle_line(line)
+            self.wfile.write(json.dumps(response, default=str).encode("utf-8") + b"\n")
+            self.wfile.flush()
+
+
+class _UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+
+class CocosDaemon:
+    """
+    Dueño de una única instancia de CocosCapital que atiende pedidos por socket.
+
+    Sync Playwright sólo puede usarse desde el hilo que lo inició, así que la
+    instancia se crea y se usa en un único hilo worker; las conexiones de los
+    clientes encolan los pedidos y esperan su resultado.
+    """
+
+    def __init__(self, factory: Callable[[], Any], socket_path: str = DEFAULT_SOCKET_PATH,
+                 login: bool = True, request_timeout: float = DEFAULT_REQUEST_TIMEOUT):
+        """
+        Args:
+            factory: Función sin argumentos que crea el CocosCapital (se llama en el worker).
+            socket_path: Ruta del socket Unix.
+            login: Si True, llama a login() al iniciar.
+            request_timeout: Tiempo máximo (s) de espera de cada pedido.
+        """
+        self.factory = factory
+        self.socket_path = socket_path
+        self.login = login
+        self.request_timeout = request_timeout
+        self.cocos = None
+        self._queue: "queue.Queue" = queue.Queue()
+        self._ready = threading.Event()
+        self._startup_error: Optional[BaseException] = None
+        self._worker: Optional[threading.Thread] = None
+        self._server: Optional[_UnixServer] = None
+        self._serving = False
+        self._started_at = None
+        self.served = 0
+        self.failed = 0
+        self.busy_time = 0.0
+
+    def start(self) -> "CocosDaemon":
+        """
+        Inicia el worker (crea y loguea el cliente) y abre el socket.
+
+        Raises:
+            DaemonError: Si el cliente no pudo iniciarse o loguearse.
+        """
+        self._worker = threading.Thread(target=self._run_worker, name="cocos-worker", daemon=True)
+        self._worker.start()
+        self._ready.wait()
+        if self._startup_error is not None:
+            raise DaemonError(f"No se pudo iniciar el cliente: {self._startup_error}")
+
+        directory = os.path.dirname(self.socket_path)
+        if directory:
+            os.makedirs(directory, mode=0o700, exist_ok=True)
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+        # El socket da acceso a la cuenta: se crea ya con permisos 0600 (con un
+        # chmod posterior habría un instante en que otro usuario podría conectarse)
+        previous_umask = os.umask(0o177)
+        try:
+            self._server = _UnixServer(self.socket_path, _RpcHandler)
+        finally:
+            os.umask(previous_umask)
+        self._server.cocos_daemon = self
+        self._started_at = time.monotonic()
+        logger.info("Daemon escuchando en %s", self.socket_path)
+        return self
+
+    def serve_forever(self) -> None:
+        """Atiende conexiones hasta que se llame a stop()."""
+        self._serving = True
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Cierra el socket, termina el worker y cierra el navegador."""
+        if self._server is not None:
+            if self._serving:
+                self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+        if self._worker is not None:
+            self._queue.put(None)
+            self._worker.join()
+            self._worker = None
+        logger.info("Daemon detenido.")
+
+    def submit(self, method: str, args=(), kwargs=None) -> Future:
+        """
+        Encola la llamada a un método de la fachada.
+
+        Returns:
+            Future: Se completa con el resultado o la excepción del método.
+        """
+        future: Future = Future()
+        self._queue.put((method, tuple(args), dict(kwargs or {}), future))
+        return future
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve el estado del daemon.
+
+        Returns:
+            Dict[str, Any]: pedidos atendidos y fallidos, pedidos en cola, tiempo
+            ocupado del worker y segundos en línea.
+        """
+        return {
+            "served": self.served,
+            "failed": self.failed,
+            "queued": self._queue.qsize(),
+            "busy_time_s": self.busy_time,
+            "uptime_s": time.monotonic() - self._started_at if self._started_at else 0.0,
+        }
+
+    def handle_line(self, line: bytes) -> Dict[str, Any]:
+        """
+        Procesa una línea JSON-RPC y arma la respuesta.
+
+        Args:
+            line: Pedido JSON-RPC 2.0 serializado.
+
+        Returns:
+            Dict[str, Any]: Respuesta JSON-RPC 2.0.
+        """
+        try:
+            request = json.loads(line)
+        except ValueError as e:
+            return _error(None, PARSE_ERROR, f"JSON inválido: {e}")
+        if not isinstance(request, dict) or not isinstance(request.get("method"), str):
+            return _error(None, INVALID_REQUEST, "Pedido JSON-RPC inválido")
+
+        request_id = request.get("id")
+        method = request["method"]
+        params = request.get("params", [])
+        if method == "ping":
+            return _result(request_id, "pong")
+        if method == "stats":
+            return _result(request_id, self.stats())
+        if method not in RPC_METHODS:
+            return _error(request_id, METHOD_NOT_FOUND, f"Método no disponible: {method}")
+        if isinstance(params, list):
+            args, kwargs = params, {}
+        elif isinstance(params, dict):
+            args, kwargs = [], params
+        else:
+            return _error(request_id, INVALID_PARAMS, "params debe ser una lista o un objeto")
+        # Los params se validan contra la firma antes de encolar: un TypeError
+        # dentro del método es un error del servidor, no de los parámetros.
+        try:
+            inspect.signature(getattr(self.cocos, method)).bind(*args, **kwargs)
+        except TypeError as e:
+            return _error(request_id, INVALID_PARAMS, str(e))
+
+        future = self.submit(method, args, kwargs)
+        if not wait([future], timeout=self.request_timeout).done:
+            if future.cancel():
+                return _error(request_id, REQUEST_TIMEOUT,
+                              f"{method} no empezó en {self.request_timeout} s y se canceló sin ejecutarse")
+            logger.warning("La llamada %s sigue en ejecución después de %s s.", method, self.request_timeout)
+            return _error(request_id, OUTCOME_UNKNOWN,
+                          f"{method} sigue en ejecución después de {self.request_timeout} s; resultado desconocido")
+        try:
+            return _result(request_id, _jsonable(future.result()))
+        except Exception as e:
+            return _error(request_id, SERVER_ERROR, str(e) or type(e).__name__, {"type": type(e).__name__})
+
+    def _run_worker(self) -> None:
+        """Hilo dueño de Playwright: crea el cliente y ejecuta los pedidos en orden."""
+        try:
+            self.cocos = self.factory()
+            if self.login:
+                self.cocos.login()
+        except Exception as e:
+            logger.error("Error al iniciar el cliente del daemon: %s", e)
+            self._startup_error = e
+            self._ready.set()
+            if self.cocos is not None:
+                self.cocos.close_browser()
+            return
+        self._ready.set()
+
+        while True:
+            try:
+                item = self._queue.get(timeout=IDLE_PUMP_INTERVAL)
+            except queue.Empty:
+                self._pump()
+                continue
+            if item is None:
+                break
+            method, args, kwargs, future = item
+            if not future.set_running_or_notify_cancel():
+                continue
+            start = time.monotonic()
+            try:
+                future.set_result(getattr(self.cocos, method)(*args, **kwargs))
+                self.served += 1
+            except Exception as e:
+                logger.error("Error en la llamada %s: %s", method, e)
+                future.set_exception(e)
+                self.failed += 1
+            finally:
+                self.busy_time += time.monotonic() - start
+        self.cocos.close_browser()
+
+    def _pump(self) -> None:
+        """Deja correr los eventos de Playwright (cache pasivo, headers de API) mientras no hay pedidos."""
+        if not self.cocos.started:
+            return
+        try:
+            self.cocos.page.wait_for_timeout(1)
+        except Exception as e:
+            logger.debug("No se pudieron procesar eventos en espera: %s", e)
+
+
+def _jsonable(value: Any) -> Any:
+    """
+    Convierte los resultados de la fachada que json no serializa bien: objetos
+    con to_dict() (MarketSnapshot) y NamedTuples (Instrument, que si no quedarían
+    como listas sin nombres de campo).
+    """
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "_asdict"):
+        return value._asdict()
+    if isinstance(value, list):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def _result(request_id, result) -> Dict[str, Any]:
+    return {"jsonrpc": "2.0", "id": request_id, "result": result}
+
+
+def _error(request_id, code: int, message: str, data: Any = None) -> Dict[str, Any]:
+    error = {"code": code, "message": message}
+    if data is not None:
+        error["data"] = data
+    return {"jsonrpc": "2.0", "id": request_id, "error": error}
+
+
+class DaemonClient:
+    """
+    Cliente liviano del daemon. Mantiene una conexión abierta al socket.
+
+    Los métodos de la fachada se pueden llamar como atributos:
+
+    Example:
+        with DaemonClient() as client:
+            client.get_portfolio_data()
+            client.create_order("GGAL", "BUY", 1000)
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: Optional[float] = DEFAULT_REQUEST_TIMEOUT):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+        self._next_id = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __getattr__(self, name):
+        if name in RPC_METHODS or name in ("ping", "stats"):
+            return lambda *args, **kwargs: self.call(name, *args, **kwargs)
+        raise AttributeError(name)
+
+    def call(self, method: str, *args, **kwargs) -> Any:
+        """
+        Llama a un método del daemon.
+
+        Args:
+            method: Nombre del método.
+            *args, **kwargs: Parámetros (no se pueden mezclar posicionales y nombrados).
+
+        Returns:
+            Any: Resultado del método.
+
+        Raises:
+            DaemonError: Si el daemon devuelve un error o no se puede conectar.
+        """
+        if args and kwargs:
+            raise DaemonError("JSON-RPC no admite mezclar parámetros posicionales y nombrados")
+        self._next_id += 1
+        request = {"jsonrpc": "2.0", "id": self._next_id, "method": method, "params": kwargs or list(args)}
+        try:
+            self._connect()
+            self._sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+            line = self._file.readline()
+        except OSError as e:
+            self.close()
+            raise DaemonError(f"No se pudo comunicar con el daemon en {self.socket_path}: {e}")
+        if not line:
+            self.close()
+            raise DaemonError("El daemon cerró la conexión")
+        response = json.loads(line)
+        if "error" in response:
+            error = response["error"]
+            raise DaemonError(error.get("message"), error.get("code"), error.get("data"))
+        return response.get("result")
+
+    def close(self) -> None:
+        """Cierra la conexión."""
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def _connect(self) -> None:
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            sock.connect(self.socket_path)
+            self._sock = sock
+            self._file = sock.makefile("rb")
+
+
+def _cocos_from_env(args) -> Callable[[], Any]:
+    """Arma la factory de CocosCapital con las credenciales de las variables de entorno."""
+    from CocosBot.core.cocos_capital import CocosCapital
+
+    required = ["COCOS_USERNAME", "COCOS_PASSWORD", "GMAIL_USER", "GMAIL_APP_PASS"]
+    creds = {key: os.environ.get(key) for key in required}
+    missing = [key for key, value in creds.items() if not value]
+    if missing:
+        raise SystemExit(f"Faltan variables de entorno: {', '.join(missing)}")
+    return lambda: CocosCapital(
+        creds["COCOS_USERNAME"], creds["COCOS_PASSWORD"], creds["GMAIL_USER"], creds["GMAIL_APP_PASS"],
+        headless=True, direct_api=args.direct_api, session_file=args.session_file,
+        response_cache=args.response_cache,
+    )
+
+
+def main(argv=None) -> int:
+    """Punto de entrada: 'serve' inicia el daemon y 'call' invoca un método."""
+    parser = argparse.ArgumentParser(prog="python -m CocosBot.core.daemon")
+    parser.add_argument("--socket", default=DEFAULT_SOCKET_PATH, help="Ruta del socket Unix")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve = commands.add_parser("serve", help="Inicia el daemon con las credenciales del entorno")
+    serve.add_argument("--direct-api", action="store_true")
+    serve.add_argument("--session-file")
+    serve.add_argument("--response-cache", action="store_true")
+
+    call = commands.add_parser("call", help="Llama a un método del daemon")
+    call.add_argument("method")
+    call.add_argument("params", nargs="?", default="[]", help="Parámetros como lista u objeto JSON")
+
+    args = parser.parse_args(argv)
+    if args.command == "serve":
+        configure_logging(logging.INFO, use_queue=True)
+        daemon = CocosDaemon(_cocos_from_env(args), args.socket).start()
+        try:
+            daemon.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            daemon.stop()
+        return 0
+
+    params = json.loads(args.params)
+    with DaemonClient(args.socket) as client:
+        try:
+            result = client.call(args.method, **params) if isinstance(params, dict) else client.call(args.method, *params)
+        except DaemonError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            return 1
+    print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
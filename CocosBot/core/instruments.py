@@ -0,0 +1,285 @@
+import bisect
+import json
+import os
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+from urllib.parse import urlsplit, parse_qs
+from CocosBot.config.enums import MarketType
+from CocosBot.config.general import INSTRUMENT_MASTER_TTL
+from CocosBot.config.urls import API_URLS
+
+import logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_INSTRUMENTS_PATH = os.path.join(os.path.expanduser("~"), ".cocosbot", "instruments.json")
+
+# Segmento preferido cuando un ticker cotiza en más de uno
+DEFAULT_SEGMENT = "C"
+
+# Versión del formato del archivo
+FILE_VERSION = 1
+
+# Campos de los ítems de la lista de mercado, en orden de preferencia
+_TICKER_FIELDS = ("short_ticker", "instrument_code", "ticker")
+_ID_FIELDS = ("instrument_id", "id_tick", "id")
+_LOT_FIELDS = ("lot_size", "min_lot", "lot")
+_ITEM_LIST_FIELDS = ("items", "data", "results", "tickers")
+
+
+class Instrument(NamedTuple):
+    """Datos de un instrumento que alcanzan para operar sin pasar por la UI."""
+    ticker: str
+    market_type: str
+    segment: str = DEFAULT_SEGMENT
+    currency: str = "ARS"
+    lot_size: float = 1
+    instrument_id: Optional[Any] = None
+
+
+def _first(item: Dict[str, Any], fields: Iterable[str], default: Any = None) -> Any:
+    for field in fields:
+        if item.get(field) not in (None, ""):
+            return item[field]
+    return default
+
+
+def item_ticker(item: Dict[str, Any]) -> Optional[str]:
+    """Ticker de un ítem de la lista de mercado (en mayúsculas), o None si no lo trae."""
+    ticker = _first(item, _TICKER_FIELDS)
+    return str(ticker).upper() if ticker else None
+
+
+def market_list_items(data: Any) -> List[Tuple[str, Dict[str, Any]]]:
+    """
+    Extrae los ítems de una respuesta de la lista de mercado.
+
+    Acepta una lista de ítems o un objeto que la contenga (items, data, results
+    o tickers). Los ítems sin ticker se descartan.
+
+    Args:
+        data: Cuerpo JSON de la respuesta.
+
+    Returns:
+        List[Tuple[str, Dict[str, Any]]]: Pares (ticker en mayúsculas, ítem).
+    """
+    if isinstance(data, dict):
+        data = _first(data, _ITEM_LIST_FIELDS, [])
+    items = []
+    for item in data if isinstance(data, list) else []:
+        if not isinstance(item, dict):
+            continue
+        ticker = item_ticker(item)
+        if ticker:
+            items.append((ticker, item))
+    return items
+
+
+def parse_instruments(data: Any, market_type: Union[str, MarketType]) -> List[Instrument]:
+    """
+    Convierte una respuesta de la lista de mercado en instrumentos.
+
+    Args:
+        data: Cuerpo JSON de la respuesta (ver market_list_items).
+        market_type: Mercado al que pertenece la lista.
+
+    Returns:
+        List[Instrument]: Instrumentos de la respuesta.
+    """
+    market = market_type.value if isinstance(market_type, MarketType) else market_type
+    instruments = []
+    for ticker, item in market_list_items(data):
+        instruments.append(Instrument(
+            ticker=ticker,
+            market_type=market,
+            segment=item.get("segment") or DEFAULT_SEGMENT,
+            currency=item.get("currency") or "ARS",
+            lot_size=_first(item, _LOT_FIELDS, 1),
+            instrument_id=_first(item, _ID_FIELDS),
+        ))
+    return instruments
+
+
+class InstrumentMaster:
+    """
+    Maestro de instrumentos persistido en disco: ticker -> mercado, segmento,
+    moneda, lote e id interno.
+
+    La búsqueda exacta es un acceso a diccionario y la búsqueda por prefijo usa
+    bisect sobre la lista ordenada de tickers, así que resolver o validar un
+    ticker no requiere navegar. Se alimenta de las listas de mercado: las que la
+    web app pide al navegar (observe) y las que pide MarketService.refresh_instruments
+    para los mercados cuya última actualización tiene más de INSTRUMENT_MASTER_TTL
+    segundos.
+    """
+
+    def __init__(self, path: Optional[str] = DEFAULT_INSTRUMENTS_PATH, ttl: float = INSTRUMENT_MASTER_TTL):
+        """
+        Args:
+            path: Archivo JSON donde se guarda el maestro. Si es None, sólo vive en memoria.
+            ttl: Segundos tras los cuales un mercado se considera desactualizado.
+        """
+        self.path = path
+        self.ttl = ttl
+        self._by_ticker: Dict[str, Instrument] = {}
+        self._sorted: Optional[List[str]] = None
+        self.refreshed_at: Dict[str, float] = {}
+        if path:
+            self.load()
+
+    def __len__(self) -> int:
+        return len(self._by_ticker)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._by_ticker
+
+    def lookup(self, ticker: str) -> Optional[Instrument]:
+        """Devuelve el instrumento del ticker, o None si no está en el maestro."""
+        return self._by_ticker.get(ticker.upper())
+
+    def search(self, prefix: str, limit: Optional[int] = 20) -> List[Instrument]:
+        """
+        Busca instrumentos cuyo ticker empieza con prefix.
+
+        Args:
+            prefix: Prefijo del ticker (sin distinguir mayúsculas).
+            limit: Cantidad máxima de resultados; None para todos.
+
+        Returns:
+            List[Instrument]: Instrumentos en orden alfabético de ticker.
+        """
+        if self._sorted is None:
+            self._sorted = sorted(self._by_ticker)
+        prefix = prefix.upper()
+        start = bisect.bisect_left(self._sorted, prefix)
+        end = bisect.bisect_left(self._sorted, prefix + "\uffff", lo=start)
+        if limit is not None:
+            end = min(end, start + limit)
+        return [self._by_ticker[ticker] for ticker in self._sorted[start:end]]
+
+    def update(self, market_type: Union[str, MarketType], data: Any, refreshed: bool = False) -> int:
+        """
+        Incorpora una respuesta de la lista de mercado y guarda el archivo si hubo cambios.
+
+        Los instrumentos existentes se actualizan y los nuevos se agregan; si un
+        ticker cotiza en varios segmentos, se conserva el segmento DEFAULT_SEGMENT.
+
+        Args:
+            market_type: Mercado de la lista.
+            data: Cuerpo JSON de la respuesta.
+            refreshed: Si True, marca el mercado como actualizado (reinicia su TTL).
+
+        Returns:
+            int: Cantidad de instrumentos nuevos o modificados.
+        """
+        market = market_type.value if isinstance(market_type, MarketType) else market_type
+        changed = 0
+        for instrument in parse_instruments(data, market):
+            current = self._by_ticker.get(instrument.ticker)
+            if current == instrument:
+                continue
+            if current is None or current.segment == instrument.segment or instrument.segment == DEFAULT_SEGMENT:
+                if current is None:
+                    self._sorted = None
+                self._by_ticker[instrument.ticker] = instrument
+                changed += 1
+        if refreshed:
+            self.refreshed_at[market] = time.time()
+        if changed or refreshed:
+            logger.info("Maestro de instrumentos: %d cambios en %s (%d en total).", changed, market, len(self))
+            self.save()
+        return changed
+
+    def observe(self, response) -> None:
+        """
+        Observador de respuestas: incorpora las listas de mercado que pide la web app.
+
+        Args:
+            response: Objeto Response de Playwright.
+        """
+        if API_URLS["markets_list"] not in response.url or response.status != 200:
+            return
+        market = market_of(response.url)
+        if market is None:
+            return
+        try:
+            self.update(market, response.json())
+        except Exception as e:
+            logger.debug("No se pudo leer la lista de mercado %s: %s", response.url, e)
+
+    def is_stale(self, market_type: Union[str, MarketType]) -> bool:
+        """True si el mercado nunca se actualizó o su última actualización venció."""
+        market = market_type.value if isinstance(market_type, MarketType) else market_type
+        refreshed_at = self.refreshed_at.get(market)
+        return refreshed_at is None or time.time() - refreshed_at > self.ttl
+
+    def stale_markets(self) -> List[MarketType]:
+        """Mercados que necesitan actualizarse."""
+        return [market for market in MarketType if self.is_stale(market)]
+
+    def load(self) -> bool:
+        """
+        Carga el maestro desde el archivo.
+
+        Returns:
+            bool: True si se cargó; False si no existe o es inválido.
+        """
+        if not self.path or not os.path.exists(self.path):
+            return False
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != FILE_VERSION:
+                raise ValueError(f"versión {data.get('version')}")
+            by_ticker = {row[0]: Instrument(*row) for row in data["instruments"]}
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            logger.warning("Se ignora el maestro de instrumentos %s: %s", self.path, e)
+            return False
+        self._by_ticker = by_ticker
+        self._sorted = None
+        self.refreshed_at = dict(data.get("refreshed_at", {}))
+        logger.info("Maestro de instrumentos cargado: %d instrumentos.", len(self))
+        return True
+
+    def save(self) -> None:
+        """Guarda el maestro en el archivo (escritura atómica)."""
+        if not self.path:
+            return
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({
+                "version": FILE_VERSION,
+                "refreshed_at": self.refreshed_at,
+                "instruments": [list(instrument) for instrument in self._by_ticker.values()],
+            }, f)
+        os.replace(tmp_path, self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve el estado del maestro.
+
+        Returns:
+            Dict[str, Any]: cantidad de instrumentos, por mercado, y mercados desactualizados.
+        """
+        per_market: Dict[str, int] = {}
+        for instrument in self._by_ticker.values():
+            per_market[instrument.market_type] = per_market.get(instrument.market_type, 0) + 1
+        return {
+            "instruments": len(self),
+            "per_market": per_market,
+            "stale_markets": [market.value for market in self.stale_markets()],
+        }
+
+
+def market_of(url: str) -> Optional[MarketType]:
+    """
+    Mercado de una URL de la lista de mercado (parámetro instrument_type).
+
+    Returns:
+        Optional[MarketType]: Mercado, o None si la URL no lo indica o es desconocido.
+    """
+    values = parse_qs(urlsplit(url).query).get("instrument_type")
+    try:
+        return MarketType(values[0]) if values else None
+    except ValueError:
+        return None
@@ -0,0 +1,127 @@
+import atexit
+import logging
+import logging.handlers
+import queue
+import re
+from typing import Optional, Union
+from CocosBot.config.general import LOG_FORMAT
+
+# Logger raíz del paquete: configure_logging sólo toca éste, nunca el root
+PACKAGE_LOGGER = "CocosBot"
+
+MASK = "***"
+
+# Secretos que pueden aparecer en mensajes de log: tokens Bearer, JWT sueltos y
+# campos de credenciales en JSON o en repr de diccionarios.
+_SECRET_PATTERNS = (
+    (re.compile(r"(Bearer\s+)[\w\-.~+/]+=*", re.IGNORECASE), r"\1" + MASK),
+    (re.compile(r"eyJ[\w-]+\.[\w-]+\.[\w-]*"), MASK),
+    (re.compile(r"""(["']?(?:password|access_token|refresh_token|app_pass)["']?\s*[:=]\s*["']?)[^"',}\s]+""",
+                re.IGNORECASE), r"\1" + MASK),
+)
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_handler: Optional[logging.Handler] = None
+
+
+def mask(value) -> str:
+    """
+    Versión para logs de un valor sensible (contraseña, código 2FA).
+
+    Returns:
+        str: MASK y la cantidad de caracteres, sin el contenido.
+    """
+    return f"{MASK} ({len(str(value))} caracteres)"
+
+
+def redact(text: str) -> str:
+    """Reemplaza por MASK los tokens y credenciales que encuentre en un texto."""
+    for pattern, replacement in _SECRET_PATTERNS:
+        text = pattern.sub(replacement, text)
+    return text
+
+
+def level_of(level: Union[int, str]) -> int:
+    """
+    Nivel de logging numérico a partir de un número o un nombre ("DEBUG", "info").
+
+    Raises:
+        ValueError: Si el nombre no es un nivel conocido.
+    """
+    if isinstance(level, int):
+        return level
+    value = logging.getLevelName(level.strip().upper())
+    if not isinstance(value, int):
+        raise ValueError(f"Nivel de logging desconocido: {level}")
+    return value
+
+
+class RedactingFilter(logging.Filter):
+    """
+    Filtro de handler que enmascara tokens y credenciales en el mensaje ya formateado.
+
+    Va en el handler final (no en el QueueHandler), así que con la cola corre en
+    el hilo del listener y no en el de Playwright.
+    """
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        redacted = redact(message)
+        if redacted != message:
+            record.msg, record.args = redacted, None
+        return True
+
+
+def configure_logging(level: Union[int, str] = logging.INFO, handler: Optional[logging.Handler] = None,
+                      use_queue: bool = False, fmt: str = LOG_FORMAT) -> logging.Logger:
+    """
+    Configura los logs de CocosBot sin tocar el logging de la aplicación.
+
+    Agrega un handler (por defecto, a stderr) con RedactingFilter al logger
+    "CocosBot" y deja de propagar al root. Con use_queue=True el logger sólo
+    encola los registros (QueueHandler) y un QueueListener los escribe en otro
+    hilo, así que la E/S de los logs nunca bloquea el hilo de Playwright. Volver
+    a llamarla reemplaza la configuración anterior.
+
+    Args:
+        level: Nivel del logger del paquete (número o nombre).
+        handler: Handler de destino (por defecto, StreamHandler a stderr).
+        use_queue: Si True, escribe los logs desde un hilo aparte.
+        fmt: Formato de los mensajes, si el handler no tiene uno.
+
+    Returns:
+        logging.Logger: El logger "CocosBot".
+    """
+    global _listener, _handler
+    stop_logging()
+    target = handler or logging.StreamHandler()
+    if target.formatter is None:
+        target.setFormatter(logging.Formatter(fmt))
+    target.addFilter(RedactingFilter())
+    package = logging.getLogger(PACKAGE_LOGGER)
+    package.setLevel(level_of(level))
+    package.propagate = False
+    if use_queue:
+        _listener = logging.handlers.QueueListener(queue.SimpleQueue(), target, respect_handler_level=True)
+        _listener.start()
+        _handler = logging.handlers.QueueHandler(_listener.queue)
+    else:
+        _handler = target
+    package.addHandler(_handler)
+    return package
+
+
+def stop_logging() -> None:
+    """Quita el handler de configure_logging y vacía la cola pendiente, si la hay."""
+    global _listener, _handler
+    package = logging.getLogger(PACKAGE_LOGGER)
+    if _handler is not None:
+        package.removeHandler(_handler)
+        package.propagate = True
+        _handler = None
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(stop_logging)
@@ -0,0 +1,155 @@
+import math
+import time
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+from CocosBot.config.enums import MarketType
+from CocosBot.core.instruments import market_list_items
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Columnas numéricas del snapshot y campos de la lista de mercado de los que se
+# toman, en orden de preferencia
+SNAPSHOT_FIELDS = {
+    "last": ("last", "last_price", "close"),
+    "bid": ("bid", "bid_price"),
+    "ask": ("ask", "ask_price"),
+    "volume": ("volume", "total_volume", "nominal_volume"),
+}
+
+# Puntas del libro cuando la lista trae el libro en lugar de los precios planos
+_BOOK_FIELDS = {"bid": "bids", "ask": "asks"}
+
+NAN = float("nan")
+
+
+def _number(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return NAN
+
+
+def quote_value(item: Dict[str, Any], column: str) -> float:
+    """Valor de una columna de SNAPSHOT_FIELDS para un ítem, o NaN si no lo trae."""
+    for field in SNAPSHOT_FIELDS[column]:
+        if item.get(field) is not None:
+            return _number(item[field])
+    book = item.get(_BOOK_FIELDS.get(column, ""))
+    if isinstance(book, list) and book and isinstance(book[0], dict):
+        return _number(book[0].get("price"))
+    return NAN
+
+
+class MarketSnapshot:
+    """
+    Cotizaciones de todo un mercado en formato columnar.
+
+    Cada columna de SNAPSHOT_FIELDS es una lista de floats alineada con tickers
+    (NaN donde la lista no trae el dato), de modo que filtrar o calcular sobre
+    todo el tablero no requiere recorrer diccionarios. to_numpy() devuelve un
+    record array si NumPy está instalado.
+    """
+
+    def __init__(self, market_type: Union[str, MarketType], tickers: List[str],
+                 columns: Dict[str, List[float]], taken_at: Optional[float] = None):
+        """
+        Args:
+            market_type: Mercado del snapshot.
+            tickers: Tickers, en el orden de las columnas.
+            columns: Columnas numéricas (last, bid, ask, volume).
+            taken_at: Momento del snapshot (time.time()); por defecto, ahora.
+        """
+        self.market_type = market_type.value if isinstance(market_type, MarketType) else market_type
+        self.tickers = tickers
+        self.columns = columns
+        self.taken_at = taken_at if taken_at is not None else time.time()
+        self._index = {ticker: row for row, ticker in enumerate(tickers)}
+
+    @classmethod
+    def from_response(cls, data: Any, market_type: Union[str, MarketType]) -> "MarketSnapshot":
+        """
+        Arma el snapshot desde una respuesta de la lista de mercado.
+
+        Args:
+            data: Cuerpo JSON de la respuesta (ver market_list_items).
+            market_type: Mercado de la lista.
+
+        Returns:
+            MarketSnapshot: Snapshot con una fila por ticker (la última si se repite).
+        """
+        rows: Dict[str, Dict[str, Any]] = {}
+        for ticker, item in market_list_items(data):
+            rows[ticker] = item
+        tickers = list(rows)
+        columns = {column: [quote_value(rows[ticker], column) for ticker in tickers] for column in SNAPSHOT_FIELDS}
+        return cls(market_type, tickers, columns)
+
+    def __len__(self) -> int:
+        return len(self.tickers)
+
+    def __contains__(self, ticker: str) -> bool:
+        return ticker.upper() in self._index
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return (self.row(ticker) for ticker in self.tickers)
+
+    def __getitem__(self, column: str) -> List[float]:
+        """Columna completa (p. ej. snapshot["last"])."""
+        return self.columns[column]
+
+    def row(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """
+        Cotización de un ticker.
+
+        Returns:
+            Optional[Dict[str, Any]]: ticker y columnas, o None si no está en el snapshot.
+        """
+        index = self._index.get(ticker.upper())
+        if index is None:
+            return None
+        return {"ticker": self.tickers[index], **{column: values[index] for column, values in self.columns.items()}}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Versión serializable a JSON del snapshot (p. ej. para el daemon).
+
+        Returns:
+            Dict[str, Any]: market_type, taken_at, tickers y columns, con None
+            donde la columna tiene NaN (JSON no admite NaN).
+        """
+        return {
+            "market_type": self.market_type,
+            "taken_at": self.taken_at,
+            "tickers": list(self.tickers),
+            "columns": {column: [None if math.isnan(value) else value for value in values]
+                        for column, values in self.columns.items()},
+        }
+
+    def where(self, column: str, predicate: Callable[[float], bool]) -> List[str]:
+        """
+        Tickers cuyo valor en column cumple predicate (las filas con NaN se descartan).
+
+        Example:
+            snapshot.where("volume", lambda v: v > 1_000_000)
+        """
+        return [ticker for ticker, value in zip(self.tickers, self.columns[column])
+                if not math.isnan(value) and predicate(value)]
+
+    def to_numpy(self):
+        """
+        Devuelve el snapshot como numpy.recarray con los campos ticker, last, bid, ask y volume.
+
+        Raises:
+            ImportError: Si NumPy no está instalado (pip install CocosBot[numpy]).
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("MarketSnapshot.to_numpy requiere NumPy: pip install CocosBot[numpy]") from e
+        width = max((len(ticker) for ticker in self.tickers), default=1)
+        dtype = [("ticker", f"U{width}")] + [(column, "f8") for column in self.columns]
+        records = np.empty(len(self), dtype=dtype)
+        records["ticker"] = self.tickers
+        for column, values in self.columns.items():
+            records[column] = values
+        return records.view(np.recarray)
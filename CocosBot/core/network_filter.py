@@ -0,0 +1,103 @@
+from typing import Any, Dict, Union
+from urllib.parse import urlsplit
+from CocosBot.config.network import BLOCK_PROFILES, ESTIMATED_RESOURCE_BYTES
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class ResourceBlocker:
+    """
+    Aborta los requests que no aportan a la extracción de datos (imágenes,
+    fuentes, media y analytics de terceros) mediante page.route.
+
+    Los dominios de allowed_domains nunca se bloquean por dominio, así que los
+    scripts de app.cocos.capital y los XHR de api.cocos.capital siempre pasan.
+    """
+
+    def __init__(self, profile: Union[str, Dict[str, Any]] = "services"):
+        """
+        Args:
+            profile: Nombre de un preset de BLOCK_PROFILES o un diccionario con
+                las claves resource_types, blocked_domains y allowed_domains.
+
+        Raises:
+            ValueError: Si el preset no existe.
+        """
+        if isinstance(profile, str):
+            if profile not in BLOCK_PROFILES:
+                raise ValueError(f"Perfil de bloqueo no válido: {profile}. Use uno de {list(BLOCK_PROFILES)}.")
+            profile = BLOCK_PROFILES[profile]
+        self.resource_types = set(profile.get("resource_types", ()))
+        self.blocked_domains = tuple(profile.get("blocked_domains", ()))
+        self.allowed_domains = tuple(profile.get("allowed_domains", ()))
+        self.blocked_requests = 0
+        self.allowed_requests = 0
+        self.bytes_saved = 0
+        self.blocked_by_type: Dict[str, int] = {}
+
+    def install(self, page) -> None:
+        """
+        Registra el handler de routing en la página (o contexto).
+
+        Args:
+            page: Página o BrowserContext de Playwright.
+        """
+        page.route("**/*", self._handle_route)
+        logger.info("Perfil de bloqueo de recursos instalado.")
+
+    def should_block(self, url: str, resource_type: str) -> bool:
+        """
+        Decide si un request debe abortarse.
+
+        Args:
+            url: URL del request.
+            resource_type: Tipo de recurso según Playwright (image, script, xhr...).
+
+        Returns:
+            bool: True si el request se bloquea.
+        """
+        if resource_type in self.resource_types:
+            return True
+        host = (urlsplit(url).hostname or "").lower()
+        if self._matches(host, self.allowed_domains):
+            return False
+        return self._matches(host, self.blocked_domains)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve el ahorro de la sesión.
+
+        Returns:
+            Dict[str, Any]: requests bloqueados y permitidos, bytes ahorrados
+            (estimados por tipo de recurso) y bloqueos por tipo.
+        """
+        return {
+            "blocked_requests": self.blocked_requests,
+            "allowed_requests": self.allowed_requests,
+            "estimated_bytes_saved": self.bytes_saved,
+            "blocked_by_type": dict(self.blocked_by_type),
+        }
+
+    def _handle_route(self, route) -> None:
+        """
+        Handler de Playwright para cada request de la página.
+
+        Args:
+            route: Objeto Route de Playwright.
+        """
+        request = route.request
+        resource_type = request.resource_type
+        if self.should_block(request.url, resource_type):
+            self.blocked_requests += 1
+            self.blocked_by_type[resource_type] = self.blocked_by_type.get(resource_type, 0) + 1
+            self.bytes_saved += ESTIMATED_RESOURCE_BYTES.get(resource_type, ESTIMATED_RESOURCE_BYTES["other"])
+            route.abort()
+        else:
+            self.allowed_requests += 1
+            route.continue_()
+
+    @staticmethod
+    def _matches(host: str, domains) -> bool:
+        """True si host es alguno de los dominios o un subdominio de ellos."""
+        return any(host == domain or host.endswith("." + domain) for domain in domains)
@@ -0,0 +1,441 @@
+import asyncio
+import time
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+from CocosBot.config.enums import OrderEventType, OrderOperation, OrderStatus
+from CocosBot.config.general import ORDER_WATCH_INTERVAL
+from CocosBot.config.urls import API_URLS
+from CocosBot.core.instruments import item_ticker
+from CocosBot.core.response_dispatcher import DISPATCH_POLL_INTERVAL
+from CocosBot.utils.data_transformations import extract_order_id
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Claves bajo las que la respuesta de órdenes puede anidar la lista
+_ORDER_LIST_FIELDS = ("orders", "data", "items", "results")
+_STATUS_FIELDS = ("status", "order_status", "state")
+_FILLED_FIELDS = ("executed_quantity", "filled_quantity", "quantity_executed", "executed_amount", "filled")
+_SIDE_FIELDS = ("side", "operation", "order_side")
+_SIDES = {"BUY": OrderOperation.BUY, "COMPRA": OrderOperation.BUY,
+          "SELL": OrderOperation.SELL, "VENTA": OrderOperation.SELL}
+
+# Fragmentos del estado informado por la API, en orden de prioridad. Un estado
+# parcial ("PARCIALMENTE EJECUTADA", "PARTIALLY_FILLED") sigue pendiente.
+_STATUS_KEYWORDS = (
+    (("RECHAZ", "REJECT"), OrderStatus.REJECTED),
+    (("CANCEL", "ANULAD", "VENCID", "EXPIRED"), OrderStatus.CANCELLED),
+    (("PARCIAL", "PARTIAL"), OrderStatus.PENDING),
+    (("EJECUTAD", "EXECUTED", "FILLED", "COMPLET", "TERMINAD"), OrderStatus.EXECUTED),
+)
+_FINAL_EVENTS = {
+    OrderStatus.EXECUTED: OrderEventType.EXECUTED,
+    OrderStatus.CANCELLED: OrderEventType.CANCELLED,
+    OrderStatus.REJECTED: OrderEventType.REJECTED,
+}
+
+
+class OrderEvent(NamedTuple):
+    """Cambio de una orden entre dos lecturas."""
+    kind: OrderEventType
+    order_id: Any
+    status: OrderStatus
+    filled: float
+    last_fill: float
+    order: Dict[str, Any]
+    received_at: float
+
+
+def _field(item: Dict[str, Any], fields: Tuple[str, ...], default: Any) -> Any:
+    return next((item[field] for field in fields if item.get(field) not in (None, "")), default)
+
+
+def _quantity(value: Any) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def order_items(data: Any) -> List[Tuple[Any, Dict[str, Any]]]:
+    """
+    Extrae las órdenes de una respuesta del endpoint de órdenes.
+
+    Acepta una lista o un objeto que la contenga (orders, data, items o results).
+    Las órdenes sin id se descartan.
+
+    Returns:
+        List[Tuple[Any, Dict[str, Any]]]: Pares (id de orden, orden).
+    """
+    if isinstance(data, dict):
+        data = next((data[key] for key in _ORDER_LIST_FIELDS if isinstance(data.get(key), list)), [data])
+    if not isinstance(data, list):
+        return []
+    items = []
+    for item in data:
+        order_id = extract_order_id(item)
+        if order_id is not None:
+            items.append((order_id, item))
+    return items
+
+
+def order_status(item: Dict[str, Any]) -> Tuple[OrderStatus, bool]:
+    """
+    Estado de una orden según la API.
+
+    Returns:
+        Tuple[OrderStatus, bool]: Estado y si la API la informa como parcialmente
+        ejecutada. Los estados desconocidos se toman como PENDING.
+    """
+    text = str(_field(item, _STATUS_FIELDS, "")).upper()
+    for keywords, status in _STATUS_KEYWORDS:
+        if any(keyword in text for keyword in keywords):
+            return status, status is OrderStatus.PENDING
+    return OrderStatus.PENDING, False
+
+
+def order_side(item: Dict[str, Any]) -> Optional[OrderOperation]:
+    """Operación de una orden (BUY/SELL, también en castellano), o None si no la trae."""
+    return _SIDES.get(str(_field(item, _SIDE_FIELDS, "")).upper())
+
+
+def open_orders(data: Any, ticker: Optional[str] = None,
+                side: Union[str, OrderOperation, None] = None) -> List[Tuple[Any, Dict[str, Any]]]:
+    """
+    Órdenes pendientes de una respuesta del endpoint de órdenes.
+
+    Args:
+        data: Cuerpo JSON de la respuesta.
+        ticker: Si se indica, sólo las órdenes de ese ticker.
+        side: Si se indica, sólo las compras o las ventas.
+
+    Returns:
+        List[Tuple[Any, Dict[str, Any]]]: Pares (id de orden, orden).
+    """
+    ticker = ticker.upper() if ticker else None
+    side = OrderOperation(side.upper()) if isinstance(side, str) else side
+    return [
+        (order_id, item) for order_id, item in order_items(data)
+        if order_status(item)[0] is OrderStatus.PENDING
+        and (ticker is None or item_ticker(item) == ticker)
+        and (side is None or order_side(item) is side)
+    ]
+
+
+def is_orders_list(response) -> bool:
+    """True si la respuesta es una lectura exitosa (GET) de la lista de órdenes."""
+    try:
+        return (response.status == 200 and response.request.method == "GET"
+                and response.url.split("?")[0].rstrip("/") == API_URLS["orders"])
+    except AttributeError:
+        return False
+
+
+class _OrderTracker:
+    """
+    Parte común de OrderWatcher y AsyncOrderWatcher: guarda el último estado de
+    cada orden por id y convierte cada lectura en los eventos de las órdenes que
+    cambiaron.
+    """
+
+    def __init__(self, interval: int = ORDER_WATCH_INTERVAL, emit_initial: bool = False):
+        """
+        Args:
+            interval: ms entre lecturas del endpoint de órdenes.
+            emit_initial: Si es True, la primera lectura emite NEW (y su estado)
+                para cada orden existente; si no, sólo establece la base.
+        """
+        self.interval = interval
+        self.emit_initial = emit_initial
+        self.orders: Dict[Any, Dict[str, Any]] = {}
+        self._state: Dict[Any, Tuple[OrderStatus, bool, float]] = {}
+        self._primed = False
+        self.polls = 0
+        self.observed = 0
+        self.fetch_errors = 0
+        self.events = 0
+        self._fetch_time = 0.0
+
+    @property
+    def primed(self) -> bool:
+        """True si ya se leyó el estado base de las órdenes."""
+        return self._primed
+
+    def apply(self, data: Any) -> List[OrderEvent]:
+        """
+        Incorpora una respuesta del endpoint de órdenes.
+
+        Args:
+            data: Cuerpo JSON de la respuesta (None se ignora).
+
+        Returns:
+            List[OrderEvent]: Eventos de las órdenes nuevas o que cambiaron de estado
+            o de cantidad ejecutada.
+        """
+        if data is None:
+            return []
+        received_at = time.time()
+        events = []
+        for order_id, item in order_items(data):
+            status, partial = order_status(item)
+            state = (status, partial, _quantity(_field(item, _FILLED_FIELDS, 0)))
+            previous = self._state.get(order_id)
+            if previous == state:
+                continue
+            self._state[order_id] = state
+            self.orders[order_id] = item
+            if self._primed or self.emit_initial:
+                events.extend(self._diff(order_id, item, previous, state, received_at))
+        self._primed = True
+        self.events += len(events)
+        return events
+
+    def _diff(self, order_id, item, previous, state, received_at) -> List[OrderEvent]:
+        status, partial, filled = state
+        _, was_partial, was_filled = previous or (OrderStatus.PENDING, False, 0.0)
+        # Sin cantidad ejecutada en la respuesta, el estado parcial es la única señal de ejecución
+        new_fill = filled > was_filled or (partial and not was_partial and not filled)
+        kinds = [OrderEventType.NEW] if previous is None else []
+        if status in _FINAL_EVENTS and (previous is None or previous[0] is not status):
+            kinds.append(_FINAL_EVENTS[status])
+        elif status is OrderStatus.PENDING and new_fill:
+            kinds.append(OrderEventType.PARTIALLY_FILLED)
+        last_fill = max(0.0, filled - was_filled)
+        for kind in kinds:
+            logger.info("Orden %s: %s (ejecutado %s).", order_id, kind.value, filled)
+        return [OrderEvent(kind, order_id, status, filled, last_fill, item, received_at) for kind in kinds]
+
+    def _timed_fetch(self, start: float, data: Any) -> List[OrderEvent]:
+        self.polls += 1
+        self._fetch_time += time.perf_counter() - start
+        return self.apply(data)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve los contadores del watcher.
+
+        Returns:
+            Dict[str, Any]: órdenes conocidas, lecturas propias y observadas,
+            errores de lectura, eventos emitidos y tiempo promedio de lectura (ms).
+        """
+        return {
+            "orders": len(self._state),
+            "polls": self.polls,
+            "observed": self.observed,
+            "fetch_errors": self.fetch_errors,
+            "events": self.events,
+            "avg_fetch_ms": (self._fetch_time * 1000 / self.polls) if self.polls else 0.0,
+        }
+
+
+class OrderWatcher(_OrderTracker):
+    """
+    Seguimiento de órdenes para playwright.sync_api.
+
+    Lee el endpoint de órdenes cada interval ms (con direct_api, sin navegar) y,
+    entre lecturas, bombea los eventos de Playwright para incorporar también las
+    respuestas de órdenes que pida la propia web app. iter_events() emite sólo
+    los cambios: órdenes nuevas, ejecuciones parciales, ejecutadas, canceladas y
+    rechazadas.
+
+    Example:
+        with cocos.watch_orders() as watcher:
+            cocos.submit_order("GGAL", OrderOperation.BUY, 10000, limit=4200)
+            for event in watcher.iter_events(timeout=60000):
+                print(event.kind, event.order_id, event.filled)
+    """
+
+    def __init__(self, page, fetch: Callable[[], Any], dispatcher=None, **kwargs):
+        """
+        Args:
+            page: Página de Playwright cuyos eventos se bombean entre lecturas.
+            fetch: Función que devuelve la respuesta del endpoint de órdenes.
+            dispatcher: ResponseDispatcher de la página para observar las
+                respuestas de órdenes que lleguen sin pedirlas (opcional).
+            **kwargs: interval y emit_initial (ver _OrderTracker).
+        """
+        super().__init__(**kwargs)
+        self.page = page
+        self.fetch = fetch
+        self.dispatcher = dispatcher
+        self._queue: deque = deque()
+        self._started = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __iter__(self) -> Iterator[OrderEvent]:
+        return self.iter_events()
+
+    def start(self) -> None:
+        """Empieza a observar las respuestas de órdenes y lee el estado base."""
+        if not self._started:
+            self._started = True
+            if self.dispatcher is not None:
+                self.dispatcher.add_observer(self._observe)
+        if not self._primed:
+            self._queue.extend(self.poll())
+
+    def stop(self) -> None:
+        """Deja de observar las respuestas de órdenes."""
+        if self._started and self.dispatcher is not None:
+            self.dispatcher.remove_observer(self._observe)
+        self._started = False
+
+    def poll(self) -> List[OrderEvent]:
+        """
+        Lee el endpoint de órdenes una vez.
+
+        Returns:
+            List[OrderEvent]: Cambios respecto de la lectura anterior.
+        """
+        start = time.perf_counter()
+        try:
+            data = self.fetch()
+        except Exception as e:
+            self.fetch_errors += 1
+            logger.warning("Error al leer las órdenes: %s", e)
+            return []
+        return self._timed_fetch(start, data)
+
+    def iter_events(self, timeout: Optional[int] = None,
+                    poll_interval: int = DISPATCH_POLL_INTERVAL) -> Iterator[OrderEvent]:
+        """
+        Generador de eventos de órdenes en orden de llegada.
+
+        Args:
+            timeout: ms sin eventos tras los cuales termina; None para no terminar.
+            poll_interval: Intervalo en ms para bombear eventos entre lecturas.
+
+        Yields:
+            OrderEvent: Cambios de las órdenes.
+        """
+        self.start()
+        idle_since = time.monotonic()
+        next_poll = idle_since + self.interval / 1000
+        while True:
+            while self._queue:
+                yield self._queue.popleft()
+                idle_since = time.monotonic()
+            now = time.monotonic()
+            if timeout is not None and now - idle_since > timeout / 1000:
+                return
+            if now >= next_poll:
+                next_poll = now + self.interval / 1000
+                self._queue.extend(self.poll())
+                continue
+            self.page.wait_for_timeout(max(1, min(poll_interval, int((next_poll - now) * 1000))))
+
+    def _observe(self, response) -> None:
+        """Observador del dispatcher para las lecturas de órdenes de la web app."""
+        if not is_orders_list(response):
+            return
+        self.observed += 1
+        self._queue.extend(self.apply(response.json()))
+
+
+class AsyncOrderWatcher(_OrderTracker):
+    """
+    Seguimiento de órdenes para playwright.async_api, consumible con 'async for'.
+    Ver OrderWatcher.
+    """
+
+    def __init__(self, fetch: Callable[[], Awaitable[Any]], context=None, **kwargs):
+        """
+        Args:
+            fetch: Corrutina que devuelve la respuesta del endpoint de órdenes.
+            context: BrowserContext cuyas respuestas de órdenes se observan (opcional).
+            **kwargs: interval y emit_initial (ver _OrderTracker).
+        """
+        super().__init__(**kwargs)
+        self.fetch = fetch
+        self.context = context
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._started = False
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __aiter__(self) -> AsyncIterator[OrderEvent]:
+        return self.iter_events()
+
+    async def start(self) -> None:
+        """Empieza a observar las respuestas de órdenes y lee el estado base."""
+        if not self._started:
+            self._started = True
+            if self.context is not None:
+                self.context.on("response", self._observe)
+        if not self._primed:
+            self._enqueue(await self.poll())
+
+    def stop(self) -> None:
+        """Deja de observar las respuestas de órdenes."""
+        if self._started and self.context is not None:
+            self.context.remove_listener("response", self._observe)
+        self._started = False
+
+    async def poll(self) -> List[OrderEvent]:
+        """Lee el endpoint de órdenes una vez. Ver OrderWatcher.poll."""
+        start = time.perf_counter()
+        try:
+            data = await self.fetch()
+        except Exception as e:
+            self.fetch_errors += 1
+            logger.warning("Error al leer las órdenes: %s", e)
+            return []
+        return self._timed_fetch(start, data)
+
+    async def iter_events(self, timeout: Optional[int] = None) -> AsyncIterator[OrderEvent]:
+        """
+        Iterador asíncrono de eventos de órdenes. Ver OrderWatcher.iter_events.
+
+        Args:
+            timeout: ms sin eventos tras los cuales termina; None para no terminar.
+        """
+        await self.start()
+        idle_since = time.monotonic()
+        next_poll = idle_since + self.interval / 1000
+        while True:
+            while not self._queue.empty():
+                yield self._queue.get_nowait()
+                idle_since = time.monotonic()
+            now = time.monotonic()
+            if timeout is not None and now - idle_since > timeout / 1000:
+                return
+            if now >= next_poll:
+                next_poll = now + self.interval / 1000
+                self._enqueue(await self.poll())
+                continue
+            wait = next_poll - now
+            if timeout is not None:
+                wait = min(wait, timeout / 1000 - (now - idle_since))
+            try:
+                event = await asyncio.wait_for(self._queue.get(), max(wait, 0.001))
+            except asyncio.TimeoutError:
+                continue
+            yield event
+            idle_since = time.monotonic()
+
+    def _enqueue(self, events: List[OrderEvent]) -> None:
+        for event in events:
+            self._queue.put_nowait(event)
+
+    async def _observe(self, response) -> None:
+        """Callback de Playwright para las lecturas de órdenes de la web app."""
+        if not is_orders_list(response):
+            return
+        try:
+            data = await response.json()
+        except Exception as e:
+            logger.debug("No se pudo leer la respuesta de órdenes: %s", e)
+            return
+        self.observed += 1
+        self._enqueue(self.apply(data))
@@ -0,0 +1,307 @@
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional
+from CocosBot.config.general import DEFAULT_TIMEOUT, PAGE_POOL_SIZE
+from CocosBot.core.response_dispatcher import ResponseDispatcher, DISPATCH_POLL_INTERVAL
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class FetchRequest(NamedTuple):
+    """
+    Lectura que puede correr en una página del pool.
+
+    Attributes:
+        request_url: URL (o fragmento) del request de la API a interceptar.
+        navigation_url: URL de la web app que dispara el request.
+        process_response: Función opcional para procesar los datos.
+        action: Función opcional que recibe la página después de navegar y
+            dispara el request (p. ej. buscar y seleccionar un ticker).
+    """
+    request_url: str
+    navigation_url: str
+    process_response: Optional[Callable[[Any], Any]] = None
+    action: Optional[Callable[[Any], None]] = None
+
+
+class PagePoolExhausted(RuntimeError):
+    """No hay páginas libres en el pool."""
+    pass
+
+
+class PooledPage:
+    """Página de un pool, con su propio contexto y ResponseDispatcher."""
+
+    def __init__(self, context, page):
+        self.context = context
+        self.page = page
+        self.dispatcher = ResponseDispatcher(page)
+        self.checked_out_at: Optional[float] = None
+
+
+class _PoolStats:
+    """Contadores comunes de PagePool y AsyncPagePool."""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.checkouts = 0
+        self.busy_time = 0.0
+        self.queue_wait_time = 0.0
+        self.max_queue_wait = 0.0
+        self._started_at: Optional[float] = None
+
+    def _on_checkout(self, queued_for: float) -> float:
+        now = time.monotonic()
+        if self._started_at is None:
+            self._started_at = now
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+        self.checkouts += 1
+        self.queue_wait_time += queued_for
+        self.max_queue_wait = max(self.max_queue_wait, queued_for)
+        return now
+
+    def _on_release(self, checked_out_at: float) -> None:
+        self.in_use -= 1
+        self.busy_time += time.monotonic() - checked_out_at
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve la utilización del pool.
+
+        Returns:
+            Dict[str, Any]: tamaño, páginas creadas y en uso, pico de uso, checkouts,
+            segundos ocupados, utilización (tiempo ocupado sobre tamaño por tiempo
+            transcurrido desde el primer checkout) y espera en cola promedio y máxima (ms).
+        """
+        elapsed = time.monotonic() - self._started_at if self._started_at else 0.0
+        return {
+            "size": self.size,
+            "created": self.created,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "checkouts": self.checkouts,
+            "busy_s": self.busy_time,
+            "utilization": self.busy_time / (self.size * elapsed) if elapsed else 0.0,
+            "avg_queue_wait_ms": self.queue_wait_time * 1000 / self.checkouts if self.checkouts else 0.0,
+            "max_queue_wait_ms": self.max_queue_wait * 1000,
+        }
+
+
+class PagePool(_PoolStats):
+    """
+    Pool de páginas para playwright.sync_api, cada una en su propio BrowserContext
+    creado con el storage state de la sesión autenticada.
+
+    La API sync de Playwright corre en un único hilo: checkout() no bloquea (lanza
+    PagePoolExhausted si no hay páginas libres) y run() reparte varias lecturas
+    entre las páginas, disparando todas las navegaciones antes de ejecutar las
+    acciones y de esperar, para que el navegador las resuelva en paralelo. Las lecturas que no encuentran
+    página libre esperan en cola y ese tiempo queda en stats().
+    """
+
+    def __init__(self, browser, storage_state: Callable[[], Any], size: int = PAGE_POOL_SIZE,
+                 setup: Optional[Callable[[PooledPage], None]] = None):
+        """
+        Args:
+            browser: Browser de Playwright donde crear los contextos.
+            storage_state: Función que devuelve el storage state de la sesión
+                (se llama al crear cada contexto, así toma la sesión vigente).
+            size: Cantidad máxima de páginas.
+            setup: Función opcional que prepara cada página nueva (bloqueo de
+                recursos, observadores del dispatcher).
+        """
+        super().__init__(size)
+        self.browser = browser
+        self.storage_state = storage_state
+        self.setup = setup
+        self._idle: List[PooledPage] = []
+        self._pages: List[PooledPage] = []
+
+    @property
+    def created(self) -> int:
+        """Cantidad de páginas creadas."""
+        return len(self._pages)
+
+    @property
+    def available(self) -> int:
+        """Páginas que se pueden tomar sin esperar (libres o por crear)."""
+        return len(self._idle) + self.size - len(self._pages)
+
+    def checkout(self, queued_for: float = 0.0) -> PooledPage:
+        """
+        Toma una página libre, creándola si el pool todavía no llegó a su tamaño.
+
+        Args:
+            queued_for: Segundos que la tarea esperó una página (para las estadísticas).
+
+        Returns:
+            PooledPage: Página reservada; se devuelve con release().
+
+        Raises:
+            PagePoolExhausted: Si todas las páginas están en uso.
+        """
+        if self._idle:
+            pooled = self._idle.pop()
+        elif len(self._pages) < self.size:
+            pooled = self._create()
+        else:
+            raise PagePoolExhausted(f"Las {self.size} páginas del pool están en uso")
+        pooled.checked_out_at = self._on_checkout(queued_for)
+        return pooled
+
+    def release(self, pooled: PooledPage) -> None:
+        """Devuelve una página al pool."""
+        if pooled.checked_out_at is None:
+            return
+        self._on_release(pooled.checked_out_at)
+        pooled.checked_out_at = None
+        self._idle.append(pooled)
+
+    def run(self, requests: Dict[Hashable, FetchRequest], timeout: int = DEFAULT_TIMEOUT,
+            poll_interval: int = DISPATCH_POLL_INTERVAL) -> Dict[Hashable, Any]:
+        """
+        Ejecuta varias lecturas repartidas entre las páginas del pool.
+
+        Args:
+            requests: Lecturas por clave.
+            timeout: Tiempo máximo en ms por lectura, desde que toma una página.
+            poll_interval: Intervalo en ms para bombear eventos mientras se espera.
+
+        Returns:
+            Dict[Hashable, Any]: Response de Playwright por clave, o None si la
+            lectura falló o no llegó a tiempo.
+        """
+        queued_at = time.monotonic()
+        queue = deque(requests.items())
+        active: Dict[Hashable, Any] = {}
+        results: Dict[Hashable, Any] = {}
+
+        while queue or active:
+            navigated = []
+            while queue and self.available:
+                key, request = queue.popleft()
+                pooled = self.checkout(time.monotonic() - queued_at)
+                waiter = pooled.dispatcher.expect(request.request_url)
+                try:
+                    pooled.page.goto(request.navigation_url, wait_until="commit")
+                except Exception as e:
+                    results[key] = self._abort(pooled, waiter, e)
+                    continue
+                navigated.append((key, request, pooled, waiter))
+            # Las acciones (fill/click) bloquean hasta que su página carga; corren
+            # después de disparar todas las navegaciones para que las páginas
+            # carguen en paralelo mientras se espera la primera.
+            for key, request, pooled, waiter in navigated:
+                try:
+                    if request.action:
+                        request.action(pooled.page)
+                except Exception as e:
+                    results[key] = self._abort(pooled, waiter, e)
+                    continue
+                active[key] = (pooled, waiter)
+
+            if not active:
+                if queue:
+                    raise PagePoolExhausted(f"Las {self.size} páginas del pool están tomadas fuera de run()")
+                continue
+            next(iter(active.values()))[0].page.wait_for_timeout(poll_interval)
+            now = time.monotonic()
+            for key, (pooled, waiter) in list(active.items()):
+                if waiter.done or now - pooled.checked_out_at > timeout / 1000:
+                    if not waiter.done:
+                        logger.info("No llegó la respuesta de %s antes del timeout.", waiter.pattern)
+                    results[key] = waiter.response
+                    pooled.dispatcher.discard(waiter)
+                    self.release(pooled)
+                    del active[key]
+        return results
+
+    def _abort(self, pooled: PooledPage, waiter, error: Exception) -> None:
+        """Libera la página de una lectura cuya navegación o acción falló."""
+        logger.warning("Falló la navegación de %s en el pool: %s", waiter.pattern, error)
+        pooled.dispatcher.discard(waiter)
+        self.release(pooled)
+
+    def close(self) -> None:
+        """Cierra todos los contextos del pool."""
+        for pooled in self._pages:
+            try:
+                pooled.context.close()
+            except Exception as e:
+                logger.debug("Error al cerrar un contexto del pool: %s", e)
+        self._pages.clear()
+        self._idle.clear()
+
+    def _create(self) -> PooledPage:
+        """Crea un contexto con la sesión actual y su página."""
+        context = self.browser.new_context(storage_state=self.storage_state())
+        pooled = PooledPage(context, context.new_page())
+        if self.setup:
+            self.setup(pooled)
+        self._pages.append(pooled)
+        logger.info("Página %s/%s del pool creada.", len(self._pages), self.size)
+        return pooled
+
+
+class AsyncPagePool(_PoolStats):
+    """
+    Pool de páginas para playwright.async_api en el contexto compartido de la sesión.
+
+    page() es un context manager asíncrono: si todas las páginas están en uso, la
+    corrutina espera a que se libere una y ese tiempo queda en stats().
+    """
+
+    def __init__(self, context, size: int = PAGE_POOL_SIZE):
+        """
+        Args:
+            context: BrowserContext autenticado donde crear las páginas.
+            size: Cantidad máxima de páginas.
+        """
+        super().__init__(size)
+        self.context = context
+        self._idle: List[Any] = []
+        self._pages: List[Any] = []
+        self._semaphore = asyncio.Semaphore(size)
+
+    @property
+    def created(self) -> int:
+        """Cantidad de páginas creadas."""
+        return len(self._pages)
+
+    @asynccontextmanager
+    async def page(self):
+        """Reserva una página del pool mientras dura el bloque 'async with'."""
+        queued_at = time.monotonic()
+        await self._semaphore.acquire()
+        try:
+            if self._idle:
+                page = self._idle.pop()
+            else:
+                page = await self.context.new_page()
+                self._pages.append(page)
+        except BaseException:
+            self._semaphore.release()
+            raise
+        checked_out_at = self._on_checkout(time.monotonic() - queued_at)
+        try:
+            yield page
+        finally:
+            self._on_release(checked_out_at)
+            self._idle.append(page)
+            self._semaphore.release()
+
+    async def close(self) -> None:
+        """Cierra todas las páginas del pool."""
+        for page in self._pages:
+            try:
+                await page.close()
+            except Exception as e:
+                logger.debug("Error al cerrar una página del pool: %s", e)
+        self._pages.clear()
+        self._idle.clear()
@@ -0,0 +1,397 @@
+import abc
+import asyncio
+import json
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from CocosBot.config.general import QUOTE_QUEUE_SIZE, QUOTE_RECONNECT_DELAY, QUOTE_MAX_RECONNECTS
+from CocosBot.core.instruments import item_ticker
+from CocosBot.core.market_snapshot import quote_value
+from CocosBot.core.response_dispatcher import DISPATCH_POLL_INTERVAL
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Sólo se escuchan los WebSockets cuya URL contiene este host
+QUOTE_FEED_HOST = "cocos.capital"
+
+# Claves bajo las que un frame puede anidar las cotizaciones
+_FRAME_CONTAINERS = ("data", "payload", "quotes", "items", "results", "tickers")
+_TIME_FIELDS = ("timestamp", "ts", "time", "date")
+
+
+class QuoteTick(NamedTuple):
+    """Cotización recibida por el feed."""
+    ticker: str
+    last: float
+    bid: float
+    ask: float
+    volume: float
+    exchange_time: Optional[float]
+    received_at: float
+
+    @property
+    def lag(self) -> Optional[float]:
+        """Segundos entre la hora informada por el feed y la recepción, si el frame la trae."""
+        return self.received_at - self.exchange_time if self.exchange_time is not None else None
+
+
+class QuoteStreamError(RuntimeError):
+    """El feed no se pudo reconectar."""
+    pass
+
+
+def _timestamp(item: Dict[str, Any]) -> Optional[float]:
+    """Hora del frame en segundos epoch (acepta segundos, milisegundos o ISO 8601)."""
+    for field in _TIME_FIELDS:
+        value = item.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool):
+            return value / 1000 if value > 1e11 else float(value)
+        if isinstance(value, str):
+            try:
+                return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+            except ValueError:
+                continue
+    return None
+
+
+def _frame_items(data: Any, depth: int = 0) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    if depth > 4:
+        return
+    if isinstance(data, list):
+        for element in data:
+            yield from _frame_items(element, depth + 1)
+    elif isinstance(data, dict):
+        ticker = item_ticker(data)
+        if ticker:
+            yield ticker, data
+            return
+        for key in _FRAME_CONTAINERS:
+            if key in data:
+                yield from _frame_items(data[key], depth + 1)
+
+
+def decode_frame(payload) -> List[QuoteTick]:
+    """
+    Decodifica un frame del feed de cotizaciones.
+
+    Acepta JSON con una cotización, una lista o un objeto que las anide (data,
+    payload, quotes, ...), con o sin el prefijo numérico de Socket.IO. Los frames
+    de control (ping/pong) no producen ticks.
+
+    Args:
+        payload: Contenido del frame (str o bytes).
+
+    Returns:
+        List[QuoteTick]: Cotizaciones del frame.
+
+    Raises:
+        ValueError: Si el frame no es JSON.
+    """
+    if isinstance(payload, (bytes, bytearray)):
+        payload = payload.decode("utf-8", "replace")
+    text = payload.lstrip("0123456789")
+    if not text:
+        return []
+    received_at = time.time()
+    return [
+        QuoteTick(ticker, quote_value(item, "last"), quote_value(item, "bid"), quote_value(item, "ask"),
+                  quote_value(item, "volume"), _timestamp(item), received_at)
+        for ticker, item in _frame_items(json.loads(text))
+    ]
+
+
+class _QuoteFeed(abc.ABC):
+    """
+    Parte común de QuoteStream y AsyncQuoteStream: escucha los WebSockets de la
+    página, decodifica los frames, filtra por tickers suscriptos y lleva las
+    estadísticas de descartes, desconexiones y demora.
+    """
+
+    def __init__(self, page, tickers: Optional[Iterable[str]] = None, queue_size: int = QUOTE_QUEUE_SIZE,
+                 reconnect_delay: int = QUOTE_RECONNECT_DELAY, max_reconnects: int = QUOTE_MAX_RECONNECTS,
+                 url_filter: str = QUOTE_FEED_HOST):
+        """
+        Args:
+            page: Página de Playwright cuya web app abre el feed.
+            tickers: Tickers a emitir; None para todos los del feed.
+            queue_size: Ticks en espera antes de descartar los más viejos.
+            reconnect_delay: ms sin feed abierto antes de recargar la página.
+            max_reconnects: Recargas seguidas sin recibir ticks antes de abandonar.
+            url_filter: Fragmento que debe contener la URL del WebSocket.
+        """
+        self.page = page
+        self.tickers = {ticker.upper() for ticker in tickers} if tickers else None
+        self.queue_size = queue_size
+        self.reconnect_delay = reconnect_delay
+        self.max_reconnects = max_reconnects
+        self.url_filter = url_filter
+        self.started = False
+        self.frames = 0
+        self.ticks = 0
+        self.decode_errors = 0
+        self.dropped = 0
+        self.disconnects = 0
+        self.reconnects = 0
+        self.max_lag = 0.0
+        self.max_gap = 0.0
+        self._lag_total = 0.0
+        self._lag_count = 0
+        self._last_tick_at: Optional[float] = None
+        self._sockets: List[Any] = []
+        self._disconnected_since: Optional[float] = None
+        self._failed_reconnects = 0
+
+    def subscribe(self, tickers: Iterable[str]) -> None:
+        """Agrega tickers al filtro del stream."""
+        if self.tickers is None:
+            self.tickers = set()
+        self.tickers.update(ticker.upper() for ticker in tickers)
+
+    def unsubscribe(self, tickers: Iterable[str]) -> None:
+        """Quita tickers del filtro del stream."""
+        if self.tickers is not None:
+            self.tickers.difference_update(ticker.upper() for ticker in tickers)
+
+    def start(self) -> None:
+        """Empieza a escuchar los WebSockets que abra la página."""
+        if self.started:
+            return
+        self.started = True
+        self._disconnected_since = time.monotonic()
+        self.page.on("websocket", self._on_websocket)
+
+    def _detach(self) -> None:
+        if not self.started:
+            return
+        self.started = False
+        self.page.remove_listener("websocket", self._on_websocket)
+        for ws in self._sockets:
+            ws.remove_listener("framereceived", self._on_frame)
+            ws.remove_listener("close", self._on_close)
+        self._sockets.clear()
+        logger.info("Stream de cotizaciones detenido: %s", self.stats())
+
+    @property
+    def connected(self) -> bool:
+        """True si hay algún WebSocket del feed abierto."""
+        return bool(self._sockets)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve las estadísticas del stream.
+
+        Returns:
+            Dict[str, Any]: frames y ticks recibidos, errores de decodificación, ticks
+            descartados por cola llena, desconexiones, reconexiones, demora promedio y
+            máxima (ms, sólo frames con hora) y mayor intervalo entre ticks (ms).
+        """
+        return {
+            "connected": self.connected,
+            "frames": self.frames,
+            "ticks": self.ticks,
+            "decode_errors": self.decode_errors,
+            "dropped": self.dropped,
+            "disconnects": self.disconnects,
+            "reconnects": self.reconnects,
+            "avg_lag_ms": self._lag_total * 1000 / self._lag_count if self._lag_count else None,
+            "max_lag_ms": self.max_lag * 1000,
+            "max_gap_ms": self.max_gap * 1000,
+        }
+
+    def _on_websocket(self, ws) -> None:
+        if self.url_filter not in ws.url:
+            return
+        logger.info("Feed de cotizaciones conectado: %s", ws.url)
+        self._sockets.append(ws)
+        self._disconnected_since = None
+        ws.on("framereceived", self._on_frame)
+        ws.on("close", self._on_close)
+
+    def _on_close(self, ws) -> None:
+        if ws in self._sockets:
+            self._sockets.remove(ws)
+            self.disconnects += 1
+            logger.warning("Feed de cotizaciones desconectado: %s", ws.url)
+        if not self._sockets:
+            self._disconnected_since = time.monotonic()
+
+    def _on_frame(self, payload) -> None:
+        self.frames += 1
+        try:
+            ticks = decode_frame(payload)
+        except ValueError:
+            self.decode_errors += 1
+            return
+        for tick in ticks:
+            if self.tickers is not None and tick.ticker not in self.tickers:
+                continue
+            self._record(tick)
+            self._push(tick)
+
+    def _record(self, tick: QuoteTick) -> None:
+        self.ticks += 1
+        self._failed_reconnects = 0
+        if self._last_tick_at is not None:
+            self.max_gap = max(self.max_gap, tick.received_at - self._last_tick_at)
+        self._last_tick_at = tick.received_at
+        if tick.lag is not None:
+            self._lag_total += tick.lag
+            self._lag_count += 1
+            self.max_lag = max(self.max_lag, tick.lag)
+
+    @abc.abstractmethod
+    def _push(self, tick: QuoteTick) -> None:
+        """Encola un tick ya filtrado para el consumidor."""
+
+    def _needs_reconnect(self) -> bool:
+        return (self._disconnected_since is not None
+                and time.monotonic() - self._disconnected_since > self.reconnect_delay / 1000)
+
+    def _begin_reconnect(self) -> None:
+        """Cuenta un intento de reconexión o abandona si se superó max_reconnects."""
+        if self._failed_reconnects >= self.max_reconnects:
+            raise QuoteStreamError(f"El feed de cotizaciones no volvió después de {self.max_reconnects} recargas")
+        self._failed_reconnects += 1
+        self.reconnects += 1
+        self._disconnected_since = time.monotonic()
+        logger.warning("Sin feed de cotizaciones; recargando la página (intento %s).", self._failed_reconnects)
+
+
+class QuoteStream(_QuoteFeed):
+    """
+    Stream de cotizaciones para playwright.sync_api.
+
+    Escucha el WebSocket que abre la web app en la página del mercado y emite
+    QuoteTick con iter_ticks(), que bombea los eventos de Playwright mientras
+    espera. Si el feed queda cerrado más de reconnect_delay ms, recarga la página
+    para que la web app vuelva a conectarse.
+
+    Example:
+        with cocos.stream_quotes(["GGAL", "YPFD"]) as stream:
+            for tick in stream.iter_ticks(timeout=60000):
+                print(tick.ticker, tick.last)
+    """
+
+    def __init__(self, page, tickers: Optional[Iterable[str]] = None, **kwargs):
+        super().__init__(page, tickers, **kwargs)
+        self._queue: deque = deque()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def __iter__(self) -> Iterator[QuoteTick]:
+        return self.iter_ticks()
+
+    def stop(self) -> None:
+        """Deja de escuchar el feed."""
+        self._detach()
+
+    def iter_ticks(self, timeout: Optional[int] = None,
+                   poll_interval: int = DISPATCH_POLL_INTERVAL) -> Iterator[QuoteTick]:
+        """
+        Generador de ticks en orden de llegada.
+
+        Args:
+            timeout: ms sin ticks tras los cuales termina; None para no terminar.
+            poll_interval: Intervalo en ms para bombear eventos mientras se espera.
+
+        Yields:
+            QuoteTick: Cotizaciones de los tickers suscriptos.
+
+        Raises:
+            QuoteStreamError: Si el feed no vuelve después de max_reconnects recargas.
+        """
+        self.start()
+        idle_since = time.monotonic()
+        while True:
+            while self._queue:
+                yield self._queue.popleft()
+                idle_since = time.monotonic()
+            if timeout is not None and time.monotonic() - idle_since > timeout / 1000:
+                return
+            if self._needs_reconnect():
+                self._begin_reconnect()
+                try:
+                    self.page.reload(wait_until="commit")
+                except Exception as e:
+                    logger.warning("No se pudo recargar la página del feed: %s", e)
+            self.page.wait_for_timeout(poll_interval)
+
+    def _push(self, tick: QuoteTick) -> None:
+        if len(self._queue) >= self.queue_size:
+            self._queue.popleft()
+            self.dropped += 1
+        self._queue.append(tick)
+
+
+class AsyncQuoteStream(_QuoteFeed):
+    """
+    Stream de cotizaciones para playwright.async_api, consumible con 'async for'.
+
+    Con close_page=True la página se cierra al detener el stream (para streams
+    en una página propia del contexto).
+    """
+
+    def __init__(self, page, tickers: Optional[Iterable[str]] = None, close_page: bool = False, **kwargs):
+        super().__init__(page, tickers, **kwargs)
+        self.close_page = close_page
+        self._queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+
+    async def __aenter__(self):
+        self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop()
+
+    def __aiter__(self) -> AsyncIterator[QuoteTick]:
+        return self.iter_ticks()
+
+    async def stop(self) -> None:
+        """Deja de escuchar el feed y cierra la página si es propia."""
+        self._detach()
+        if self.close_page:
+            try:
+                await self.page.close()
+            except Exception as e:
+                logger.debug("Error al cerrar la página del feed: %s", e)
+
+    async def iter_ticks(self, timeout: Optional[int] = None) -> AsyncIterator[QuoteTick]:
+        """
+        Iterador asíncrono de ticks. Ver QuoteStream.iter_ticks.
+
+        Args:
+            timeout: ms sin ticks tras los cuales termina; None para no terminar.
+        """
+        self.start()
+        idle_since = time.monotonic()
+        while True:
+            wait = self.reconnect_delay / 1000
+            if timeout is not None:
+                wait = min(wait, max(0.0, timeout / 1000 - (time.monotonic() - idle_since)))
+            try:
+                tick = await asyncio.wait_for(self._queue.get(), wait)
+            except asyncio.TimeoutError:
+                if timeout is not None and time.monotonic() - idle_since >= timeout / 1000:
+                    return
+                if self._needs_reconnect():
+                    self._begin_reconnect()
+                    try:
+                        await self.page.reload(wait_until="commit")
+                    except Exception as e:
+                        logger.warning("No se pudo recargar la página del feed: %s", e)
+                continue
+            yield tick
+            idle_since = time.monotonic()
+
+    def _push(self, tick: QuoteTick) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped += 1
+        self._queue.put_nowait(tick)
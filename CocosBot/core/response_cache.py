@@ -0,0 +1,113 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+import logging
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_SIZE = 256
+
+
+def normalize_api_url(url: str) -> str:
+    """
+    Normaliza una URL de API para usarla como clave del cache.
+
+    Ordena los parámetros del query string, descarta el fragmento y la barra final,
+    de modo que la misma consulta escrita de dos formas comparta entrada.
+
+    Args:
+        url: URL del endpoint.
+
+    Returns:
+        str: URL normalizada.
+    """
+    parts = urlsplit(url)
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((parts.scheme, parts.netloc.lower(), parts.path.rstrip("/"), query, ""))
+
+
+class ResponseCache:
+    """
+    Cache LRU acotado con el último cuerpo JSON recibido por cada URL de API.
+
+    Lo alimentan pasivamente todas las respuestas que la web app recibe de
+    api.cocos.capital, además de las lecturas de fetch_data. get() sólo
+    devuelve datos con una antigüedad menor o igual a max_age.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_CACHE_SIZE):
+        """
+        Args:
+            max_entries: Cantidad máxima de URLs guardadas antes de desalojar la menos usada.
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, url: str, data: Any, timestamp: Optional[float] = None) -> None:
+        """
+        Guarda el cuerpo de una respuesta.
+
+        Args:
+            url: URL del endpoint.
+            data: Cuerpo JSON decodificado.
+            timestamp: Momento de la respuesta (time.time()); por defecto, ahora.
+        """
+        key = normalize_api_url(url)
+        self._entries[key] = (timestamp if timestamp is not None else time.time(), data)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, url: str, max_age: float) -> Tuple[bool, Any]:
+        """
+        Busca una respuesta suficientemente reciente.
+
+        Args:
+            url: URL del endpoint.
+            max_age: Antigüedad máxima aceptada, en segundos.
+
+        Returns:
+            tuple: (True, datos) si hay una entrada fresca, (False, None) si no.
+        """
+        key = normalize_api_url(url)
+        entry = self._entries.get(key)
+        if entry is None or time.time() - entry[0] > max_age:
+            self.misses += 1
+            return False, None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return True, entry[1]
+
+    def age(self, url: str) -> Optional[float]:
+        """Antigüedad en segundos de la entrada de una URL, o None si no existe."""
+        entry = self._entries.get(normalize_api_url(url))
+        return time.time() - entry[0] if entry else None
+
+    def clear(self) -> None:
+        """Vacía el cache (mantiene las estadísticas)."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve las estadísticas del cache.
+
+        Returns:
+            Dict[str, Any]: tamaño, capacidad, aciertos, fallos, tasa de aciertos y desalojos.
+        """
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
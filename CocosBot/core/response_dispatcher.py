@@ -0,0 +1,207 @@
+import time
+from typing import Callable, Dict, List, Any
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Intervalo en ms con el que se bombea el loop de Playwright mientras se espera
+DISPATCH_POLL_INTERVAL = 50
+
+
+class ResponseWaiter:
+    """
+    Espera pendiente de una respuesta cuya URL contiene un patrón.
+
+    Se crea con ResponseDispatcher.expect() y se usa como context manager para
+    que se desregistre al terminar, tanto si llegó la respuesta como si no.
+    """
+
+    def __init__(self, dispatcher, pattern: str):
+        self.dispatcher = dispatcher
+        self.pattern = pattern
+        self.response = None
+
+    @property
+    def done(self) -> bool:
+        """True si ya llegó una respuesta que coincide con el patrón."""
+        return self.response is not None
+
+    def wait(self, timeout: int) -> Any:
+        """
+        Bloquea hasta que llegue la respuesta.
+
+        Args:
+            timeout: Tiempo máximo de espera en ms.
+
+        Returns:
+            Response de Playwright.
+
+        Raises:
+            TimeoutError: Si la respuesta no llega a tiempo.
+        """
+        self.dispatcher.wait_all([self], timeout)
+        if not self.done:
+            raise TimeoutError(f"No llegó la respuesta de {self.pattern} en {timeout} ms")
+        return self.response
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.dispatcher.discard(self)
+
+
+class ResponseDispatcher:
+    """
+    Único listener de 'response' por página que reparte cada respuesta a las
+    esperas pendientes cuyo patrón coincide con la URL.
+
+    Reemplaza el registro de un callback nuevo por cada llamada: la cantidad de
+    listeners queda fija en uno y las esperas se eliminan al completarse o al
+    vencer. También reenvía cada respuesta a los observadores registrados con
+    add_observer (p. ej. el cache pasivo). stats() expone contadores para
+    monitorear procesos de larga duración.
+    """
+
+    def __init__(self, page=None, poll_interval: int = DISPATCH_POLL_INTERVAL):
+        """
+        Registra el listener en la página.
+
+        Args:
+            page: Página de Playwright. Puede ser None y registrarse después con
+                attach (el navegador sincrónico la crea recién al primer uso).
+            poll_interval: Intervalo en ms para bombear eventos mientras se espera.
+        """
+        self.page = None
+        self.poll_interval = poll_interval
+        self._pending: Dict[str, List[ResponseWaiter]] = {}
+        self._observers: List[Callable[[Any], None]] = []
+        self.listener_count = 0
+        self.dispatched = 0
+        self.matched = 0
+        self.timeouts = 0
+        self.dispatch_time = 0.0
+        if page is not None:
+            self.attach(page)
+
+    def attach(self, page) -> None:
+        """
+        Registra el listener en la página.
+
+        Las esperas y observadores agregados antes se conservan.
+
+        Args:
+            page: Página de Playwright.
+        """
+        self.page = page
+        self.page.on("response", self._dispatch)
+        self.listener_count += 1
+
+    def expect(self, pattern: str) -> ResponseWaiter:
+        """
+        Registra una espera para la próxima respuesta cuya URL contenga pattern.
+
+        Debe registrarse antes de disparar la navegación o el clic que genera el request.
+
+        Args:
+            pattern: URL (o fragmento de URL) a esperar.
+
+        Returns:
+            ResponseWaiter: Espera registrada.
+        """
+        waiter = ResponseWaiter(self, pattern)
+        self._pending.setdefault(pattern, []).append(waiter)
+        return waiter
+
+    def add_observer(self, callback: Callable[[Any], None]) -> None:
+        """
+        Registra un callback que recibe todas las respuestas de la página.
+
+        Los errores del callback se registran y no interrumpen el despacho.
+
+        Args:
+            callback: Función que recibe el Response de Playwright.
+        """
+        self._observers.append(callback)
+
+    def remove_observer(self, callback: Callable[[Any], None]) -> None:
+        """Quita un observador registrado con add_observer (no hace nada si no está)."""
+        if callback in self._observers:
+            self._observers.remove(callback)
+
+    def discard(self, waiter: ResponseWaiter) -> None:
+        """Elimina una espera pendiente (no hace nada si ya se completó)."""
+        waiters = self._pending.get(waiter.pattern)
+        if waiters and waiter in waiters:
+            waiters.remove(waiter)
+            if not waiters:
+                del self._pending[waiter.pattern]
+
+    def wait_all(self, waiters: List[ResponseWaiter], timeout: int) -> bool:
+        """
+        Bombea eventos de Playwright hasta que todas las esperas se completen o venza el timeout.
+
+        Args:
+            waiters: Esperas a completar.
+            timeout: Tiempo máximo total en ms.
+
+        Returns:
+            bool: True si todas se completaron.
+        """
+        deadline = time.monotonic() + timeout / 1000
+        while not all(w.done for w in waiters):
+            remaining = (deadline - time.monotonic()) * 1000
+            if remaining <= 0:
+                self.timeouts += 1
+                for waiter in waiters:
+                    self.discard(waiter)
+                return False
+            self.page.wait_for_timeout(min(self.poll_interval, remaining))
+        return True
+
+    @property
+    def pending_count(self) -> int:
+        """Cantidad de esperas pendientes."""
+        return sum(len(w) for w in self._pending.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Devuelve los contadores del dispatcher.
+
+        Returns:
+            Dict[str, Any]: listeners registrados, esperas pendientes, respuestas
+            despachadas y coincidentes, timeouts y tiempo de despacho (total y promedio, en ms).
+        """
+        return {
+            "listeners": self.listener_count,
+            "pending": self.pending_count,
+            "dispatched": self.dispatched,
+            "matched": self.matched,
+            "timeouts": self.timeouts,
+            "dispatch_time_ms": self.dispatch_time * 1000,
+            "avg_dispatch_time_ms": (self.dispatch_time * 1000 / self.dispatched) if self.dispatched else 0.0,
+        }
+
+    def _dispatch(self, response) -> None:
+        """
+        Callback de Playwright: completa las esperas cuyo patrón está en la URL.
+
+        Args:
+            response: Objeto Response de Playwright.
+        """
+        start = time.perf_counter()
+        url = response.url
+        for pattern in [p for p in self._pending if p in url]:
+            waiters = self._pending.pop(pattern)
+            for waiter in waiters:
+                waiter.response = response
+            self.matched += len(waiters)
+            logger.debug("Respuesta interceptada: URL=%s, Estado=%s", url, response.status)
+        for observer in self._observers:
+            try:
+                observer(response)
+            except Exception as e:
+                logger.debug("Error en observador de respuestas: %s", e)
+        self.dispatched += 1
+        self.dispatch_time += time.perf_counter() - start
+
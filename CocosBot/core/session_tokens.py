@@ -0,0 +1,232 @@
+import base64
+import json
+import threading
+import time
+from typing import Any, Dict, Optional
+from CocosBot.config.general import TOKEN_REFRESH_MARGIN, TOKEN_REFRESH_RETRY
+from CocosBot.config.urls import API_URLS
+from CocosBot.core.api_client import ApiClientError
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Fragmento común a los endpoints que emiten tokens (login y refresh)
+TOKEN_ENDPOINT = "/auth/v1/token"
+
+
+def jwt_expiry(token: Optional[str]) -> Optional[float]:
+    """
+    Lee el vencimiento (claim 'exp') de un JWT sin verificar la firma.
+
+    Args:
+        token: Access token, con o sin el prefijo 'Bearer '.
+
+    Returns:
+        Optional[float]: Timestamp de vencimiento, o None si el token no es un JWT válido.
+    """
+    if not token:
+        return None
+    token = token.split(" ", 1)[-1]
+    try:
+        payload = token.split(".")[1]
+        payload += "=" * (-len(payload) % 4)
+        exp = json.loads(base64.urlsafe_b64decode(payload)).get("exp")
+        return float(exp) if exp is not None else None
+    except (IndexError, ValueError, TypeError, AttributeError):
+        return None
+
+
+class TokenManager:
+    """
+    Sigue el access token de la sesión y lo renueva antes de que venza.
+
+    Se alimenta pasivamente de las respuestas de API_URLS["auth_token"] (el login)
+    y de los refresh que haga la web app. Con un ApiClient (modo API directa),
+    programa un refresh con el refresh token TOKEN_REFRESH_MARGIN segundos antes
+    del vencimiento y actualiza el header Authorization del cliente, de modo que un
+    proceso de larga duración no tenga que repetir el login con 2FA.
+
+    Los refresh corren siempre en un mismo hilo de larga duración, así que el
+    ApiClient mantiene una sola conexión keep-alive para ellos; stop() termina el
+    hilo y cierra esa conexión.
+
+    Si el servidor rota los refresh tokens (cada refresh invalida el anterior), un
+    refresh hecho acá deja sin validez el refresh token que guarda la web app: el
+    navegador sigue funcionando hasta que vence su access token y después queda
+    deslogueado, así que las acciones por la UI necesitan un nuevo login. Las
+    llamadas por ApiClient no se ven afectadas.
+    """
+
+    def __init__(self, api_client=None, margin: float = TOKEN_REFRESH_MARGIN,
+                 retry_delay: float = TOKEN_REFRESH_RETRY):
+        """
+        Args:
+            api_client: ApiClient que usa y renueva el token (opcional).
+            margin: Segundos antes del vencimiento en que se renueva.
+            retry_delay: Segundos entre reintentos si el refresh falla.
+        """
+        self.api_client = api_client
+        self.margin = margin
+        self.retry_delay = retry_delay
+        self.access_token: Optional[str] = None
+        self.refresh_token: Optional[str] = None
+        self.expires_at: Optional[float] = None
+        self.refreshes = 0
+        self.failures = 0
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._due: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def observe(self, response) -> None:
+        """
+        Observador de respuestas: toma los tokens de las respuestas del endpoint de tokens.
+
+        Args:
+            response: Objeto Response de Playwright.
+        """
+        if TOKEN_ENDPOINT in response.url and response.status == 200:
+            self.update(response.json())
+
+    def update(self, data: Dict[str, Any]) -> None:
+        """
+        Guarda los tokens de una respuesta del endpoint de tokens y reprograma el refresh.
+
+        Args:
+            data: Cuerpo con access_token, refresh_token y expires_at/expires_in.
+        """
+        if not data or not data.get("access_token"):
+            return
+        with self._lock:
+            self.access_token = data["access_token"]
+            self.refresh_token = data.get("refresh_token") or self.refresh_token
+            self.expires_at = self._expiry_of(data)
+            if self.api_client is not None:
+                self.api_client.headers["authorization"] = f"Bearer {self.access_token}"
+        logger.info("Token de sesión capturado; vence en %.0f s.", self.seconds_left() or 0)
+        self.schedule()
+
+    def seconds_left(self) -> Optional[float]:
+        """Segundos hasta el vencimiento del access token, o None si no se conoce."""
+        return self.expires_at - time.time() if self.expires_at is not None else None
+
+    def needs_refresh(self) -> bool:
+        """True si el token vence dentro del margen configurado."""
+        left = self.seconds_left()
+        return left is not None and left <= self.margin
+
+    def is_stale(self, authorization: Optional[str]) -> bool:
+        """
+        Indica si un header Authorization capturado es más viejo que el token actual,
+        para no pisar un token renovado con el que la web app sigue enviando.
+        """
+        if not authorization or self.expires_at is None:
+            return False
+        expiry = jwt_expiry(authorization)
+        return expiry is not None and expiry < self.expires_at
+
+    def refresh(self) -> bool:
+        """
+        Renueva el access token con el refresh token a través del ApiClient.
+
+        Si el servidor devuelve un refresh token distinto (rotación), la sesión de la
+        web app ya no podrá renovarse por su cuenta; ver la documentación de la clase.
+
+        Returns:
+            bool: True si se obtuvo un token nuevo.
+        """
+        if self.api_client is None or not self.refresh_token:
+            return False
+        used = self.refresh_token
+        try:
+            data = self.api_client.post_json(API_URLS["auth_refresh"], {"refresh_token": used})
+        except (ApiClientError, OSError) as e:
+            self.failures += 1
+            logger.warning("No se pudo renovar el token de sesión: %s", e)
+            return False
+        if not data or not data.get("access_token"):
+            self.failures += 1
+            logger.warning("La respuesta del refresh no trae un access token.")
+            return False
+        self.refreshes += 1
+        if data.get("refresh_token") and data["refresh_token"] != used:
+            logger.warning("El servidor rotó el refresh token: la sesión del navegador no podrá renovarse "
+                           "sola y las acciones por la UI requerirán un nuevo login.")
+        self.update(data)
+        return True
+
+    def schedule(self) -> None:
+        """Programa el próximo refresh (sólo con ApiClient y refresh token)."""
+        if self.api_client is None or not self.refresh_token or self.expires_at is None:
+            self._set_due(None)
+            return
+        delay = max(0.0, self.seconds_left() - self.margin)
+        self._set_due(delay)
+        logger.debug("Refresh del token programado en %.0f s.", delay)
+
+    def stop(self) -> None:
+        """Cancela el refresh programado y termina el hilo de refresh."""
+        with self._wakeup:
+            self._due = None
+            self._thread = None
+            self._wakeup.notify_all()
+
+    def status(self) -> Dict[str, Any]:
+        """
+        Devuelve el estado del token.
+
+        Returns:
+            Dict[str, Any]: vencimiento, segundos restantes, si hay refresh programado
+            y cantidad de refresh exitosos y fallidos.
+        """
+        return {
+            "expires_at": self.expires_at,
+            "seconds_left": self.seconds_left(),
+            "scheduled": self._due is not None,
+            "refreshes": self.refreshes,
+            "failures": self.failures,
+        }
+
+    def _set_due(self, delay: Optional[float]) -> None:
+        """Fija (o anula, con None) el próximo refresh y arranca el hilo si hace falta."""
+        with self._wakeup:
+            self._due = time.monotonic() + delay if delay is not None else None
+            if delay is not None and self._thread is None:
+                self._thread = threading.Thread(target=self._refresh_loop, name="cocos-token-refresh", daemon=True)
+                self._thread.start()
+            self._wakeup.notify_all()
+
+    def _refresh_loop(self) -> None:
+        """Hilo de refresh: espera el próximo vencimiento programado hasta que stop() lo reemplace."""
+        me = threading.current_thread()
+        try:
+            while True:
+                with self._wakeup:
+                    while self._thread is me and (self._due is None or self._due > time.monotonic()):
+                        self._wakeup.wait(None if self._due is None else self._due - time.monotonic())
+                    if self._thread is not me:
+                        return
+                    self._due = None
+                self._scheduled_refresh()
+        finally:
+            if self.api_client is not None:
+                self.api_client.close_thread_connections()
+
+    def _scheduled_refresh(self) -> None:
+        """Renueva y, si falla, reintenta mientras el token siga vigente."""
+        if self.refresh():
+            return
+        left = self.seconds_left()
+        if left is not None and left > 0:
+            self._set_due(min(self.retry_delay, left))
+        else:
+            logger.error("El token de sesión venció sin poder renovarse; hará falta un nuevo login.")
+
+    @staticmethod
+    def _expiry_of(data: Dict[str, Any]) -> Optional[float]:
+        """Vencimiento informado por la respuesta, o el claim exp del JWT."""
+        if data.get("expires_at"):
+            return float(data["expires_at"])
+        if data.get("expires_in"):
+            return time.time() + float(data["expires_in"])
+        return jwt_expiry(data["access_token"])
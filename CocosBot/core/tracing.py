@@ -0,0 +1,351 @@
+import asyncio
+import functools
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from typing import Any, Dict, IO, List, Optional, Sequence, Tuple, Union
+from CocosBot.config.general import TRACE_BUFFER_SIZE
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Límites superiores (s) de los buckets de los histogramas, como en Prometheus
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Etapa con la que se registra la duración total de una operación
+TOTAL_STAGE = "total"
+
+PROMETHEUS_METRIC = "cocosbot_span_duration_seconds"
+
+# Span abierto en el hilo o la tarea actual
+_current_span: ContextVar[Optional["Span"]] = ContextVar("cocosbot_current_span", default=None)
+
+
+class Span:
+    """Tramo medido de una operación, con sus tramos anidados."""
+
+    __slots__ = ("name", "attributes", "parent", "children", "start", "end", "started_at", "error")
+
+    def __init__(self, name: str, attributes: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.attributes = attributes
+        self.parent = parent
+        self.children: List["Span"] = []
+        self.started_at = time.time()
+        self.start = time.perf_counter()
+        self.end: Optional[float] = None
+        self.error: Optional[str] = None
+
+    @property
+    def duration(self) -> float:
+        """Segundos transcurridos (hasta ahora, si el span sigue abierto)."""
+        return (self.end if self.end is not None else time.perf_counter()) - self.start
+
+    @property
+    def root(self) -> "Span":
+        """Span de nivel superior (la operación) al que pertenece este span."""
+        span = self
+        while span.parent is not None:
+            span = span.parent
+        return span
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serializa la traza de este span.
+
+        Returns:
+            Dict[str, Any]: operación, hora de inicio, duración y error del span, y
+            la lista plana de sus spans anidados con su padre, inicio relativo y duración (ms).
+        """
+        spans = []
+        pending = [(child, self.name) for child in self.children]
+        while pending:
+            span, parent = pending.pop(0)
+            spans.append({
+                "name": span.name, "parent": parent,
+                "offset_ms": round((span.start - self.start) * 1000, 3),
+                "duration_ms": round(span.duration * 1000, 3),
+                "error": span.error, **span.attributes,
+            })
+            pending.extend((child, span.name) for child in span.children)
+        return {
+            "operation": self.name, "started_at": self.started_at,
+            "duration_ms": round(self.duration * 1000, 3), "error": self.error,
+            **self.attributes, "spans": spans,
+        }
+
+
+class Histogram:
+    """Histograma de duraciones con buckets fijos (acumulables como en Prometheus)."""
+
+    __slots__ = ("bounds", "counts", "count", "sum", "min", "max")
+
+    def __init__(self, bounds: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(bounds)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        """Registra una duración en segundos."""
+        index = next((i for i, bound in enumerate(self.bounds) if value <= bound), len(self.bounds))
+        self.counts[index] += 1
+        self.count += 1
+        self.sum += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """
+        Estima un cuantil interpolando dentro del bucket que lo contiene.
+
+        Args:
+            q: Cuantil entre 0 y 1 (p. ej. 0.95).
+
+        Returns:
+            float: Segundos estimados, acotados al mínimo y máximo observados (0 si no hay datos).
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                lower = self.bounds[index - 1] if index else 0.0
+                upper = self.bounds[index] if index < len(self.bounds) else self.max
+                estimate = lower + (upper - lower) * (rank - seen) / count
+                return min(max(estimate, self.min), self.max)
+            seen += count
+        return self.max
+
+    def cumulative(self) -> List[Tuple[float, int]]:
+        """Pares (límite superior, cantidad acumulada), terminando en +Inf."""
+        total = 0
+        pairs = []
+        for bound, count in zip(self.bounds + (math.inf,), self.counts):
+            total += count
+            pairs.append((bound, total))
+        return pairs
+
+
+class _SpanScope:
+    """Context manager que abre un span al entrar y lo registra al salir."""
+
+    __slots__ = ("tracer", "name", "attributes", "span", "token")
+
+    def __init__(self, tracer: "Tracer", name: str, attributes: Dict[str, Any]):
+        self.tracer = tracer
+        self.name = name
+        self.attributes = attributes
+
+    def __enter__(self) -> Span:
+        parent = _current_span.get()
+        self.span = Span(self.name, self.attributes, parent)
+        if parent is not None:
+            parent.children.append(self.span)
+        self.token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.span.end = time.perf_counter()
+        if exc_type is not None:
+            self.span.error = exc_type.__name__
+        _current_span.reset(self.token)
+        self.tracer._finish(self.span)
+        return False
+
+
+class _NullScope:
+    """Span que no mide nada, para cuando la instrumentación está desactivada."""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        return False
+
+
+_NULL_SCOPE = _NullScope()
+
+
+class Tracer:
+    """
+    Instrumentación de las operaciones: spans anidados con tiempos monotónicos.
+
+    Cada método de la fachada abre un span de nivel superior (la operación) y el
+    navegador y los servicios abren spans anidados para sus etapas (go_to,
+    wait_for_element, expect_response, response.json, process_response, ...).
+    Al cerrarse, cada span se registra en un histograma por (operación, etapa);
+    las últimas trazas completas se guardan para exportarlas a JSON lines, y los
+    histogramas se exportan en formato de texto de Prometheus.
+
+    Example:
+        cocos.get_portfolio_data()
+        cocos.tracer.summary()["get_portfolio_data"]["total"]["p95_ms"]
+    """
+
+    def __init__(self, enabled: bool = True, buffer_size: int = TRACE_BUFFER_SIZE,
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Args:
+            enabled: Si es False, span() no mide nada.
+            buffer_size: Cantidad de trazas completas que se conservan.
+            buckets: Límites superiores (s) de los buckets de los histogramas.
+        """
+        self.enabled = enabled
+        self.buckets = tuple(buckets)
+        self.traces: deque = deque(maxlen=buffer_size)
+        self.histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def span(self, name: str, **attributes):
+        """
+        Abre un span como context manager, anidado en el span abierto del hilo o la tarea actual.
+
+        Args:
+            name: Nombre de la operación o etapa.
+            **attributes: Datos a incluir en la traza (p. ej. url).
+
+        Example:
+            with tracer.span("go_to", url=url):
+                page.goto(url)
+        """
+        if not self.enabled:
+            return _NULL_SCOPE
+        return _SpanScope(self, name, attributes)
+
+    def _finish(self, span: Span) -> None:
+        root = span.root
+        key = (root.name, TOTAL_STAGE if span is root else span.name)
+        with self._lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram(self.buckets)
+            histogram.observe(span.duration)
+            if span is root:
+                self.traces.append(span)
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Devuelve las latencias por operación y etapa.
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, float]]]: Para cada operación y etapa
+            ("total" para la operación completa): count, avg_ms, p50_ms, p95_ms y max_ms.
+        """
+        result: Dict[str, Dict[str, Dict[str, float]]] = {}
+        with self._lock:
+            items = list(self.histograms.items())
+        for (operation, stage), histogram in sorted(items):
+            result.setdefault(operation, {})[stage] = {
+                "count": histogram.count,
+                "avg_ms": histogram.sum * 1000 / histogram.count,
+                "p50_ms": histogram.quantile(0.5) * 1000,
+                "p95_ms": histogram.quantile(0.95) * 1000,
+                "max_ms": histogram.max * 1000,
+            }
+        return result
+
+    def to_prometheus(self, metric: str = PROMETHEUS_METRIC) -> str:
+        """
+        Exporta los histogramas en el formato de texto de Prometheus.
+
+        Args:
+            metric: Nombre de la métrica.
+
+        Returns:
+            str: Series _bucket, _sum y _count con las etiquetas operation y stage.
+        """
+        lines = [f"# HELP {metric} Duración de las operaciones de CocosBot y de sus etapas.",
+                 f"# TYPE {metric} histogram"]
+        with self._lock:
+            items = sorted(self.histograms.items())
+            for (operation, stage), histogram in items:
+                labels = f'operation="{_label(operation)}",stage="{_label(stage)}"'
+                for bound, count in histogram.cumulative():
+                    le = "+Inf" if math.isinf(bound) else repr(bound)
+                    lines.append(f'{metric}_bucket{{{labels},le="{le}"}} {count}')
+                lines.append(f"{metric}_sum{{{labels}}} {histogram.sum!r}")
+                lines.append(f"{metric}_count{{{labels}}} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+    def export_jsonl(self, target: Union[str, IO[str]], clear: bool = True) -> int:
+        """
+        Escribe las trazas guardadas en formato JSON lines (una operación por línea).
+
+        Args:
+            target: Ruta del archivo (se agrega al final) o archivo abierto.
+            clear: Si es True, descarta las trazas escritas.
+
+        Returns:
+            int: Cantidad de trazas escritas.
+        """
+        with self._lock:
+            traces = list(self.traces)
+            if clear:
+                self.traces.clear()
+        lines = "".join(json.dumps(trace.to_dict(), default=str) + "\n" for trace in traces)
+        if isinstance(target, str):
+            with open(target, "a", encoding="utf-8") as f:
+                f.write(lines)
+        else:
+            target.write(lines)
+        return len(traces)
+
+    def reset(self) -> None:
+        """Descarta histogramas y trazas."""
+        with self._lock:
+            self.histograms.clear()
+            self.traces.clear()
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def span_of(owner: Any, name: str, **attributes):
+    """
+    Abre un span con el tracer de owner (un navegador o fachada), o ninguno si no lo tiene.
+
+    Pensado para los servicios, que reciben el navegador y no deben fallar si no
+    tiene instrumentación.
+    """
+    tracer = getattr(owner, "tracer", None)
+    if not isinstance(tracer, Tracer):
+        return _NULL_SCOPE
+    return tracer.span(name, **attributes)
+
+
+def traced_methods(cls):
+    """
+    Decorador de clase que abre un span con el nombre de cada método público
+    definido en la clase (no en sus bases), usando el tracer de la instancia.
+    Admite métodos sincrónicos y corrutinas.
+    """
+    for name, member in list(vars(cls).items()):
+        if name.startswith("_") or not callable(member) or isinstance(member, (staticmethod, classmethod, type)):
+            continue
+        setattr(cls, name, _traced(member, name))
+    return cls
+
+
+def _traced(method, name: str):
+    if asyncio.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self, *args, **kwargs):
+            with span_of(self, name):
+                return await method(self, *args, **kwargs)
+        return async_wrapper
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with span_of(self, name):
+            return method(self, *args, **kwargs)
+    return wrapper
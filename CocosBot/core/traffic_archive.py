@@ -0,0 +1,370 @@
+import base64
+import json
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+from CocosBot.config.urls import API_ROOT, API_URLS
+from CocosBot.core.log_setup import MASK, redact
+from CocosBot.core.response_cache import normalize_api_url
+
+import logging
+logger = logging.getLogger(__name__)
+
+HAR_VERSION = "1.2"
+
+# Respuesta de replay para los requests que no están en el archivo
+MISSING_STATUS = 404
+
+# Campos que se enmascaran en los cuerpos de los endpoints auth_* (login y refresh)
+_SECRET_FIELDS = {"email", "password", "access_token", "refresh_token", "provider_token",
+                  "provider_refresh_token"}
+
+
+def api_key_of(url: str) -> Optional[str]:
+    """
+    Clave de API_URLS de una URL de la API (la entrada más larga que es prefijo de la URL).
+
+    Returns:
+        Optional[str]: Clave (p. ej. "markets_list" o "orders"), o None si no es de la API.
+    """
+    matches = [(len(prefix), key) for key, prefix in API_URLS.items() if url.startswith(prefix)]
+    return max(matches)[1] if matches else None
+
+
+class ArchivedResponse(NamedTuple):
+    """Request a la API y su respuesta, tal como quedaron en el archivo."""
+    key: Optional[str]
+    method: str
+    url: str
+    status: int
+    content_type: str
+    body: Any
+    timestamp: float
+    request_body: Any = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return self._asdict()
+
+
+def _redact_body(body: Any) -> Any:
+    """Copia de un cuerpo de auth_* con credenciales y tokens reemplazados por MASK."""
+    if isinstance(body, dict):
+        return {key: MASK if key in _SECRET_FIELDS and body[key] else _redact_body(value)
+                for key, value in body.items()}
+    if isinstance(body, list):
+        return [_redact_body(item) for item in body]
+    if isinstance(body, str):
+        return redact(body)
+    return body
+
+
+def _decode(text: Optional[str], content_type: str) -> Any:
+    if text is None or text == "":
+        return None
+    if "json" in content_type:
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    return text
+
+
+def _har_entry(entry: ArchivedResponse) -> Dict[str, Any]:
+    text = entry.body if isinstance(entry.body, str) or entry.body is None else json.dumps(entry.body)
+    request = {"method": entry.method, "url": entry.url, "httpVersion": "HTTP/1.1", "headers": [],
+               "queryString": [], "cookies": [], "headersSize": -1, "bodySize": -1}
+    if entry.request_body is not None:
+        request["postData"] = {"mimeType": "application/json", "text": json.dumps(entry.request_body)}
+    return {
+        "startedDateTime": datetime.fromtimestamp(entry.timestamp, timezone.utc).isoformat(),
+        "time": 0,
+        "request": request,
+        "response": {
+            "status": entry.status, "statusText": "", "httpVersion": "HTTP/1.1", "cookies": [],
+            "headers": [{"name": "content-type", "value": entry.content_type}],
+            "content": {"size": len(text or ""), "mimeType": entry.content_type, "text": text or ""},
+            "redirectURL": "", "headersSize": -1, "bodySize": -1,
+        },
+        "cache": {},
+        "timings": {"send": 0, "wait": 0, "receive": 0},
+        "_apiKey": entry.key,
+    }
+
+
+def _from_har_entry(item: Dict[str, Any]) -> ArchivedResponse:
+    request, response = item["request"], item["response"]
+    content = response.get("content", {})
+    content_type = content.get("mimeType", "")
+    text = content.get("text")
+    if text and content.get("encoding") == "base64":
+        text = base64.b64decode(text).decode("utf-8", "replace")
+    post_data = request.get("postData", {}).get("text")
+    try:
+        timestamp = datetime.fromisoformat(item["startedDateTime"].replace("Z", "+00:00")).timestamp()
+    except (KeyError, ValueError):
+        timestamp = 0.0
+    return ArchivedResponse(
+        api_key_of(request["url"]), request["method"].upper(), request["url"], response["status"],
+        content_type, _decode(text, content_type), timestamp, _decode(post_data, "json"),
+    )
+
+
+class TrafficArchive:
+    """
+    Respuestas de la API grabadas en una sesión real, para reproducirlas sin red.
+
+    Se lee de un HAR (el de TrafficRecorder o uno exportado por Playwright o las
+    devtools, del que sólo se toman los requests a API_ROOT) o de un JSON lines
+    compacto. Los requests repetidos a la misma URL se responden en el orden en
+    que se grabaron, repitiendo la última respuesta cuando se agotan (así un
+    polling ve la misma evolución que en la sesión original).
+    """
+
+    def __init__(self, entries: List[ArchivedResponse]):
+        self.entries = list(entries)
+        self._index: Dict[Tuple[str, str], List[ArchivedResponse]] = {}
+        self._cursor: Dict[Tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+        for entry in self.entries:
+            self._index.setdefault((entry.method, normalize_api_url(entry.url)), []).append(entry)
+
+    @classmethod
+    def load(cls, path: str) -> "TrafficArchive":
+        """
+        Lee un archivo .har o .jsonl.
+
+        Raises:
+            ValueError: Si el archivo no tiene un formato reconocido.
+        """
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+        if path.endswith(".har") or text.lstrip().startswith('{"log"'):
+            try:
+                items = json.loads(text)["log"]["entries"]
+            except (ValueError, KeyError, TypeError) as e:
+                raise ValueError(f"HAR no válido: {path}: {e}")
+            entries = [_from_har_entry(item) for item in items if item["request"]["url"].startswith(API_ROOT)]
+        else:
+            try:
+                entries = [ArchivedResponse(**json.loads(line)) for line in text.splitlines() if line.strip()]
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Archivo JSON lines no válido: {path}: {e}")
+        logger.info("Archivo de tráfico %s cargado: %d respuestas.", path, len(entries))
+        return cls(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def next_response(self, method: str, url: str) -> Optional[ArchivedResponse]:
+        """
+        Siguiente respuesta grabada para un request.
+
+        Args:
+            method: Método HTTP.
+            url: URL del request (se normaliza como en ResponseCache).
+
+        Returns:
+            Optional[ArchivedResponse]: La respuesta, o None si el request no se grabó.
+        """
+        key = (method.upper(), normalize_api_url(url))
+        responses = self._index.get(key)
+        if not responses:
+            return None
+        with self._lock:
+            position = self._cursor.get(key, 0)
+            self._cursor[key] = position + 1
+        return responses[min(position, len(responses) - 1)]
+
+    def rewind(self) -> None:
+        """Vuelve a reproducir el archivo desde la primera respuesta de cada URL."""
+        with self._lock:
+            self._cursor.clear()
+
+    def keys(self) -> Dict[str, int]:
+        """Cantidad de respuestas grabadas por clave de API_URLS."""
+        counts: Dict[str, int] = {}
+        for entry in self.entries:
+            counts[entry.key or "other"] = counts.get(entry.key or "other", 0) + 1
+        return counts
+
+
+class TrafficRecorder:
+    """
+    Graba el tráfico a la API de una sesión real (request, estado y cuerpo de la
+    respuesta, con su clave de API_URLS) para reproducirlo con ReplayRouter.
+
+    Con una ruta .har escribe un HAR 1.2 al cerrar; con cualquier otra ruta agrega
+    una línea JSON por respuesta apenas llega. No se guardan los headers de los
+    requests (llevan el token de sesión) y en los cuerpos de los endpoints auth_*
+    (login y refresh) el email, la contraseña y los tokens quedan enmascarados.
+    Igual el archivo se deja legible sólo por el usuario actual.
+    """
+
+    def __init__(self, path: str):
+        """
+        Args:
+            path: Ruta del archivo (.har, o .jsonl para el formato compacto).
+        """
+        self.path = path
+        self.har = path.endswith(".har")
+        self.recorded = 0
+        self._entries: List[ArchivedResponse] = []
+        self._lock = threading.Lock()
+        self._file = None if self.har else open(path, "a", encoding="utf-8")
+        if self._file is not None:
+            os.chmod(path, 0o600)
+
+    @staticmethod
+    def wants(response) -> bool:
+        """True si la respuesta es de la API y hay que grabarla."""
+        return response.url.startswith(API_ROOT) and response.request.method != "OPTIONS"
+
+    def observe(self, response) -> None:
+        """
+        Observador de respuestas del ResponseDispatcher (navegador sincrónico).
+
+        Args:
+            response: Objeto Response de Playwright.
+        """
+        if not self.wants(response):
+            return
+        try:
+            text = response.text()
+        except Exception as e:
+            logger.debug("No se pudo leer el cuerpo de %s: %s", response.url, e)
+            text = None
+        self.record(response, text)
+
+    async def observe_async(self, response) -> None:
+        """Versión de observe para el navegador asíncrono (context.on('response'))."""
+        if not self.wants(response):
+            return
+        try:
+            text = await response.text()
+        except Exception as e:
+            logger.debug("No se pudo leer el cuerpo de %s: %s", response.url, e)
+            text = None
+        self.record(response, text)
+
+    def record(self, response, text: Optional[str]) -> ArchivedResponse:
+        """Agrega una respuesta (con su cuerpo ya leído) al archivo."""
+        content_type = response.headers.get("content-type", "")
+        request = response.request
+        key = api_key_of(response.url)
+        body, request_body = _decode(text, content_type), _decode(request.post_data, "json")
+        if key and key.startswith("auth_"):
+            body, request_body = _redact_body(body), _redact_body(request_body)
+        entry = ArchivedResponse(
+            key, request.method.upper(), response.url, response.status,
+            content_type, body, time.time(), request_body,
+        )
+        with self._lock:
+            self.recorded += 1
+            if self._file is not None:
+                self._file.write(json.dumps(entry.to_dict(), default=str) + "\n")
+                self._file.flush()
+            else:
+                self._entries.append(entry)
+        return entry
+
+    def close(self) -> None:
+        """Cierra el archivo (escribe el HAR, en ese formato)."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            elif self.har and self._entries is not None:
+                har = {"log": {"version": HAR_VERSION, "creator": {"name": "CocosBot", "version": "0.1.0"},
+                               "entries": [_har_entry(entry) for entry in self._entries]}}
+                with open(self.path, "w", encoding="utf-8") as f:
+                    json.dump(har, f, default=str)
+                os.chmod(self.path, 0o600)
+                self._entries = None
+        logger.info("Tráfico grabado en %s: %d respuestas.", self.path, self.recorded)
+
+
+class ReplayRouter:
+    """
+    Responde los requests a la API con las respuestas de un TrafficArchive vía
+    page.route, sin salir a la red.
+
+    Los requests que no están en el archivo reciben un 404 (o, con
+    passthrough=True, siguen a la red).
+    """
+
+    def __init__(self, archive: TrafficArchive, passthrough: bool = False):
+        """
+        Args:
+            archive: Respuestas grabadas.
+            passthrough: Si True, los requests no grabados salen a la red.
+        """
+        self.archive = archive
+        self.passthrough = passthrough
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def matches(url: str) -> bool:
+        return url.startswith(API_ROOT)
+
+    def install(self, page) -> None:
+        """
+        Registra el handler en la página o contexto (sincrónico).
+
+        Args:
+            page: Página o BrowserContext de Playwright.
+        """
+        page.route(self.matches, self._handle_route)
+        logger.info("Replay de la API instalado (%d respuestas grabadas).", len(self.archive))
+
+    async def install_async(self, page) -> None:
+        """Versión de install para el navegador asíncrono."""
+        await page.route(self.matches, self._handle_route_async)
+        logger.info("Replay de la API instalado (%d respuestas grabadas).", len(self.archive))
+
+    def lookup(self, url: str, method: str = "GET") -> Optional[ArchivedResponse]:
+        """Siguiente respuesta grabada para un request, contando aciertos y fallos."""
+        entry = self.archive.next_response(method, url)
+        if entry is None:
+            self.misses += 1
+            logger.warning("Request sin respuesta grabada: %s %s", method, url)
+        else:
+            self.hits += 1
+        return entry
+
+    def fulfillment(self, request) -> Optional[Dict[str, Any]]:
+        """
+        Argumentos de route.fulfill para un request, o None si debe seguir a la red.
+
+        Args:
+            request: Objeto Request de Playwright.
+        """
+        entry = self.lookup(request.url, request.method)
+        if entry is None:
+            if self.passthrough:
+                return None
+            return {"status": MISSING_STATUS, "content_type": "application/json",
+                    "body": json.dumps({"error": "not_recorded", "url": request.url})}
+        body = entry.body if isinstance(entry.body, str) or entry.body is None else json.dumps(entry.body)
+        return {"status": entry.status, "content_type": entry.content_type or "application/json",
+                "body": body or ""}
+
+    def _handle_route(self, route) -> None:
+        fulfillment = self.fulfillment(route.request)
+        if fulfillment is None:
+            route.continue_()
+        else:
+            route.fulfill(**fulfillment)
+
+    async def _handle_route_async(self, route) -> None:
+        fulfillment = self.fulfillment(route.request)
+        if fulfillment is None:
+            await route.continue_()
+        else:
+            await route.fulfill(**fulfillment)
+
+    def stats(self) -> Dict[str, Any]:
+        """Respuestas grabadas, aciertos y fallos del replay."""
+        return {"recorded": len(self.archive), "hits": self.hits, "misses": self.misses}
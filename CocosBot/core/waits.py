@@ -0,0 +1,338 @@
+import re
+import time
+from typing import Any, Callable, Dict, Optional
+from CocosBot.config.general import DEFAULT_TIMEOUT, WAIT_POLL_INTERVAL
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Esperas fijas que reemplaza este módulo (segundos), usadas como referencia
+# para calcular el tiempo ahorrado en el reporte.
+LEGACY_SLEEPS = {
+    "limit_order": 3.0,
+    "order_confirmation": 4.0,
+    "typing_per_char": 0.4,
+    "two_factor_mail": 20.0,
+}
+
+# El elemento existe, está visible, habilitado y es el que recibe el clic en su centro
+# (no lo tapa una animación ni un overlay).
+_ENABLED_JS = """
+selector => {
+    const el = document.querySelector(selector);
+    if (!el || el.disabled || el.getAttribute('aria-disabled') === 'true') return false;
+    const rect = el.getBoundingClientRect();
+    if (!rect.width || !rect.height) return false;
+    const top = document.elementFromPoint(rect.x + rect.width / 2, rect.y + rect.height / 2);
+    return !!top && (el === top || el.contains(top));
+}
+"""
+
+# Los dígitos del valor del input coinciden con los esperados (ignora el formato
+# de miles que la web app aplica mientras se escribe).
+_VALUE_JS = """
+([selector, digits]) => {
+    const el = document.querySelector(selector);
+    return !!el && el.value.replace(/\\D/g, '') === digits;
+}
+"""
+
+# El contenido del elemento cambió respecto del texto inicial.
+_MUTATION_JS = """
+([selector, initial]) => {
+    const el = document.querySelector(selector);
+    return !!el && el.innerText !== initial;
+}
+"""
+
+
+def _playwright_timeout() -> type:
+    """
+    TimeoutError de Playwright (la misma clase en la API sincrónica y la asíncrona).
+
+    Se importa recién cuando hay que traducir un error, para que importar
+    CocosBot no cargue Playwright.
+    """
+    from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+    return PlaywrightTimeoutError
+
+
+def digits_of(value: str) -> str:
+    """Devuelve sólo los dígitos de un valor (p. ej. '1.234,5' -> '12345')."""
+    return re.sub(r"\D", "", value)
+
+
+class WaitReport:
+    """
+    Acumula el tiempo esperado por flujo y lo compara con la espera fija que
+    reemplaza, para mostrar los segundos ahorrados.
+    """
+
+    def __init__(self):
+        self._flows: Dict[str, Dict[str, float]] = {}
+
+    def record(self, flow: str, waited: float, baseline: float = 0.0) -> None:
+        """
+        Registra una espera.
+
+        Args:
+            flow: Nombre del flujo (p. ej. "limit_order").
+            waited: Segundos esperados realmente.
+            baseline: Segundos que esperaba la versión con sleep fijo.
+        """
+        entry = self._flows.setdefault(flow, {"calls": 0, "waited_s": 0.0, "baseline_s": 0.0})
+        entry["calls"] += 1
+        entry["waited_s"] += waited
+        entry["baseline_s"] += baseline
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        Devuelve el reporte por flujo.
+
+        Returns:
+            Dict[str, Dict[str, float]]: llamadas, segundos esperados, segundos de la
+            espera fija y segundos ahorrados por flujo.
+        """
+        return {
+            flow: {**entry, "saved_s": entry["baseline_s"] - entry["waited_s"]}
+            for flow, entry in self._flows.items()
+        }
+
+    def total_saved(self) -> float:
+        """Segundos ahorrados sumando todos los flujos."""
+        return sum(entry["saved_s"] for entry in self.summary().values())
+
+    def reset(self) -> None:
+        """Descarta lo acumulado."""
+        self._flows.clear()
+
+
+# Reporte compartido por defecto
+timing_report = WaitReport()
+
+
+def wait_until(predicate: Callable[[], Any], timeout: int = DEFAULT_TIMEOUT,
+               interval: int = WAIT_POLL_INTERVAL, flow: Optional[str] = None,
+               baseline: float = 0.0, report: Optional[WaitReport] = None) -> Any:
+    """
+    Espera fuera del navegador (p. ej. un cambio en la casilla de correo)
+    evaluando predicate hasta que devuelva un valor verdadero.
+
+    Args:
+        predicate: Función sin argumentos; su primer resultado verdadero se devuelve.
+        timeout: Tiempo máximo en ms.
+        interval: Intervalo entre evaluaciones en ms.
+        flow: Nombre del flujo para el reporte de tiempos.
+        baseline: Espera fija que reemplaza, en segundos.
+        report: Reporte donde registrar (por defecto, timing_report).
+
+    Returns:
+        El resultado verdadero de predicate.
+
+    Raises:
+        TimeoutError: Si la condición no se cumple a tiempo.
+    """
+    start = time.monotonic()
+    deadline = start + timeout / 1000
+    try:
+        while True:
+            result = predicate()
+            if result:
+                return result
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError(f"La condición no se cumplió en {timeout} ms")
+            time.sleep(min(interval / 1000, remaining))
+    finally:
+        if flow:
+            (report or timing_report).record(flow, time.monotonic() - start, baseline)
+
+
+class _ResponseWait:
+    """Context manager de WaitEngine.response: registra la espera al entrar y espera al salir."""
+
+    def __init__(self, engine, pattern, timeout, flow, baseline):
+        self.engine = engine
+        self.pattern = pattern
+        self.timeout = timeout
+        self.flow = flow
+        self.baseline = baseline
+        self.response = None
+
+    def __enter__(self):
+        self._waiter = self.engine.dispatcher.expect(self.pattern)
+        self._start = time.monotonic()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        try:
+            if exc_type is None:
+                self.response = self._waiter.wait(self.timeout)
+        finally:
+            self.engine.dispatcher.discard(self._waiter)
+            self.engine._record(self.flow, self._start, self.baseline)
+        return False
+
+
+class WaitEngine:
+    """
+    Esperas sobre señales concretas de la página en lugar de sleeps fijos:
+    elemento habilitado, valor de un input, mutación del DOM y respuesta de un XHR.
+
+    Todas las esperas lanzan TimeoutError si la señal no llega a tiempo y, si se
+    indica flow, registran el tiempo esperado en el reporte.
+    """
+
+    def __init__(self, page, dispatcher=None, report: Optional[WaitReport] = None):
+        """
+        Args:
+            page: Página de Playwright.
+            dispatcher: ResponseDispatcher de la página (necesario para response()).
+            report: Reporte de tiempos (por defecto, timing_report).
+        """
+        self.page = page
+        self.dispatcher = dispatcher
+        self.report = report or timing_report
+
+    def element_enabled(self, selector: str, timeout: int = DEFAULT_TIMEOUT,
+                        flow: Optional[str] = None, baseline: float = 0.0) -> None:
+        """
+        Espera a que un elemento esté visible, habilitado y sin nada encima.
+
+        Args:
+            selector: Selector CSS del elemento.
+            timeout: Tiempo máximo en ms.
+            flow: Nombre del flujo para el reporte de tiempos.
+            baseline: Espera fija que reemplaza, en segundos.
+        """
+        self._wait_for_function(_ENABLED_JS, selector, timeout, flow, baseline, "raf")
+
+    def input_value(self, selector: str, value: str, timeout: int = DEFAULT_TIMEOUT,
+                    flow: Optional[str] = None, baseline: float = 0.0) -> None:
+        """
+        Espera a que un input contenga los dígitos de value.
+
+        Args:
+            selector: Selector CSS del input.
+            value: Valor esperado (se comparan sólo los dígitos).
+            timeout: Tiempo máximo en ms.
+            flow: Nombre del flujo para el reporte de tiempos.
+            baseline: Espera fija que reemplaza, en segundos.
+        """
+        self._wait_for_function(_VALUE_JS, [selector, digits_of(value)], timeout, flow, baseline, "raf")
+
+    def dom_mutation(self, selector: str, initial_text: str, timeout: int = DEFAULT_TIMEOUT,
+                     flow: Optional[str] = None, baseline: float = 0.0) -> None:
+        """
+        Espera a que el texto de un elemento cambie respecto de initial_text.
+
+        Se evalúa en cada mutación del DOM, sin polling por tiempo.
+
+        Args:
+            selector: Selector CSS del elemento.
+            initial_text: Texto antes de la acción.
+            timeout: Tiempo máximo en ms.
+            flow: Nombre del flujo para el reporte de tiempos.
+            baseline: Espera fija que reemplaza, en segundos.
+        """
+        self._wait_for_function(_MUTATION_JS, [selector, initial_text], timeout, flow, baseline, "mutation")
+
+    def response(self, pattern: str, timeout: int = DEFAULT_TIMEOUT,
+                 flow: Optional[str] = None, baseline: float = 0.0) -> _ResponseWait:
+        """
+        Espera la respuesta de un XHR disparado dentro del bloque 'with'.
+
+        Example:
+            with browser.waits.response(API_URLS["orders"]) as wait:
+                browser.click_element(confirm_selector)
+            wait.response.status
+
+        Args:
+            pattern: URL (o fragmento) del request.
+            timeout: Tiempo máximo en ms.
+            flow: Nombre del flujo para el reporte de tiempos.
+            baseline: Espera fija que reemplaza, en segundos.
+        """
+        return _ResponseWait(self, pattern, timeout, flow, baseline)
+
+    def _wait_for_function(self, expression, arg, timeout, flow, baseline, polling) -> None:
+        """Ejecuta page.wait_for_function traduciendo el timeout de Playwright a TimeoutError."""
+        start = time.monotonic()
+        try:
+            self.page.wait_for_function(expression, arg=arg, timeout=timeout, polling=polling)
+        except _playwright_timeout() as e:
+            raise TimeoutError(str(e)) from e
+        finally:
+            self._record(flow, start, baseline)
+
+    def _record(self, flow, start, baseline) -> None:
+        """Registra el tiempo transcurrido desde start si hay flujo."""
+        if flow:
+            elapsed = time.monotonic() - start
+            self.report.record(flow, elapsed, baseline)
+            logger.debug("Espera '%s': %.2f s (antes %.2f s)", flow, elapsed, baseline)
+
+
+class _AsyncResponseWait:
+    """Context manager asíncrono de AsyncWaitEngine.response."""
+
+    def __init__(self, engine, pattern, timeout, flow, baseline):
+        self.engine = engine
+        self.pattern = pattern
+        self.timeout = timeout
+        self.flow = flow
+        self.baseline = baseline
+        self.response = None
+
+    async def __aenter__(self):
+        self._expectation = self.engine.page.expect_response(self.pattern, timeout=self.timeout)
+        self._info = await self._expectation.__aenter__()
+        self._start = time.monotonic()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        try:
+            await self._expectation.__aexit__(exc_type, exc_val, exc_tb)
+            if exc_type is None:
+                self.response = await self._info.value
+        except _playwright_timeout() as e:
+            raise TimeoutError(str(e)) from e
+        finally:
+            self.engine._record(self.flow, self._start, self.baseline)
+        return False
+
+
+class AsyncWaitEngine(WaitEngine):
+    """Versión de WaitEngine para playwright.async_api; response() usa 'async with'."""
+
+    def __init__(self, page, report: Optional[WaitReport] = None):
+        super().__init__(page, report=report)
+
+    async def element_enabled(self, selector: str, timeout: int = DEFAULT_TIMEOUT,
+                              flow: Optional[str] = None, baseline: float = 0.0) -> None:
+        """Ver WaitEngine.element_enabled."""
+        await self._wait_for_function(_ENABLED_JS, selector, timeout, flow, baseline, "raf")
+
+    async def input_value(self, selector: str, value: str, timeout: int = DEFAULT_TIMEOUT,
+                          flow: Optional[str] = None, baseline: float = 0.0) -> None:
+        """Ver WaitEngine.input_value."""
+        await self._wait_for_function(_VALUE_JS, [selector, digits_of(value)], timeout, flow, baseline, "raf")
+
+    async def dom_mutation(self, selector: str, initial_text: str, timeout: int = DEFAULT_TIMEOUT,
+                           flow: Optional[str] = None, baseline: float = 0.0) -> None:
+        """Ver WaitEngine.dom_mutation."""
+        await self._wait_for_function(_MUTATION_JS, [selector, initial_text], timeout, flow, baseline, "mutation")
+
+    def response(self, pattern: str, timeout: int = DEFAULT_TIMEOUT,
+                 flow: Optional[str] = None, baseline: float = 0.0) -> _AsyncResponseWait:
+        """Ver WaitEngine.response; se usa con 'async with'."""
+        return _AsyncResponseWait(self, pattern, timeout, flow, baseline)
+
+    async def _wait_for_function(self, expression, arg, timeout, flow, baseline, polling) -> None:
+        start = time.monotonic()
+        try:
+            await self.page.wait_for_function(expression, arg=arg, timeout=timeout, polling=polling)
+        except _playwright_timeout() as e:
+            raise TimeoutError(str(e)) from e
+        finally:
+            self._record(flow, start, baseline)
@@ -0,0 +1,206 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional
+from CocosBot.utils.gmail_2fa import obtener_codigo_2FA, TwoFactorMailWatcher
+from CocosBot.config.urls import WEB_APP_URLS, API_URLS
+from CocosBot.config.selectors import LOGIN_SELECTORS
+from CocosBot.config.general import DEFAULT_TIMEOUT, TWO_FACTOR_SENDER, MAIL_WATCHER_TIMEOUT
+from CocosBot.services.auth import AuthService, AuthenticationError, TwoFactorError
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class AsyncAuthService:
+    """Versión asíncrona de AuthService para AsyncPlaywrightBrowser."""
+
+    def __init__(self, browser):
+        """
+        Inicializa el servicio de autenticación.
+
+        Args:
+            browser: Instancia de AsyncPlaywrightBrowser
+        """
+        self.browser = browser
+        self._mail_watcher: Optional[TwoFactorMailWatcher] = None
+        self.login_timings: Dict[str, float] = {}
+        self._stage_start = 0.0
+
+    _start_mail_watcher = AuthService._start_mail_watcher
+    _discard_mail_watcher = AuthService._discard_mail_watcher
+    _start_timings = AuthService._start_timings
+    _mark = AuthService._mark
+    _finish_timings = AuthService._finish_timings
+
+    async def login(self, username: str, password: str, gmail_user: str, gmail_app_pass: str) -> bool:
+        """
+        Realiza el login en Cocos Capital.
+
+        La conexión IMAP se prepara en un hilo mientras carga la página y se
+        completan las credenciales; la duración de cada etapa queda en login_timings.
+
+        Args:
+            username: Email del usuario
+            password: Contraseña del usuario
+            gmail_user: Usuario de Gmail para 2FA
+            gmail_app_pass: Contraseña de aplicación de Gmail para 2FA
+
+        Returns:
+            bool: True si el login fue exitoso
+
+        Raises:
+            AuthenticationError: Si hay un error durante el proceso de login
+        """
+        self._start_timings()
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cocos-imap")
+        watcher_future = pool.submit(self._start_mail_watcher, gmail_user, gmail_app_pass)
+        pool.shutdown(wait=False)
+        watcher_task = asyncio.wrap_future(watcher_future)
+        succeeded = False
+        try:
+            await self.browser.go_to(WEB_APP_URLS["login"])
+            self._mark("navigation")
+            await self.browser.fill_input(LOGIN_SELECTORS["email_input"], username, "Llenando el email...")
+            await self.browser.fill_input(LOGIN_SELECTORS["password_input"], password, "Llenando la contraseña...")
+            self._mark("credentials")
+            watcher = await self._wait_mail_watcher(watcher_task)
+            self._mark("imap_ready")
+            submitted_at = time.time()
+            await self.browser.click_element(LOGIN_SELECTORS["submit_button"], "Enviando formulario de login...")
+
+            try:
+                await self._handle_two_factor_authentication(gmail_user, gmail_app_pass, watcher, submitted_at)
+            except Exception:
+                await self.browser.take_screenshot("debug_login_failure.png")
+                raise
+
+            await self._handle_save_device_prompt()
+            self._mark("save_device")
+            await self.browser.capture_api_session()
+            self._mark("session_capture")
+
+            logger.info("Login exitoso.")
+            succeeded = True
+            return True
+
+        except Exception as e:
+            logger.error("Error durante el proceso de login: %s", e)
+            raise AuthenticationError(f"Error en el proceso de login: {str(e)}")
+        finally:
+            if not succeeded:
+                # Ver AuthService.login; el callback corre en el hilo IMAP, no en el event loop
+                watcher_future.add_done_callback(self._discard_mail_watcher)
+            self._finish_timings()
+
+    async def _wait_mail_watcher(self, task) -> Optional[TwoFactorMailWatcher]:
+        """Ver AuthService._wait_mail_watcher; el hilo sigue corriendo si vence el plazo."""
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), MAIL_WATCHER_TIMEOUT / 1000)
+        except asyncio.TimeoutError:
+            logger.warning("La conexión IMAP no estuvo lista a tiempo; se busca el código sin watcher.")
+            return None
+
+    async def _handle_two_factor_authentication(self, gmail_user: str, gmail_app_pass: str,
+                                                watcher: Optional[TwoFactorMailWatcher] = None,
+                                                submitted_at: Optional[float] = None) -> None:
+        """
+        Maneja la autenticación de dos factores. La lectura del mail corre en un
+        hilo aparte para no bloquear el event loop.
+
+        Raises:
+            TwoFactorError: Si hay un error con el código 2FA
+        """
+        await self.browser.wait_for_element(
+            LOGIN_SELECTORS["two_factor_container"],
+            log_message="Esperando pantalla de autenticación de dos factores.",
+            timeout=DEFAULT_TIMEOUT
+        )
+        self._mark("two_factor_screen")
+
+        if watcher is not None:
+            code = await asyncio.to_thread(obtener_codigo_2FA, gmail_user, gmail_app_pass, TWO_FACTOR_SENDER,
+                                           watcher=watcher)
+        else:
+            code = await asyncio.to_thread(obtener_codigo_2FA, gmail_user, gmail_app_pass, TWO_FACTOR_SENDER,
+                                           submitted_at=submitted_at)
+        if not code or len(code) != 6:
+            logger.error("No se pudo obtener un código 2FA válido.")
+            raise TwoFactorError("No se pudo obtener un código 2FA válido.")
+        self._mark("two_factor_mail")
+
+        try:
+            await self.browser.type_code(
+                LOGIN_SELECTORS["two_factor_container"],
+                code,
+                LOGIN_SELECTORS["two_factor_digit"].format(index=len(code) - 1),
+                "Ingresando el código 2FA..."
+            )
+        except TimeoutError:
+            logger.warning("Las casillas no reflejaron el código 2FA, ingresándolo dígito por dígito.")
+            for i, digit in enumerate(code):
+                await self.browser.fill_input(
+                    LOGIN_SELECTORS["two_factor_digit"].format(index=i),
+                    digit,
+                    f"Ingresando dígito {i + 1} del código 2FA..."
+                )
+
+        self._mark("code_entry")
+        logger.info("Código 2FA ingresado automáticamente.")
+
+    async def _handle_save_device_prompt(self) -> None:
+        """Maneja la pantalla de guardar el dispositivo como seguro."""
+        try:
+            await self.browser.click_element(
+                LOGIN_SELECTORS["save_device_button"],
+                log_message="Guardando dispositivo como seguro...",
+                timeout=5000
+            )
+        except Exception:
+            logger.warning("No apareció la pantalla de guardar dispositivo.")
+
+    async def is_session_valid(self, timeout: int = 5000) -> bool:
+        """
+        Verifica si la sesión actual sigue autenticada consultando API_URLS["user_data"].
+
+        Returns:
+            bool: True si la API devolvió los datos del usuario.
+        """
+        user_data = await self.browser.fetch_data(
+            API_URLS["user_data"],
+            WEB_APP_URLS["dashboard"],
+            timeout=timeout
+        )
+        return user_data is not None
+
+    def session_expires_in(self) -> Optional[float]:
+        """Ver AuthService.session_expires_in."""
+        return self.browser.tokens.seconds_left()
+
+    async def refresh_session(self) -> bool:
+        """Ver AuthService.refresh_session; el request corre en un hilo aparte."""
+        return await asyncio.to_thread(self.browser.tokens.refresh)
+
+    async def save_session(self, path: str) -> None:
+        """Guarda la sesión actual para reutilizarla en próximas ejecuciones."""
+        await self.browser.save_storage_state(path)
+
+    async def logout(self) -> bool:
+        """
+        Realiza el logout de Cocos Capital.
+
+        Returns:
+            bool: True si el logout fue exitoso
+        """
+        try:
+            await self.browser.go_to(WEB_APP_URLS["dashboard"])
+            await self.browser.click_element(LOGIN_SELECTORS["logout_button"], "Haciendo clic en el botón de logout...")
+            await self.browser.wait_for_element(LOGIN_SELECTORS["email_input"], log_message="Confirmando logout exitoso...")
+            if self._mail_watcher is not None:
+                await asyncio.to_thread(self._mail_watcher.close)
+                self._mail_watcher = None
+            logger.info("Logout realizado con éxito.")
+            return True
+        except Exception as e:
+            logger.error("Error durante el proceso de logout: %s", e)
+            return False
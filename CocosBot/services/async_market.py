@@ -0,0 +1,330 @@
+import asyncio
+import time
+from typing import Optional, Dict, Any, Iterable, List, Union
+from CocosBot.config.urls import WEB_APP_URLS, API_URLS
+from CocosBot.config.enums import OrderOperation, MarketType
+from CocosBot.config.selectors import (
+    OPERATION_SELECTORS,
+    COMMON_SELECTORS,
+    LIST_SELECTORS,
+    ORDER_SELECTORS
+)
+from CocosBot.core.market_snapshot import MarketSnapshot
+from CocosBot.core.order_watcher import AsyncOrderWatcher, open_orders
+from CocosBot.core.quote_stream import AsyncQuoteStream
+from CocosBot.core.instruments import DEFAULT_SEGMENT, item_ticker
+from CocosBot.core.tracing import span_of
+from CocosBot.core.waits import LEGACY_SLEEPS
+from CocosBot.services.market import CANCEL_REQUIRES_API, MarketService, OrderCreationError
+from CocosBot.utils.validators import validate_order_params
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class AsyncMarketService:
+    """Versión asíncrona de MarketService para AsyncPlaywrightBrowser."""
+
+    def __init__(self, browser):
+        self.browser = browser
+
+    _get_navigation_ticker_url = MarketService._get_navigation_ticker_url
+    _submit_order_api = MarketService._submit_order_api
+    _cancel_order_api = MarketService._cancel_order_api
+    _has_api_session = MarketService._has_api_session
+    _order_watch_options = MarketService._order_watch_options
+    _instrument_master = MarketService._instrument_master
+    _resolve_instrument = MarketService._resolve_instrument
+    instruments_request = MarketService.instruments_request
+    snapshot_request = MarketService.snapshot_request
+    _build_snapshot = MarketService._build_snapshot
+    lookup_instrument = MarketService.lookup_instrument
+    search_instruments = MarketService.search_instruments
+
+    async def submit_order(self, ticker: str, operation: Union[str, OrderOperation], amount: float,
+                           limit: Optional[float] = None, segment: str = "C") -> Dict[str, Any]:
+        """
+        Envía una orden por la API (en un hilo aparte) y usa la UI como alternativa.
+
+        Ver MarketService.submit_order.
+        """
+        operation_str = operation.value if isinstance(operation, OrderOperation) else operation
+        try:
+            operation_str, ticker = validate_order_params(ticker, operation_str, amount, limit)
+        except ValueError as e:
+            raise OrderCreationError(f"Error al crear la orden: {e}")
+
+        result = await asyncio.to_thread(self._submit_order_api, ticker, operation_str, amount, limit, segment)
+        if result is not None:
+            return result
+
+        start = time.perf_counter()
+        await self.create_order(ticker, operation_str, amount, limit)
+        return {"order_id": None, "latency_ms": (time.perf_counter() - start) * 1000, "via": "ui", "response": None}
+
+    async def create_order(self, ticker: str, operation: Union[str, OrderOperation], amount: float,
+                           limit: Optional[float] = None) -> bool:
+        """
+        Crea una orden de compra o venta para un ticker específico en la página principal.
+
+        Args:
+            ticker: Símbolo del ticker.
+            operation: Tipo de operación (BUY o SELL).
+            amount: Monto a invertir o cantidad de acciones.
+            limit: Precio límite para la orden (opcional).
+
+        Returns:
+            bool: True si la orden se creó exitosamente.
+
+        Raises:
+            OrderCreationError: Si hay un error al crear la orden.
+        """
+        try:
+            operation_str = operation.value if isinstance(operation, OrderOperation) else operation
+            operation_str, ticker = validate_order_params(ticker, operation_str, amount, limit)
+
+            formatted_amount = str(amount).replace('.', ',')
+            formatted_limit = str(limit).replace('.', ',') if limit is not None else None
+
+            await self.browser.go_to(WEB_APP_URLS["market_stocks"])
+            with span_of(self.browser, "select_ticker", ticker=ticker):
+                await self.browser.search_and_select(
+                    search_input_selector=COMMON_SELECTORS["search_input"],
+                    search_term=ticker,
+                    list_item_selector=LIST_SELECTORS["list_item"](ticker),
+                    log_message=f"Seleccionando el ticker '{ticker}' de la lista."
+                )
+            await self.browser.click_element(OPERATION_SELECTORS["general"]["expand_windows"], "Expandiendo pantalla.")
+
+            op_config = OPERATION_SELECTORS[operation_str]
+            await self.browser.click_element(op_config["button"], f"Seleccionando la operación: {op_config['message']}.")
+
+            if formatted_limit:
+                await self._configure_limit_order(formatted_limit)
+
+            await self.browser.click_element(op_config["amount_input"], "Seleccionando el campo de entrada para el monto o cantidad.")
+            await self.browser.fill_input(op_config["amount_input"], formatted_amount)
+
+            with span_of(self.browser, "confirm_operation"):
+                await self.confirm_operation()
+
+            logger.info("Orden de %s creada exitosamente para %s", operation_str, ticker)
+            return True
+
+        except Exception as e:
+            logger.error("Error creando la orden: %s", e)
+            raise OrderCreationError(f"Error al crear la orden: {str(e)}")
+
+    async def _configure_limit_order(self, limit: str) -> None:
+        """
+        Configura una orden límite con el precio especificado.
+
+        Args:
+            limit: Precio límite formateado (con coma decimal).
+        """
+        await self.browser.waits.element_enabled(
+            OPERATION_SELECTORS["general"]["more_options"],
+            flow="limit_order",
+            baseline=LEGACY_SLEEPS["limit_order"]
+        )
+        await self.browser.click_element(OPERATION_SELECTORS["general"]["more_options"], "Expandiendo opciones adicionales.")
+        await self.browser.click_element(OPERATION_SELECTORS["general"]["limit_button"], "Seleccionando orden límite.")
+        await self.browser.fill_input_with_delay(
+            OPERATION_SELECTORS["general"]["limit_input"],
+            limit,
+            f"Ingresando precio límite: {limit}"
+        )
+
+    async def confirm_operation(self) -> None:
+        """Confirma la operación haciendo clic en 'Revisar' y 'Confirmar'."""
+        try:
+            await self.browser.click_element(OPERATION_SELECTORS["confirm_buttons"]["review_buy"], "Haciendo clic en 'Revisar'.")
+            try:
+                async with self.browser.waits.response(
+                    API_URLS["orders"],
+                    flow="order_confirmation",
+                    baseline=LEGACY_SLEEPS["order_confirmation"]
+                ):
+                    await self.browser.click_element(OPERATION_SELECTORS["confirm_buttons"]["confirm"],
+                                                     "Haciendo clic en 'Confirmar'.")
+            except TimeoutError:
+                logger.warning("No se observó la respuesta del envío de la orden.")
+            logger.info("Operación confirmada exitosamente.")
+        except Exception as e:
+            logger.error("Error al confirmar la operación: %s", e)
+            raise OrderCreationError(f"Error al confirmar la operación: {e}")
+
+    async def get_ticker_info(self, ticker: str, ticker_type: Union[str, MarketType, None] = None,
+                              segment: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene la información de un ticker en una página aparte (del pool o
+        temporal), para poder consultar precios mientras la página principal opera.
+
+        Args:
+            ticker: Símbolo del ticker.
+            ticker_type: Tipo de mercado como cadena o instancia de MarketType. Si no
+                se indica, se toma del maestro de instrumentos.
+            segment: Segmento del mercado. Por defecto, el del maestro o "C".
+
+        Returns:
+            Optional[Dict[str, Any]]: Información del ticker, o None si falla.
+        """
+        ticker_type_enum, segment = self._resolve_instrument(ticker, ticker_type, segment)
+        navigation_url = self._get_navigation_ticker_url(ticker_type_enum)
+        if not navigation_url:
+            return None
+
+        request_url = f"{API_URLS['markets_tickers']}/{ticker}?segment={segment}"
+        try:
+            async with self.browser.page_slot() as page:
+                await page.goto(navigation_url)
+                await page.fill(COMMON_SELECTORS["search_input"], ticker)
+                async with page.expect_response(request_url) as response_info:
+                    await page.click(LIST_SELECTORS["list_item"](ticker))
+                response = await response_info.value
+                return await self.browser.process_response(response, f"Información del ticker {ticker} obtenida con éxito.")
+        except Exception as e:
+            logger.error("Error al obtener información del ticker %s: %s", ticker, e)
+            return None
+
+    async def get_market_snapshot(self, market_type: Union[str, MarketType]) -> Optional[MarketSnapshot]:
+        """
+        Obtiene las cotizaciones de todo un mercado con una sola lectura.
+
+        Ver MarketService.get_market_snapshot.
+        """
+        request = self.snapshot_request(market_type)
+        return await self.browser.fetch_data(request.request_url, request.navigation_url, request.process_response)
+
+    async def stream_quotes(self, tickers: Iterable[str], market_type: Union[str, MarketType, None] = None,
+                            **kwargs) -> AsyncQuoteStream:
+        """
+        Abre un stream de cotizaciones en una página propia del contexto, para que la
+        página principal siga libre. Ver MarketService.stream_quotes.
+        """
+        tickers = [ticker.upper() for ticker in tickers]
+        if not tickers:
+            raise ValueError("stream_quotes necesita al menos un ticker.")
+        market, _ = self._resolve_instrument(tickers[0], market_type, DEFAULT_SEGMENT)
+        page = await self.browser.context.new_page()
+        stream = AsyncQuoteStream(page, tickers, close_page=True, **kwargs)
+        stream.start()
+        try:
+            await page.goto(self._get_navigation_ticker_url(market))
+        except Exception:
+            await stream.stop()
+            raise
+        return stream
+
+    async def refresh_instruments(self, force: bool = False) -> List[str]:
+        """
+        Actualiza el maestro de instrumentos con las listas de los mercados
+        desactualizados, leídas en paralelo. Ver MarketService.refresh_instruments.
+        """
+        master = self._instrument_master() or self.browser.enable_instrument_master()
+        markets = list(MarketType) if force else master.stale_markets()
+        requests = [self.instruments_request(market) for market in markets]
+        results = await asyncio.gather(*(
+            self.browser.fetch_data(request.request_url, request.navigation_url) for request in requests
+        ))
+        refreshed = []
+        for market, data in zip(markets, results):
+            if data is None:
+                logger.warning("No se pudo actualizar la lista de %s.", market.value)
+                continue
+            master.update(market, data, refreshed=True)
+            refreshed.append(market.value)
+        return refreshed
+
+    async def get_market_schedule(self) -> Optional[Dict[str, Any]]:
+        """Obtiene los horarios de apertura y cierre del mercado."""
+        return await self.browser.fetch_data(
+            request_url=API_URLS["markets_schedule"],
+            navigation_url=WEB_APP_URLS["dashboard"]
+        )
+
+    async def get_orders(self) -> Optional[Dict[str, Any]]:
+        """Obtiene todas las órdenes del usuario (pendientes y ejecutadas)."""
+        orders = await self.browser.fetch_data(
+            request_url=API_URLS["orders"],
+            navigation_url=WEB_APP_URLS["orders"]
+        )
+        if orders is None:
+            logger.info("No hay órdenes pendientes.")
+        return orders
+
+    async def watch_orders(self, **kwargs) -> AsyncOrderWatcher:
+        """
+        Empieza a seguir las órdenes del usuario. Ver MarketService.watch_orders.
+
+        Además de sus propias lecturas, el watcher observa las respuestas de
+        órdenes de todas las páginas del contexto.
+        """
+        watcher = AsyncOrderWatcher(
+            lambda: self.browser.fetch_data(request_url=API_URLS["orders"], navigation_url=WEB_APP_URLS["orders"]),
+            context=self.browser.context,
+            **self._order_watch_options(kwargs)
+        )
+        await watcher.start()
+        return watcher
+
+    async def cancel_order(self, order_id: Union[int, str, float, None] = None, quantity: Optional[int] = None,
+                           amount: Optional[float] = None) -> bool:
+        """
+        Cancela una orden por id vía API o, en la forma anterior, por monto y
+        cantidad desde la página de órdenes. Ver MarketService.cancel_order.
+        """
+        if quantity is not None:
+            return await self._cancel_order_ui(amount if amount is not None else order_id, quantity)
+        if order_id is None:
+            raise ValueError("cancel_order necesita el id de la orden (o monto y cantidad).")
+        return (await asyncio.to_thread(self._cancel_order_api, order_id))["cancelled"]
+
+    async def cancel_all(self, ticker: Optional[str] = None,
+                         side: Union[str, OrderOperation, None] = None) -> List[Dict[str, Any]]:
+        """
+        Cancela en paralelo, por API, todas las órdenes pendientes que coinciden.
+        Ver MarketService.cancel_all.
+        """
+        if not self._has_api_session():
+            raise RuntimeError(CANCEL_REQUIRES_API)
+        targets = open_orders(await self.get_orders(), ticker, side)
+        results = await asyncio.gather(*(
+            asyncio.to_thread(self._cancel_order_api, order_id) for order_id, _ in targets
+        ))
+        for result, (_, item) in zip(results, targets):
+            result["ticker"] = item_ticker(item)
+        return list(results)
+
+    async def _cancel_order_ui(self, amount: float, quantity: int) -> bool:
+        """
+        Cancela una orden buscándola por monto y cantidad en la página de órdenes.
+
+        Args:
+            amount (float): Monto de la orden a cancelar.
+            quantity (int): Cantidad de acciones de la orden a cancelar.
+
+        Returns:
+            bool: True si la orden fue cancelada exitosamente.
+        """
+        try:
+            await self.browser.go_to(WEB_APP_URLS["orders"])
+            formatted_amount = f"AR${str(amount).replace('.', ',')}"
+            order_selector = (
+                f"div._rowContainer_1m8d2_23:has(span:text-is('{formatted_amount}')) "
+                f":has(span:text-is('{quantity}'))"
+            )
+            await self.browser.click_element(order_selector, "Seleccionando la orden en la tabla.")
+            await self.browser.click_element(ORDER_SELECTORS["cancel_button"], "Clic en el botón 'Cancelar orden'.")
+            logger.info("Orden con monto %s y cantidad %s cancelada exitosamente.", amount, quantity)
+            return True
+        except Exception as e:
+            logger.error("Error al cancelar la orden: %s", e)
+            return False
+
+    async def get_mep_value(self) -> Optional[Dict[str, Any]]:
+        """Obtiene el valor actual del dólar MEP."""
+        return await self.browser.fetch_data(
+            API_URLS["mep_prices"],
+            WEB_APP_URLS["portfolio"]
+        )
@@ -0,0 +1,112 @@
+from typing import Optional, Dict, Any
+from CocosBot.config.urls import WEB_APP_URLS, API_URLS
+from CocosBot.config.enums import Currency
+from CocosBot.config.selectors import TRANSFER_SELECTORS
+
+import logging
+logger = logging.getLogger(__name__)
+
+
+class AsyncUserService:
+    """Versión asíncrona de UserService para AsyncPlaywrightBrowser."""
+
+    def __init__(self, browser):
+        """
+        Inicializa el servicio de usuario.
+
+        Args:
+            browser: Instancia de AsyncPlaywrightBrowser.
+        """
+        self.browser = browser
+
+    async def get_user_data(self) -> Optional[Dict[str, Any]]:
+        """Obtiene los datos básicos del usuario."""
+        return await self.browser.fetch_data(API_URLS["user_data"], WEB_APP_URLS["dashboard"])
+
+    async def get_account_tier(self) -> Optional[Dict[str, Any]]:
+        """Obtiene el nivel de cuenta (tier) del usuario."""
+        return await self.browser.fetch_data(
+            request_url=API_URLS["account_tier"],
+            navigation_url=WEB_APP_URLS["dashboard"]
+        )
+
+    async def navigate_withdraw_form(self, amount: float, currency: Currency = Currency.ARS) -> bool:
+        """
+        Navega al formulario de extracción y lo completa sin clickear el botón final.
+
+        Args:
+            amount: Monto a extraer
+            currency: Moneda seleccionada ("ARS" o "USD")
+
+        Returns:
+            bool: True si la navegación fue exitosa
+        """
+        try:
+            await self.browser.click_element(
+                TRANSFER_SELECTORS["withdraw_button"],
+                "Navegando al apartado de extraer desde el dashboard."
+            )
+            if currency == Currency.ARS:
+                await self.browser.click_element(TRANSFER_SELECTORS["currency_ars"], "Seleccionando moneda ARS.")
+            elif currency == Currency.USD:
+                await self.browser.click_element(TRANSFER_SELECTORS["currency_usd"], "Seleccionando moneda USD.")
+            else:
+                raise ValueError("Moneda no soportada. Use 'ARS' o 'USD'.")
+
+            await self.browser.fill_input(TRANSFER_SELECTORS["amount_input"], str(amount), f"Ingresando monto {amount}")
+            await self.browser.page.locator(TRANSFER_SELECTORS["amount_input"]).evaluate("el => el.blur()")
+            await self.browser.wait_for_element(
+                TRANSFER_SELECTORS["continue_button"],
+                "Esperando que el botón 'Continuar' habilitado sea visible dentro del contenedor 'Extraé dinero'."
+            )
+            return True
+
+        except Exception as e:
+            logger.error("Error navegando al formulario de extracción: %s", e)
+            return False
+
+    async def get_linked_accounts(self, amount: float = 5000, currency: Currency = Currency.ARS) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene las cuentas bancarias vinculadas disponibles para extracciones.
+
+        Args:
+            amount: Monto a extraer (default: 5000).
+            currency: Moneda seleccionada (default: Currency.ARS).
+
+        Returns:
+            Optional[Dict[str, Any]]: Información de cuentas vinculadas o None si falla.
+        """
+        try:
+            if not await self.navigate_withdraw_form(amount, currency):
+                return None
+
+            async with self.browser.page.expect_response(f'{API_URLS["user_accounts"]}{currency.value}') as response_info:
+                await self.browser.click_element('button:has-text("Continuar")', "Click en el botón 'Continuar'.")
+            response = await response_info.value
+            return await self.browser.process_response(response, "Cuentas disponibles obtenidas con éxito.")
+
+        except Exception as e:
+            logger.error("Error obteniendo cuentas vinculadas: %s", e)
+            return None
+
+    async def get_portfolio_data(self) -> Optional[Dict[str, Any]]:
+        """Obtiene los datos completos del portafolio del usuario."""
+        return await self.browser.fetch_data(
+            request_url=API_URLS["portfolio_data"],
+            navigation_url=WEB_APP_URLS["portfolio"]
+        )
+
+    async def get_portfolio_balance(self) -> Optional[float]:
+        """Obtiene el balance total del portafolio del usuario."""
+        return await self.browser.fetch_data(
+            API_URLS["portfolio_balance"],
+            WEB_APP_URLS["portfolio"],
+            lambda response: response.get('totalBalance')
+        )
+
+    async def get_academy_data(self) -> Optional[Dict[str, Any]]:
+        """Obtiene los datos de la sección de Academia (contenido educativo)."""
+        return await self.browser.fetch_data(
+            request_url=API_URLS["academy"],
+            navigation_url=WEB_APP_URLS["dashboard"]
+        )
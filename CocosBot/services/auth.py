@@ -1,7 +1,11 @@
-from CocosBot.utils.gmail_2fa import obtener_codigo_2FA
-from CocosBot.config.urls import WEB_APP_URLS
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, Optional
+from CocosBot.utils.gmail_2fa import obtener_codigo_2FA, TwoFactorMailWatcher
+from CocosBot.config.urls import WEB_APP_URLS, API_URLS
 from CocosBot.config.selectors import LOGIN_SELECTORS
-from CocosBot.config.general import DEFAULT_TIMEOUT
+from CocosBot.config.general import DEFAULT_TIMEOUT, TWO_FACTOR_SENDER, MAIL_WATCHER_TIMEOUT
+from CocosBot.core.log_setup import mask
 
 import logging
 logger = logging.getLogger(__name__)
@@ -18,11 +22,17 @@ class AuthService:
             browser: Instancia de PlaywrightBrowser
         """
         self.browser = browser
+        self._mail_watcher: Optional[TwoFactorMailWatcher] = None
+        self.login_timings: Dict[str, float] = {}
+        self._stage_start = 0.0
 
     def login(self, username: str, password: str, gmail_user: str, gmail_app_pass: str) -> bool:
         """
         Realiza el login en Cocos Capital.
 
+        La conexión IMAP se abre en un hilo aparte mientras carga la página y se
+        completan las credenciales; la duración de cada etapa queda en login_timings.
+
         Args:
             username: Email del usuario
             password: Contraseña del usuario
@@ -35,8 +45,14 @@ class AuthService:
         Raises:
             AuthenticationError: Si hay un error durante el proceso de login
         """
+        self._start_timings()
+        pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cocos-imap")
+        watcher_future = pool.submit(self._start_mail_watcher, gmail_user, gmail_app_pass)
+        pool.shutdown(wait=False)
+        succeeded = False
         try:
             self.browser.go_to(WEB_APP_URLS["login"])
+            self._mark("navigation")
             self.browser.fill_input(
                 LOGIN_SELECTORS["email_input"],
                 username,
@@ -45,35 +61,110 @@ class AuthService:
             self.browser.fill_input(
                 LOGIN_SELECTORS["password_input"],
                 password,
-                "Llenando la contraseña..."
+                "Llenando la contraseña...",
+                sensitive=True
             )
+            self._mark("credentials")
+            watcher = self._wait_mail_watcher(watcher_future)
+            self._mark("imap_ready")
+            submitted_at = time.time()
             self.browser.click_element(
                 LOGIN_SELECTORS["submit_button"],
                 "Enviando formulario de login..."
             )
 
             try:
-                self._handle_two_factor_authentication(gmail_user, gmail_app_pass)
+                self._handle_two_factor_authentication(gmail_user, gmail_app_pass, watcher, submitted_at)
             except Exception:
                 self.browser.take_screenshot("debug_login_failure.png")
                 raise
 
             self._handle_save_device_prompt()
+            self._mark("save_device")
+            self.browser.capture_api_session()
+            self._mark("session_capture")
 
             logger.info("Login exitoso.")
+            succeeded = True
             return True
 
         except Exception as e:
             logger.error("Error durante el proceso de login: %s", e)
             raise AuthenticationError(f"Error en el proceso de login: {str(e)}")
+        finally:
+            if not succeeded:
+                # No queda una sesión IMAP abierta por cada intento fallido; si el hilo
+                # todavía se está conectando, se cierra cuando termine.
+                watcher_future.add_done_callback(self._discard_mail_watcher)
+            self._finish_timings()
+
+    def _start_timings(self) -> None:
+        """Reinicia login_timings al comenzar un login."""
+        self.login_timings = {}
+        self._stage_start = time.monotonic()
+
+    def _mark(self, stage: str) -> None:
+        """Registra en login_timings los segundos transcurridos desde la etapa anterior."""
+        now = time.monotonic()
+        self.login_timings[stage] = now - self._stage_start
+        self._stage_start = now
+
+    def _finish_timings(self) -> None:
+        """Agrega el total a login_timings y lo registra en el log."""
+        self.login_timings["total"] = sum(self.login_timings.values())
+        logger.info("Tiempos del login (s): %s",
+                    ", ".join(f"{stage}={elapsed:.2f}" for stage, elapsed in self.login_timings.items()))
+
+    def _wait_mail_watcher(self, future) -> Optional[TwoFactorMailWatcher]:
+        """
+        Espera a que el hilo termine de preparar el watcher IMAP. Debe estar listo
+        antes de enviar el formulario para que el correo del código quede después
+        de la referencia de correos nuevos.
+
+        Returns:
+            Optional[TwoFactorMailWatcher]: El watcher, o None si no estuvo a tiempo.
+        """
+        try:
+            return future.result(timeout=MAIL_WATCHER_TIMEOUT / 1000)
+        except FutureTimeoutError:
+            logger.warning("La conexión IMAP no estuvo lista a tiempo; se busca el código sin watcher.")
+            return None
+
+    def _discard_mail_watcher(self, *_) -> None:
+        """Cierra la sesión IMAP del watcher, si hay una (se acepta el future como callback)."""
+        watcher, self._mail_watcher = self._mail_watcher, None
+        if watcher is not None:
+            watcher.close()
+
+    def _start_mail_watcher(self, gmail_user: str, gmail_app_pass: str) -> Optional[TwoFactorMailWatcher]:
+        """
+        Abre (o reutiliza) la sesión IMAP y fija la referencia de correos nuevos
+        antes de enviar el formulario, para recibir el código apenas llega.
+
+        Returns:
+            Optional[TwoFactorMailWatcher]: El watcher listo, o None si no se pudo
+            preparar (se usa la búsqueda completa de la casilla).
+        """
+        try:
+            if self._mail_watcher is None or self._mail_watcher.email_address != gmail_user:
+                self._mail_watcher = TwoFactorMailWatcher(gmail_user, gmail_app_pass, TWO_FACTOR_SENDER)
+            return self._mail_watcher.start()
+        except Exception as e:
+            logger.warning("No se pudo preparar la espera del correo 2FA: %s", e)
+            return None
 
-    def _handle_two_factor_authentication(self, gmail_user: str, gmail_app_pass: str) -> None:
+    def _handle_two_factor_authentication(self, gmail_user: str, gmail_app_pass: str,
+                                          watcher: Optional[TwoFactorMailWatcher] = None,
+                                          submitted_at: Optional[float] = None) -> None:
         """
         Maneja la autenticación de dos factores.
 
         Args:
             gmail_user: Usuario de Gmail
             gmail_app_pass: Contraseña de aplicación de Gmail
+            watcher: Watcher IMAP iniciado antes de enviar el login (opcional)
+            submitted_at: Momento (time.time()) del envío del login; sin watcher,
+                sólo se aceptan correos 2FA posteriores
 
         Raises:
             TwoFactorError: Si hay un error con el código 2FA
@@ -83,21 +174,37 @@ class AuthService:
             log_message="Esperando pantalla de autenticación de dos factores.",
             timeout=DEFAULT_TIMEOUT
         )
+        self._mark("two_factor_screen")
 
-        code = obtener_codigo_2FA(gmail_user, gmail_app_pass, 'no-reply@cocos.capital')
+        if watcher is not None:
+            code = obtener_codigo_2FA(gmail_user, gmail_app_pass, TWO_FACTOR_SENDER, watcher=watcher)
+        else:
+            code = obtener_codigo_2FA(gmail_user, gmail_app_pass, TWO_FACTOR_SENDER, submitted_at=submitted_at)
         if not code or len(code) != 6:
             logger.error("No se pudo obtener un código 2FA válido.")
             raise TwoFactorError("No se pudo obtener un código 2FA válido.")
 
-        logger.info("Código 2FA obtenido: %s", code)
+        logger.info("Código 2FA obtenido: %s", mask(code))
+        self._mark("two_factor_mail")
 
-        for i, digit in enumerate(code):
-            self.browser.fill_input(
-                f'input#input{i}',
-                digit,
-                f"Ingresando dígito {i + 1} del código 2FA..."
+        try:
+            self.browser.type_code(
+                LOGIN_SELECTORS["two_factor_container"],
+                code,
+                LOGIN_SELECTORS["two_factor_digit"].format(index=len(code) - 1),
+                "Ingresando el código 2FA..."
             )
+        except TimeoutError:
+            logger.warning("Las casillas no reflejaron el código 2FA, ingresándolo dígito por dígito.")
+            for i, digit in enumerate(code):
+                self.browser.fill_input(
+                    LOGIN_SELECTORS["two_factor_digit"].format(index=i),
+                    digit,
+                    f"Ingresando dígito {i + 1} del código 2FA...",
+                    sensitive=True
+                )
 
+        self._mark("code_entry")
         logger.info("Código 2FA ingresado automáticamente.")
 
     def _handle_save_device_prompt(self) -> None:
@@ -111,6 +218,62 @@ class AuthService:
         except Exception:
             logger.warning("No apareció la pantalla de guardar dispositivo.")
 
+    def is_session_valid(self, timeout: int = 5000) -> bool:
+        """
+        Verifica si la sesión actual sigue autenticada.
+
+        Hace una sola carga del dashboard y espera la respuesta de
+        API_URLS["user_data"]; si la sesión expiró la web app redirige al login
+        y la respuesta no llega.
+
+        Args:
+            timeout: Tiempo máximo de espera en ms.
+
+        Returns:
+            bool: True si la API devolvió los datos del usuario.
+        """
+        user_data = self.browser.fetch_data(
+            API_URLS["user_data"],
+            WEB_APP_URLS["dashboard"],
+            timeout=timeout
+        )
+        if user_data is None:
+            logger.info("La sesión guardada no es válida.")
+            return False
+        logger.info("Sesión guardada válida.")
+        return True
+
+    def session_expires_in(self) -> Optional[float]:
+        """
+        Segundos hasta que vence el access token de la sesión.
+
+        El token se toma de la respuesta de API_URLS["auth_token"] durante el login
+        (o de los refresh posteriores); en modo API directa se renueva solo antes
+        de vencer.
+
+        Returns:
+            Optional[float]: Segundos restantes, o None si todavía no se capturó el token.
+        """
+        return self.browser.tokens.seconds_left()
+
+    def refresh_session(self) -> bool:
+        """
+        Renueva ahora el access token con el refresh token, sin repetir el login.
+
+        Returns:
+            bool: True si se obtuvo un token nuevo (requiere modo API directa).
+        """
+        return self.browser.tokens.refresh()
+
+    def save_session(self, path: str) -> None:
+        """
+        Guarda la sesión actual para reutilizarla en próximas ejecuciones.
+
+        Args:
+            path: Ruta del archivo de sesión.
+        """
+        self.browser.save_storage_state(path)
+
     def logout(self) -> bool:
         """
         Realiza el logout de Cocos Capital.
@@ -129,11 +292,15 @@ class AuthService:
                 log_message="Confirmando logout exitoso..."
             )
 
+            if self._mail_watcher is not None:
+                self._mail_watcher.close()
+                self._mail_watcher = None
+
             logger.info("Logout realizado con éxito.")
             return True
 
         except Exception as e:
-            logger.error(f"Error durante el proceso de logout: {e}")
+            logger.error("Error durante el proceso de logout: %s", e)
             return False
 
 
@@ -1,18 +1,36 @@
+import contextvars
 import time
-from typing import Optional, Dict, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Dict, Any, Iterable, List, Tuple, Union
 from CocosBot.config.urls import WEB_APP_URLS, API_URLS
 from CocosBot.config.enums import OrderOperation, MarketType
+from CocosBot.config.general import CANCEL_CONCURRENCY, ORDER_WATCH_NAVIGATION_INTERVAL
 from CocosBot.config.selectors import (
     OPERATION_SELECTORS,
     COMMON_SELECTORS,
     LIST_SELECTORS,
     ORDER_SELECTORS
 )
+from CocosBot.core.api_client import ApiClientError
+from CocosBot.core.instruments import Instrument, InstrumentMaster, DEFAULT_SEGMENT, item_ticker
+from CocosBot.core.market_snapshot import MarketSnapshot
+from CocosBot.core.order_watcher import OrderWatcher, open_orders
+from CocosBot.core.quote_stream import QuoteStream
+from CocosBot.core.page_pool import FetchRequest
+from CocosBot.core.tracing import span_of
+from CocosBot.core.waits import LEGACY_SLEEPS
+from CocosBot.utils.data_transformations import build_order_payload, extract_order_id
 from CocosBot.utils.validators import validate_order_params, validate_market_type
 
 import logging
 logger = logging.getLogger(__name__)
 
+# Estados del POST de órdenes que garantizan que la orden no se creó y permiten
+# reintentar por la UI (sesión no aceptada o endpoint/método inexistente).
+API_ORDER_FALLBACK_STATUSES = (401, 403, 404, 405)
+
+CANCEL_REQUIRES_API = "Cancelar por id requiere direct_api=True y una sesión de API capturada."
+
 
 class MarketService:
     """Servicio para manejar operaciones de mercado en Cocos Capital."""
@@ -50,12 +68,13 @@ class MarketService:
             self.browser.go_to(WEB_APP_URLS["market_stocks"])
 
             # Buscar y seleccionar el ticker
-            self.browser.search_and_select(
-                search_input_selector=COMMON_SELECTORS["search_input"],
-                search_term=ticker,
-                list_item_selector=LIST_SELECTORS["list_item"](ticker),
-                log_message=f"Seleccionando el ticker '{ticker}' de la lista."
-            )
+            with span_of(self.browser, "select_ticker", ticker=ticker):
+                self.browser.search_and_select(
+                    search_input_selector=COMMON_SELECTORS["search_input"],
+                    search_term=ticker,
+                    list_item_selector=LIST_SELECTORS["list_item"](ticker),
+                    log_message=f"Seleccionando el ticker '{ticker}' de la lista."
+                )
 
             # Expandir pantalla
             self.browser.click_element(OPERATION_SELECTORS["general"]["expand_windows"], "Expandiendo pantalla.")
@@ -71,30 +90,74 @@ class MarketService:
             self._enter_amount(operation_str, formatted_amount)
 
             # Confirmar la operación
-            self.confirm_operation()
+            with span_of(self.browser, "confirm_operation"):
+                self.confirm_operation()
 
-            logger.info(f"Orden de {operation_str} creada exitosamente para {ticker}")
+            logger.info("Orden de %s creada exitosamente para %s", operation_str, ticker)
             return True
 
         except Exception as e:
-            logger.error(f"Error creando la orden: {str(e)}")
+            logger.error("Error creando la orden: %s", e)
             raise OrderCreationError(f"Error al crear la orden: {str(e)}")
 
-    def get_ticker_info(self, ticker: str, ticker_type: Union[str, MarketType], segment: str = "C") -> Optional[
-        Dict[str, Any]]:
+    def submit_order(self, ticker: str, operation: Union[str, OrderOperation], amount: float,
+                     limit: Optional[float] = None, segment: str = "C") -> Dict[str, Any]:
         """
-        Obtiene la información de un ticker.
+        Envía una orden directamente al endpoint de órdenes de la API, con la sesión
+        del navegador, y usa el flujo de la UI (create_order) como alternativa.
+
+        Sólo se recurre a la UI cuando es seguro que la API no creó la orden: no hay
+        sesión de API capturada o el POST respondió 401/403/404/405. Ante otros
+        errores (rechazo, error del servidor, conexión cortada) no se reintenta para
+        no duplicar la orden.
 
         Args:
             ticker: Símbolo del ticker.
-            ticker_type: Tipo de mercado como cadena o instancia de MarketType.
+            operation: Tipo de operación (BUY o SELL).
+            amount: Monto a invertir (compra) o cantidad de acciones (venta).
+            limit: Precio límite para la orden (opcional).
             segment: Segmento del mercado. Por defecto, "C".
 
+        Returns:
+            Dict[str, Any]: order_id (None si se usó la UI o la API no lo devolvió),
+            latency_ms del envío, via ("api" o "ui") y response con el cuerpo de la API.
+
+        Raises:
+            OrderCreationError: Si la orden no se pudo enviar.
+        """
+        operation_str = operation.value if isinstance(operation, OrderOperation) else operation
+        try:
+            operation_str, ticker = validate_order_params(ticker, operation_str, amount, limit)
+        except ValueError as e:
+            raise OrderCreationError(f"Error al crear la orden: {e}")
+
+        result = self._submit_order_api(ticker, operation_str, amount, limit, segment)
+        if result is not None:
+            return result
+
+        start = time.perf_counter()
+        self.create_order(ticker, operation_str, amount, limit)
+        return {"order_id": None, "latency_ms": (time.perf_counter() - start) * 1000, "via": "ui", "response": None}
+
+    def get_ticker_info(self, ticker: str, ticker_type: Union[str, MarketType, None] = None,
+                        segment: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Obtiene la información de un ticker.
+
+        Args:
+            ticker: Símbolo del ticker.
+            ticker_type: Tipo de mercado como cadena o instancia de MarketType. Si no
+                se indica, se toma del maestro de instrumentos.
+            segment: Segmento del mercado. Por defecto, el del maestro o "C".
+
         Returns:
             Optional[Dict[str, Any]]: Información del ticker, o None si falla.
+
+        Raises:
+            ValueError: Si el tipo de mercado no es válido o no se indicó y el
+                ticker no está en el maestro.
         """
-        # Validar y convertir ticker_type
-        ticker_type_enum = validate_market_type(ticker_type)
+        ticker_type_enum, segment = self._resolve_instrument(ticker, ticker_type, segment)
 
         navigation_url = self._get_navigation_ticker_url(ticker_type_enum)
         if not navigation_url:
@@ -112,44 +175,186 @@ class MarketService:
             )
 
             with self.browser.page.expect_response(request_url) as response_info:
-                logger.info(f"Esperando la respuesta de {request_url}...")
+                logger.info("Esperando la respuesta de %s...", request_url)
                 response = response_info.value
 
             return self.browser.process_response(response, f"Información del ticker {ticker} obtenida con éxito.")
         except Exception as e:
-            logger.error(f"Error al obtener información del ticker {ticker}: {e}")
+            logger.error("Error al obtener información del ticker %s: %s", ticker, e)
             return None
 
-    def get_market_schedule(self) -> Optional[Dict[str, Any]]:
+    def get_market_schedule(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Obtiene los horarios de apertura y cierre del mercado.
         
+        Args:
+            max_age: Si se indica, acepta una respuesta del cache pasivo con esta
+                antigüedad máxima en segundos.
+
         Returns:
             Optional[Dict[str, Any]]: Información de horarios del mercado o None si falla.
         """
         return self.browser.fetch_data(
             request_url=API_URLS["markets_schedule"],
-            navigation_url=WEB_APP_URLS["dashboard"]
+            navigation_url=WEB_APP_URLS["dashboard"],
+            max_age=max_age
         )
 
-    def get_orders(self) -> Optional[Dict[str, Any]]:
+    def get_orders(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Obtiene todas las órdenes del usuario (pendientes y ejecutadas).
         
+        Args:
+            max_age: Si se indica, acepta una respuesta del cache pasivo con esta
+                antigüedad máxima en segundos.
+
         Returns:
             Optional[Dict[str, Any]]: Información de órdenes o None si no hay órdenes/error.
         """
+        request = self.orders_request()
         orders = self.browser.fetch_data(
-            request_url=API_URLS["orders"],
-            navigation_url=WEB_APP_URLS["orders"]
+            request_url=request.request_url,
+            navigation_url=request.navigation_url,
+            max_age=max_age
         )
         if orders is None:
             logger.info("No hay órdenes pendientes.")
         return orders
 
-    def cancel_order(self, amount: float, quantity: int) -> bool:
+    def watch_orders(self, **kwargs) -> OrderWatcher:
         """
-        Cancela una orden en el mercado basada en el monto y la cantidad.
+        Empieza a seguir las órdenes del usuario y devuelve un watcher que emite
+        sólo sus cambios (nuevas, ejecutadas parcial o totalmente, canceladas y
+        rechazadas), indexadas por id de orden.
+
+        Con direct_api cada lectura es una llamada a la API; sin él, cada lectura
+        navega la página principal a la de órdenes, así que se hacen cada
+        ORDER_WATCH_NAVIGATION_INTERVAL ms como mínimo y entre lecturas los
+        cambios llegan sólo por las respuestas de órdenes que pida la web app.
+
+        Args:
+            **kwargs: Opciones de OrderWatcher (interval, emit_initial).
+
+        Returns:
+            OrderWatcher: Watcher con el estado base ya leído; se consume con
+            iter_events() y se detiene con stop() (o usándolo como context manager).
+        """
+        request = self.orders_request()
+        watcher = OrderWatcher(
+            self.browser.page,
+            lambda: self.browser.fetch_data(request.request_url, request.navigation_url),
+            dispatcher=self.browser.dispatcher,
+            **self._order_watch_options(kwargs)
+        )
+        watcher.start()
+        return watcher
+
+    def _order_watch_options(self, kwargs: Dict[str, Any]) -> Dict[str, Any]:
+        """Opciones del watcher de órdenes, con el intervalo mínimo si las lecturas navegan."""
+        api_client = getattr(self.browser, "api_client", None)
+        if api_client and api_client.is_authenticated:
+            return kwargs
+        interval = kwargs.get("interval")
+        if interval is not None and interval < ORDER_WATCH_NAVIGATION_INTERVAL:
+            logger.warning("Sin direct_api cada lectura de órdenes navega; se usa un intervalo de %s ms "
+                           "en lugar de %s ms.", ORDER_WATCH_NAVIGATION_INTERVAL, interval)
+        return {**kwargs, "interval": max(interval or 0, ORDER_WATCH_NAVIGATION_INTERVAL)}
+
+    def cancel_order(self, order_id: Union[int, str, float, None] = None, quantity: Optional[int] = None,
+                     amount: Optional[float] = None) -> bool:
+        """
+        Cancela una orden.
+
+        Con el id de la orden (cancel_order(order_id)) la cancela con un DELETE
+        al endpoint de órdenes, sin navegar; requiere direct_api=True. La forma
+        anterior, con monto y cantidad (cancel_order(amount, quantity)), busca la
+        fila en la página de órdenes: se mantiene por compatibilidad, pero es
+        lenta y ambigua si dos órdenes tienen el mismo monto y cantidad.
+
+        Args:
+            order_id: Id de la orden (o el monto, en la forma anterior).
+            quantity: Cantidad de la orden, sólo en la forma anterior.
+            amount: Monto de la orden, sólo en la forma anterior.
+
+        Returns:
+            bool: True si la orden fue cancelada exitosamente.
+
+        Raises:
+            ValueError: Si no se indica la orden.
+        """
+        if quantity is not None:
+            return self._cancel_order_ui(amount if amount is not None else order_id, quantity)
+        if order_id is None:
+            raise ValueError("cancel_order necesita el id de la orden (o monto y cantidad).")
+        return self._cancel_order_api(order_id)["cancelled"]
+
+    def cancel_all(self, ticker: Optional[str] = None,
+                   side: Union[str, OrderOperation, None] = None) -> List[Dict[str, Any]]:
+        """
+        Cancela en paralelo, por API, todas las órdenes pendientes que coinciden.
+
+        Args:
+            ticker: Si se indica, sólo las órdenes de ese ticker.
+            side: Si se indica, sólo las compras o las ventas.
+
+        Returns:
+            List[Dict[str, Any]]: Un resultado por orden con order_id, ticker,
+            cancelled, error (None si se canceló) y latency_ms.
+
+        Raises:
+            RuntimeError: Si no hay una sesión de API (direct_api=True); se
+            comprueba antes de navegar a la página de órdenes.
+        """
+        if not self._has_api_session():
+            raise RuntimeError(CANCEL_REQUIRES_API)
+        targets = open_orders(self.get_orders(), ticker, side)
+        if not targets:
+            logger.info("No hay órdenes pendientes para cancelar.")
+            return []
+        with ThreadPoolExecutor(max_workers=min(len(targets), CANCEL_CONCURRENCY)) as pool:
+            # Cada worker corre en una copia del contexto para que sus spans
+            # cuelguen del span del llamador.
+            futures = [pool.submit(contextvars.copy_context().run, self._cancel_order_api, order_id)
+                       for order_id, _ in targets]
+            results = [future.result() for future in futures]
+        for result, (_, item) in zip(results, targets):
+            result["ticker"] = item_ticker(item)
+        logger.info("Canceladas %s de %s órdenes pendientes.", sum(r['cancelled'] for r in results), len(results))
+        return results
+
+    def _has_api_session(self) -> bool:
+        """Indica si hay un cliente de API autenticado para operar sin navegar."""
+        api_client = getattr(self.browser, "api_client", None)
+        return bool(api_client and api_client.is_authenticated)
+
+    def _cancel_order_api(self, order_id: Union[int, str]) -> Dict[str, Any]:
+        """
+        Cancela una orden con un DELETE al endpoint de órdenes.
+
+        Returns:
+            Dict[str, Any]: order_id, cancelled, error (None si se canceló) y latency_ms.
+        """
+        api_client = getattr(self.browser, "api_client", None)
+        start = time.perf_counter()
+        error = None
+        if not self._has_api_session():
+            error = CANCEL_REQUIRES_API
+        else:
+            try:
+                with span_of(self.browser, "api_cancel", order_id=order_id):
+                    api_client.delete(f"{API_URLS['orders']}/{order_id}")
+            except (ApiClientError, OSError) as e:
+                error = str(e) or type(e).__name__
+        latency_ms = (time.perf_counter() - start) * 1000
+        if error is None:
+            logger.info("Orden %s cancelada por API en %.0f ms.", order_id, latency_ms)
+        else:
+            logger.error("No se pudo cancelar la orden %s: %s", order_id, error)
+        return {"order_id": order_id, "cancelled": error is None, "error": error, "latency_ms": latency_ms}
+
+    def _cancel_order_ui(self, amount: float, quantity: int) -> bool:
+        """
+        Cancela una orden buscándola por monto y cantidad en la página de órdenes.
 
         Args:
             amount (float): Monto de la orden a cancelar.
@@ -181,25 +386,260 @@ class MarketService:
             cancel_button_selector = ORDER_SELECTORS["cancel_button"]
             self.browser.click_element(cancel_button_selector, "Clic en el botón 'Cancelar orden'.")
 
-            logger.info(f"Orden con monto {amount} y cantidad {quantity} cancelada exitosamente.")
+            logger.info("Orden con monto %s y cantidad %s cancelada exitosamente.", amount, quantity)
             return True
 
         except Exception as e:
-            logger.error(f"Error al cancelar la orden: {e}")
+            logger.error("Error al cancelar la orden: %s", e)
             return False
 
-    def get_mep_value(self) -> Optional[Dict[str, Any]]:
+    def get_mep_value(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Obtiene el valor actual del dólar MEP (Mercado Electrónico de Pagos).
         
+        Args:
+            max_age: Si se indica, acepta una respuesta del cache pasivo con esta
+                antigüedad máxima en segundos.
+
         Returns:
             Optional[Dict[str, Any]]: Información del valor MEP o None si falla.
         """
+        request = self.mep_request()
+        return self.browser.fetch_data(
+            request.request_url,
+            request.navigation_url,
+            max_age=max_age
+        )
+
+    def orders_request(self) -> FetchRequest:
+        """Lectura de las órdenes, para usar con browser.fetch_parallel."""
+        return FetchRequest(API_URLS["orders"], WEB_APP_URLS["orders"])
+
+    def mep_request(self) -> FetchRequest:
+        """Lectura del dólar MEP, para usar con browser.fetch_parallel."""
+        return FetchRequest(API_URLS["mep_prices"], WEB_APP_URLS["portfolio"])
+
+    def ticker_request(self, ticker: str, ticker_type: Union[str, MarketType, None] = None,
+                       segment: Optional[str] = None) -> FetchRequest:
+        """
+        Lectura de la información de un ticker, para usar con browser.fetch_parallel.
+
+        En una página del pool, después de navegar al mercado busca y selecciona el
+        ticker, igual que get_ticker_info.
+
+        Args:
+            ticker: Símbolo del ticker.
+            ticker_type: Tipo de mercado como cadena o instancia de MarketType. Si no
+                se indica, se toma del maestro de instrumentos.
+            segment: Segmento del mercado. Por defecto, el del maestro o "C".
+
+        Raises:
+            ValueError: Si el tipo de mercado no es válido o no se puede resolver.
+        """
+        ticker_type_enum, segment = self._resolve_instrument(ticker, ticker_type, segment)
+        navigation_url = self._get_navigation_ticker_url(ticker_type_enum)
+        if not navigation_url:
+            raise ValueError(f"Tipo de mercado sin página de navegación: {ticker_type}")
+
+        def select_ticker(page):
+            page.fill(COMMON_SELECTORS["search_input"], ticker)
+            page.click(LIST_SELECTORS["list_item"](ticker))
+
+        return FetchRequest(f"{API_URLS['markets_tickers']}/{ticker}?segment={segment}", navigation_url,
+                            action=select_ticker)
+
+    def get_market_snapshot(self, market_type: Union[str, MarketType],
+                            max_age: Optional[float] = None) -> Optional[MarketSnapshot]:
+        """
+        Obtiene las cotizaciones (último, compra, venta y volumen) de todo un mercado
+        con una sola lectura de la lista que carga la página del mercado.
+
+        Si el maestro de instrumentos está activo, también se actualiza con la lista.
+
+        Args:
+            market_type: Tipo de mercado como cadena o instancia de MarketType.
+            max_age: Si se indica, acepta una respuesta del cache pasivo con esta
+                antigüedad máxima en segundos.
+
+        Returns:
+            Optional[MarketSnapshot]: Snapshot columnar por ticker, o None si falla.
+        """
+        request = self.snapshot_request(market_type)
         return self.browser.fetch_data(
-            API_URLS["mep_prices"],
-            WEB_APP_URLS["portfolio"]
+            request.request_url,
+            request.navigation_url,
+            request.process_response,
+            max_age=max_age
         )
 
+    def stream_quotes(self, tickers: Iterable[str], market_type: Union[str, MarketType, None] = None,
+                      **kwargs) -> QuoteStream:
+        """
+        Abre un stream de cotizaciones en tiempo real para los tickers indicados.
+
+        Empieza a escuchar los WebSockets de la página principal y navega a la
+        página del mercado para que la web app abra su feed. Un stream cubre un
+        mercado: el indicado o el del primer ticker según el maestro de instrumentos.
+
+        Args:
+            tickers: Tickers a emitir.
+            market_type: Mercado cuya página abrir. Si no se indica, se resuelve
+                con el maestro de instrumentos.
+            **kwargs: Opciones de QuoteStream (queue_size, reconnect_delay, ...).
+
+        Returns:
+            QuoteStream: Stream ya conectado; se consume con iter_ticks() y se
+            detiene con stop() (o usándolo como context manager).
+
+        Raises:
+            ValueError: Si no hay tickers o no se puede resolver el mercado.
+        """
+        tickers = [ticker.upper() for ticker in tickers]
+        if not tickers:
+            raise ValueError("stream_quotes necesita al menos un ticker.")
+        market, _ = self._resolve_instrument(tickers[0], market_type, DEFAULT_SEGMENT)
+        stream = QuoteStream(self.browser.page, tickers, **kwargs)
+        stream.start()
+        try:
+            self.browser.go_to(self._get_navigation_ticker_url(market),
+                               f"Abriendo el mercado {market.value} para el stream de cotizaciones.")
+        except Exception:
+            stream.stop()
+            raise
+        return stream
+
+    def snapshot_request(self, market_type: Union[str, MarketType]) -> FetchRequest:
+        """Lectura del snapshot de un mercado, para usar con browser.fetch_parallel."""
+        market = validate_market_type(market_type)
+        return self.instruments_request(market)._replace(
+            process_response=lambda data: self._build_snapshot(data, market))
+
+    def instruments_request(self, market_type: Union[str, MarketType]) -> FetchRequest:
+        """Lectura de la lista de un mercado, para usar con browser.fetch_parallel."""
+        market = validate_market_type(market_type)
+        return FetchRequest(f"{API_URLS['markets_list']}{market.value}", self._get_navigation_ticker_url(market))
+
+    def refresh_instruments(self, force: bool = False) -> List[str]:
+        """
+        Actualiza el maestro de instrumentos con las listas de los mercados
+        desactualizados (o de todos si force), leídas en paralelo.
+
+        Activa el maestro en el navegador si todavía no lo estaba.
+
+        Args:
+            force: Si True, actualiza todos los mercados aunque estén vigentes.
+
+        Returns:
+            List[str]: Mercados actualizados.
+        """
+        master = self._instrument_master() or self.browser.enable_instrument_master()
+        markets = list(MarketType) if force else master.stale_markets()
+        if not markets:
+            logger.info("El maestro de instrumentos está al día.")
+            return []
+        results = self.browser.fetch_parallel({market: self.instruments_request(market) for market in markets})
+        refreshed = []
+        for market, data in results.items():
+            if data is None:
+                logger.warning("No se pudo actualizar la lista de %s.", market.value)
+                continue
+            master.update(market, data, refreshed=True)
+            refreshed.append(market.value)
+        return refreshed
+
+    def lookup_instrument(self, ticker: str) -> Optional[Instrument]:
+        """
+        Busca un ticker en el maestro de instrumentos, sin navegar.
+
+        Returns:
+            Optional[Instrument]: Mercado, segmento, moneda, lote e id del ticker, o
+            None si no está en el maestro (o el maestro no está activo).
+        """
+        master = self._instrument_master()
+        return master.lookup(ticker) if master is not None else None
+
+    def search_instruments(self, prefix: str, limit: Optional[int] = 20) -> List[Instrument]:
+        """
+        Busca en el maestro de instrumentos los tickers que empiezan con prefix, sin navegar.
+
+        Args:
+            prefix: Prefijo del ticker.
+            limit: Cantidad máxima de resultados; None para todos.
+
+        Returns:
+            List[Instrument]: Instrumentos en orden alfabético.
+        """
+        master = self._instrument_master()
+        return master.search(prefix, limit) if master is not None else []
+
+    def _build_snapshot(self, data: Any, market: MarketType) -> MarketSnapshot:
+        """Arma el snapshot de la lista de un mercado y la incorpora al maestro de instrumentos."""
+        master = self._instrument_master()
+        if master is not None:
+            master.update(market, data)
+        snapshot = MarketSnapshot.from_response(data, market)
+        logger.info("Snapshot de %s: %s instrumentos.", market.value, len(snapshot))
+        return snapshot
+
+    def _instrument_master(self) -> Optional[InstrumentMaster]:
+        """Maestro de instrumentos del navegador, si está activo."""
+        return getattr(self.browser, "instruments", None)
+
+    def _resolve_instrument(self, ticker: str, ticker_type: Union[str, MarketType, None],
+                            segment: Optional[str]) -> Tuple[MarketType, str]:
+        """
+        Completa el tipo de mercado y el segmento de un ticker con el maestro de instrumentos.
+
+        Raises:
+            ValueError: Si el tipo no es válido, o no se indicó y el ticker no está en el maestro.
+        """
+        instrument = self.lookup_instrument(ticker) if ticker_type is None or segment is None else None
+        if ticker_type is None:
+            if instrument is None:
+                raise ValueError(f"El ticker {ticker} no está en el maestro de instrumentos; indicá ticker_type.")
+            ticker_type = MarketType(instrument.market_type)
+        if segment is None:
+            segment = instrument.segment if instrument is not None else DEFAULT_SEGMENT
+        return validate_market_type(ticker_type), segment
+
+    def _submit_order_api(self, ticker: str, operation: str, amount: float, limit: Optional[float],
+                          segment: str) -> Optional[Dict[str, Any]]:
+        """
+        Envía la orden por la API si hay sesión capturada.
+
+        Returns:
+            Optional[Dict[str, Any]]: Resultado del envío, o None si hay que usar la UI.
+
+        Raises:
+            OrderCreationError: Si la API falló de forma que la orden pudo haberse creado o fue rechazada.
+        """
+        api_client = getattr(self.browser, "api_client", None)
+        if not (api_client and api_client.is_authenticated):
+            return None
+
+        payload = build_order_payload(ticker, operation, amount, limit, segment)
+        start = time.perf_counter()
+        try:
+            with span_of(self.browser, "api_order", ticker=ticker):
+                data = api_client.post_json(API_URLS["orders"], payload)
+        except ApiClientError as e:
+            if e.status not in API_ORDER_FALLBACK_STATUSES:
+                logger.error("La API rechazó la orden de %s para %s: %s", operation, ticker, e)
+                raise OrderCreationError(f"Error al crear la orden por API: {e}")
+            logger.warning("Endpoint de órdenes no disponible (%s), usando la UI.", e.status)
+            return None
+        except OSError as e:
+            # La conexión se cortó con el POST ya enviado: la orden pudo haber llegado
+            # al broker, así que tampoco se reintenta por la UI.
+            logger.error("Error de conexión al enviar la orden de %s para %s: %s", operation, ticker, e)
+            raise OrderCreationError(f"Error al crear la orden por API: {e}") from e
+
+        latency_ms = (time.perf_counter() - start) * 1000
+        order_id = extract_order_id(data)
+        logger.info("Orden de %s enviada por API para %s: id=%s, latencia=%.0f ms",
+                    operation, ticker, order_id, latency_ms)
+        return {"order_id": order_id, "latency_ms": latency_ms, "via": "api", "response": data}
+
     def _get_navigation_ticker_url(self, ticker_type: MarketType) -> Optional[str]:
         """
         Obtiene la URL de navegación para un tipo de ticker específico.
@@ -227,7 +667,7 @@ class MarketService:
         # Buscar la URL correspondiente
         navigation_url = market_navigation_urls.get(ticker_type_str)
         if not navigation_url:
-            logger.error(f"Tipo de ticker desconocido: {ticker_type_str}")
+            logger.error("Tipo de ticker desconocido: %s", ticker_type_str)
             return None
         return navigation_url
 
@@ -251,7 +691,12 @@ class MarketService:
         Args:
             limit: Precio límite formateado (con coma decimal).
         """
-        time.sleep(3) #No me gusta el tiempo explicito, pero no aparece clickeable rápido.
+        # El botón aparece antes de ser clickeable (animación de la pantalla expandida)
+        self.browser.waits.element_enabled(
+            OPERATION_SELECTORS["general"]["more_options"],
+            flow="limit_order",
+            baseline=LEGACY_SLEEPS["limit_order"]
+        )
         self.browser.click_element(
             OPERATION_SELECTORS["general"]["more_options"],
             "Expandiendo opciones adicionales."
@@ -301,16 +746,22 @@ class MarketService:
                 "Haciendo clic en 'Revisar'."
             )
 
-            # Hacer clic en el botón "Confirmar"
-            self.browser.click_element(
-                OPERATION_SELECTORS["confirm_buttons"]["confirm"],
-                "Haciendo clic en 'Confirmar'."
-            )
-
-            time.sleep(4)
+            # Hacer clic en el botón "Confirmar" y esperar el envío de la orden
+            try:
+                with self.browser.waits.response(
+                    API_URLS["orders"],
+                    flow="order_confirmation",
+                    baseline=LEGACY_SLEEPS["order_confirmation"]
+                ):
+                    self.browser.click_element(
+                        OPERATION_SELECTORS["confirm_buttons"]["confirm"],
+                        "Haciendo clic en 'Confirmar'."
+                    )
+            except TimeoutError:
+                logger.warning("No se observó la respuesta del envío de la orden.")
             logger.info("Operación confirmada exitosamente.")
         except Exception as e:
-            logger.error(f"Error al confirmar la operación: {e}")
+            logger.error("Error al confirmar la operación: %s", e)
             raise OrderCreationError(f"Error al confirmar la operación: {e}")
 
 
@@ -2,6 +2,7 @@ from typing import Optional, Dict, Any
 from CocosBot.config.urls import WEB_APP_URLS, API_URLS
 from CocosBot.config.enums import Currency
 from CocosBot.config.selectors import TRANSFER_SELECTORS
+from CocosBot.core.page_pool import FetchRequest
 
 import logging
 logger = logging.getLogger(__name__)
@@ -23,28 +24,38 @@ class UserService:
         """
         self.browser = browser
 
-    def get_user_data(self) -> Optional[Dict[str, Any]]:
+    def get_user_data(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Obtiene los datos básicos del usuario.
         
+        Args:
+            max_age: Si se indica, acepta una respuesta del cache pasivo con esta
+                antigüedad máxima en segundos.
+
         Returns:
             Optional[Dict[str, Any]]: Datos del usuario o None si falla.
         """
         return self.browser.fetch_data(
             API_URLS["user_data"],
-            WEB_APP_URLS["dashboard"]
+            WEB_APP_URLS["dashboard"],
+            max_age=max_age
         )
 
-    def get_account_tier(self) -> Optional[Dict[str, Any]]:
+    def get_account_tier(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Obtiene el nivel de cuenta (tier) del usuario.
         
+        Args:
+            max_age: Si se indica, acepta una respuesta del cache pasivo con esta
+                antigüedad máxima en segundos.
+
         Returns:
             Optional[Dict[str, Any]]: Información del tier de la cuenta o None si falla.
         """
         return self.browser.fetch_data(
             request_url=API_URLS["account_tier"],
-            navigation_url=WEB_APP_URLS["dashboard"]
+            navigation_url=WEB_APP_URLS["dashboard"],
+            max_age=max_age
         )
 
     def navigate_withdraw_form(self, amount: float, currency: Currency = Currency.ARS) -> bool:
@@ -99,7 +110,7 @@ class UserService:
             return True
 
         except Exception as e:
-            logger.error(f"Error navegando al formulario de extracción: {e}")
+            logger.error("Error navegando al formulario de extracción: %s", e)
             return False
 
     def get_linked_accounts(self, amount: float = 5000, currency: Currency = Currency.ARS) -> Optional[Dict[str, Any]]:
@@ -129,25 +140,39 @@ class UserService:
                 return self.browser.process_response(response, "Cuentas disponibles obtenidas con éxito.")
 
         except Exception as e:
-            logger.error(f"Error obteniendo cuentas vinculadas: {e}")
+            logger.error("Error obteniendo cuentas vinculadas: %s", e)
             return None
 
-    def get_portfolio_data(self) -> Optional[Dict[str, Any]]:
+    def get_portfolio_data(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Obtiene los datos completos del portafolio del usuario.
         
+        Args:
+            max_age: Si se indica, acepta una respuesta del cache pasivo con esta
+                antigüedad máxima en segundos.
+
         Returns:
             Optional[Dict[str, Any]]: Datos del portafolio o None si falla.
         """
+        request = self.portfolio_request()
         return self.browser.fetch_data(
-            request_url=API_URLS["portfolio_data"],
-            navigation_url=WEB_APP_URLS["portfolio"]
+            request_url=request.request_url,
+            navigation_url=request.navigation_url,
+            max_age=max_age
         )
 
-    def get_portfolio_balance(self) -> Optional[float]:
+    def portfolio_request(self) -> FetchRequest:
+        """Lectura del portafolio, para usar con browser.fetch_parallel."""
+        return FetchRequest(API_URLS["portfolio_data"], WEB_APP_URLS["portfolio"])
+
+    def get_portfolio_balance(self, max_age: Optional[float] = None) -> Optional[float]:
         """
         Obtiene el balance total del portafolio del usuario.
         
+        Args:
+            max_age: Si se indica, acepta una respuesta del cache pasivo con esta
+                antigüedad máxima en segundos.
+
         Returns:
             Optional[float]: Balance total o None si falla.
         """
@@ -172,17 +197,23 @@ class UserService:
         return self.browser.fetch_data(
             API_URLS["portfolio_balance"],
             WEB_APP_URLS["portfolio"],
-            process_response
+            process_response,
+            max_age=max_age
         )
 
-    def get_academy_data(self) -> Optional[Dict[str, Any]]:
+    def get_academy_data(self, max_age: Optional[float] = None) -> Optional[Dict[str, Any]]:
         """
         Obtiene los datos de la sección de Academia (contenido educativo).
         
+        Args:
+            max_age: Si se indica, acepta una respuesta del cache pasivo con esta
+                antigüedad máxima en segundos.
+
         Returns:
             Optional[Dict[str, Any]]: Datos de la Academia o None si falla.
         """
         return self.browser.fetch_data(
             request_url=API_URLS["academy"],
-            navigation_url=WEB_APP_URLS["dashboard"]
+            navigation_url=WEB_APP_URLS["dashboard"],
+            max_age=max_age
         )
\ No newline at end of file
@@ -30,5 +30,48 @@ def process_mep_data(mep_data):
         }
         return processed_data
     except KeyError as e:
-        logger.error(f"Error al procesar los datos MEP: clave faltante {e}")
+        logger.error("Error al procesar los datos MEP: clave faltante %s", e)
         return None
+
+
+def build_order_payload(ticker, operation, amount, limit=None, segment="C"):
+    """
+    Arma el cuerpo del POST de órdenes con los mismos datos que carga la UI.
+
+    El esquema replica lo que envía la web app al confirmar una orden; si la API
+    lo cambia, ajustarlo aquí (ver scripts/discover_endpoints.py).
+
+    Args:
+        ticker: Símbolo del ticker.
+        operation: 'BUY' o 'SELL'.
+        amount: Monto a invertir (compra) o cantidad de acciones (venta).
+        limit: Precio límite (opcional; sin límite la orden es a mercado).
+        segment: Segmento del mercado.
+
+    Returns:
+        dict: Cuerpo JSON de la orden.
+    """
+    payload = {
+        "ticker": ticker,
+        "segment": segment,
+        "side": operation,
+        "type": "LIMIT" if limit is not None else "MARKET",
+    }
+    # La UI pide monto en las compras y cantidad en las ventas
+    if operation == "BUY":
+        payload["amount"] = amount
+    else:
+        payload["quantity"] = amount
+    if limit is not None:
+        payload["price"] = limit
+    return payload
+
+
+def extract_order_id(order_response):
+    """Devuelve el id de orden de la respuesta del POST de órdenes, o None si no viene."""
+    if not isinstance(order_response, dict):
+        return None
+    for key in ("id", "order_id", "orderId"):
+        if order_response.get(key) is not None:
+            return order_response[key]
+    return None
@@ -1,7 +1,37 @@
+import base64
+import html
 import imaplib
 import email
+import quopri
+import re
+import select
 import time
-from bs4 import BeautifulSoup
+from datetime import datetime, timedelta
+from CocosBot.config.general import TWO_FACTOR_MAIL_TIMEOUT, WAIT_POLL_INTERVAL
+from CocosBot.core.waits import wait_until, timing_report, LEGACY_SLEEPS
+
+import logging
+logger = logging.getLogger(__name__)
+
+# Duración máxima (s) de cada ronda de IDLE antes de volver a buscar; acota la
+# demora si la notificación EXISTS quedó en el buffer de lectura.
+IDLE_ROUND = 5
+
+# <span> cuyo style contiene 'font-size: 32px' y sólo texto adentro (el formato del
+# correo de Cocos). Si el span tiene otro markup adentro no coincide y se usa bs4.
+_CODE_SPAN = (
+    r'<span\b[^>]*?\bstyle\s*=\s*(["\'])(?:(?!\1).)*?font-size:\s*32px(?:(?!\1).)*?\1[^>]*>'
+    r'([^<]*)</span\s*>'
+)
+_CODE_SPAN_BYTES = re.compile(_CODE_SPAN.encode(), re.IGNORECASE | re.DOTALL)
+_CODE_SPAN_STR = re.compile(_CODE_SPAN, re.IGNORECASE | re.DOTALL)
+
+# Margen (s) para diferencias de reloj entre esta máquina y el servidor IMAP al
+# comparar la fecha de llegada (INTERNALDATE) con el envío del login.
+CLOCK_SKEW = 10
+
+# Tokens de una respuesta IMAP: paréntesis, strings entre comillas y átomos
+_IMAP_TOKEN = re.compile(rb'\(|\)|"(?:[^"\\]|\\.)*"|[^\s()"]+')
 
 
 def conectar_imap(email_address, password):
@@ -12,11 +42,36 @@ def conectar_imap(email_address, password):
     return mail
 
 
-def buscar_correos(mail, sender_address):
-    """Busca correos del remitente especificado y devuelve los IDs de los correos."""
-    status, data = mail.search(None, f'(FROM "{sender_address}")')
-    mail_ids = data[0]
-    return mail_ids.split()
+def buscar_correos(mail, sender_address, since=None):
+    """
+    Busca correos del remitente especificado y devuelve los IDs de los correos.
+
+    Args:
+        mail: Sesión IMAP con la casilla seleccionada.
+        sender_address: Dirección del remitente.
+        since: Si se indica (epoch en segundos), sólo se devuelven los correos que
+            llegaron al servidor después (con CLOCK_SKEW de margen).
+    """
+    if since is None:
+        status, data = mail.search(None, f'(FROM "{sender_address}")')
+        return data[0].split()
+    # SINCE compara sólo la fecha; un día de margen evita problemas de huso horario
+    day = (datetime.fromtimestamp(since) - timedelta(days=1)).strftime('%d-%b-%Y')
+    status, data = mail.search(None, f'(FROM "{sender_address}" SINCE {day})')
+    mail_ids = data[0].split()
+    if not mail_ids:
+        return []
+    status, data = mail.fetch(b','.join(mail_ids), '(INTERNALDATE)')
+    recientes = set()
+    for line in data or ():
+        if isinstance(line, tuple):
+            line = line[0]
+        if not isinstance(line, bytes):
+            continue
+        received = imaplib.Internaldate2tuple(line)
+        if received is not None and time.mktime(received) >= since - CLOCK_SKEW:
+            recientes.add(line.split()[0])
+    return [mail_id for mail_id in mail_ids if mail_id in recientes]
 
 
 def extraer_y_eliminar_codigo_2fa(mail, email_id):
@@ -25,14 +80,7 @@ def extraer_y_eliminar_codigo_2fa(mail, email_id):
     status, data = mail.fetch(email_id, '(RFC822)')
     for response_part in data:
         if isinstance(response_part, tuple):
-            message = email.message_from_bytes(response_part[1])
-            if message.is_multipart():
-                for part in message.get_payload():
-                    if part.get_content_type() == 'text/html':
-                        codigo_2fa = procesar_html(part.get_payload(decode=True))
-            else:
-                if message.get_content_type() == 'text/html':
-                    codigo_2fa = procesar_html(message.get_payload(decode=True))
+            codigo_2fa = _codigo_de_mensaje(email.message_from_bytes(response_part[1]))
 
     if codigo_2fa:
         eliminar_correo(mail, email_id)
@@ -40,6 +88,18 @@ def extraer_y_eliminar_codigo_2fa(mail, email_id):
     return codigo_2fa
 
 
+def _codigo_de_mensaje(message):
+    """Extrae el código 2FA de la parte HTML de un mensaje ya parseado."""
+    codigo_2fa = None
+    if message.is_multipart():
+        for part in message.get_payload():
+            if part.get_content_type() == 'text/html':
+                codigo_2fa = procesar_html(part.get_payload(decode=True))
+    elif message.get_content_type() == 'text/html':
+        codigo_2fa = procesar_html(message.get_payload(decode=True))
+    return codigo_2fa
+
+
 def eliminar_correo(mail, email_id):
     """Elimina el correo especificado por email_id."""
     mail.store(email_id, '+FLAGS', '\\Deleted')
@@ -47,32 +107,331 @@ def eliminar_correo(mail, email_id):
 
 
 def procesar_html(html_content):
-    """Procesa el contenido HTML para encontrar y devolver el código 2FA."""
+    """
+    Procesa el contenido HTML para encontrar y devolver el código 2FA.
+
+    Busca el span con una expresión regular sobre el contenido (bytes o str) sin
+    armar el árbol del documento; BeautifulSoup se importa y se usa sólo si el
+    correo menciona el tamaño de fuente del código pero el span no coincide.
+    """
+    is_bytes = isinstance(html_content, (bytes, bytearray))
+    match = (_CODE_SPAN_BYTES if is_bytes else _CODE_SPAN_STR).search(html_content)
+    if match:
+        text = match.group(2)
+        return html.unescape(text.decode('utf-8', 'replace') if is_bytes else text)
+    if (b'32px' if is_bytes else '32px') not in html_content:
+        return None
+    return _procesar_html_bs4(html_content)
+
+
+def _procesar_html_bs4(html_content):
+    """Búsqueda del código con BeautifulSoup, para HTML que la expresión regular no cubre."""
+    from bs4 import BeautifulSoup
+
     soup = BeautifulSoup(html_content, 'html.parser')
 
     codigo_2fa = soup.find('span', style=lambda value: value and 'font-size: 32px' in value)
     return codigo_2fa.text if codigo_2fa else None
 
 
-def obtener_codigo_2FA(email_address, password, sender_address):
+def parsear_lista_imap(raw):
+    """
+    Convierte una respuesta IMAP con listas entre paréntesis (p. ej. BODYSTRUCTURE)
+    en listas de Python: strings para átomos y valores entre comillas, None para NIL.
+    """
+    stack = [[]]
+    for match in _IMAP_TOKEN.finditer(raw):
+        token = match.group()
+        if token == b'(':
+            stack.append([])
+        elif token == b')':
+            if len(stack) > 1:
+                item = stack.pop()
+                stack[-1].append(item)
+        elif token.startswith(b'"'):
+            stack[-1].append(re.sub(rb'\\(.)', rb'\1', token[1:-1]).decode('utf-8', 'replace'))
+        elif token.upper() == b'NIL':
+            stack[-1].append(None)
+        else:
+            stack[-1].append(token.decode('utf-8', 'replace'))
+    return stack[0]
+
+
+def buscar_parte_html(structure, prefix=""):
+    """
+    Busca la parte text/html en un BODYSTRUCTURE ya parseado.
+
+    Returns:
+        tuple | None: (número de parte, codificación, charset) o None si no hay parte HTML.
+    """
+    if structure and isinstance(structure[0], list):
+        index = 0
+        for child in structure:
+            if not isinstance(child, list):
+                break
+            index += 1
+            found = buscar_parte_html(child, f"{prefix}{index}.")
+            if found:
+                return found
+        return None
+    if len(structure) > 5 and str(structure[0]).upper() == 'TEXT' and str(structure[1]).upper() == 'HTML':
+        params = structure[2] or []
+        charset = next(
+            (params[i + 1] for i in range(0, len(params) - 1, 2) if str(params[i]).upper() == 'CHARSET'),
+            'utf-8'
+        )
+        return (prefix.rstrip('.') or '1', str(structure[5] or '7BIT').upper(), charset)
+    return None
+
+
+def decodificar_parte(payload, encoding, charset):
+    """Decodifica una parte del mensaje según su Content-Transfer-Encoding."""
+    if encoding == 'BASE64':
+        payload = base64.b64decode(payload)
+    elif encoding == 'QUOTED-PRINTABLE':
+        payload = quopri.decodestring(payload)
+    return payload.decode(charset or 'utf-8', 'replace')
+
+
+class TwoFactorMailWatcher:
+    """
+    Espera el correo con el código 2FA sin demoras fijas.
+
+    start() se llama antes de enviar el formulario de login: abre (o reutiliza) la
+    sesión IMAP y toma como referencia el UIDNEXT de la casilla, así sólo se
+    consideran correos que llegan después. wait_for_code() espera con IDLE si el
+    servidor lo soporta (o con polling corto), busca sólo por UID nuevo, remitente
+    y fecha (SINCE) y descarga únicamente la parte HTML del mensaje.
+
+    La conexión queda abierta para reutilizarla en el próximo login; close() la cierra.
+    """
+
+    def __init__(self, email_address, password, sender_address, poll_interval=WAIT_POLL_INTERVAL):
+        """
+        Args:
+            email_address: Dirección de Gmail del usuario.
+            password: Contraseña de aplicación de Gmail.
+            sender_address: Dirección del remitente que envía el código 2FA.
+            poll_interval: Intervalo en ms entre búsquedas si el servidor no soporta IDLE.
+        """
+        self.email_address = email_address
+        self.password = password
+        self.sender_address = sender_address
+        self.poll_interval = poll_interval
+        self.mail = None
+        self.uid_baseline = None
+        self.since = None
+        self._skipped = set()
+
+    def start(self, include_existing=False):
+        """
+        Prepara la espera de un código nuevo.
+
+        Args:
+            include_existing: Si True, también se aceptan correos de hoy que ya
+                estaban en la casilla (útil si el login ya se envió).
+        """
+        self._ensure_connection()
+        # SINCE compara sólo la fecha; un día de margen evita problemas de huso horario
+        self.since = (datetime.now() - timedelta(days=1)).strftime('%d-%b-%Y')
+        self.uid_baseline = 1 if include_existing else self._uid_next()
+        self._skipped = set()
+        logger.info("Esperando correo 2FA desde UID %s.", self.uid_baseline)
+        return self
+
+    def wait_for_code(self, timeout=TWO_FACTOR_MAIL_TIMEOUT):
+        """
+        Espera el correo nuevo y devuelve su código 2FA (el correo se elimina).
+
+        Args:
+            timeout: Tiempo máximo de espera en ms.
+
+        Returns:
+            str: Código 2FA.
+
+        Raises:
+            TimeoutError: Si el código no llega a tiempo.
+        """
+        if self.mail is None:
+            self.start()
+        start = time.monotonic()
+        deadline = start + timeout / 1000
+        try:
+            while True:
+                uid = self._find_new_message()
+                if uid is not None:
+                    code = self._read_code(uid)
+                    if code:
+                        self._delete(uid)
+                        logger.info("Código 2FA recibido en %.2f s.", time.monotonic() - start)
+                        return code
+                    self._skipped.add(uid)
+                    continue
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError(f"No llegó el correo 2FA en {timeout} ms")
+                self._wait_for_activity(remaining)
+        finally:
+            timing_report.record("two_factor_mail", time.monotonic() - start, LEGACY_SLEEPS["two_factor_mail"])
+
+    def close(self):
+        """Cierra la sesión IMAP."""
+        if self.mail is not None:
+            try:
+                self.mail.logout()
+            except Exception as e:
+                logger.debug("Error al cerrar la sesión IMAP: %s", e)
+            self.mail = None
+
+    def _ensure_connection(self):
+        """Reutiliza la sesión IMAP si sigue viva; si no, abre una nueva."""
+        if self.mail is not None:
+            try:
+                self.mail.noop()
+                return
+            except Exception:
+                logger.info("La sesión IMAP expiró, reconectando.")
+                self.mail = None
+        self.mail = conectar_imap(self.email_address, self.password)
+
+    def _uid_next(self):
+        """Devuelve el UID que tendrá el próximo correo de la casilla."""
+        status, data = self.mail.status('INBOX', '(UIDNEXT)')
+        match = re.search(rb'UIDNEXT (\d+)', data[0] if data and data[0] else b'')
+        return int(match.group(1)) if match else 1
+
+    def _find_new_message(self):
+        """Devuelve el UID más reciente del remitente posterior a la referencia, o None."""
+        status, data = self.mail.uid(
+            'SEARCH', 'UID', f'{self.uid_baseline}:*',
+            'FROM', f'"{self.sender_address}"', 'SINCE', self.since
+        )
+        # 'n:*' siempre incluye el último mensaje aunque su UID sea menor que n
+        uids = [
+            int(uid) for uid in (data[0] or b'').split()
+            if int(uid) >= self.uid_baseline and int(uid) not in self._skipped
+        ]
+        return max(uids) if uids else None
+
+    def _read_code(self, uid):
+        """Descarga sólo la parte HTML del correo y extrae el código."""
+        uid = str(uid)
+        status, data = self.mail.uid('FETCH', uid, '(BODYSTRUCTURE)')
+        part = None
+        if data and isinstance(data[0], bytes):
+            items = parsear_lista_imap(data[0])
+            fields = next((item for item in items if isinstance(item, list)), [])
+            if 'BODYSTRUCTURE' in fields:
+                part = buscar_parte_html(fields[fields.index('BODYSTRUCTURE') + 1])
+        if part is None:
+            # Estructura no reconocida: se descarga el mensaje completo
+            status, data = self.mail.uid('FETCH', uid, '(BODY.PEEK[])')
+            for response_part in data:
+                if isinstance(response_part, tuple):
+                    return _codigo_de_mensaje(email.message_from_bytes(response_part[1]))
+            return None
+
+        number, encoding, charset = part
+        status, data = self.mail.uid('FETCH', uid, f'(BODY.PEEK[{number}])')
+        for response_part in data:
+            if isinstance(response_part, tuple):
+                return procesar_html(decodificar_parte(response_part[1], encoding, charset))
+        return None
+
+    def _delete(self, uid):
+        """Elimina el correo ya leído."""
+        self.mail.uid('STORE', str(uid), '+FLAGS', '(\\Deleted)')
+        self.mail.expunge()
+
+    def _wait_for_activity(self, remaining):
+        """Espera novedades en la casilla: IDLE si está disponible, si no un intervalo corto."""
+        if 'IDLE' in getattr(self.mail, 'capabilities', ()):
+            self._idle(min(remaining, IDLE_ROUND))
+        else:
+            time.sleep(min(self.poll_interval / 1000, remaining))
+
+    def _idle(self, timeout):
+        """
+        Ejecuta una ronda de IMAP IDLE (RFC 2177) hasta recibir EXISTS o vencer timeout.
+
+        imaplib no implementa IDLE antes de Python 3.14, así que se envía el comando
+        a mano y se consume la respuesta etiquetada al terminar.
+        """
+        mail = self.mail
+        tag = mail._new_tag()
+        mail.send(tag + b' IDLE\r\n')
+        if not mail.readline().startswith(b'+'):
+            mail.tagged_commands.pop(tag, None)
+            time.sleep(min(self.poll_interval / 1000, timeout))
+            return
+        sock = mail.sock
+        deadline = time.monotonic() + timeout
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                pending = getattr(sock, 'pending', lambda: 0)()
+                if remaining <= 0 or (not pending and not select.select([sock], [], [], remaining)[0]):
+                    break
+                line = mail.readline()
+                if not line:
+                    raise imaplib.IMAP4.abort("El servidor cerró la conexión durante IDLE")
+                if b'EXISTS' in line:
+                    break
+        finally:
+            mail.send(b'DONE\r\n')
+            while True:
+                line = mail.readline()
+                if not line or line.startswith(tag):
+                    break
+            mail.tagged_commands.pop(tag, None)
+
+
+def obtener_codigo_2FA(email_address, password, sender_address, timeout=TWO_FACTOR_MAIL_TIMEOUT,
+                       poll_interval=WAIT_POLL_INTERVAL, watcher=None, submitted_at=None):
     """
     Obtiene el código de autenticación de dos factores desde Gmail.
     
-    Espera 20 segundos para que llegue el correo, se conecta a Gmail vía IMAP,
-    busca el último correo del remitente especificado y extrae el código 2FA.
+    Se conecta a Gmail vía IMAP y revisa la casilla hasta que aparece un correo
+    del remitente especificado que llegó después del envío del login (en lugar
+    de esperar 20 segundos fijos); luego extrae el código 2FA del último. Los
+    correos anteriores de la casilla se ignoran para no devolver un código viejo.
     
     Args:
         email_address: Dirección de Gmail del usuario.
         password: Contraseña de aplicación de Gmail.
         sender_address: Dirección del remitente que envía el código 2FA.
+        timeout: Tiempo máximo de espera del correo en ms.
+        poll_interval: Intervalo entre búsquedas en ms.
+        watcher: TwoFactorMailWatcher ya iniciado antes de enviar el login. Si se
+            indica, se usa en lugar de la búsqueda completa de la casilla.
+        submitted_at: Momento (epoch en segundos, time.time()) en que se envió el
+            formulario de login. Por defecto, el momento de la llamada.
         
     Returns:
         str | None: Código 2FA extraído del correo, o None si no se encuentra.
     """
-    time.sleep(20)
+    if watcher is not None:
+        try:
+            return watcher.wait_for_code(timeout)
+        except TimeoutError:
+            return None
+
+    since = time.time() if submitted_at is None else submitted_at
     mail = conectar_imap(email_address, password)
-    ids_correos = buscar_correos(mail, sender_address)
-    latest_email_id = ids_correos[-1] if ids_correos else None
-    if latest_email_id:
-        return extraer_y_eliminar_codigo_2fa(mail, latest_email_id)
-    return None
+    try:
+        try:
+            ids_correos = wait_until(
+                lambda: buscar_correos(mail, sender_address, since=since),
+                timeout=timeout,
+                interval=poll_interval,
+                flow="two_factor_mail",
+                baseline=LEGACY_SLEEPS["two_factor_mail"]
+            )
+        except TimeoutError:
+            return None
+        return extraer_y_eliminar_codigo_2fa(mail, ids_correos[-1])
+    finally:
+        try:
+            mail.logout()
+        except Exception as e:
+            logger.debug("Error al cerrar la sesión IMAP: %s", e)
@@ -0,0 +1,119 @@
+"""
+Micro-benchmark del extractor del código 2FA.
+
+Compara procesar_html (expresión regular sobre los bytes decodificados) con la
+búsqueda con BeautifulSoup que usaba antes, sobre un corpus de correos con la
+forma de los que envía Cocos: HTML de plantilla con tablas y estilos inline,
+codificado en base64 o quoted-printable dentro de un multipart/alternative.
+También mide el costo de importar bs4, que ya no se paga al importar
+CocosBot.services.auth.
+
+Usage:
+    python scripts/bench_2fa_extractor.py [--emails 200] [--repeat 5]
+"""
+
+import argparse
+import email
+import email.charset
+import os
+import random
+import subprocess
+import sys
+import time
+from email.mime.multipart import MIMEMultipart
+from email.mime.text import MIMEText
+
+# Add project root to path so we can import CocosBot
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from CocosBot.utils.gmail_2fa import procesar_html, _procesar_html_bs4
+
+ROW = (
+    '<tr><td style="padding: 8px 24px; font-family: Helvetica, Arial, sans-serif; font-size: 14px; '
+    'color: #4a4a4a; line-height: 20px;">{text}</td></tr>\n'
+)
+
+FILLER = [
+    "Recibimos un pedido de inicio de sesión en tu cuenta de Cocos.",
+    "Si no fuiste vos, cambiá tu contraseña y contactate con soporte.",
+    "Este código vence en 10 minutos y sólo puede usarse una vez.",
+    "Cocos Capital S.A. - Agente de Liquidación y Compensación Propio.",
+    "No respondas este correo; la casilla no recibe mensajes.",
+]
+
+
+def build_html(code: str, rng: random.Random) -> str:
+    """Arma un HTML con la estructura del correo de Cocos y el código en un span de 32px."""
+    rows = "".join(ROW.format(text=rng.choice(FILLER)) for _ in range(rng.randint(20, 60)))
+    code_row = (
+        '<tr><td align="center" style="padding: 24px;">'
+        f'<span style="font-family: Helvetica, Arial, sans-serif; font-size: 32px; letter-spacing: 8px; '
+        f'color: #0062e1; font-weight: 600;">{code}</span></td></tr>\n'
+    )
+    split = rng.randint(0, len(rows))
+    return (
+        '<!DOCTYPE html><html><head><meta charset="utf-8"><style>td{border:0}</style></head>'
+        '<body style="margin: 0; background: #f2f2f2;"><table width="100%" cellpadding="0" cellspacing="0">'
+        f'{rows[:split]}{code_row}{rows[split:]}</table></body></html>'
+    )
+
+
+def build_corpus(count: int, seed: int = 2024):
+    """Devuelve una lista de (código, bytes del HTML decodificado) extraídos de mensajes MIME."""
+    rng = random.Random(seed)
+    corpus = []
+    for _ in range(count):
+        code = f"{rng.randint(0, 999999):06d}"
+        message = MIMEMultipart("alternative")
+        message["From"] = "no-reply@cocos.capital"
+        message["Subject"] = "Tu código de verificación"
+        message.attach(MIMEText(f"Tu código es {code}", "plain", "utf-8"))
+        charset = email.charset.Charset("utf-8")
+        charset.body_encoding = email.charset.QP if rng.random() < 0.5 else email.charset.BASE64
+        message.attach(MIMEText(build_html(code, rng), "html", charset))
+        parsed = email.message_from_bytes(message.as_bytes())
+        payload = next(p for p in parsed.walk() if p.get_content_type() == "text/html").get_payload(decode=True)
+        corpus.append((code, payload))
+    return corpus
+
+
+def bench(extractor, corpus, repeat: int) -> float:
+    """Devuelve el mejor tiempo por correo (en µs) de repeat pasadas sobre el corpus."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for code, payload in corpus:
+            if extractor(payload) != code:
+                raise AssertionError(f"{extractor.__name__} no encontró {code}")
+        best = min(best, time.perf_counter() - start)
+    return best / len(corpus) * 1e6
+
+
+def import_time(module: str) -> float:
+    """Tiempo (ms) de importar un módulo en un intérprete nuevo."""
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True,
+                         cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return float(out.stdout) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--emails", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    corpus = build_corpus(args.emails)
+    size = sum(len(payload) for _, payload in corpus) / len(corpus)
+    regex_us = bench(procesar_html, corpus, args.repeat)
+    bs4_us = bench(_procesar_html_bs4, corpus, args.repeat)
+
+    print(f"Corpus: {len(corpus)} correos, {size / 1024:.1f} KiB de HTML promedio")
+    print(f"procesar_html (regex):  {regex_us:10.1f} µs/correo")
+    print(f"BeautifulSoup:          {bs4_us:10.1f} µs/correo  ({bs4_us / regex_us:.0f}x)")
+    print(f"import CocosBot.services.auth: {import_time('CocosBot.services.auth'):.1f} ms")
+    print(f"import bs4 (ya no incluido):   {import_time('bs4'):.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""
+Benchmark de punta a punta contra la web app y la API falsas de tests/fake_server.py.
+
+Levanta el servidor local con la latencia indicada, apunta CocosBot a él
+(COCOSBOT_WEB_APP_ROOT / COCOSBOT_API_ROOT) y mide con un navegador real
+login, fetch_data, get_ticker_info, create_order y cancel_order. El código 2FA
+lo da el servidor, así que no se abre IMAP. Necesita Chromium de Playwright
+(playwright install chromium).
+
+El resultado (mediana, p95, mínimo y máximo por operación, las etapas medidas
+por el tracer y los requests que recibió el servidor) se escribe en un JSON.
+Con --baseline se compara con una corrida anterior y el script termina con
+código 1 si alguna mediana empeoró más que --threshold.
+
+Usage:
+    python scripts/bench_end_to_end.py [--repeat 5] [--latency-ms 80] [--endpoint-latency orders=300]
+        [--direct-api] [--output bench_e2e.json] [--baseline bench_anterior.json] [--threshold 0.2]
+"""
+
+import argparse
+import importlib
+import json
+import math
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from unittest.mock import patch
+
+# Add project root to path so we can import CocosBot
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import CocosBot.config.urls
+from CocosBot.config.enums import MarketType, OrderOperation
+from tests.fake_server import FakeCocosServer
+
+OPERATIONS = ("login", "fetch_data", "get_ticker_info", "create_order", "cancel_order")
+
+
+class FakeMailWatcher:
+    """Reemplazo del watcher IMAP: el código 2FA sale del servidor local."""
+
+    def __init__(self, email_address, *args, **kwargs):
+        self.email_address = email_address
+
+    def start(self):
+        return self
+
+    def close(self):
+        pass
+
+
+def percentile(samples, q: float) -> float:
+    """Percentil por rango más cercano (sin interpolar, para pocas muestras)."""
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(q * len(ordered)) - 1)]
+
+
+def summarize(samples, failures: int) -> dict:
+    """Estadísticas (ms) de las muestras de una operación."""
+    if not samples:
+        return {"count": 0, "failures": failures}
+    return {
+        "count": len(samples),
+        "failures": failures,
+        "median_ms": statistics.median(samples),
+        "p95_ms": percentile(samples, 0.95),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+        "samples_ms": [round(sample, 3) for sample in samples],
+    }
+
+
+def git_commit():
+    """Commit actual del repositorio, o None si no se puede leer."""
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, cwd=ROOT)
+        return out.stdout.strip() or None
+    except OSError:
+        return None
+
+
+def run_operations(cocos, server, repeat: int, direct_api: bool, record: bool, results: dict) -> None:
+    """
+    Ejecuta cada operación repeat veces y agrega la duración (ms) de las exitosas a results.
+
+    Cada pasada usa montos distintos para que la fila de la orden a cancelar sea
+    única en la tabla de órdenes.
+    """
+    from CocosBot.config.urls import API_URLS, WEB_APP_URLS
+
+    for _ in range(repeat):
+        serial = len(server.orders)
+        amount = 1000 + serial
+        order = server.add_order("GGAL", amount=5000 + serial, quantity=1)
+        flows = {
+            "login": cocos.login,
+            "fetch_data": lambda: cocos.fetch_data(API_URLS["portfolio_data"], WEB_APP_URLS["portfolio"]),
+            "get_ticker_info": lambda: cocos.get_ticker_info("GGAL", MarketType.STOCKS),
+            "create_order": lambda: cocos.create_order("GGAL", OrderOperation.BUY, amount, limit=1500),
+            "cancel_order": (lambda: cocos.cancel_order(order["id"])) if direct_api else
+                            (lambda: cocos.cancel_order(order["amount"], order["quantity"])),
+        }
+        for name in OPERATIONS:
+            start = time.perf_counter()
+            try:
+                ok = flows[name]()
+            except Exception as e:
+                print(f"  {name}: error {e}")
+                ok = False
+            elapsed = (time.perf_counter() - start) * 1000
+            if not record:
+                continue
+            if ok:
+                results[name]["samples"].append(elapsed)
+            else:
+                results[name]["failures"] += 1
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Imprime la mediana de cada operación contra la corrida anterior.
+
+    Returns:
+        list: Operaciones cuya mediana empeoró más que threshold.
+    """
+    regressions = []
+    print(f"{'operación':<16}{'antes (ms)':>12}{'ahora (ms)':>12}{'cambio':>10}")
+    for name, stats in current["operations"].items():
+        before = baseline.get("operations", {}).get(name, {}).get("median_ms")
+        now = stats.get("median_ms")
+        if not before or now is None:
+            print(f"{name:<16}{'-':>12}{now if now is not None else '-':>12}")
+            continue
+        change = now / before - 1
+        flag = "  <-- regresión" if change > threshold else ""
+        print(f"{name:<16}{before:>12.1f}{now:>12.1f}{change:>+10.1%}{flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--warmup", type=int, default=1, help="Pasadas previas que no se registran.")
+    parser.add_argument("--latency-ms", type=float, default=80.0, help="Latencia de cada endpoint de la API.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--endpoint-latency", action="append", default=[], metavar="CLAVE=MS",
+                        help="Latencia de una entrada de API_URLS (se puede repetir).")
+    parser.add_argument("--direct-api", action="store_true", help="Usa el modo de API directa (direct_api=True).")
+    parser.add_argument("--headed", action="store_true", help="Muestra el navegador.")
+    parser.add_argument("--seed", type=int, default=2024)
+    parser.add_argument("--output", default="bench_e2e.json")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para comparar.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Empeoramiento tolerado de la mediana.")
+    args = parser.parse_args()
+
+    endpoint_latency = {key: float(ms) for key, ms in (item.split("=", 1) for item in args.endpoint_latency)}
+    server = FakeCocosServer(latency_ms=args.latency_ms, endpoint_latency_ms=endpoint_latency,
+                             jitter_ms=args.jitter_ms, seed=args.seed).start()
+    # Las URLs se arman al importar: se recalculan antes de importar el resto de CocosBot
+    os.environ.update(server.environ())
+    importlib.reload(CocosBot.config.urls)
+    from CocosBot.core.cocos_capital import CocosCapital
+
+    results = {name: {"samples": [], "failures": 0} for name in OPERATIONS}
+    try:
+        with patch("CocosBot.services.auth.TwoFactorMailWatcher", FakeMailWatcher), \
+                patch("CocosBot.services.auth.obtener_codigo_2FA", return_value=server.two_factor_code):
+            cocos = CocosCapital("bench@example.com", "bench", "bench@gmail.com", "bench",
+                                 headless=not args.headed, direct_api=args.direct_api)
+            try:
+                run_operations(cocos, server, args.warmup, args.direct_api, False, results)
+                cocos.tracer.reset()
+                run_operations(cocos, server, args.repeat, args.direct_api, True, results)
+                stages = cocos.tracer.summary()
+            finally:
+                cocos.close_browser()
+    finally:
+        server.stop()
+
+    report = {
+        "meta": {
+            "timestamp": time.time(), "git_commit": git_commit(), "python": platform.python_version(),
+            "platform": platform.platform(), "repeat": args.repeat, "warmup": args.warmup,
+            "latency_ms": args.latency_ms, "jitter_ms": args.jitter_ms, "endpoint_latency_ms": endpoint_latency,
+            "direct_api": args.direct_api, "headless": not args.headed,
+        },
+        "operations": {name: summarize(r["samples"], r["failures"]) for name, r in results.items()},
+        "stages": stages,
+        "server_hits": dict(server.hits),
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Resultados en {args.output}")
+
+    for name, stats in report["operations"].items():
+        if stats["count"]:
+            print(f"{name:<16} mediana {stats['median_ms']:8.1f} ms   p95 {stats['p95_ms']:8.1f} ms"
+                  f"   fallas {stats['failures']}")
+        else:
+            print(f"{name:<16} sin muestras exitosas ({stats['failures']} fallas)")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"Regresiones: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Benchmark del arranque: importar CocosBot, construir CocosCapital y lanzar Chromium.
+
+Cada medición corre en un intérprete nuevo, así que incluye el costo real de
+importar los módulos (Playwright ya no se importa hasta lanzar el navegador).
+Construir CocosCapital no lanza Chromium; con --launch también se mide
+start(), que sí lo hace y necesita Chromium de Playwright
+(playwright install chromium).
+
+El resultado (mediana, mínimo y máximo por etapa, y los módulos pesados que
+quedaron importados después de construir el cliente) se escribe en un JSON.
+Con --baseline se compara con una corrida anterior y el script termina con
+código 1 si alguna mediana empeoró más que --threshold.
+
+Usage:
+    python scripts/bench_startup.py [--repeat 10] [--launch] [--output bench_startup.json]
+        [--baseline bench_startup_anterior.json] [--threshold 0.2]
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Módulos de terceros que no deberían cargarse sólo por construir el cliente
+HEAVY_MODULES = ("playwright", "bs4")
+
+PROBE = """
+import json, sys, time
+t0 = time.perf_counter()
+from CocosBot.core.cocos_capital import CocosCapital
+t1 = time.perf_counter()
+cocos = CocosCapital("bench@example.com", "bench", "bench@gmail.com", "bench", headless=True)
+t2 = time.perf_counter()
+heavy = sorted({{name.split(".")[0] for name in sys.modules}} & set({heavy!r}))
+result = {{"import_ms": (t1 - t0) * 1000, "construct_ms": (t2 - t1) * 1000, "heavy_modules": heavy}}
+if {launch!r}:
+    cocos.start()
+    result["launch_ms"] = (time.perf_counter() - t2) * 1000
+cocos.close_browser()
+print(json.dumps(result))
+"""
+
+
+def probe(launch: bool) -> dict:
+    """Mide el arranque en un intérprete nuevo."""
+    code = PROBE.format(heavy=HEAVY_MODULES, launch=launch)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True, cwd=ROOT)
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def summarize(samples) -> dict:
+    """Estadísticas (ms) de las muestras de una etapa."""
+    return {
+        "median_ms": statistics.median(samples),
+        "min_ms": min(samples),
+        "max_ms": max(samples),
+        "samples_ms": [round(sample, 3) for sample in samples],
+    }
+
+
+def compare(current: dict, baseline: dict, threshold: float) -> list:
+    """
+    Imprime la mediana de cada etapa contra la corrida anterior.
+
+    Returns:
+        list: Etapas cuya mediana empeoró más que threshold.
+    """
+    regressions = []
+    for name, stats in current["stages"].items():
+        before = baseline.get("stages", {}).get(name, {}).get("median_ms")
+        if not before:
+            continue
+        change = stats["median_ms"] / before - 1
+        flag = "  <-- regresión" if change > threshold else ""
+        print(f"{name:<14}{before:>10.1f}{stats['median_ms']:>10.1f}{change:>+10.1%}{flag}")
+        if change > threshold:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--launch", action="store_true", help="También mide el lanzamiento de Chromium.")
+    parser.add_argument("--output", default="bench_startup.json")
+    parser.add_argument("--baseline", help="JSON de una corrida anterior para comparar.")
+    parser.add_argument("--threshold", type=float, default=0.2, help="Empeoramiento tolerado de la mediana.")
+    args = parser.parse_args()
+
+    runs = [probe(args.launch) for _ in range(args.repeat)]
+    stages = [name for name in ("import_ms", "construct_ms", "launch_ms") if name in runs[0]]
+    report = {
+        "meta": {"timestamp": time.time(), "python": platform.python_version(), "platform": platform.platform(),
+                 "repeat": args.repeat, "launch": args.launch},
+        "stages": {name[:-3]: summarize([run[name] for run in runs]) for name in stages},
+        "heavy_modules": runs[0]["heavy_modules"],
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"Resultados en {args.output}")
+
+    for name, stats in report["stages"].items():
+        print(f"{name:<14} mediana {stats['median_ms']:8.1f} ms   mín {stats['min_ms']:8.1f} ms")
+    if report["heavy_modules"]:
+        print(f"Módulos pesados importados al construir: {', '.join(report['heavy_modules'])}")
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(report, json.load(f), args.threshold)
+        if regressions:
+            print(f"Regresiones: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
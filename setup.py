@@ -20,6 +20,9 @@ setup(
         "playwright>=1.0.0",
         "beautifulsoup4"
     ],
+    extras_require={
+        "numpy": ["numpy"],
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -36,3 +36,8 @@ class TestGeneralConfig:
     def test_retry_delay_value(self):
         """Test RETRY_DELAY has expected value."""
         assert general.RETRY_DELAY == 1000
+
+    def test_step_log_level_is_a_level_name(self):
+        """Test STEP_LOG_LEVEL names a logging level."""
+        import logging
+        assert isinstance(logging.getLevelName(general.STEP_LOG_LEVEL.upper()), int)
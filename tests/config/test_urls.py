@@ -156,3 +156,27 @@ class TestApiUrls:
         """Test that all API URLs start with API_ROOT."""
         for key, url in urls.API_URLS.items():
             assert url.startswith(urls.API_ROOT), f"{key} URL doesn't start with API_ROOT"
+
+    def test_dashboard_api_keys_exist(self):
+        """Test that every dashboard endpoint key is defined in API_URLS."""
+        for key in urls.DASHBOARD_API_KEYS:
+            assert key in urls.API_URLS
+
+
+class TestRootOverrides:
+    """Tests for the environment overrides of the base URLs."""
+
+    def test_roots_can_point_to_a_local_server(self, monkeypatch):
+        """Test that the roots (and every URL built on them) follow the environment."""
+        import importlib
+        monkeypatch.setenv("COCOSBOT_WEB_APP_ROOT", "http://127.0.0.1:8000/")
+        monkeypatch.setenv("COCOSBOT_API_ROOT", "http://127.0.0.1:8000/api")
+        try:
+            reloaded = importlib.reload(urls)
+            assert reloaded.WEB_APP_URLS["login"] == "http://127.0.0.1:8000/login"
+            assert reloaded.API_URLS["orders"] == "http://127.0.0.1:8000/api/orders"
+        finally:
+            monkeypatch.delenv("COCOSBOT_WEB_APP_ROOT")
+            monkeypatch.delenv("COCOSBOT_API_ROOT")
+            importlib.reload(urls)
+        assert urls.API_ROOT == "https://api.cocos.capital/api"
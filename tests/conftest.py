@@ -1,6 +1,13 @@
 """Shared fixtures for CocosBot tests."""
 import pytest
-from unittest.mock import Mock, MagicMock
+from unittest.mock import Mock, MagicMock, patch
+
+
+@pytest.fixture(autouse=True)
+def mail_watcher():
+    """Keep login tests off the network: the 2FA mail watcher never opens IMAP."""
+    with patch('CocosBot.services.auth.TwoFactorMailWatcher') as watcher_cls:
+        yield watcher_cls
 
 
 @pytest.fixture
@@ -13,6 +20,8 @@ def mock_browser():
     browser = Mock()
     browser.page = Mock()
     browser.page.locator = Mock(return_value=Mock())
+    browser.waits = MagicMock()
+    browser.instruments = None
     return browser
 
 
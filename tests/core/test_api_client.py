@@ -0,0 +1,226 @@
+"""Tests for CocosBot.core.api_client"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from unittest.mock import patch
+from CocosBot.core.api_client import ApiClient, ApiClientError, KEEPALIVE_IDLE_LIMIT
+
+
+class _StubHandler(BaseHTTPRequestHandler):
+    """Minimal stand-in for api.cocos.capital"""
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _reply(self, status, body):
+        raw = body if isinstance(body, bytes) else json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        server = self.server
+        server.requests.append((self.command, self.path, dict(self.headers)))
+        server.client_ports.add(self.client_address[1])
+        if self.path.startswith("/api/v2/users/me"):
+            self._reply(200, {"id": 1, "name": "Test"})
+        elif self.path.startswith("/api/empty"):
+            self._reply(200, b"")
+        elif self.path.startswith("/api/html"):
+            self._reply(200, b"<html></html>")
+        else:
+            self._reply(401, {"error": "unauthorized"})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        payload = json.loads(self.rfile.read(length))
+        self.server.requests.append((self.command, self.path, dict(self.headers)))
+        self._reply(200, {"received": payload})
+
+    def do_DELETE(self):
+        self.server.requests.append((self.command, self.path, dict(self.headers)))
+        self._reply(204, b"")
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _StubHandler)
+    server.requests = []
+    server.client_ports = set()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def base_url(stub_server):
+    return f"http://127.0.0.1:{stub_server.server_address[1]}/api"
+
+
+class TestSession:
+    """Tests for header and cookie capture"""
+
+    def test_not_authenticated_by_default(self):
+        assert ApiClient().is_authenticated is False
+
+    def test_update_headers_keeps_auth_and_custom_headers(self):
+        client = ApiClient()
+        client.update_headers({
+            "Authorization": "Bearer abc",
+            "apikey": "key",
+            "X-Account-Id": "42",
+            "User-Agent": "Chrome",
+        })
+
+        assert client.headers == {"authorization": "Bearer abc", "apikey": "key", "x-account-id": "42"}
+        assert client.is_authenticated is True
+
+    def test_update_headers_ignores_requests_without_auth(self):
+        client = ApiClient()
+        client.update_headers({"accept": "*/*"})
+
+        assert client.headers == {}
+
+
+class TestRequests:
+    """Tests against a local stub server"""
+
+    def test_get_json_sends_session(self, stub_server, base_url):
+        client = ApiClient()
+        client.update_headers({"authorization": "Bearer abc"})
+        client.set_cookies([
+            {"name": "sid", "value": "1", "domain": "127.0.0.1"},
+            {"name": "other", "value": "2", "domain": ".example.com"},
+        ])
+
+        result = client.get_json(f"{base_url}/v2/users/me")
+
+        assert result == {"id": 1, "name": "Test"}
+        _, path, headers = stub_server.requests[0]
+        assert path == "/api/v2/users/me"
+        assert headers["authorization"] == "Bearer abc"
+        assert headers["Cookie"] == "sid=1"
+
+    @pytest.mark.parametrize("host, domain, matches", [
+        ("api.cocos.capital", "cocos.capital", True),
+        ("cocos.capital", "cocos.capital", True),
+        ("evilcocos.capital", "cocos.capital", False),
+        ("cocos.capital.evil.com", "cocos.capital", False),
+    ])
+    def test_cookie_domain_match(self, host, domain, matches):
+        assert ApiClient._domain_matches(host, domain) is matches
+
+    def test_connection_error_keeps_cause(self):
+        client = ApiClient()
+
+        with pytest.raises(ApiClientError) as error:
+            client.get_json("http://127.0.0.1:9/nothing")
+
+        assert isinstance(error.value.__cause__, ConnectionError)
+
+    def test_connection_is_reused(self, stub_server, base_url):
+        client = ApiClient()
+        for _ in range(3):
+            client.get_json(f"{base_url}/v2/users/me")
+
+        assert len(stub_server.client_ports) == 1
+        client.close()
+
+    def test_close_thread_connections(self, stub_server, base_url):
+        client = ApiClient()
+        client.get_json(f"{base_url}/v2/users/me")
+
+        client.close_thread_connections()
+        client.get_json(f"{base_url}/v2/users/me")
+
+        assert len(stub_server.client_ports) == 2
+        assert len(client._connections) == 1
+        client.close()
+
+    def test_non_2xx_raises(self, base_url):
+        client = ApiClient()
+
+        with pytest.raises(ApiClientError) as exc_info:
+            client.get_json(f"{base_url}/orders")
+
+        assert exc_info.value.status == 401
+
+    def test_non_json_raises(self, base_url):
+        with pytest.raises(ApiClientError):
+            ApiClient().get_json(f"{base_url}/html")
+
+    def test_empty_body_returns_none(self, base_url):
+        assert ApiClient().get_json(f"{base_url}/empty") is None
+
+    def test_post_json(self, stub_server, base_url):
+        result = ApiClient().post_json(f"{base_url}/orders", {"ticker": "GGAL"})
+
+        assert result == {"received": {"ticker": "GGAL"}}
+        assert stub_server.requests[0][2]["Content-Type"] == "application/json"
+
+    def test_delete(self, stub_server, base_url):
+        assert ApiClient().delete(f"{base_url}/orders/1") is None
+        assert stub_server.requests[0][:2] == ("DELETE", "/api/orders/1")
+
+    def test_connection_error_raises(self):
+        client = ApiClient(timeout=500)
+
+        with pytest.raises((ApiClientError, OSError)):
+            client.get_json("http://127.0.0.1:1/api/v2/users/me")
+
+
+class TestNonIdempotentRequests:
+    """Tests for POST connection handling"""
+
+    def test_post_is_not_retried_on_connection_error(self, base_url):
+        client = ApiClient()
+
+        with patch("http.client.HTTPConnection.request", side_effect=ConnectionResetError("reset")) as mock_request:
+            with pytest.raises(ApiClientError):
+                client.post_json(f"{base_url}/orders", {"ticker": "GGAL"})
+
+        assert mock_request.call_count == 1
+
+    def test_get_is_retried_on_connection_error(self, base_url):
+        client = ApiClient()
+
+        with patch("http.client.HTTPConnection.request", side_effect=ConnectionResetError("reset")) as mock_request:
+            with pytest.raises(ApiClientError):
+                client.get_json(f"{base_url}/v2/users/me")
+
+        assert mock_request.call_count == 2
+
+    @pytest.mark.parametrize("method, payload", [("GET", None), ("POST", {"ticker": "GGAL"})])
+    def test_timeout_drops_connection_without_retry(self, method, payload, stub_server, base_url):
+        client = ApiClient()
+        client.get_json(f"{base_url}/v2/users/me")
+        key = ("http", f"127.0.0.1:{stub_server.server_address[1]}")
+        used = client._local.pool[key]
+
+        with patch("http.client.HTTPConnection.getresponse", side_effect=TimeoutError("timed out")) as mock_get:
+            with pytest.raises(ApiClientError) as error:
+                client.request(method, f"{base_url}/orders", payload)
+
+        assert isinstance(error.value.__cause__, TimeoutError)
+        assert mock_get.call_count == 1
+        assert key not in client._local.pool and used not in client._connections
+        assert client.post_json(f"{base_url}/orders", {"ticker": "GGAL"}) == {"received": {"ticker": "GGAL"}}
+
+    def test_post_after_idle_opens_fresh_connection(self, stub_server, base_url):
+        client = ApiClient()
+        client.get_json(f"{base_url}/v2/users/me")
+        key = ("http", f"127.0.0.1:{stub_server.server_address[1]}")
+        stale = client._local.pool[key]
+        client._local.last_used[key] -= KEEPALIVE_IDLE_LIMIT + 1
+
+        client.post_json(f"{base_url}/orders", {"ticker": "GGAL"})
+
+        assert client._local.pool[key] is not stale
+        assert client._idle_time(*key) < 1
@@ -0,0 +1,354 @@
+"""Tests for CocosBot.core.async_browser"""
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
+from CocosBot.core.async_browser import AsyncPlaywrightBrowser
+from CocosBot.core.api_client import ApiClientError
+
+
+def _awaitable(value):
+    future = asyncio.get_running_loop().create_future()
+    future.set_result(value)
+    return future
+
+
+def _make_page(response=None):
+    """Build an async page mock whose expect_response yields `response`."""
+    page = AsyncMock()
+    page.on = Mock()
+    page.locator = Mock(return_value=AsyncMock())
+    info = Mock()
+    cm = MagicMock()
+
+    async def enter(*args):
+        info.value = _awaitable(response)
+        return info
+    cm.__aenter__.side_effect = enter
+    cm.__aexit__.return_value = False
+    page.expect_response = Mock(return_value=cm)
+    return page
+
+
+@pytest.fixture
+def mock_async_playwright():
+    with patch('CocosBot.core.async_browser.async_playwright') as mock_ap:
+        mock_pw = AsyncMock()
+        mock_browser = AsyncMock()
+        mock_context = AsyncMock()
+        mock_context.on = Mock()
+        mock_page = _make_page()
+        mock_pw.chromium.launch.return_value = mock_browser
+        mock_browser.new_context.return_value = mock_context
+        mock_context.new_page.return_value = mock_page
+        mock_ap.return_value.start = AsyncMock(return_value=mock_pw)
+        yield mock_pw, mock_browser, mock_context, mock_page
+
+
+class TestLifecycle:
+    """Tests for start/close and async context manager"""
+
+    def test_constructor_does_not_start(self, mock_async_playwright):
+        browser = AsyncPlaywrightBrowser()
+
+        assert browser.page is None
+
+    def test_async_with_starts_and_closes(self, mock_async_playwright):
+        mock_pw, mock_browser, mock_context, mock_page = mock_async_playwright
+
+        async def run():
+            async with AsyncPlaywrightBrowser(headless=True) as browser:
+                assert browser.page is mock_page
+            return browser
+
+        asyncio.run(run())
+
+        mock_pw.chromium.launch.assert_awaited_once_with(headless=True)
+        mock_browser.close.assert_awaited_once()
+        mock_pw.stop.assert_awaited_once()
+
+    def test_start_is_idempotent(self, mock_async_playwright):
+        mock_pw = mock_async_playwright[0]
+
+        async def run():
+            browser = AsyncPlaywrightBrowser()
+            await browser.start()
+            await browser.start()
+            await browser.close_browser()
+            await browser.close_browser()
+
+        asyncio.run(run())
+
+        mock_pw.chromium.launch.assert_awaited_once()
+        mock_pw.stop.assert_awaited_once()
+
+    def test_restores_session_and_captures_headers(self, mock_async_playwright, tmp_path):
+        _, mock_browser, mock_context, _ = mock_async_playwright
+        session_file = tmp_path / "session.json"
+        session_file.write_text("{}")
+
+        async def run():
+            browser = AsyncPlaywrightBrowser(direct_api=True, storage_state=str(session_file))
+            await browser.start()
+            return browser
+
+        browser = asyncio.run(run())
+
+        mock_browser.new_context.assert_awaited_once_with(storage_state=str(session_file))
+        mock_context.on.assert_any_call("request", browser._capture_api_headers)
+        mock_context.on.assert_any_call("response", browser._observe_tokens)
+        assert browser.session_restored is True
+
+    def test_observe_tokens(self, mock_async_playwright):
+        browser = AsyncPlaywrightBrowser()
+        browser.tokens = Mock()
+        token = AsyncMock(url="https://api.cocos.capital/api/auth/v1/token?grant_type=password", status=200)
+        token.json.return_value = {"access_token": "a"}
+        broken = AsyncMock(url=token.url, status=200)
+        broken.json.side_effect = ValueError("not json")
+        other = AsyncMock(url="https://api.cocos.capital/api/v2/users/me", status=200)
+
+        async def run():
+            for response in (token, broken, other):
+                await browser._observe_tokens(response)
+
+        asyncio.run(run())
+
+        browser.tokens.update.assert_called_once_with({"access_token": "a"})
+        other.json.assert_not_awaited()
+
+    def test_observe_instruments(self, mock_async_playwright):
+        _, _, mock_context, _ = mock_async_playwright
+        listing = AsyncMock(url="https://api.cocos.capital/api/v1/markets/tickers/?instrument_type=CEDEARS&page=1",
+                            status=200)
+        listing.json.return_value = [{"short_ticker": "AAPL"}]
+        unknown = AsyncMock(url="https://api.cocos.capital/api/v1/markets/tickers/?instrument_type=OTRO", status=200)
+        broken = AsyncMock(url=listing.url, status=200)
+        broken.json.side_effect = ValueError("not json")
+
+        async def run():
+            browser = await AsyncPlaywrightBrowser(instrument_master=True).start()
+            browser.instruments.path = None
+            for response in (listing, unknown, broken):
+                await browser._observe_instruments(response)
+            return browser
+
+        with patch('CocosBot.core.async_browser.InstrumentMaster.load'):
+            browser = asyncio.run(run())
+
+        mock_context.on.assert_any_call("response", browser._observe_instruments)
+        assert browser.instruments.lookup("AAPL").market_type == "CEDEARS"
+        unknown.json.assert_not_awaited()
+
+    def test_save_storage_state(self, mock_async_playwright, tmp_path):
+        _, _, mock_context, _ = mock_async_playwright
+        path = tmp_path / "session.json"
+        mock_context.storage_state.side_effect = lambda path: open(path, "w").close()
+
+        async def run():
+            browser = await AsyncPlaywrightBrowser().start()
+            await browser.save_storage_state(str(path))
+
+        asyncio.run(run())
+
+        assert path.stat().st_mode & 0o777 == 0o600
+
+
+class TestPageActions:
+    """Tests for the awaitable page helpers"""
+
+    def test_form_helpers(self, mock_async_playwright):
+        mock_page = mock_async_playwright[3]
+
+        async def run():
+            browser = await AsyncPlaywrightBrowser().start()
+            await browser.go_to("https://example.com")
+            await browser.search_and_select("input#search", "GGAL", "li.item-{}", "Select")
+            await browser.fill_input_with_delay("input#price", "12", delay=0.01)
+            await browser.take_screenshot("shot.png")
+
+        asyncio.run(run())
+
+        mock_page.goto.assert_awaited_once_with("https://example.com")
+        mock_page.fill.assert_awaited_once_with("input#search", "GGAL")
+        mock_page.click.assert_awaited_once_with("li.item-GGAL")
+        mock_page.locator.return_value.type.assert_awaited_once_with("12", delay=10)
+        mock_page.wait_for_function.assert_awaited_once()
+        mock_page.screenshot.assert_awaited_once_with(path="shot.png")
+
+    def test_type_code(self, mock_async_playwright):
+        mock_page = mock_async_playwright[3]
+
+        async def run():
+            browser = await AsyncPlaywrightBrowser().start()
+            await browser.type_code("input#input0", "123456", "input#input5", log_message="Code")
+
+        asyncio.run(run())
+
+        mock_page.focus.assert_awaited_once_with("input#input0")
+        mock_page.keyboard.type.assert_awaited_once_with("123456")
+        assert mock_page.wait_for_function.call_args.kwargs["arg"] == ["input#input5", "6"]
+
+    def test_process_response(self, mock_async_playwright):
+        ok = AsyncMock(status=200)
+        ok.json.return_value = {"a": 1}
+        failed = AsyncMock(status=500)
+        broken = AsyncMock(status=200)
+        broken.json.side_effect = Exception("bad json")
+
+        async def run():
+            browser = AsyncPlaywrightBrowser()
+            return [await browser.process_response(r, "ok") for r in (ok, failed, broken)]
+
+        assert asyncio.run(run()) == [{"a": 1}, None, None]
+
+
+class TestFetchData:
+    """Tests for AsyncPlaywrightBrowser.fetch_data"""
+
+    def _run(self, mock_async_playwright, response, **kwargs):
+        _, _, mock_context, _ = mock_async_playwright
+        temp_page = _make_page(response)
+
+        async def run():
+            browser = await AsyncPlaywrightBrowser().start()
+            mock_context.new_page.return_value = temp_page
+            return await browser.fetch_data("https://api.example.com/data", "https://example.com/page", **kwargs)
+
+        return asyncio.run(run()), temp_page
+
+    def test_uses_temporary_page(self, mock_async_playwright):
+        response = AsyncMock(status=200)
+        response.json.return_value = {"total": 3}
+
+        result, temp_page = self._run(mock_async_playwright, response, process_response=lambda d: d["total"])
+
+        assert result == 3
+        temp_page.goto.assert_awaited_once_with("https://example.com/page")
+        temp_page.close.assert_awaited_once()
+
+    def test_non_200(self, mock_async_playwright):
+        result, temp_page = self._run(mock_async_playwright, AsyncMock(status=404))
+
+        assert result is None
+        temp_page.close.assert_awaited_once()
+
+    def test_invalid_json(self, mock_async_playwright):
+        response = AsyncMock(status=200)
+        response.json.side_effect = Exception("bad json")
+
+        result, _ = self._run(mock_async_playwright, response)
+
+        assert result is None
+
+    def test_navigation_error(self, mock_async_playwright):
+        _, _, mock_context, _ = mock_async_playwright
+        temp_page = _make_page()
+        temp_page.goto.side_effect = Exception("net::ERR")
+
+        async def run():
+            browser = await AsyncPlaywrightBrowser().start()
+            mock_context.new_page.return_value = temp_page
+            return await browser.fetch_data("https://api.example.com/data", "https://example.com/page")
+
+        assert asyncio.run(run()) is None
+        temp_page.close.assert_awaited_once()
+
+    def test_page_pool_reuses_pages(self, mock_async_playwright):
+        _, _, mock_context, _ = mock_async_playwright
+        response = AsyncMock(status=200)
+        response.json.return_value = {"total": 3}
+        pooled_page = _make_page(response)
+
+        async def run():
+            browser = await AsyncPlaywrightBrowser(page_pool_size=2).start()
+            mock_context.new_page.return_value = pooled_page
+            results = [await browser.fetch_data("https://api.example.com/data", "https://example.com/page")
+                       for _ in range(3)]
+            stats = browser.page_pool.stats()
+            await browser.close_browser()
+            return results, stats
+
+        results, stats = asyncio.run(run())
+
+        assert results == [{"total": 3}] * 3
+        assert stats["created"] == 1
+        assert stats["checkouts"] == 3
+        pooled_page.close.assert_awaited_once()
+
+    def test_concurrent_fetches(self, mock_async_playwright):
+        _, _, mock_context, _ = mock_async_playwright
+        responses = []
+        for value in ({"a": 1}, {"b": 2}):
+            response = AsyncMock(status=200)
+            response.json.return_value = value
+            responses.append(_make_page(response))
+
+        async def run():
+            browser = await AsyncPlaywrightBrowser().start()
+            mock_context.new_page.side_effect = responses
+            return await asyncio.gather(
+                browser.fetch_data("https://api/a", "https://app/a"),
+                browser.fetch_data("https://api/b", "https://app/b"),
+            )
+
+        assert asyncio.run(run()) == [{"a": 1}, {"b": 2}]
+
+    def test_direct_api(self, mock_async_playwright):
+        mock_page = mock_async_playwright[3]
+
+        async def run():
+            browser = await AsyncPlaywrightBrowser(direct_api=True).start()
+            browser.api_client = Mock(is_authenticated=True)
+            browser.api_client.get_json.return_value = {"direct": True}
+            return await browser.fetch_data("https://api.example.com/data", "https://example.com/page")
+
+        assert asyncio.run(run()) == {"direct": True}
+        mock_page.goto.assert_not_awaited()
+
+    def test_direct_api_fallback(self, mock_async_playwright):
+        response = AsyncMock(status=200)
+        response.json.return_value = {"intercepted": True}
+        _, _, mock_context, _ = mock_async_playwright
+        temp_page = _make_page(response)
+
+        async def run():
+            browser = await AsyncPlaywrightBrowser(direct_api=True).start()
+            browser.api_client = Mock(is_authenticated=True)
+            browser.api_client.get_json.side_effect = ApiClientError("401", status=401)
+            browser.api_client.update_headers = Mock()
+            browser._capture_api_headers(Mock(url="https://api.cocos.capital/api/x", headers={"a": "b"}))
+            mock_context.cookies.return_value = []
+            assert await browser.capture_api_session() is True
+            mock_context.new_page.return_value = temp_page
+            return await browser.fetch_data("https://api.example.com/data", "https://example.com/page")
+
+        assert asyncio.run(run()) == {"intercepted": True}
+
+    def test_capture_api_session_disabled(self, mock_async_playwright):
+        assert asyncio.run(AsyncPlaywrightBrowser().capture_api_session()) is False
+
+
+class TestTrafficArchiveOption:
+    """Tests for the record and replay options"""
+
+    def test_record_and_replay(self, mock_async_playwright, tmp_path):
+        from CocosBot.config.urls import API_URLS
+        _, _, mock_context, mock_page = mock_async_playwright
+        path = tmp_path / "session.jsonl"
+        path.write_text('{"key": "user_data", "method": "GET", "url": "%s", "status": 200, '
+                        '"content_type": "application/json", "body": {"id": 3}, "timestamp": 0}\n'
+                        % API_URLS["user_data"])
+
+        async def run():
+            browser = await AsyncPlaywrightBrowser(record=str(tmp_path / "new.har"), replay=str(path)).start()
+            data = await browser.fetch_data(API_URLS["user_data"], "https://app.cocos.capital/")
+            await browser.close_browser()
+            return browser, data
+
+        browser, data = asyncio.run(run())
+
+        assert data == {"id": 3}
+        mock_context.route.assert_awaited_once_with(browser.replay.matches, browser.replay._handle_route_async)
+        mock_context.on.assert_any_call("response", browser.recorder.observe_async)
+        mock_page.goto.assert_not_awaited()
+        assert (tmp_path / "new.har").exists()
@@ -0,0 +1,110 @@
+"""Tests for CocosBot.core.async_cocos_capital"""
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, Mock
+from CocosBot.config.enums import Currency, OrderOperation, MarketType
+from CocosBot.core.async_cocos_capital import AsyncCocosCapital
+
+
+@pytest.fixture
+def cocos():
+    cc = AsyncCocosCapital("user@test.com", "pass123", "gmail@test.com", "app_pass")
+    cc.auth = AsyncMock()
+    cc.market = AsyncMock()
+    cc.user = AsyncMock()
+    return cc
+
+
+class TestAsyncCocosCapital:
+    """Tests for AsyncCocosCapital delegation"""
+
+    def test_init_validates_credentials(self):
+        with pytest.raises(ValueError):
+            AsyncCocosCapital("", "pass", "gmail@test.com", "app_pass")
+
+    def test_login_delegates(self, cocos):
+        cocos.auth.login.return_value = True
+
+        assert asyncio.run(cocos.login()) is True
+        cocos.auth.login.assert_awaited_once_with("user@test.com", "pass123", "gmail@test.com", "app_pass")
+        cocos.auth.is_session_valid.assert_not_awaited()
+
+    def test_login_reuses_valid_session(self, tmp_path):
+        session_file = tmp_path / "session.json"
+        session_file.write_text("{}")
+        cocos = AsyncCocosCapital("user@test.com", "pass123", "gmail@test.com", "app_pass",
+                                  session_file=str(session_file))
+        cocos.auth = AsyncMock()
+        cocos.auth.is_session_valid.return_value = True
+
+        assert asyncio.run(cocos.login()) is True
+        cocos.auth.login.assert_not_awaited()
+
+    def test_login_saves_session(self, tmp_path):
+        session_file = tmp_path / "session.json"
+        cocos = AsyncCocosCapital("user@test.com", "pass123", "gmail@test.com", "app_pass",
+                                  session_file=str(session_file))
+        cocos.auth = AsyncMock()
+        session_file.write_text("{}")
+
+        asyncio.run(cocos.login())
+        cocos.auth.save_session.assert_awaited_once_with(str(session_file))
+
+        asyncio.run(cocos.logout())
+        assert not session_file.exists()
+
+    def test_login_skipped_in_replay_mode(self, cocos):
+        cocos.replay = Mock()
+
+        assert asyncio.run(cocos.login()) is True
+        cocos.auth.login.assert_not_awaited()
+
+    def test_user_methods_delegate(self, cocos):
+        asyncio.run(cocos.get_user_data())
+        asyncio.run(cocos.get_account_tier())
+        asyncio.run(cocos.get_portfolio_data())
+        asyncio.run(cocos.fetch_portfolio_balance())
+        asyncio.run(cocos.get_linked_accounts(1000, Currency.USD))
+        asyncio.run(cocos.get_academy_data())
+
+        cocos.user.get_user_data.assert_awaited_once()
+        cocos.user.get_account_tier.assert_awaited_once()
+        cocos.user.get_portfolio_data.assert_awaited_once()
+        cocos.user.get_portfolio_balance.assert_awaited_once()
+        cocos.user.get_linked_accounts.assert_awaited_once_with(1000, Currency.USD)
+        cocos.user.get_academy_data.assert_awaited_once()
+
+    def test_market_methods_delegate(self, cocos):
+        asyncio.run(cocos.create_order("GGAL", OrderOperation.BUY, 1000, 10.0))
+        asyncio.run(cocos.submit_order("GGAL", OrderOperation.BUY, 1000))
+        asyncio.run(cocos.get_ticker_info("GGAL", MarketType.STOCKS))
+        asyncio.run(cocos.get_market_schedule())
+        asyncio.run(cocos.get_orders())
+        asyncio.run(cocos.cancel_order(1000, 10))
+        asyncio.run(cocos.get_mep_value())
+        asyncio.run(cocos.get_market_snapshot(MarketType.STOCKS))
+        asyncio.run(cocos.refresh_instruments())
+        asyncio.run(cocos.stream_quotes(["GGAL"]))
+        asyncio.run(cocos.watch_orders(emit_initial=True))
+        asyncio.run(cocos.cancel_order(55))
+        asyncio.run(cocos.cancel_all("GGAL"))
+        cocos.market.lookup_instrument = Mock()
+        cocos.market.search_instruments = Mock()
+        cocos.lookup_instrument("GGAL")
+        cocos.search_instruments("GG")
+
+        cocos.market.create_order.assert_awaited_once_with("GGAL", OrderOperation.BUY, 1000, 10.0)
+        cocos.market.submit_order.assert_awaited_once_with("GGAL", OrderOperation.BUY, 1000, None, "C")
+        cocos.market.get_ticker_info.assert_awaited_once_with("GGAL", MarketType.STOCKS, None)
+        cocos.market.get_market_schedule.assert_awaited_once()
+        cocos.market.get_orders.assert_awaited_once()
+        cocos.market.cancel_order.assert_any_await(1000, 10)
+        cocos.market.cancel_order.assert_awaited_with(55)
+        cocos.market.cancel_all.assert_awaited_once_with("GGAL", None)
+        cocos.market.get_mep_value.assert_awaited_once()
+        cocos.market.get_market_snapshot.assert_awaited_once_with(MarketType.STOCKS)
+        cocos.market.refresh_instruments.assert_awaited_once_with(False)
+        cocos.market.stream_quotes.assert_awaited_once_with(["GGAL"], None)
+        cocos.market.watch_orders.assert_awaited_once_with(emit_initial=True)
+        cocos.market.lookup_instrument.assert_called_once_with("GGAL")
+        cocos.market.search_instruments.assert_called_once_with("GG", 20)
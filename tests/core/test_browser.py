@@ -1,13 +1,35 @@
 """Tests for CocosBot.core.browser"""
+import logging
+import subprocess
+import sys
+import threading
+
 import pytest
 from unittest.mock import Mock, patch, MagicMock
+from CocosBot.config.general import INPUT_VALUE_TIMEOUT
 from CocosBot.core.browser import PlaywrightBrowser
+from CocosBot.core.page_pool import FetchRequest, PagePool
+from CocosBot.core.instruments import DEFAULT_INSTRUMENTS_PATH
 
 
 @patch('CocosBot.core.browser.sync_playwright')
 class TestInit:
     """Tests for PlaywrightBrowser.__init__"""
 
+    def test_init_does_not_launch(self, mock_sync_pw):
+        browser = PlaywrightBrowser()
+
+        mock_sync_pw.assert_not_called()
+        assert browser.started is False
+
+    def test_import_does_not_load_playwright(self, mock_sync_pw):
+        code = ("import sys, CocosBot.core.cocos_capital, CocosBot.core.async_cocos_capital; "
+                "print(sorted({m.split('.')[0] for m in sys.modules} & {'playwright', 'bs4'}))")
+
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert out.stdout.strip() == "[]"
+
     def test_init_headless_false(self, mock_sync_pw):
         mock_pw = Mock()
         mock_browser = Mock()
@@ -18,9 +40,12 @@ class TestInit:
 
         browser = PlaywrightBrowser(headless=False)
 
+        assert browser.page == mock_page
+        assert browser.page == mock_page
         mock_pw.chromium.launch.assert_called_once_with(headless=False)
         mock_browser.new_page.assert_called_once()
-        assert browser.page == mock_page
+        assert browser.dispatcher.page is mock_page and browser.waits.page is mock_page
+        mock_page.on.assert_called_once_with("response", browser.dispatcher._dispatch)
 
     def test_init_headless_true(self, mock_sync_pw):
         mock_pw = Mock()
@@ -30,9 +55,10 @@ class TestInit:
         mock_browser.new_page.return_value = mock_page
         mock_sync_pw.return_value.start.return_value = mock_pw
 
-        browser = PlaywrightBrowser(headless=True)
+        browser = PlaywrightBrowser(headless=True).start()
 
         mock_pw.chromium.launch.assert_called_once_with(headless=True)
+        assert browser.started is True
 
 
 @patch('CocosBot.core.browser.sync_playwright')
@@ -54,7 +80,7 @@ class TestContextManager:
         mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=Mock()))
         mock_sync_pw.return_value.start.return_value = mock_pw
 
-        browser = PlaywrightBrowser()
+        browser = PlaywrightBrowser().start()
         browser.__exit__(None, None, None)
 
         browser.browser.close.assert_called_once()
@@ -72,12 +98,20 @@ class TestCloseBrowser:
         mock_browser_inst.new_page.return_value = Mock()
         mock_sync_pw.return_value.start.return_value = mock_pw
 
-        browser = PlaywrightBrowser()
+        browser = PlaywrightBrowser().start()
         browser.close_browser()
 
         mock_browser_inst.close.assert_called_once()
         mock_pw.stop.assert_called_once()
 
+    def test_close_without_launch(self, mock_sync_pw):
+        browser = PlaywrightBrowser()
+        browser.close_browser()
+
+        mock_sync_pw.assert_not_called()
+        with pytest.raises(RuntimeError):
+            browser.page
+
     def test_close_browser_idempotent(self, mock_sync_pw):
         mock_pw = Mock()
         mock_browser_inst = Mock()
@@ -85,7 +119,7 @@ class TestCloseBrowser:
         mock_browser_inst.new_page.return_value = Mock()
         mock_sync_pw.return_value.start.return_value = mock_pw
 
-        browser = PlaywrightBrowser()
+        browser = PlaywrightBrowser().start()
         browser.close_browser()
         browser.close_browser()
 
@@ -246,35 +280,69 @@ class TestFillInputWithDelay:
         browser = PlaywrightBrowser()
         return browser, mock_page, mock_locator
 
-    @patch('CocosBot.core.browser.time.sleep')
-    def test_fill_input_with_delay(self, mock_sleep, mock_sync_pw):
+    def test_fill_input_with_delay(self, mock_sync_pw):
         browser, mock_page, mock_locator = self._make_browser(mock_sync_pw)
         browser.fill_input_with_delay("input#price", "123", delay=0.1)
 
         # Should clear the input first
         mock_locator.fill.assert_called_once_with("")
-        # Should type each character
-        assert mock_locator.type.call_count == 3
-        mock_locator.type.assert_any_call("1")
-        mock_locator.type.assert_any_call("2")
-        mock_locator.type.assert_any_call("3")
-        assert mock_sleep.call_count == 3
-
-    @patch('CocosBot.core.browser.time.sleep')
-    def test_fill_input_with_delay_clears_first(self, mock_sleep, mock_sync_pw):
+        # Should type the value with a per-key delay and wait for it to settle
+        mock_locator.type.assert_called_once_with("123", delay=100)
+        args, kwargs = mock_page.wait_for_function.call_args
+        assert kwargs["arg"] == ["input#price", "123"]
+
+    def test_fill_input_with_delay_clears_first(self, mock_sync_pw):
         browser, mock_page, mock_locator = self._make_browser(mock_sync_pw)
         browser.fill_input_with_delay("input#price", "ab")
 
         mock_locator.fill.assert_called_once_with("")
-        assert mock_locator.type.call_count == 2
+        assert mock_locator.type.call_count == 1
 
-    @patch('CocosBot.core.browser.time.sleep')
-    def test_fill_input_with_delay_with_log_message(self, mock_sleep, mock_sync_pw):
+    def test_fill_input_with_delay_with_log_message(self, mock_sync_pw):
         browser, mock_page, mock_locator = self._make_browser(mock_sync_pw)
         browser.fill_input_with_delay("input#price", "5", log_message="Filling price")
 
         mock_locator.fill.assert_called_once_with("")
-        mock_locator.type.assert_called_once_with("5")
+        mock_locator.type.assert_called_once_with("5", delay=50)
+
+    def test_fill_input_with_delay_retypes_slowly_when_value_is_lost(self, mock_sync_pw):
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+        browser, mock_page, mock_locator = self._make_browser(mock_sync_pw)
+        mock_page.wait_for_function.side_effect = PlaywrightTimeoutError("timeout")
+
+        browser.fill_input_with_delay("input#price", "12", timeout=10000)
+
+        assert mock_locator.fill.call_count == 2
+        mock_locator.type.assert_called_with("12", delay=400)
+        # The value check is bounded by one poll interval, not the element timeout
+        assert mock_page.wait_for_function.call_args.kwargs["timeout"] == INPUT_VALUE_TIMEOUT
+
+    def test_fill_input_with_delay_records_typing_flow(self, mock_sync_pw):
+        browser, _, _ = self._make_browser(mock_sync_pw)
+        browser.waits.report = Mock()
+
+        browser.fill_input_with_delay("input#price", "123")
+
+        flow, _, baseline = browser.waits.report.record.call_args[0]
+        assert flow == "typing"
+        assert baseline == pytest.approx(1.2)
+
+    def test_type_code_uses_one_keyboard_sequence(self, mock_sync_pw):
+        browser, mock_page, _ = self._make_browser(mock_sync_pw)
+
+        browser.type_code("input#input0", "123456", "input#input5", log_message="Code")
+
+        mock_page.focus.assert_called_once_with("input#input0")
+        mock_page.keyboard.type.assert_called_once_with("123456")
+        assert mock_page.wait_for_function.call_args.kwargs["arg"] == ["input#input5", "6"]
+
+    def test_type_code_raises_when_last_box_is_empty(self, mock_sync_pw):
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+        browser, mock_page, _ = self._make_browser(mock_sync_pw)
+        mock_page.wait_for_function.side_effect = PlaywrightTimeoutError("timeout")
+
+        with pytest.raises(TimeoutError):
+            browser.type_code("input#input0", "123456", "input#input5")
 
 
 @patch('CocosBot.core.browser.sync_playwright')
@@ -408,25 +476,23 @@ class TestSearchAndSelect:
 class TestFetchData:
     """Tests for fetch_data"""
 
-    def _make_browser(self, mock_sync_pw):
+    def _make_browser(self, mock_sync_pw, response=None):
         mock_pw = Mock()
         mock_page = Mock()
         mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=mock_page))
         mock_sync_pw.return_value.start.return_value = mock_pw
         browser = PlaywrightBrowser()
+        if response is not None:
+            # The SPA fires the request while the page loads
+            mock_page.goto.side_effect = lambda url: browser.dispatcher._dispatch(response)
         return browser, mock_page
 
     def test_fetch_data_happy_path(self, mock_sync_pw):
-        browser, mock_page = self._make_browser(mock_sync_pw)
         mock_response = Mock()
         mock_response.status = 200
         mock_response.url = "https://api.example.com/data"
         mock_response.json.return_value = {"key": "value"}
-
-        mock_response_info = Mock()
-        mock_response_info.value = mock_response
-        mock_page.expect_response.return_value.__enter__ = Mock(return_value=mock_response_info)
-        mock_page.expect_response.return_value.__exit__ = Mock(return_value=False)
+        browser, mock_page = self._make_browser(mock_sync_pw, mock_response)
 
         result = browser.fetch_data(
             "https://api.example.com/data",
@@ -435,18 +501,14 @@ class TestFetchData:
 
         assert result == {"key": "value"}
         mock_page.goto.assert_called_once()
+        assert set(browser.tracer.summary()) == {"go_to", "expect_response", "response.json"}
 
     def test_fetch_data_with_callback(self, mock_sync_pw):
-        browser, mock_page = self._make_browser(mock_sync_pw)
         mock_response = Mock()
         mock_response.status = 200
         mock_response.url = "https://api.example.com/data"
         mock_response.json.return_value = {"total": 100, "items": [1, 2]}
-
-        mock_response_info = Mock()
-        mock_response_info.value = mock_response
-        mock_page.expect_response.return_value.__enter__ = Mock(return_value=mock_response_info)
-        mock_page.expect_response.return_value.__exit__ = Mock(return_value=False)
+        browser, mock_page = self._make_browser(mock_sync_pw, mock_response)
 
         callback = lambda data: data["total"]
         result = browser.fetch_data(
@@ -459,59 +521,46 @@ class TestFetchData:
 
     def test_fetch_data_timeout(self, mock_sync_pw):
         browser, mock_page = self._make_browser(mock_sync_pw)
-        mock_page.expect_response.return_value.__enter__ = Mock(side_effect=TimeoutError("Timeout"))
-        mock_page.expect_response.return_value.__exit__ = Mock(return_value=False)
 
         result = browser.fetch_data(
             "https://api.example.com/data",
-            "https://example.com/page"
+            "https://example.com/page",
+            timeout=50
         )
 
         assert result is None
+        assert browser.dispatcher.pending_count == 0
+        assert browser.dispatcher.stats()["timeouts"] == 1
 
-    def test_fetch_data_handle_response_callback(self, mock_sync_pw):
-        browser, mock_page = self._make_browser(mock_sync_pw)
-        mock_response = Mock()
-        mock_response.status = 200
-        mock_response.url = "https://api.example.com/data"
-        mock_response.json.return_value = {"key": "value"}
+    def test_fetch_data_ignores_other_responses(self, mock_sync_pw):
+        other = Mock(status=200, url="https://api.example.com/other")
+        browser, mock_page = self._make_browser(mock_sync_pw, other)
 
-        mock_response_info = Mock()
-        mock_response_info.value = mock_response
-        mock_page.expect_response.return_value.__enter__ = Mock(return_value=mock_response_info)
-        mock_page.expect_response.return_value.__exit__ = Mock(return_value=False)
+        result = browser.fetch_data("https://api.example.com/data", "https://example.com/page", timeout=50)
 
-        captured_callback = None
-        def capture_on(event, callback):
-            nonlocal captured_callback
-            if event == "response":
-                captured_callback = callback
-        mock_page.on.side_effect = capture_on
+        assert result is None
+        other.json.assert_not_called()
 
-        result = browser.fetch_data(
-            "https://api.example.com/data",
-            "https://example.com/page"
-        )
+    def test_fetch_data_single_listener(self, mock_sync_pw):
+        mock_response = Mock(status=200, url="https://api.example.com/data?page=1")
+        mock_response.json.return_value = {"key": "value"}
+        browser, mock_page = self._make_browser(mock_sync_pw, mock_response)
 
-        assert result == {"key": "value"}
-        # Invoke the captured callback to cover handle_response lines
-        assert captured_callback is not None
-        cb_response = Mock()
-        cb_response.url = "https://api.example.com/data?page=1"
-        cb_response.status = 200
-        cb_result = captured_callback(cb_response)
-        assert cb_result == cb_response
+        for _ in range(5):
+            assert browser.fetch_data("https://api.example.com/data", "https://example.com/page") == {"key": "value"}
+
+        response_listeners = [c for c in mock_page.on.call_args_list if c.args[0] == "response"]
+        assert len(response_listeners) == 1
+        stats = browser.dispatcher.stats()
+        assert stats["listeners"] == 1
+        assert stats["pending"] == 0
+        assert stats["matched"] == 5
 
     def test_fetch_data_empty_response(self, mock_sync_pw):
-        browser, mock_page = self._make_browser(mock_sync_pw)
-        mock_response = Mock()
+        mock_response = Mock(url="https://api.example.com/data")
         mock_response.status = 200
         mock_response.json.return_value = {}
-
-        mock_response_info = Mock()
-        mock_response_info.value = mock_response
-        mock_page.expect_response.return_value.__enter__ = Mock(return_value=mock_response_info)
-        mock_page.expect_response.return_value.__exit__ = Mock(return_value=False)
+        browser, mock_page = self._make_browser(mock_sync_pw, mock_response)
 
         result = browser.fetch_data(
             "https://api.example.com/data",
@@ -521,15 +570,10 @@ class TestFetchData:
         assert result is None
 
     def test_fetch_data_json_decode_error(self, mock_sync_pw):
-        browser, mock_page = self._make_browser(mock_sync_pw)
-        mock_response = Mock()
+        mock_response = Mock(url="https://api.example.com/data")
         mock_response.status = 200
         mock_response.json.side_effect = Exception("Invalid JSON")
-
-        mock_response_info = Mock()
-        mock_response_info.value = mock_response
-        mock_page.expect_response.return_value.__enter__ = Mock(return_value=mock_response_info)
-        mock_page.expect_response.return_value.__exit__ = Mock(return_value=False)
+        browser, mock_page = self._make_browser(mock_sync_pw, mock_response)
 
         result = browser.fetch_data(
             "https://api.example.com/data",
@@ -539,14 +583,9 @@ class TestFetchData:
         assert result is None
 
     def test_fetch_data_non_200_status(self, mock_sync_pw):
-        browser, mock_page = self._make_browser(mock_sync_pw)
-        mock_response = Mock()
+        mock_response = Mock(url="https://api.example.com/data")
         mock_response.status = 500
-
-        mock_response_info = Mock()
-        mock_response_info.value = mock_response
-        mock_page.expect_response.return_value.__enter__ = Mock(return_value=mock_response_info)
-        mock_page.expect_response.return_value.__exit__ = Mock(return_value=False)
+        browser, mock_page = self._make_browser(mock_sync_pw, mock_response)
 
         result = browser.fetch_data(
             "https://api.example.com/data",
@@ -565,3 +604,557 @@ class TestFetchData:
         )
 
         assert result is None
+        assert browser.dispatcher.pending_count == 0
+
+
+@patch('CocosBot.core.browser.sync_playwright')
+class TestDirectApi:
+    """Tests for the direct API mode of fetch_data"""
+
+    def _make_browser(self, mock_sync_pw):
+        mock_pw = Mock()
+        mock_page = Mock()
+        mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=mock_page))
+        mock_sync_pw.return_value.start.return_value = mock_pw
+        browser = PlaywrightBrowser(direct_api=True)
+        browser.api_client = Mock()
+        browser.api_client.is_authenticated = True
+        return browser, mock_page
+
+    def test_disabled_by_default(self, mock_sync_pw):
+        mock_pw = Mock()
+        mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=Mock()))
+        mock_sync_pw.return_value.start.return_value = mock_pw
+
+        browser = PlaywrightBrowser()
+
+        assert browser.api_client is None
+        assert browser.capture_api_session() is False
+
+    def test_registers_request_listener(self, mock_sync_pw):
+        mock_pw = Mock()
+        mock_page = Mock()
+        mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=mock_page))
+        mock_sync_pw.return_value.start.return_value = mock_pw
+
+        browser = PlaywrightBrowser(direct_api=True).start()
+
+        mock_page.on.assert_any_call("request", browser._capture_api_headers)
+
+    def test_capture_api_headers_only_for_api(self, mock_sync_pw):
+        browser, _ = self._make_browser(mock_sync_pw)
+        api_request = Mock(url="https://api.cocos.capital/api/v2/users/me", headers={"authorization": "Bearer x"})
+        app_request = Mock(url="https://app.cocos.capital/", headers={"authorization": "Bearer y"})
+
+        browser._capture_api_headers(api_request)
+        browser._capture_api_headers(app_request)
+
+        browser.api_client.update_headers.assert_called_once_with({"authorization": "Bearer x"})
+
+    def test_capture_api_headers_keeps_refreshed_token(self, mock_sync_pw):
+        from tests.core.test_session_tokens import make_jwt, token_response
+        browser, _ = self._make_browser(mock_sync_pw)
+        browser.tokens.update(token_response(2000))
+        request = Mock(url="https://api.cocos.capital/api/v2/users/me",
+                       headers={"authorization": f"Bearer {make_jwt(1000)}", "apikey": "k"})
+
+        browser._capture_api_headers(request)
+
+        browser.api_client.update_headers.assert_called_once_with({"apikey": "k"})
+
+    def test_token_responses_reach_token_manager(self, mock_sync_pw):
+        from tests.core.test_session_tokens import token_response
+        browser, _ = self._make_browser(mock_sync_pw)
+        response = Mock(url="https://api.cocos.capital/api/auth/v1/token?grant_type=password", status=200)
+        response.json.return_value = token_response(2000)
+
+        browser.dispatcher._dispatch(response)
+
+        assert browser.tokens.expires_at == 2000
+
+    def test_capture_api_session_copies_cookies(self, mock_sync_pw):
+        browser, mock_page = self._make_browser(mock_sync_pw)
+        mock_page.context.cookies.return_value = [{"name": "sid", "value": "1"}]
+
+        assert browser.capture_api_session() is True
+        browser.api_client.set_cookies.assert_called_once_with([{"name": "sid", "value": "1"}])
+
+    def test_capture_api_session_without_token(self, mock_sync_pw):
+        browser, _ = self._make_browser(mock_sync_pw)
+        browser.api_client.is_authenticated = False
+
+        assert browser.capture_api_session() is False
+
+    def test_fetch_data_direct_skips_navigation(self, mock_sync_pw):
+        browser, mock_page = self._make_browser(mock_sync_pw)
+        browser.api_client.get_json.return_value = {"total": 5}
+
+        result = browser.fetch_data("https://api.example.com/data", "https://example.com/page",
+                                    process_response=lambda d: d["total"])
+
+        assert result == 5
+        mock_page.goto.assert_not_called()
+
+    def test_fetch_data_direct_empty(self, mock_sync_pw):
+        browser, mock_page = self._make_browser(mock_sync_pw)
+        browser.api_client.get_json.return_value = []
+
+        assert browser.fetch_data("https://api.example.com/data", "https://example.com/page") is None
+        mock_page.goto.assert_not_called()
+
+    def test_fetch_data_direct_falls_back_to_intercept(self, mock_sync_pw):
+        from CocosBot.core.api_client import ApiClientError
+        browser, mock_page = self._make_browser(mock_sync_pw)
+        browser.api_client.get_json.side_effect = ApiClientError("401", status=401)
+        mock_response = Mock(status=200, url="https://api.example.com/data")
+        mock_response.json.return_value = {"key": "value"}
+        mock_page.goto.side_effect = lambda url: browser.dispatcher._dispatch(mock_response)
+
+        result = browser.fetch_data("https://api.example.com/data", "https://example.com/page")
+
+        assert result == {"key": "value"}
+        mock_page.goto.assert_called_once_with("https://example.com/page")
+
+    def test_close_browser_closes_api_client(self, mock_sync_pw):
+        browser, _ = self._make_browser(mock_sync_pw)
+        api_client = browser.api_client
+
+        browser.tokens = Mock()
+
+        browser.close_browser()
+
+        api_client.close.assert_called_once()
+        browser.tokens.stop.assert_called_once()
+
+
+@patch('CocosBot.core.browser.sync_playwright')
+class TestStorageState:
+    """Tests for session persistence via storage_state"""
+
+    def _setup(self, mock_sync_pw):
+        mock_pw = Mock()
+        mock_browser_inst = Mock()
+        mock_pw.chromium.launch.return_value = mock_browser_inst
+        mock_sync_pw.return_value.start.return_value = mock_pw
+        return mock_browser_inst
+
+    def test_restores_existing_session_file(self, mock_sync_pw, tmp_path):
+        mock_browser_inst = self._setup(mock_sync_pw)
+        session_file = tmp_path / "session.json"
+        session_file.write_text("{}")
+
+        browser = PlaywrightBrowser(storage_state=str(session_file)).start()
+
+        mock_browser_inst.new_page.assert_called_once_with(storage_state=str(session_file))
+        assert browser.session_restored is True
+
+    def test_missing_session_file_starts_clean(self, mock_sync_pw, tmp_path):
+        mock_browser_inst = self._setup(mock_sync_pw)
+
+        browser = PlaywrightBrowser(storage_state=str(tmp_path / "missing.json")).start()
+
+        mock_browser_inst.new_page.assert_called_once_with()
+        assert browser.session_restored is False
+
+    def test_save_storage_state_restricts_permissions(self, mock_sync_pw, tmp_path):
+        mock_browser_inst = self._setup(mock_sync_pw)
+        session_file = tmp_path / "session.json"
+        mock_page = mock_browser_inst.new_page.return_value
+        mock_page.context.storage_state.side_effect = lambda path: open(path, "w").close()
+
+        browser = PlaywrightBrowser()
+        browser.save_storage_state(str(session_file))
+
+        mock_page.context.storage_state.assert_called_once_with(path=str(session_file))
+        assert session_file.stat().st_mode & 0o777 == 0o600
+
+
+@patch('CocosBot.core.browser.sync_playwright')
+class TestFetchMany:
+    """Tests for fetch_many"""
+
+    def _make_browser(self, mock_sync_pw, responses=()):
+        mock_pw = Mock()
+        mock_page = Mock()
+        mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=mock_page))
+        mock_sync_pw.return_value.start.return_value = mock_pw
+        browser = PlaywrightBrowser()
+
+        def load(url):
+            for response in responses:
+                browser.dispatcher._dispatch(response)
+        mock_page.goto.side_effect = load
+        return browser, mock_page
+
+    def _response(self, url, data, status=200):
+        response = Mock(url=url, status=status)
+        response.json.return_value = data
+        return response
+
+    def test_single_navigation_for_all_endpoints(self, mock_sync_pw):
+        browser, mock_page = self._make_browser(mock_sync_pw, [
+            self._response("https://api/a", {"a": 1}),
+            self._response("https://api/static", {}),
+            self._response("https://api/b", {"b": 2}),
+        ])
+
+        result = browser.fetch_many("https://app/", ["https://api/a", "https://api/b"])
+
+        assert result == {"https://api/a": {"a": 1}, "https://api/b": {"b": 2}}
+        mock_page.goto.assert_called_once_with("https://app/")
+        assert browser.dispatcher.pending_count == 0
+
+    def test_missing_and_failed_responses_are_none(self, mock_sync_pw):
+        browser, _ = self._make_browser(mock_sync_pw, [
+            self._response("https://api/a", {"a": 1}),
+            self._response("https://api/b", None, status=500),
+        ])
+
+        result = browser.fetch_many("https://app/", ["https://api/a", "https://api/b", "https://api/c"], timeout=50)
+
+        assert result == {"https://api/a": {"a": 1}, "https://api/b": None, "https://api/c": None}
+        assert browser.dispatcher.pending_count == 0
+
+    def test_navigation_error(self, mock_sync_pw):
+        browser, mock_page = self._make_browser(mock_sync_pw)
+        mock_page.goto.side_effect = Exception("Network error")
+
+        result = browser.fetch_many("https://app/", ["https://api/a"])
+
+        assert result == {"https://api/a": None}
+        assert browser.dispatcher.pending_count == 0
+
+    def test_direct_api_only_navigates_for_failures(self, mock_sync_pw):
+        from CocosBot.core.api_client import ApiClientError
+        browser, mock_page = self._make_browser(mock_sync_pw, [self._response("https://api/b", {"b": 2})])
+        browser.api_client = Mock(is_authenticated=True)
+        browser.api_client.get_json.side_effect = lambda url: {"a": 1} if url == "https://api/a" else (_ for _ in ()).throw(ApiClientError("404"))
+
+        result = browser.fetch_many("https://app/", ["https://api/a", "https://api/b"])
+
+        assert result == {"https://api/a": {"a": 1}, "https://api/b": {"b": 2}}
+        mock_page.goto.assert_called_once()
+
+    def test_direct_api_all_succeed(self, mock_sync_pw):
+        browser, mock_page = self._make_browser(mock_sync_pw)
+        browser.api_client = Mock(is_authenticated=True)
+        browser.api_client.get_json.return_value = {"ok": True}
+
+        result = browser.fetch_many("https://app/", ["https://api/a"])
+
+        assert result == {"https://api/a": {"ok": True}}
+        mock_page.goto.assert_not_called()
+
+
+@patch('CocosBot.core.browser.sync_playwright')
+class TestResponseCacheIntegration:
+    """Tests for the passive response cache in PlaywrightBrowser"""
+
+    API = "https://api.cocos.capital/api/orders"
+
+    def _make_browser(self, mock_sync_pw, **kwargs):
+        mock_pw = Mock()
+        mock_page = Mock()
+        mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=mock_page))
+        mock_sync_pw.return_value.start.return_value = mock_pw
+        return PlaywrightBrowser(**kwargs), mock_page
+
+    def _json_response(self, url, data, status=200, content_type="application/json"):
+        response = Mock(url=url, status=status, headers={"content-type": content_type})
+        response.json.return_value = data
+        return response
+
+    def test_disabled_by_default(self, mock_sync_pw):
+        browser, _ = self._make_browser(mock_sync_pw)
+
+        assert browser.response_cache is None
+
+    def test_records_background_api_responses(self, mock_sync_pw):
+        browser, _ = self._make_browser(mock_sync_pw, response_cache=True)
+
+        browser.dispatcher._dispatch(self._json_response(self.API, {"orders": [1]}))
+        browser.dispatcher._dispatch(self._json_response("https://app.cocos.capital/x", {"no": 1}))
+        browser.dispatcher._dispatch(self._json_response(self.API + "/2", {"err": 1}, status=500))
+        browser.dispatcher._dispatch(self._json_response(self.API + "/3", None, content_type="text/html"))
+
+        assert len(browser.response_cache) == 1
+        assert browser.response_cache.get(self.API, max_age=60) == (True, {"orders": [1]})
+
+    def test_enable_is_idempotent(self, mock_sync_pw):
+        browser, _ = self._make_browser(mock_sync_pw)
+
+        cache = browser.enable_response_cache(max_entries=8)
+
+        assert browser.enable_response_cache() is cache
+        assert cache.max_entries == 8
+
+    def test_fetch_data_fresh_cache_skips_navigation(self, mock_sync_pw):
+        browser, mock_page = self._make_browser(mock_sync_pw, response_cache=True)
+        browser.response_cache.put(self.API, {"orders": [1]})
+
+        result = browser.fetch_data(self.API, "https://app.cocos.capital/orders", max_age=30)
+
+        assert result == {"orders": [1]}
+        mock_page.goto.assert_not_called()
+
+    def test_fetch_data_without_max_age_ignores_cache(self, mock_sync_pw):
+        browser, mock_page = self._make_browser(mock_sync_pw, response_cache=True)
+        browser.response_cache.put(self.API, {"orders": [1]})
+        fresh = self._json_response(self.API, {"orders": [2]})
+        mock_page.goto.side_effect = lambda url: browser.dispatcher._dispatch(fresh)
+
+        result = browser.fetch_data(self.API, "https://app.cocos.capital/orders")
+
+        assert result == {"orders": [2]}
+        assert browser.response_cache.get(self.API, max_age=60) == (True, {"orders": [2]})
+
+    def test_direct_api_results_are_cached(self, mock_sync_pw):
+        browser, _ = self._make_browser(mock_sync_pw, response_cache=True)
+        browser.api_client = Mock(is_authenticated=True)
+        browser.api_client.get_json.return_value = {"orders": [3]}
+
+        browser.fetch_data(self.API, "https://app.cocos.capital/orders")
+
+        assert browser.response_cache.get(self.API, max_age=60) == (True, {"orders": [3]})
+
+
+@patch('CocosBot.core.browser.sync_playwright')
+class TestResourceBlocking:
+    """Tests for the block_profile option"""
+
+    def _make_browser(self, mock_sync_pw, **kwargs):
+        mock_pw = Mock()
+        mock_page = Mock()
+        mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=mock_page))
+        mock_sync_pw.return_value.start.return_value = mock_pw
+        return PlaywrightBrowser(**kwargs), mock_page
+
+    def test_disabled_by_default(self, mock_sync_pw):
+        browser, mock_page = self._make_browser(mock_sync_pw)
+
+        assert browser.resource_blocker is None
+        mock_page.route.assert_not_called()
+
+    def test_preset_installs_route(self, mock_sync_pw):
+        browser, mock_page = self._make_browser(mock_sync_pw, block_profile="services")
+        browser.start()
+
+        mock_page.route.assert_called_once_with("**/*", browser.resource_blocker._handle_route)
+
+    def test_close_logs_stats(self, mock_sync_pw):
+        browser, _ = self._make_browser(mock_sync_pw, block_profile="services")
+
+        with patch('CocosBot.core.browser.logger') as mock_logger:
+            browser.close_browser()
+
+        mock_logger.info.assert_any_call("Recursos bloqueados en la sesión: %s", browser.resource_blocker.stats())
+
+
+@patch('CocosBot.core.browser.sync_playwright')
+class TestFetchParallel:
+    """Tests for fetch_parallel and the page pool"""
+
+    def _make_browser(self, mock_sync_pw, **kwargs):
+        mock_pw = Mock()
+        mock_page = Mock()
+        mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=mock_page))
+        mock_sync_pw.return_value.start.return_value = mock_pw
+        return PlaywrightBrowser(**kwargs), mock_page
+
+    def _requests(self):
+        return {
+            "orders": FetchRequest("https://api.test/orders", "https://app.test/orders"),
+            "mep": FetchRequest("https://api.test/mep", "https://app.test/mep", process_response=lambda d: d["ask"]),
+        }
+
+    def test_direct_mode_runs_calls_in_threads(self, mock_sync_pw):
+        browser, _ = self._make_browser(mock_sync_pw, response_cache=True)
+        browser.api_client = Mock(is_authenticated=True)
+        threads = set()
+
+        def get_json(url):
+            threads.add(threading.current_thread().name)
+            return {"ask": 1200} if url.endswith("mep") else [1, 2]
+        browser.api_client.get_json.side_effect = get_json
+
+        results = browser.fetch_parallel(self._requests())
+
+        assert results == {"orders": [1, 2], "mep": 1200}
+        assert threading.current_thread().name not in threads
+        assert browser.response_cache.get("https://api.test/orders", max_age=60) == (True, [1, 2])
+        assert browser.page_pool is None
+
+    def test_failed_direct_calls_fall_back_to_the_pool(self, mock_sync_pw):
+        from CocosBot.core.api_client import ApiClientError
+        browser, _ = self._make_browser(mock_sync_pw, direct_api=True)
+        browser.api_client = Mock(is_authenticated=True)
+        browser.api_client.get_json.side_effect = lambda url: (
+            [1] if url.endswith("orders") else (_ for _ in ()).throw(ApiClientError("502", status=502)))
+        mep_response = Mock(status=200)
+        mep_response.json.return_value = {"ask": 1250}
+
+        with patch.object(PagePool, "run", return_value={"mep": mep_response}) as mock_run:
+            results = browser.fetch_parallel(self._requests())
+
+        assert results == {"orders": [1], "mep": 1250}
+        assert list(mock_run.call_args[0][0]) == ["mep"]
+
+    def test_pool_pages_share_session_and_observers(self, mock_sync_pw):
+        browser, mock_page = self._make_browser(mock_sync_pw, response_cache=True,
+                                                block_profile="services", page_pool_size=2)
+        pool = browser.enable_page_pool()
+        context = browser.browser.new_context.return_value
+
+        pooled = pool.checkout()
+
+        assert browser.enable_page_pool() is pool
+        assert pool.size == 2
+        mock_page.context.storage_state.assert_called_once()
+        browser.browser.new_context.assert_called_once_with(storage_state=mock_page.context.storage_state.return_value)
+        context.new_page.return_value.route.assert_called_once()
+        assert browser.tokens.observe in pooled.dispatcher._observers
+        assert browser._record_response in pooled.dispatcher._observers
+
+    def test_close_closes_pool(self, mock_sync_pw):
+        browser, _ = self._make_browser(mock_sync_pw)
+        pool = browser.enable_page_pool()
+        pool.checkout()
+
+        browser.close_browser()
+
+        browser.browser.new_context.return_value.close.assert_called_once()
+        assert pool.created == 0
+
+
+@patch('CocosBot.core.browser.sync_playwright')
+class TestInstrumentMasterOption:
+    """Tests for the instrument_master option"""
+
+    def _make_browser(self, mock_sync_pw, **kwargs):
+        mock_pw = Mock()
+        mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=Mock()))
+        mock_sync_pw.return_value.start.return_value = mock_pw
+        return PlaywrightBrowser(**kwargs)
+
+    def test_disabled_by_default(self, mock_sync_pw):
+        assert self._make_browser(mock_sync_pw).instruments is None
+
+    def test_loads_file_and_observes_market_lists(self, mock_sync_pw, tmp_path):
+        path = str(tmp_path / "instruments.json")
+
+        browser = self._make_browser(mock_sync_pw, instrument_master=path)
+
+        assert browser.instruments.path == path
+        assert browser.instruments.observe in browser.dispatcher._observers
+        assert browser.enable_instrument_master() is browser.instruments
+        pooled = browser.enable_page_pool().checkout()
+        assert browser.instruments.observe in pooled.dispatcher._observers
+
+    def test_true_uses_default_path(self, mock_sync_pw):
+        with patch('CocosBot.core.browser.InstrumentMaster') as mock_master:
+            self._make_browser(mock_sync_pw, instrument_master=True)
+
+        mock_master.assert_called_once_with(DEFAULT_INSTRUMENTS_PATH)
+
+
+@patch('CocosBot.core.browser.sync_playwright')
+class TestTrafficArchiveOption:
+    """Tests for the record and replay options"""
+
+    def _make_browser(self, mock_sync_pw, **kwargs):
+        mock_page = Mock()
+        mock_pw = Mock()
+        mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=mock_page))
+        mock_sync_pw.return_value.start.return_value = mock_pw
+        return PlaywrightBrowser(**kwargs), mock_page
+
+    def _archive(self, tmp_path):
+        from CocosBot.config.urls import API_URLS
+        from CocosBot.core.traffic_archive import TrafficRecorder
+        path = str(tmp_path / "session.jsonl")
+        recorder = TrafficRecorder(path)
+        for url, body, status in [(API_URLS["user_data"], '{"id": 7}', 200),
+                                  (API_URLS["portfolio_data"], '[1, 2]', 200),
+                                  (API_URLS["orders"], '{"error": "boom"}', 500)]:
+            response = Mock(url=url, status=status, headers={"content-type": "application/json"},
+                            request=Mock(method="GET", post_data=None))
+            response.text.return_value = body
+            recorder.observe(response)
+        recorder.close()
+        return path, API_URLS
+
+    def test_disabled_by_default(self, mock_sync_pw):
+        browser, mock_page = self._make_browser(mock_sync_pw)
+
+        assert (browser.recorder, browser.replay) == (None, None)
+        mock_page.route.assert_not_called()
+
+    def test_records_dispatched_responses(self, mock_sync_pw, tmp_path):
+        from CocosBot.core.traffic_archive import TrafficArchive
+        path = str(tmp_path / "session.har")
+        browser, _ = self._make_browser(mock_sync_pw, record=path)
+        response = Mock(url="https://api.cocos.capital/api/v1/users/me", status=200,
+                        headers={"content-type": "application/json"}, request=Mock(method="GET", post_data=None))
+        response.text.return_value = '{"id": 1}'
+
+        browser.dispatcher._dispatch(response)
+        pooled = browser.enable_page_pool().checkout()
+        browser.close_browser()
+
+        assert browser.recorder.observe in pooled.dispatcher._observers
+        assert [entry.body for entry in TrafficArchive.load(path).entries] == [{"id": 1}]
+
+    def test_replay_serves_reads_without_navigating(self, mock_sync_pw, tmp_path):
+        path, urls = self._archive(tmp_path)
+        browser, mock_page = self._make_browser(mock_sync_pw, replay=path)
+
+        user = browser.fetch_data(urls["user_data"], "https://app.cocos.capital/", process_response=lambda d: d["id"])
+        many = browser.fetch_many("https://app.cocos.capital/", [urls["portfolio_data"], urls["orders"]])
+        parallel = browser.fetch_parallel({"user": FetchRequest(urls["user_data"], "https://app.cocos.capital/")})
+
+        assert user == 7
+        assert many == {urls["portfolio_data"]: [1, 2], urls["orders"]: None}
+        assert parallel == {"user": {"id": 7}}
+        assert browser.started is False
+        assert browser.replay.stats() == {"recorded": 3, "hits": 4, "misses": 0}
+        browser.start()
+        mock_page.route.assert_called_once_with(browser.replay.matches, browser.replay._handle_route)
+
+
+@patch('CocosBot.core.browser.sync_playwright')
+class TestStepLogging:
+    """Tests for the per-step log level and value masking"""
+
+    def _make_browser(self, mock_sync_pw, **kwargs):
+        mock_pw = Mock()
+        mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=Mock()))
+        mock_sync_pw.return_value.start.return_value = mock_pw
+        return PlaywrightBrowser(**kwargs)
+
+    def test_steps_log_at_debug_by_default(self, mock_sync_pw, caplog):
+        browser = self._make_browser(mock_sync_pw).start()
+
+        with caplog.at_level(logging.INFO, logger="CocosBot.core.browser"):
+            browser.click_element("button.ok", "Confirmando")
+
+        assert [r.getMessage() for r in caplog.records] == ["Confirmando"]
+
+    def test_configurable_step_level(self, mock_sync_pw, caplog):
+        browser = self._make_browser(mock_sync_pw, step_log_level="INFO")
+
+        with caplog.at_level(logging.INFO, logger="CocosBot.core.browser"):
+            browser.fill_input("#email", "a@b.c", timeout=500)
+
+        assert browser.step_log_level == logging.INFO
+        assert "Input #email llenado con el valor: a@b.c" in caplog.messages
+        browser.page.wait_for_selector.assert_called_once_with("#email", timeout=500, state="visible")
+
+    def test_sensitive_values_are_masked(self, mock_sync_pw, caplog):
+        browser = self._make_browser(mock_sync_pw)
+
+        with caplog.at_level(logging.DEBUG, logger="CocosBot.core.browser"):
+            browser.fill_input("#password", "hunter22", sensitive=True)
+            browser.fill_input_with_events("#pin", "4321", sensitive=True)
+
+        assert "hunter22" not in caplog.text and "4321" not in caplog.text
+        assert "Input #password llenado con el valor: *** (8 caracteres)" in caplog.messages
@@ -37,8 +37,10 @@ class TestCocosCapitalInit:
         mock_sync_pw.return_value.start.return_value = mock_pw
 
         from CocosBot.core.cocos_capital import CocosCapital
-        CocosCapital("user@test.com", "pass123", "gmail@test.com", "app_pass", headless=True)
+        cc = CocosCapital("user@test.com", "pass123", "gmail@test.com", "app_pass", headless=True)
 
+        mock_pw.chromium.launch.assert_not_called()
+        cc.page
         mock_pw.chromium.launch.assert_called_once_with(headless=True)
 
 
@@ -83,6 +85,11 @@ class TestCocosCapitalDelegation:
         assert result == {"name": "Test"}
         cocos.user.get_user_data.assert_called_once()
 
+    def test_get_user_data_forwards_max_age(self, cocos):
+        cocos.get_user_data(max_age=30)
+
+        cocos.user.get_user_data.assert_called_once_with(max_age=30)
+
     def test_get_account_tier_delegates(self, cocos):
         cocos.user.get_account_tier.return_value = {"tier": "premium"}
         result = cocos.get_account_tier()
@@ -131,6 +138,13 @@ class TestCocosCapitalDelegation:
         assert result is True
         cocos.market.create_order.assert_called_once_with("AAPL", OrderOperation.BUY, 1000, 150.0)
 
+    def test_submit_order_delegates(self, cocos):
+        cocos.market.submit_order.return_value = {"order_id": 7, "via": "api"}
+        result = cocos.submit_order("GGAL", OrderOperation.BUY, 1000, limit=1500.0)
+
+        assert result == {"order_id": 7, "via": "api"}
+        cocos.market.submit_order.assert_called_once_with("GGAL", OrderOperation.BUY, 1000, 1500.0, "C")
+
     def test_get_ticker_info_delegates(self, cocos):
         cocos.market.get_ticker_info.return_value = {"ticker": "AAPL"}
         result = cocos.get_ticker_info("AAPL", MarketType.STOCKS, segment="C")
@@ -138,6 +152,23 @@ class TestCocosCapitalDelegation:
         assert result == {"ticker": "AAPL"}
         cocos.market.get_ticker_info.assert_called_once_with("AAPL", MarketType.STOCKS, "C")
 
+    def test_instrument_methods_delegate(self, cocos):
+        cocos.get_ticker_info("AAPL")
+        cocos.get_market_snapshot(MarketType.CEDEARS, max_age=10)
+        cocos.refresh_instruments(force=True)
+        cocos.lookup_instrument("AAPL")
+        cocos.search_instruments("AA", limit=5)
+        cocos.stream_quotes(["GGAL"], MarketType.STOCKS, queue_size=10)
+        cocos.watch_orders(interval=200)
+
+        cocos.market.get_ticker_info.assert_called_once_with("AAPL", None, None)
+        cocos.market.get_market_snapshot.assert_called_once_with(MarketType.CEDEARS, max_age=10)
+        cocos.market.refresh_instruments.assert_called_once_with(True)
+        cocos.market.lookup_instrument.assert_called_once_with("AAPL")
+        cocos.market.search_instruments.assert_called_once_with("AA", 5)
+        cocos.market.stream_quotes.assert_called_once_with(["GGAL"], MarketType.STOCKS, queue_size=10)
+        cocos.market.watch_orders.assert_called_once_with(interval=200)
+
     def test_get_market_schedule_delegates(self, cocos):
         cocos.market.get_market_schedule.return_value = {"open": "10:00"}
         result = cocos.get_market_schedule()
@@ -159,9 +190,112 @@ class TestCocosCapitalDelegation:
         assert result is True
         cocos.market.cancel_order.assert_called_once_with(1000, 10)
 
+    def test_facade_methods_are_traced(self, cocos):
+        cocos.market.get_orders.side_effect = lambda max_age=None: cocos.go_to("https://app/orders")
+
+        cocos.get_orders()
+
+        summary = cocos.tracer.summary()
+        assert summary["get_orders"]["total"]["count"] == 1
+        assert summary["get_orders"]["go_to"]["count"] == 1
+
+    def test_cancel_by_id_and_cancel_all_delegate(self, cocos):
+        cocos.cancel_order(55)
+        cocos.cancel_all("GGAL", side=OrderOperation.SELL)
+
+        cocos.market.cancel_order.assert_called_once_with(55)
+        cocos.market.cancel_all.assert_called_once_with("GGAL", OrderOperation.SELL)
+
     def test_get_mep_value_delegates(self, cocos):
         cocos.market.get_mep_value.return_value = {"buy": 350}
         result = cocos.get_mep_value()
 
         assert result == {"buy": 350}
         cocos.market.get_mep_value.assert_called_once()
+
+
+class TestCocosCapitalSession:
+    """Tests for session reuse in CocosCapital.login/logout"""
+
+    @pytest.fixture
+    def make_cocos(self, tmp_path):
+        def _make(session_exists):
+            session_file = tmp_path / "session.json"
+            if session_exists:
+                session_file.write_text("{}")
+            with patch('CocosBot.core.browser.sync_playwright') as mock_sync_pw:
+                mock_pw = Mock()
+                mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=Mock()))
+                mock_sync_pw.return_value.start.return_value = mock_pw
+
+                from CocosBot.core.cocos_capital import CocosCapital
+                cc = CocosCapital("user@test.com", "pass123", "gmail@test.com", "app_pass",
+                                  session_file=str(session_file))
+            cc.auth = Mock()
+            return cc, session_file
+        return _make
+
+    def test_valid_session_skips_login(self, make_cocos):
+        cocos, _ = make_cocos(session_exists=True)
+        cocos.auth.is_session_valid.return_value = True
+
+        assert cocos.login() is True
+        cocos.auth.login.assert_not_called()
+        cocos.auth.save_session.assert_not_called()
+
+    def test_expired_session_logs_in_and_saves(self, make_cocos):
+        cocos, session_file = make_cocos(session_exists=True)
+        cocos.auth.is_session_valid.return_value = False
+        cocos.auth.login.return_value = True
+
+        assert cocos.login() is True
+        cocos.auth.login.assert_called_once()
+        cocos.auth.save_session.assert_called_once_with(str(session_file))
+
+    def test_no_session_file_logs_in_without_probe(self, make_cocos):
+        cocos, session_file = make_cocos(session_exists=False)
+        cocos.auth.login.return_value = True
+
+        cocos.login()
+
+        cocos.auth.is_session_valid.assert_not_called()
+        cocos.auth.save_session.assert_called_once_with(str(session_file))
+
+    def test_logout_removes_session_file(self, make_cocos):
+        cocos, session_file = make_cocos(session_exists=True)
+        cocos.auth.logout.return_value = True
+
+        assert cocos.logout() is True
+        assert not session_file.exists()
+
+
+class TestCocosCapitalSnapshot:
+    """Tests for CocosCapital.snapshot"""
+
+    def test_snapshot_uses_single_dashboard_load(self):
+        from CocosBot.config.urls import WEB_APP_URLS, API_URLS
+        with patch('CocosBot.core.browser.sync_playwright') as mock_sync_pw:
+            mock_pw = Mock()
+            mock_pw.chromium.launch.return_value = Mock(new_page=Mock(return_value=Mock()))
+            mock_sync_pw.return_value.start.return_value = mock_pw
+
+            from CocosBot.core.cocos_capital import CocosCapital
+            cc = CocosCapital("user@test.com", "pass123", "gmail@test.com", "app_pass")
+        cc.fetch_many = Mock(return_value={
+            API_URLS["user_data"]: {"id": 1},
+            API_URLS["account_tier"]: {"tier": "gold"},
+            API_URLS["markets_schedule"]: None,
+            API_URLS["academy"]: {"courses": []},
+        })
+
+        result = cc.snapshot()
+
+        assert result == {
+            "user_data": {"id": 1},
+            "account_tier": {"tier": "gold"},
+            "markets_schedule": None,
+            "academy": {"courses": []},
+        }
+        cc.fetch_many.assert_called_once_with(WEB_APP_URLS["dashboard"], [
+            API_URLS["user_data"], API_URLS["account_tier"], API_URLS["markets_schedule"], API_URLS["academy"]
+        ])
@@ -0,0 +1,295 @@
+"""Tests for CocosBot.core.daemon"""
+import json
+import os
+import shutil
+import tempfile
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+from CocosBot.config.enums import MarketType
+from CocosBot.core.instruments import Instrument
+from CocosBot.core.market_snapshot import MarketSnapshot
+from CocosBot.core.daemon import (
+    CocosDaemon, DaemonClient, DaemonError, main,
+    METHOD_NOT_FOUND, INVALID_PARAMS, INVALID_REQUEST, PARSE_ERROR, SERVER_ERROR, REQUEST_TIMEOUT, OUTCOME_UNKNOWN,
+)
+
+
+class FakeCocos:
+    """Stand-in facade that records the thread each call runs on"""
+
+    def __init__(self):
+        self.created_in = threading.get_ident()
+        self.threads = set()
+        self.closed = False
+        self.started = True
+        self.page = Mock()
+        self.orders = []
+        self.release = threading.Event()
+
+    def login(self):
+        self.threads.add(threading.get_ident())
+        return True
+
+    def get_orders(self, max_age=None):
+        self.threads.add(threading.get_ident())
+        return {"orders": [], "max_age": max_age}
+
+    def create_order(self, ticker, operation, amount, limit=None):
+        self.threads.add(threading.get_ident())
+        self.orders.append((ticker, operation, amount))
+        return True
+
+    def get_user_data(self):
+        self.release.wait(5)
+        return {"id": 1}
+
+    def get_market_snapshot(self, market_type, max_age=None):
+        return MarketSnapshot(market_type, ["GGAL"], {"last": [4200.5], "bid": [float("nan")]}, taken_at=1.0)
+
+    def search_instruments(self, prefix, limit=20):
+        return [Instrument("GGAL", "ACCIONES")]
+
+    def get_mep_value(self):
+        raise RuntimeError("sin datos")
+
+    def get_portfolio_data(self):
+        return len(None)
+
+    def close_browser(self):
+        self.closed = True
+
+
+@pytest.fixture
+def socket_path():
+    directory = tempfile.mkdtemp(prefix="cb")
+    yield os.path.join(directory, "d.sock")
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.fixture
+def running_daemon(socket_path):
+    holder = {}
+
+    def factory():
+        holder["cocos"] = FakeCocos()
+        return holder["cocos"]
+
+    daemon = CocosDaemon(factory, socket_path).start()
+    thread = threading.Thread(target=daemon.serve_forever, daemon=True)
+    thread.start()
+    yield daemon, holder
+    daemon.stop()
+
+
+class TestDaemon:
+    """Tests for CocosDaemon over a real Unix socket"""
+
+    def test_calls_run_on_the_worker_thread(self, running_daemon, socket_path):
+        daemon, holder = running_daemon
+
+        with DaemonClient(socket_path) as client:
+            assert client.get_orders(max_age=5) == {"orders": [], "max_age": 5}
+            assert client.create_order("GGAL", "BUY", 1000) is True
+
+        cocos = holder["cocos"]
+        assert cocos.threads == {cocos.created_in}
+        assert cocos.created_in != threading.get_ident()
+        assert daemon.stats()["served"] == 2
+
+    def test_socket_is_private(self, running_daemon, socket_path):
+        assert os.stat(socket_path).st_mode & 0o777 == 0o600
+
+    def test_socket_is_created_private(self, socket_path):
+        umask = os.umask(0o022)
+        os.umask(umask)
+        with patch("CocosBot.core.daemon.os.chmod") as chmod:
+            daemon = CocosDaemon(FakeCocos, socket_path, login=False).start()
+        try:
+            assert os.stat(socket_path).st_mode & 0o777 == 0o600
+            chmod.assert_not_called()
+            assert os.umask(umask) == umask
+        finally:
+            daemon.stop()
+
+    def test_read_facades_return_json(self, running_daemon, socket_path):
+        with DaemonClient(socket_path) as client:
+            snapshot = client.get_market_snapshot(MarketType.STOCKS.value)
+            instruments = client.search_instruments("GG")
+
+        assert snapshot == {"market_type": "ACCIONES", "taken_at": 1.0, "tickers": ["GGAL"],
+                            "columns": {"last": [4200.5], "bid": [None]}}
+        assert instruments[0]["ticker"] == "GGAL"
+        assert instruments[0]["market_type"] == "ACCIONES"
+
+    def test_concurrent_clients_are_serialized(self, running_daemon, socket_path):
+        results = []
+
+        def worker():
+            with DaemonClient(socket_path) as client:
+                results.append(client.get_orders())
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert len(results) == 5
+        assert len(running_daemon[1]["cocos"].threads) == 1
+
+    def test_ping_and_stats(self, running_daemon, socket_path):
+        with DaemonClient(socket_path) as client:
+            assert client.ping() == "pong"
+            assert set(client.stats()) == {"served", "failed", "queued", "busy_time_s", "uptime_s"}
+
+    def test_method_error_is_reported(self, running_daemon, socket_path):
+        with DaemonClient(socket_path) as client:
+            with pytest.raises(DaemonError) as exc_info:
+                client.get_mep_value()
+
+        assert exc_info.value.code == SERVER_ERROR
+        assert exc_info.value.data == {"type": "RuntimeError"}
+        assert running_daemon[0].stats()["failed"] == 1
+
+    def test_unknown_method(self, running_daemon, socket_path):
+        with DaemonClient(socket_path) as client:
+            with pytest.raises(DaemonError) as exc_info:
+                client.call("close_browser")
+
+        assert exc_info.value.code == METHOD_NOT_FOUND
+
+    def test_bad_params(self, running_daemon, socket_path):
+        with DaemonClient(socket_path) as client:
+            with pytest.raises(DaemonError) as exc_info:
+                client.call("get_orders", 1, 2, 3)
+
+        assert exc_info.value.code == INVALID_PARAMS
+        assert running_daemon[0].stats()["served"] == 0
+
+    def test_type_error_inside_method_is_a_server_error(self, running_daemon, socket_path):
+        with DaemonClient(socket_path) as client:
+            with pytest.raises(DaemonError) as exc_info:
+                client.get_portfolio_data()
+
+        assert exc_info.value.code == SERVER_ERROR
+        assert exc_info.value.data == {"type": "TypeError"}
+
+    def test_timed_out_queued_order_never_runs(self, running_daemon):
+        daemon, holder = running_daemon
+        busy = daemon.submit("get_user_data")
+        daemon.request_timeout = 0.05
+
+        response = daemon.handle_line(b'{"id": 7, "method": "create_order", "params": ["GGAL", "BUY", 1000]}')
+        holder["cocos"].release.set()
+        busy.result(timeout=5)
+        daemon.submit("get_orders").result(timeout=5)  # the cancelled call was dequeued by now
+
+        assert response["error"]["code"] == REQUEST_TIMEOUT
+        assert holder["cocos"].orders == []
+
+    def test_timeout_while_running_reports_unknown_outcome(self, running_daemon):
+        daemon, holder = running_daemon
+        daemon.request_timeout = 0.05
+
+        response = daemon.handle_line(b'{"id": 8, "method": "get_user_data"}')
+        holder["cocos"].release.set()
+
+        assert response["error"]["code"] == OUTCOME_UNKNOWN
+
+    def test_stop_closes_browser_and_removes_socket(self, socket_path):
+        holder = {}
+        daemon = CocosDaemon(lambda: holder.setdefault("cocos", FakeCocos()), socket_path).start()
+
+        daemon.stop()
+
+        assert holder["cocos"].closed is True
+        assert not os.path.exists(socket_path)
+
+    def test_startup_failure_raises(self, socket_path):
+        cocos = FakeCocos()
+        cocos.login = Mock(side_effect=RuntimeError("2FA"))
+
+        with pytest.raises(DaemonError, match="2FA"):
+            CocosDaemon(lambda: cocos, socket_path).start()
+
+        assert cocos.closed is True
+
+    def test_idle_worker_pumps_playwright(self, socket_path):
+        holder = {}
+        with patch('CocosBot.core.daemon.IDLE_PUMP_INTERVAL', 0.01):
+            daemon = CocosDaemon(lambda: holder.setdefault("cocos", FakeCocos()), socket_path, login=False).start()
+            threading.Event().wait(0.1)
+            daemon.stop()
+
+        holder["cocos"].page.wait_for_timeout.assert_called_with(1)
+
+    def test_idle_worker_does_not_launch_browser(self, socket_path):
+        holder = {}
+
+        def factory():
+            cocos = holder.setdefault("cocos", FakeCocos())
+            cocos.started = False
+            return cocos
+        with patch('CocosBot.core.daemon.IDLE_PUMP_INTERVAL', 0.01):
+            daemon = CocosDaemon(factory, socket_path, login=False).start()
+            threading.Event().wait(0.1)
+            daemon.stop()
+
+        holder["cocos"].page.wait_for_timeout.assert_not_called()
+
+
+class TestHandleLine:
+    """Tests for request validation"""
+
+    @pytest.fixture
+    def daemon(self):
+        return CocosDaemon(Mock())
+
+    @pytest.mark.parametrize("line,code", [
+        (b"{not json", PARSE_ERROR),
+        (b"[1, 2]", INVALID_REQUEST),
+        (b'{"id": 1}', INVALID_REQUEST),
+        (b'{"id": 1, "method": "get_orders", "params": 5}', INVALID_PARAMS),
+    ])
+    def test_invalid_requests(self, daemon, line, code):
+        response = daemon.handle_line(line)
+
+        assert response["error"]["code"] == code
+
+
+class TestClient:
+    """Tests for DaemonClient without a daemon"""
+
+    def test_connection_error(self, socket_path):
+        with pytest.raises(DaemonError, match="No se pudo comunicar"):
+            DaemonClient(socket_path).get_orders()
+
+    def test_mixed_params_rejected(self, socket_path):
+        with pytest.raises(DaemonError):
+            DaemonClient(socket_path).call("create_order", "GGAL", limit=1)
+
+    def test_unknown_attribute(self, socket_path):
+        with pytest.raises(AttributeError):
+            DaemonClient(socket_path).close_browser
+
+
+class TestMain:
+    """Tests for the command line entry point"""
+
+    def test_call_prints_result(self, running_daemon, socket_path, capsys):
+        assert main(["--socket", socket_path, "call", "get_orders", '{"max_age": 3}']) == 0
+
+        assert json.loads(capsys.readouterr().out) == {"orders": [], "max_age": 3}
+
+    def test_call_error_exit_code(self, running_daemon, socket_path, capsys):
+        assert main(["--socket", socket_path, "call", "get_mep_value"]) == 1
+        assert "sin datos" in capsys.readouterr().err
+
+    def test_serve_requires_credentials(self, socket_path, monkeypatch):
+        for key in ("COCOS_USERNAME", "COCOS_PASSWORD", "GMAIL_USER", "GMAIL_APP_PASS"):
+            monkeypatch.delenv(key, raising=False)
+
+        with pytest.raises(SystemExit):
+            main(["--socket", socket_path, "serve"])
@@ -0,0 +1,131 @@
+"""Tests for CocosBot.core.instruments"""
+import json
+import time
+
+import pytest
+from unittest.mock import Mock
+from CocosBot.config.enums import MarketType
+from CocosBot.config.urls import API_URLS
+from CocosBot.core.instruments import Instrument, InstrumentMaster, parse_instruments, market_of
+
+
+def list_item(ticker, segment="C", currency="ARS", **extra):
+    return {"short_ticker": ticker, "instrument_code": ticker, "segment": segment, "currency": currency,
+            "id_tick": hash(ticker) % 1000, "instrument_name": f"{ticker} S.A.", **extra}
+
+
+def list_response(market, items, status=200):
+    response = Mock(url=f"{API_URLS['markets_list']}{market}&instrument_subtype=LIDERES&segment=C", status=status)
+    response.json.return_value = items
+    return response
+
+
+class TestParseInstruments:
+    """Tests for parse_instruments"""
+
+    def test_parses_list_items(self):
+        result = parse_instruments([list_item("ggal", min_lot=1), list_item("AL30D", segment="C", currency="USD",
+                                                                             lot_size=100)], MarketType.STOCKS)
+
+        assert result[0] == Instrument("GGAL", "ACCIONES", "C", "ARS", 1, hash("ggal") % 1000)
+        assert result[1].currency == "USD"
+        assert result[1].lot_size == 100
+
+    @pytest.mark.parametrize("wrapper", ["items", "data", "results", "tickers"])
+    def test_accepts_wrapped_lists(self, wrapper):
+        assert [i.ticker for i in parse_instruments({wrapper: [list_item("YPFD")]}, "ACCIONES")] == ["YPFD"]
+
+    def test_skips_invalid_items(self):
+        assert parse_instruments([{"price": 1}, "GGAL", None], "ACCIONES") == []
+        assert parse_instruments({"error": "x"}, "ACCIONES") == []
+        assert parse_instruments(None, "ACCIONES") == []
+
+    def test_market_of(self):
+        assert market_of(f"{API_URLS['markets_list']}CEDEARS&page=1") is MarketType.CEDEARS
+        assert market_of(f"{API_URLS['markets_list']}OTRO") is None
+        assert market_of(API_URLS["markets_tickers"]) is None
+
+
+class TestInstrumentMaster:
+    """Tests for InstrumentMaster"""
+
+    @pytest.fixture
+    def master(self):
+        master = InstrumentMaster(path=None)
+        master.update(MarketType.STOCKS, [list_item(t) for t in ("GGAL", "GGALD", "YPFD", "ALUA", "BMA")])
+        master.update(MarketType.CEDEARS, [list_item(t) for t in ("AAPL", "GOOGL", "GLOB")])
+        return master
+
+    def test_lookup_is_case_insensitive(self, master):
+        assert master.lookup("ggal").market_type == "ACCIONES"
+        assert "aapl" in master
+        assert master.lookup("XXXX") is None
+        assert len(master) == 8
+
+    def test_search_by_prefix(self, master):
+        assert [i.ticker for i in master.search("G")] == ["GGAL", "GGALD", "GLOB", "GOOGL"]
+        assert [i.ticker for i in master.search("gg")] == ["GGAL", "GGALD"]
+        assert [i.ticker for i in master.search("G", limit=2)] == ["GGAL", "GGALD"]
+        assert master.search("Z") == []
+        assert len(master.search("", limit=None)) == 8
+
+    def test_search_sees_new_tickers(self, master):
+        master.search("G")
+
+        master.update(MarketType.CEDEARS, [list_item("GOLD")])
+
+        assert "GOLD" in [i.ticker for i in master.search("GO")]
+
+    def test_update_counts_changes_and_prefers_default_segment(self, master):
+        assert master.update(MarketType.STOCKS, [list_item("GGAL")]) == 0
+        assert master.update(MarketType.STOCKS, [list_item("GGAL", segment="H")]) == 0
+        assert master.lookup("GGAL").segment == "C"
+        assert master.update(MarketType.STOCKS, [list_item("NEW", segment="H")]) == 1
+        assert master.update(MarketType.STOCKS, [list_item("NEW", segment="C")]) == 1
+        assert master.lookup("NEW").segment == "C"
+
+    def test_staleness(self, master):
+        assert master.is_stale(MarketType.STOCKS)  # passive updates do not reset the TTL
+
+        master.update(MarketType.STOCKS, [], refreshed=True)
+
+        assert not master.is_stale("ACCIONES")
+        assert MarketType.STOCKS not in master.stale_markets()
+        master.refreshed_at["ACCIONES"] = time.time() - master.ttl - 1
+        assert master.is_stale(MarketType.STOCKS)
+
+    def test_observe_market_list_responses(self):
+        master = InstrumentMaster(path=None)
+
+        master.observe(list_response("ACCIONES", [list_item("GGAL")]))
+        master.observe(list_response("ACCIONES", [list_item("YPFD")], status=500))
+        master.observe(list_response("DESCONOCIDO", [list_item("XX")]))
+        master.observe(Mock(url=f"{API_URLS['markets_tickers']}/GGAL?segment=C", status=200))
+        broken = list_response("CEDEARS", [])
+        broken.json.side_effect = ValueError("not json")
+        master.observe(broken)
+
+        assert [i.ticker for i in master.search("")] == ["GGAL"]
+
+    def test_persists_to_disk(self, tmp_path):
+        path = tmp_path / "cache" / "instruments.json"
+        master = InstrumentMaster(str(path))
+        master.update(MarketType.CEDEARS, [list_item("AAPL", currency="USD")], refreshed=True)
+
+        reloaded = InstrumentMaster(str(path))
+
+        assert reloaded.lookup("AAPL") == master.lookup("AAPL")
+        assert not reloaded.is_stale(MarketType.CEDEARS)
+        assert reloaded.stats() == {"instruments": 1, "per_market": {"CEDEARS": 1},
+                                    "stale_markets": [m.value for m in MarketType if m is not MarketType.CEDEARS]}
+
+    @pytest.mark.parametrize("content", ["not json", json.dumps({"version": 99, "instruments": []}),
+                                         json.dumps({"version": 1})])
+    def test_ignores_invalid_files(self, tmp_path, content):
+        path = tmp_path / "instruments.json"
+        path.write_text(content)
+
+        master = InstrumentMaster(str(path))
+
+        assert len(master) == 0
+        assert master.load() is False
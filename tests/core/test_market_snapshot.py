@@ -0,0 +1,79 @@
+"""Tests for CocosBot.core.market_snapshot"""
+import json
+import math
+
+import pytest
+from unittest.mock import patch
+from CocosBot.config.enums import MarketType
+from CocosBot.core.market_snapshot import MarketSnapshot
+
+
+BOARD = {"items": [
+    {"short_ticker": "GGAL", "last": 4200.5, "bid": 4199, "ask": 4201, "volume": 1500000},
+    {"short_ticker": "YPFD", "last_price": "38000", "bids": [{"price": 37990, "size": 10}],
+     "asks": [{"price": 38010, "size": 5}], "total_volume": 900000},
+    {"short_ticker": "ALUA", "last": 900, "bids": [], "ask": None, "volume": "n/a"},
+    {"instrument_name": "sin ticker"},
+]}
+
+
+@pytest.fixture
+def snapshot():
+    return MarketSnapshot.from_response(BOARD, MarketType.STOCKS)
+
+
+class TestMarketSnapshot:
+    """Tests for MarketSnapshot"""
+
+    def test_builds_columns(self, snapshot):
+        assert snapshot.market_type == "ACCIONES"
+        assert snapshot.tickers == ["GGAL", "YPFD", "ALUA"]
+        assert snapshot["last"][:2] == [4200.5, 38000.0]
+        assert snapshot["bid"][:2] == [4199.0, 37990.0]
+        assert snapshot["ask"][:2] == [4201.0, 38010.0]
+        assert snapshot["volume"][:2] == [1500000.0, 900000.0]
+
+    def test_to_dict_is_json_safe(self, snapshot):
+        data = snapshot.to_dict()
+
+        assert json.loads(json.dumps(data, allow_nan=False)) == data
+        assert data["tickers"] == snapshot.tickers
+        assert data["columns"]["last"][2] == 900
+        assert data["columns"]["bid"][2] is None
+
+    def test_missing_values_are_nan(self, snapshot):
+        row = snapshot.row("alua")
+
+        assert row["last"] == 900
+        assert all(math.isnan(row[column]) for column in ("bid", "ask", "volume"))
+
+    def test_lookup_and_iteration(self, snapshot):
+        assert len(snapshot) == 3
+        assert "ggal" in snapshot
+        assert snapshot.row("XXXX") is None
+        assert [row["ticker"] for row in snapshot] == snapshot.tickers
+
+    def test_where_skips_nan(self, snapshot):
+        assert snapshot.where("volume", lambda v: v > 1_000_000) == ["GGAL"]
+        assert snapshot.where("bid", lambda v: v > 0) == ["GGAL", "YPFD"]
+
+    def test_empty_response(self):
+        snapshot = MarketSnapshot.from_response([], "CEDEARS")
+
+        assert len(snapshot) == 0
+        assert snapshot["last"] == []
+
+    def test_to_numpy(self, snapshot):
+        np = pytest.importorskip("numpy")
+
+        records = snapshot.to_numpy()
+
+        assert list(records.ticker) == ["GGAL", "YPFD", "ALUA"]
+        assert records.last[1] == 38000.0
+        assert np.isnan(records.bid[2])
+        assert list(records.ticker[records.volume > 1_000_000]) == ["GGAL"]
+
+    def test_to_numpy_without_numpy(self, snapshot):
+        with patch.dict("sys.modules", {"numpy": None}):
+            with pytest.raises(ImportError, match="CocosBot\\[numpy\\]"):
+                snapshot.to_numpy()
@@ -0,0 +1,109 @@
+"""Tests for CocosBot.core.network_filter"""
+import pytest
+from unittest.mock import Mock
+from CocosBot.config.network import BLOCK_PROFILES, ESTIMATED_RESOURCE_BYTES
+from CocosBot.core.network_filter import ResourceBlocker
+
+
+def _route(url, resource_type):
+    return Mock(request=Mock(url=url, resource_type=resource_type))
+
+
+class TestShouldBlock:
+    """Tests for ResourceBlocker.should_block with the services preset"""
+
+    @pytest.fixture
+    def blocker(self):
+        return ResourceBlocker("services")
+
+    @pytest.mark.parametrize("url,resource_type", [
+        ("https://app.cocos.capital/static/js/main.js", "script"),
+        ("https://app.cocos.capital/static/css/main.css", "stylesheet"),
+        ("https://api.cocos.capital/api/v2/users/me", "xhr"),
+        ("https://api.cocos.capital/api/v1/orders", "fetch"),
+        ("https://app.cocos.capital/", "document"),
+    ])
+    def test_app_and_api_pass(self, blocker, url, resource_type):
+        assert blocker.should_block(url, resource_type) is False
+
+    @pytest.mark.parametrize("resource_type", ["image", "font", "media"])
+    def test_heavy_resource_types_blocked_even_from_app(self, blocker, resource_type):
+        assert blocker.should_block("https://app.cocos.capital/logo.png", resource_type) is True
+
+    @pytest.mark.parametrize("url", [
+        "https://www.google-analytics.com/collect",
+        "https://www.googletagmanager.com/gtm.js",
+        "https://static.hotjar.com/c/hotjar.js",
+    ])
+    def test_analytics_domains_blocked(self, blocker, url):
+        assert blocker.should_block(url, "script") is True
+
+    def test_unknown_third_party_passes(self, blocker):
+        assert blocker.should_block("https://cdn.example.com/lib.js", "script") is False
+
+    def test_suffix_match_requires_dot(self, blocker):
+        assert blocker.should_block("https://nothotjar.com/x.js", "script") is False
+
+
+class TestProfiles:
+    """Tests for profile resolution"""
+
+    def test_unknown_preset_raises(self):
+        with pytest.raises(ValueError, match="Perfil de bloqueo no válido"):
+            ResourceBlocker("nope")
+
+    def test_custom_profile(self):
+        blocker = ResourceBlocker({"resource_types": ["stylesheet"], "blocked_domains": ["ads.com"]})
+
+        assert blocker.should_block("https://app.cocos.capital/a.css", "stylesheet") is True
+        assert blocker.should_block("https://x.ads.com/a.js", "script") is True
+        assert blocker.should_block("https://app.cocos.capital/a.png", "image") is False
+
+    def test_services_preset_allows_cocos_domains(self):
+        assert BLOCK_PROFILES["services"]["allowed_domains"] == ["app.cocos.capital", "api.cocos.capital"]
+
+
+class TestRouting:
+    """Tests for route handling and stats"""
+
+    def test_install_routes_all_requests(self):
+        page = Mock()
+        blocker = ResourceBlocker()
+
+        blocker.install(page)
+
+        page.route.assert_called_once_with("**/*", blocker._handle_route)
+
+    def test_handle_route_aborts_and_continues(self):
+        blocker = ResourceBlocker()
+        image = _route("https://app.cocos.capital/a.png", "image")
+        api = _route("https://api.cocos.capital/api/v1/orders", "xhr")
+
+        blocker._handle_route(image)
+        blocker._handle_route(api)
+
+        image.abort.assert_called_once()
+        image.continue_.assert_not_called()
+        api.continue_.assert_called_once()
+        api.abort.assert_not_called()
+
+    def test_stats_count_requests_and_bytes(self):
+        blocker = ResourceBlocker()
+        for route in [
+            _route("https://app.cocos.capital/a.png", "image"),
+            _route("https://app.cocos.capital/b.png", "image"),
+            _route("https://app.cocos.capital/f.woff2", "font"),
+            _route("https://www.google-analytics.com/collect", "ping"),
+            _route("https://api.cocos.capital/api/v1/orders", "xhr"),
+        ]:
+            blocker._handle_route(route)
+
+        stats = blocker.stats()
+        assert stats["blocked_requests"] == 4
+        assert stats["allowed_requests"] == 1
+        assert stats["blocked_by_type"] == {"image": 2, "font": 1, "ping": 1}
+        assert stats["estimated_bytes_saved"] == (
+            2 * ESTIMATED_RESOURCE_BYTES["image"]
+            + ESTIMATED_RESOURCE_BYTES["font"]
+            + ESTIMATED_RESOURCE_BYTES["other"]
+        )
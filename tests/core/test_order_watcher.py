@@ -0,0 +1,177 @@
+"""Tests for CocosBot.core.order_watcher"""
+import asyncio
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+from CocosBot.config.enums import OrderEventType as Ev, OrderStatus
+from CocosBot.config.urls import API_URLS
+from CocosBot.core.order_watcher import (
+    OrderWatcher, AsyncOrderWatcher, order_items, order_status, is_orders_list,
+)
+from CocosBot.core.response_dispatcher import ResponseDispatcher
+
+
+def order(order_id, status="PENDIENTE", filled=0, **extra):
+    return {"id": order_id, "status": status, "executed_quantity": filled, "ticker": "GGAL", **extra}
+
+
+def orders_response(payload, url=API_URLS["orders"], method="GET", status=200):
+    response = Mock(url=url, status=status, request=Mock(method=method))
+    response.json.return_value = payload
+    return response
+
+
+def kinds(events):
+    return [(e.order_id, e.kind) for e in events]
+
+
+class TestParsing:
+    """Tests for the payload helpers"""
+
+    @pytest.mark.parametrize("text, expected", [
+        ("PENDIENTE", (OrderStatus.PENDING, False)),
+        ("Parcialmente ejecutada", (OrderStatus.PENDING, True)),
+        ("PARTIALLY_FILLED", (OrderStatus.PENDING, True)),
+        ("EJECUTADA", (OrderStatus.EXECUTED, False)),
+        ("FILLED", (OrderStatus.EXECUTED, False)),
+        ("Cancelada", (OrderStatus.CANCELLED, False)),
+        ("RECHAZADA", (OrderStatus.REJECTED, False)),
+        ("", (OrderStatus.PENDING, False)),
+    ])
+    def test_order_status(self, text, expected):
+        assert order_status({"status": text}) == expected
+
+    def test_order_items(self):
+        assert [i for i, _ in order_items([order(1), {"ticker": "x"}, order(2)])] == [1, 2]
+        assert [i for i, _ in order_items({"orders": [order(3)]})] == [3]
+        assert [i for i, _ in order_items(order(4))] == [4]
+        assert order_items("nada") == []
+
+    def test_is_orders_list(self):
+        assert is_orders_list(orders_response([]))
+        assert is_orders_list(orders_response([], url=f"{API_URLS['orders']}/?page=1"))
+        assert not is_orders_list(orders_response([], method="POST"))
+        assert not is_orders_list(orders_response([], url=f"{API_URLS['orders']}/99"))
+        assert not is_orders_list(orders_response([], status=500))
+        assert not is_orders_list(object())
+
+
+class TestOrderWatcher:
+    """Tests for the sync OrderWatcher"""
+
+    def _watcher(self, payloads, **kwargs):
+        fetch = Mock(side_effect=list(payloads))
+        return OrderWatcher(Mock(), fetch, **kwargs), fetch
+
+    def test_first_read_is_the_baseline(self):
+        watcher, fetch = self._watcher([[order(1), order(2, "EJECUTADA")]])
+
+        watcher.start()
+
+        assert watcher.primed
+        assert list(watcher.iter_events(timeout=0)) == []
+        assert set(watcher.orders) == {1, 2}
+        fetch.assert_called_once()
+
+    def test_emits_only_changes(self):
+        watcher, _ = self._watcher([
+            [order(1), order(2)],
+            [order(1, filled=5), order(2), order(3)],
+            [order(1, "Parcialmente ejecutada", filled=5), order(2, "CANCELADA"), order(3, "RECHAZADA")],
+            [order(1, "EJECUTADA", filled=10), order(2, "CANCELADA"), order(3, "RECHAZADA")],
+        ])
+        watcher.start()
+
+        second = watcher.poll()
+        third = watcher.poll()
+        fourth = watcher.poll()
+
+        assert kinds(second) == [(1, Ev.PARTIALLY_FILLED), (3, Ev.NEW)]
+        assert second[0].last_fill == 5
+        assert kinds(third) == [(2, Ev.CANCELLED), (3, Ev.REJECTED)]
+        assert kinds(fourth) == [(1, Ev.EXECUTED)]
+        assert (fourth[0].status, fourth[0].filled, fourth[0].last_fill) == (OrderStatus.EXECUTED, 10, 5)
+        assert watcher.stats()["events"] == 5
+
+    def test_emit_initial_and_fast_fills(self):
+        watcher, _ = self._watcher([[order(1), order(2, "EJECUTADA", filled=3)]], emit_initial=True)
+
+        events = list(watcher.iter_events(timeout=0))
+
+        assert kinds(events) == [(1, Ev.NEW), (2, Ev.NEW), (2, Ev.EXECUTED)]
+
+    def test_iter_events_polls_on_interval(self):
+        watcher, fetch = self._watcher([[order(1)], [order(1, "EJECUTADA")], [order(1, "EJECUTADA")]], interval=5)
+
+        event = next(watcher.iter_events(poll_interval=1))
+
+        assert event.kind is Ev.EXECUTED
+        assert fetch.call_count == 2
+        assert watcher.page.wait_for_timeout.called
+
+    def test_fetch_errors_are_counted(self):
+        watcher, _ = self._watcher([Exception("net"), None, [order(1)]])
+
+        watcher.start()
+        assert watcher.poll() == []
+        assert not watcher.primed
+        watcher.poll()
+
+        assert watcher.primed
+        assert watcher.stats()["fetch_errors"] == 1
+        assert watcher.stats()["polls"] == 2
+
+    def test_observes_web_app_responses(self):
+        page = Mock()
+        dispatcher = ResponseDispatcher(page)
+        watcher = OrderWatcher(page, Mock(return_value=[order(1)]), dispatcher=dispatcher)
+
+        with watcher:
+            dispatcher._dispatch(orders_response([order(1, "EJECUTADA")]))
+            dispatcher._dispatch(orders_response({"id": 9}, method="POST"))
+            events = list(watcher.iter_events(timeout=0))
+
+        assert kinds(events) == [(1, Ev.EXECUTED)]
+        assert watcher.stats()["observed"] == 1
+        dispatcher._dispatch(orders_response([order(1, "CANCELADA")]))
+        assert watcher.stats()["observed"] == 1
+
+
+class TestAsyncOrderWatcher:
+    """Tests for AsyncOrderWatcher"""
+
+    def test_async_iteration(self):
+        fetch = AsyncMock(side_effect=[[order(1)], [order(1, filled=2), order(2)], [order(1, filled=2), order(2)]])
+        context = Mock()
+
+        async def run():
+            async with AsyncOrderWatcher(fetch, context=context, interval=5) as watcher:
+                events = [e async for e in watcher.iter_events(timeout=30)]
+            return watcher, events
+
+        watcher, events = asyncio.run(run())
+
+        assert kinds(events) == [(1, Ev.PARTIALLY_FILLED), (2, Ev.NEW)]
+        context.on.assert_called_once_with("response", watcher._observe)
+        context.remove_listener.assert_called_once_with("response", watcher._observe)
+
+    def test_observes_context_responses(self):
+        watcher = AsyncOrderWatcher(AsyncMock(side_effect=[[order(1)], Exception("net")]), interval=60000)
+        response = orders_response(None)
+        response.json = AsyncMock(return_value=[order(1, "RECHAZADA")])
+        broken = orders_response(None)
+        broken.json = AsyncMock(side_effect=ValueError("not json"))
+
+        async def run():
+            await watcher.start()
+            await watcher._observe(broken)
+            await watcher._observe(orders_response([], method="POST"))
+            await watcher._observe(response)
+            async for event in watcher:
+                watcher.stop()
+                return event
+
+        event = asyncio.run(run())
+
+        assert event.kind is Ev.REJECTED
+        assert watcher.stats()["observed"] == 1
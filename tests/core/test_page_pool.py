@@ -0,0 +1,219 @@
+"""Tests for CocosBot.core.page_pool"""
+import asyncio
+import pytest
+from unittest.mock import Mock, AsyncMock
+from CocosBot.core.page_pool import FetchRequest, PagePool, PagePoolExhausted, AsyncPagePool
+
+
+def _fake_browser(statuses=None, fail_urls=()):
+    """Browser whose pages answer a navigation with a response for the request URL."""
+    statuses = statuses or {}
+    browser = Mock()
+    browser.contexts = []
+
+    def new_context(storage_state):
+        context = Mock()
+        page = Mock()
+        page.pending = []
+
+        def goto(url, wait_until=None):
+            if url in fail_urls:
+                raise Exception("net::ERR_ABORTED")
+            page.pending.append(url)
+
+        def wait_for_timeout(ms):
+            # Deliver every pending navigation of every page, like the event loop would
+            for ctx in browser.contexts:
+                p = ctx.new_page.return_value
+                handler = p.on.call_args[0][1]
+                while p.pending:
+                    nav = p.pending.pop(0)
+                    if nav in statuses:
+                        handler(Mock(url=f"https://api.test/{nav.rsplit('/', 1)[-1]}", status=statuses[nav]))
+
+        page.goto.side_effect = goto
+        page.wait_for_timeout.side_effect = wait_for_timeout
+        context.new_page.return_value = page
+        browser.contexts.append(context)
+        return context
+
+    browser.new_context.side_effect = new_context
+    return browser
+
+
+class TestPagePool:
+    """Tests for the sync PagePool"""
+
+    def test_checkout_creates_contexts_lazily_with_session_state(self):
+        browser = _fake_browser()
+        state = Mock(return_value={"cookies": []})
+        setup = Mock()
+        pool = PagePool(browser, state, size=2, setup=setup)
+
+        first = pool.checkout()
+        pool.release(first)
+        again = pool.checkout()
+
+        assert again is first
+        browser.new_context.assert_called_once_with(storage_state={"cookies": []})
+        setup.assert_called_once_with(first)
+        assert pool.created == 1
+
+    def test_checkout_raises_when_exhausted(self):
+        pool = PagePool(_fake_browser(), Mock(return_value={}), size=1)
+        pooled = pool.checkout()
+
+        with pytest.raises(PagePoolExhausted):
+            pool.checkout()
+
+        pool.release(pooled)
+        pool.release(pooled)  # double release is a no-op
+        assert pool.available == 1
+
+    def test_run_fetches_in_parallel(self):
+        browser = _fake_browser({"https://app.test/a": 200, "https://app.test/b": 200})
+        pool = PagePool(browser, Mock(return_value={}), size=2)
+
+        results = pool.run({
+            "a": FetchRequest("https://api.test/a", "https://app.test/a"),
+            "b": FetchRequest("https://api.test/b", "https://app.test/b"),
+        })
+
+        assert results["a"].url == "https://api.test/a"
+        assert results["b"].url == "https://api.test/b"
+        stats = pool.stats()
+        assert stats["created"] == 2
+        assert stats["peak_in_use"] == 2
+        assert stats["in_use"] == 0
+        assert stats["checkouts"] == 2
+
+    def test_run_queues_when_pool_is_smaller(self):
+        browser = _fake_browser({f"https://app.test/{i}": 200 for i in range(3)})
+        pool = PagePool(browser, Mock(return_value={}), size=1)
+
+        results = pool.run({i: FetchRequest(f"https://api.test/{i}", f"https://app.test/{i}") for i in range(3)})
+
+        assert [results[i].url for i in range(3)] == [f"https://api.test/{i}" for i in range(3)]
+        stats = pool.stats()
+        assert stats["created"] == 1
+        assert stats["checkouts"] == 3
+        assert stats["max_queue_wait_ms"] > 0
+        assert 0 < stats["utilization"] <= 1
+
+    def test_run_runs_action_after_navigation(self):
+        browser = _fake_browser({"https://app.test/market": 200})
+        action = Mock()
+        pool = PagePool(browser, Mock(return_value={}), size=1)
+
+        pool.run({"t": FetchRequest("https://api.test/market", "https://app.test/market", action=action)})
+
+        action.assert_called_once_with(browser.contexts[0].new_page.return_value)
+
+    def test_run_navigates_every_page_before_actions(self):
+        browser = _fake_browser({"https://app.test/a": 200, "https://app.test/b": 200})
+        calls = []
+        pool = PagePool(browser, Mock(return_value={}), size=2)
+
+        def request(name):
+            return FetchRequest(f"https://api.test/{name}", f"https://app.test/{name}",
+                                action=lambda page: calls.append(("action", name)))
+        for pooled in (pool.checkout(), pool.checkout()):
+            def goto(url, wait_until=None, original=pooled.page.goto.side_effect):
+                calls.append(("goto", url.rsplit("/", 1)[-1]))
+                original(url, wait_until)
+            pooled.page.goto.side_effect = goto
+            pool.release(pooled)
+
+        results = pool.run({"a": request("a"), "b": request("b")})
+
+        assert {call[0] for call in calls[:2]} == {"goto"}
+        assert sorted(calls[2:]) == [("action", "a"), ("action", "b")]
+        assert results["a"] is not None and results["b"] is not None
+
+    def test_run_failed_action_returns_none(self):
+        browser = _fake_browser({"https://app.test/a": 200})
+        pool = PagePool(browser, Mock(return_value={}), size=1)
+
+        results = pool.run({"a": FetchRequest("https://api.test/a", "https://app.test/a",
+                                              action=Mock(side_effect=TimeoutError("no search box")))})
+
+        assert results == {"a": None}
+        assert pool.stats()["in_use"] == 0
+
+    def test_run_failures_and_timeouts_return_none(self):
+        browser = _fake_browser(fail_urls=("https://app.test/broken",))
+        pool = PagePool(browser, Mock(return_value={}), size=2)
+
+        results = pool.run({
+            "broken": FetchRequest("https://api.test/broken", "https://app.test/broken"),
+            "silent": FetchRequest("https://api.test/silent", "https://app.test/silent"),
+        }, timeout=5)
+
+        assert results == {"broken": None, "silent": None}
+        assert pool.stats()["in_use"] == 0
+        assert all(not p.dispatcher.pending_count for p in pool._pages)
+
+    def test_run_with_pages_held_outside(self):
+        pool = PagePool(_fake_browser(), Mock(return_value={}), size=1)
+        pool.checkout()
+
+        with pytest.raises(PagePoolExhausted):
+            pool.run({"a": FetchRequest("https://api.test/a", "https://app.test/a")})
+
+    def test_close(self):
+        browser = _fake_browser()
+        pool = PagePool(browser, Mock(return_value={}), size=1)
+        pool.checkout()
+        browser.contexts[0].close.side_effect = Exception("already closed")
+
+        pool.close()
+
+        assert pool.created == 0
+        assert pool.stats()["utilization"] >= 0
+
+
+class TestAsyncPagePool:
+    """Tests for AsyncPagePool"""
+
+    def test_bounds_concurrency_and_reuses_pages(self):
+        context = AsyncMock()
+        context.new_page.side_effect = lambda: AsyncMock()
+        pool = AsyncPagePool(context, size=2)
+        active = []
+        peak = []
+
+        async def task():
+            async with pool.page() as page:
+                active.append(page)
+                peak.append(len(active))
+                await asyncio.sleep(0.01)
+                active.remove(page)
+
+        async def run():
+            await asyncio.gather(*(task() for _ in range(5)))
+            await pool.close()
+
+        asyncio.run(run())
+
+        assert max(peak) == 2
+        assert context.new_page.await_count == 2
+        stats = pool.stats()
+        assert stats["checkouts"] == 5
+        assert stats["peak_in_use"] == 2
+        assert stats["max_queue_wait_ms"] > 0
+        assert pool.created == 0
+
+    def test_failed_page_creation_frees_the_slot(self):
+        context = AsyncMock()
+        context.new_page.side_effect = [Exception("closed"), AsyncMock()]
+        pool = AsyncPagePool(context, size=1)
+
+        async def run():
+            with pytest.raises(Exception, match="closed"):
+                async with pool.page():
+                    pass
+            async with pool.page() as page:
+                return page
+
+        assert asyncio.run(run()) is not None
+        assert pool.stats()["in_use"] == 0
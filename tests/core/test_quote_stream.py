@@ -0,0 +1,231 @@
+"""Tests for CocosBot.core.quote_stream"""
+import asyncio
+import json
+import math
+import time
+
+import pytest
+from unittest.mock import Mock, AsyncMock
+from CocosBot.core.quote_stream import (
+    QuoteStream, AsyncQuoteStream, QuoteStreamError, decode_frame, QUOTE_FEED_HOST,
+)
+
+
+class FakeSocket:
+    """WebSocket double that keeps the registered handlers."""
+
+    def __init__(self, url=f"wss://quotes.{QUOTE_FEED_HOST}/feed"):
+        self.url = url
+        self.handlers = {}
+        self.remove_listener = Mock()
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+    def send(self, payload):
+        self.handlers["framereceived"](payload)
+
+    def close(self):
+        self.handlers["close"](self)
+
+
+def make_page(script=()):
+    """Page double; each wait_for_timeout runs the next scripted callable."""
+    page = Mock()
+    page.handlers = {}
+    page.on.side_effect = lambda event, handler: page.handlers.__setitem__(event, handler)
+    steps = list(script)
+    page.wait_for_timeout.side_effect = lambda ms: steps.pop(0)() if steps else None
+    return page
+
+
+def quote(ticker, last, **extra):
+    return json.dumps({"short_ticker": ticker, "last": last, "bid": last - 1, "ask": last + 1, "volume": 10, **extra})
+
+
+class TestDecodeFrame:
+    """Tests for decode_frame"""
+
+    def test_single_quote(self):
+        [tick] = decode_frame(quote("ggal", 100, timestamp=1_700_000_000_000))
+
+        assert (tick.ticker, tick.last, tick.bid, tick.ask, tick.volume) == ("GGAL", 100, 99, 101, 10)
+        assert tick.exchange_time == 1_700_000_000
+        assert tick.lag == pytest.approx(tick.received_at - 1_700_000_000)
+
+    def test_nested_and_socketio_frames(self):
+        frame = '42["quotes", {"data": [{"ticker": "AL30", "last": 1}, {"symbol": "x"}, {"ticker": "GD30"}]}]'
+
+        ticks = decode_frame(frame.encode())
+
+        assert [t.ticker for t in ticks] == ["AL30", "GD30"]
+        assert math.isnan(ticks[1].last)
+        assert ticks[0].exchange_time is None
+
+    def test_time_formats(self):
+        assert decode_frame(quote("A", 1, ts=1_700_000_000))[0].exchange_time == 1_700_000_000
+        assert decode_frame(quote("A", 1, time="2024-01-02T03:04:05Z"))[0].exchange_time == 1704164645
+        assert decode_frame(quote("A", 1, date="ayer"))[0].exchange_time is None
+
+    def test_control_frames(self):
+        assert decode_frame("2") == []
+        assert decode_frame('{"type": "pong"}') == []
+        with pytest.raises(ValueError):
+            decode_frame("not json")
+
+
+class TestQuoteStream:
+    """Tests for the sync QuoteStream"""
+
+    def test_streams_subscribed_tickers(self):
+        ws = FakeSocket()
+        page = make_page([
+            lambda: page.handlers["websocket"](ws),
+            lambda: (ws.send(quote("GGAL", 100)), ws.send(quote("YPFD", 5)), ws.send("junk")),
+            lambda: ws.send(quote("GGAL", 101)),
+        ])
+        stream = QuoteStream(page, ["ggal"])
+
+        ticks = list(stream.iter_ticks(timeout=50, poll_interval=1))
+
+        assert [t.last for t in ticks] == [100, 101]
+        stats = stream.stats()
+        assert stats["frames"] == 4
+        assert stats["ticks"] == 2
+        assert stats["decode_errors"] == 1
+        assert stats["connected"] is True
+
+    def test_ignores_other_websockets_and_subscription_changes(self):
+        stream = QuoteStream(make_page())
+        stream.start()
+        other = FakeSocket("wss://analytics.example.com")
+        stream.page.handlers["websocket"](other)
+        assert "framereceived" not in other.handlers
+
+        stream.subscribe(["AAPL"])
+        stream.unsubscribe(["AAPL"])
+        ws = FakeSocket()
+        stream.page.handlers["websocket"](ws)
+        ws.send(quote("AAPL", 1))
+
+        assert stream.ticks == 0
+
+    def test_drops_oldest_when_queue_is_full(self):
+        stream = QuoteStream(make_page(), queue_size=2)
+        stream.start()
+        ws = FakeSocket()
+        stream.page.handlers["websocket"](ws)
+        for last in (1, 2, 3):
+            ws.send(quote("GGAL", last))
+
+        assert [t.last for t in stream.iter_ticks(timeout=0)] == [2, 3]
+        assert stream.dropped == 1
+
+    def test_reloads_page_when_feed_closes(self):
+        ws, ws2 = FakeSocket(), FakeSocket()
+        page = make_page([
+            lambda: page.handlers["websocket"](ws),
+            lambda: ws.close(),
+            lambda: time.sleep(0.01),
+        ])
+
+        def reload(wait_until):
+            page.handlers["websocket"](ws2)
+            ws2.send(quote("GGAL", 7))
+        page.reload.side_effect = reload
+        stream = QuoteStream(page, reconnect_delay=5)
+
+        tick = next(stream.iter_ticks(poll_interval=1))
+
+        assert tick.last == 7
+        page.reload.assert_called_once_with(wait_until="commit")
+        assert stream.stats()["disconnects"] == 1
+        assert stream.stats()["reconnects"] == 1
+
+    def test_gives_up_after_max_reconnects(self):
+        page = make_page()
+        page.wait_for_timeout.side_effect = lambda ms: time.sleep(0.002)
+        page.reload.side_effect = Exception("net::ERR")
+        stream = QuoteStream(page, reconnect_delay=1, max_reconnects=2)
+
+        with pytest.raises(QuoteStreamError):
+            list(stream.iter_ticks(poll_interval=1))
+
+        assert page.reload.call_count == 2
+
+    def test_stats_track_lag_and_gaps(self):
+        stream = QuoteStream(make_page())
+        stream.start()
+        ws = FakeSocket()
+        stream.page.handlers["websocket"](ws)
+        ws.send(quote("GGAL", 1, ts=time.time() - 0.5))
+        time.sleep(0.01)
+        ws.send(quote("GGAL", 2))
+
+        stats = stream.stats()
+
+        assert 400 < stats["avg_lag_ms"] < 2000
+        assert stats["max_lag_ms"] == pytest.approx(stats["avg_lag_ms"])
+        assert stats["max_gap_ms"] >= 10
+
+    def test_context_manager_detaches(self):
+        page = make_page()
+        ws = FakeSocket()
+
+        with QuoteStream(page) as stream:
+            page.handlers["websocket"](ws)
+
+        page.remove_listener.assert_called_once_with("websocket", stream._on_websocket)
+        ws.remove_listener.assert_any_call("framereceived", stream._on_frame)
+        assert stream.connected is False
+        stream.stop()  # idempotent
+
+
+class TestAsyncQuoteStream:
+    """Tests for AsyncQuoteStream"""
+
+    def _page(self):
+        page = AsyncMock()
+        page.handlers = {}
+        page.on = Mock(side_effect=lambda event, handler: page.handlers.__setitem__(event, handler))
+        page.remove_listener = Mock()
+        return page
+
+    def test_async_iteration(self):
+        page = self._page()
+
+        async def run():
+            async with AsyncQuoteStream(page, ["GGAL"], close_page=True, queue_size=2) as stream:
+                ws = FakeSocket()
+                page.handlers["websocket"](ws)
+                for last in (1, 2, 3):
+                    ws.send(quote("GGAL", last))
+                ws.send(quote("YPFD", 9))
+                return [t.last async for t in stream.iter_ticks(timeout=20)], stream
+
+        lasts, stream = asyncio.run(run())
+
+        assert lasts == [2, 3]
+        assert stream.dropped == 1
+        page.close.assert_awaited_once()
+
+    def test_async_reconnect(self):
+        page = self._page()
+        ws = FakeSocket()
+
+        async def reload(wait_until):
+            page.handlers["websocket"](ws)
+            ws.send(quote("GGAL", 5))
+        page.reload.side_effect = reload
+
+        async def run():
+            stream = AsyncQuoteStream(page, reconnect_delay=10)
+            async for tick in stream:
+                await stream.stop()
+                return tick, stream
+
+        tick, stream = asyncio.run(run())
+
+        assert tick.last == 5
+        assert stream.reconnects == 1
+        page.close.assert_not_awaited()
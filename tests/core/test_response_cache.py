@@ -0,0 +1,67 @@
+"""Tests for CocosBot.core.response_cache"""
+import time
+from unittest.mock import patch
+from CocosBot.core.response_cache import ResponseCache, normalize_api_url
+
+
+class TestNormalizeApiUrl:
+    """Tests for normalize_api_url"""
+
+    def test_sorts_query_params(self):
+        assert normalize_api_url("https://api/p?from=BROKER&currency=ARS") == \
+            normalize_api_url("https://api/p?currency=ARS&from=BROKER")
+
+    def test_strips_fragment_and_trailing_slash(self):
+        assert normalize_api_url("https://API/orders/#x") == "https://api/orders"
+
+    def test_keeps_blank_values(self):
+        assert normalize_api_url("https://api/accounts?currency=") == "https://api/accounts?currency="
+
+
+class TestResponseCache:
+    """Tests for ResponseCache"""
+
+    def test_fresh_hit(self):
+        cache = ResponseCache()
+        cache.put("https://api/orders", {"a": 1})
+
+        assert cache.get("https://api/orders", max_age=60) == (True, {"a": 1})
+        assert cache.stats()["hits"] == 1
+
+    def test_stale_entry_is_a_miss(self):
+        cache = ResponseCache()
+        cache.put("https://api/orders", {"a": 1}, timestamp=time.time() - 120)
+
+        assert cache.get("https://api/orders", max_age=60) == (False, None)
+        assert cache.stats()["misses"] == 1
+        assert cache.age("https://api/orders") >= 120
+
+    def test_unknown_url_is_a_miss(self):
+        cache = ResponseCache()
+
+        assert cache.get("https://api/none", max_age=60) == (False, None)
+        assert cache.age("https://api/none") is None
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("https://api/a", 1)
+        cache.put("https://api/b", 2)
+        cache.get("https://api/a", max_age=60)
+        cache.put("https://api/c", 3)
+
+        assert len(cache) == 2
+        assert cache.get("https://api/b", max_age=60) == (False, None)
+        assert cache.get("https://api/a", max_age=60) == (True, 1)
+        assert cache.stats()["evictions"] == 1
+
+    def test_stats_and_clear(self):
+        cache = ResponseCache(max_entries=10)
+        assert cache.stats()["hit_rate"] == 0.0
+        cache.put("https://api/a", 1)
+        cache.get("https://api/a", max_age=60)
+        cache.get("https://api/b", max_age=60)
+
+        stats = cache.stats()
+        assert stats == {"size": 1, "max_entries": 10, "hits": 1, "misses": 1, "hit_rate": 0.5, "evictions": 0}
+        cache.clear()
+        assert len(cache) == 0
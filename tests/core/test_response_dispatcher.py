@@ -0,0 +1,110 @@
+"""Tests for CocosBot.core.response_dispatcher"""
+import pytest
+from unittest.mock import Mock
+from CocosBot.core.response_dispatcher import ResponseDispatcher
+
+
+@pytest.fixture
+def page():
+    return Mock()
+
+
+class TestResponseDispatcher:
+    """Tests for ResponseDispatcher"""
+
+    def test_registers_single_listener(self, page):
+        dispatcher = ResponseDispatcher(page)
+
+        page.on.assert_called_once_with("response", dispatcher._dispatch)
+        assert dispatcher.stats()["listeners"] == 1
+
+    def test_routes_response_to_matching_waiter(self, page):
+        dispatcher = ResponseDispatcher(page)
+        orders = dispatcher.expect("https://api/orders")
+        mep = dispatcher.expect("https://api/usd/prices")
+        response = Mock(url="https://api/orders?page=1", status=200)
+
+        dispatcher._dispatch(response)
+
+        assert orders.done and orders.response is response
+        assert not mep.done
+        assert dispatcher.pending_count == 1
+
+    def test_wait_returns_response(self, page):
+        dispatcher = ResponseDispatcher(page)
+        response = Mock(url="https://api/orders", status=200)
+        page.wait_for_timeout.side_effect = lambda ms: dispatcher._dispatch(response)
+
+        with dispatcher.expect("https://api/orders") as waiter:
+            assert waiter.wait(1000) is response
+
+        page.wait_for_timeout.assert_called_once()
+
+    def test_wait_timeout_cleans_up(self, page):
+        dispatcher = ResponseDispatcher(page, poll_interval=5)
+
+        with dispatcher.expect("https://api/orders") as waiter:
+            with pytest.raises(TimeoutError):
+                waiter.wait(20)
+
+        assert dispatcher.pending_count == 0
+        assert dispatcher.stats()["timeouts"] == 1
+
+    def test_context_exit_discards_pending(self, page):
+        dispatcher = ResponseDispatcher(page)
+
+        with pytest.raises(RuntimeError):
+            with dispatcher.expect("https://api/orders"):
+                raise RuntimeError("navigation failed")
+
+        assert dispatcher.pending_count == 0
+
+    def test_discard_keeps_other_waiters_for_same_pattern(self, page):
+        dispatcher = ResponseDispatcher(page)
+        first = dispatcher.expect("https://api/orders")
+        second = dispatcher.expect("https://api/orders")
+
+        dispatcher.discard(first)
+        dispatcher.discard(first)
+
+        assert dispatcher.pending_count == 1
+        dispatcher._dispatch(Mock(url="https://api/orders", status=200))
+        assert second.done
+
+    def test_wait_all(self, page):
+        dispatcher = ResponseDispatcher(page)
+        waiters = [dispatcher.expect("https://api/a"), dispatcher.expect("https://api/b")]
+        responses = iter([Mock(url="https://api/a", status=200), Mock(url="https://api/b", status=200)])
+        page.wait_for_timeout.side_effect = lambda ms: dispatcher._dispatch(next(responses))
+
+        assert dispatcher.wait_all(waiters, 1000) is True
+        assert page.wait_for_timeout.call_count == 2
+
+    def test_stats_track_dispatch(self, page):
+        dispatcher = ResponseDispatcher(page)
+        assert dispatcher.stats()["avg_dispatch_time_ms"] == 0.0
+
+        for _ in range(3):
+            dispatcher._dispatch(Mock(url="https://app/static.js", status=200))
+
+        stats = dispatcher.stats()
+        assert stats["dispatched"] == 3
+        assert stats["matched"] == 0
+        assert stats["dispatch_time_ms"] >= 0
+
+    def test_observers_receive_every_response(self, page):
+        dispatcher = ResponseDispatcher(page)
+        seen = []
+        dispatcher.add_observer(seen.append)
+        dispatcher.add_observer(Mock(side_effect=Exception("observer failed")))
+        response = Mock(url="https://app/static.js", status=200)
+
+        dispatcher._dispatch(response)
+
+        assert seen == [response]
+        assert dispatcher.stats()["dispatched"] == 1
+
+        dispatcher.remove_observer(seen.append)
+        dispatcher.remove_observer(seen.append)  # no-op if not registered
+        dispatcher._dispatch(response)
+        assert seen == [response]
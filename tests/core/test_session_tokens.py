@@ -0,0 +1,223 @@
+"""Tests for CocosBot.core.session_tokens"""
+import base64
+import json
+import threading
+import time
+
+import pytest
+from unittest.mock import Mock
+from CocosBot.config.urls import API_URLS
+from CocosBot.core.api_client import ApiClientError
+from CocosBot.core.session_tokens import TokenManager, jwt_expiry
+
+
+def make_jwt(exp):
+    payload = base64.urlsafe_b64encode(json.dumps({"sub": "1", "exp": exp}).encode()).rstrip(b"=").decode()
+    return f"eyJhbGciOiJIUzI1NiJ9.{payload}.signature"
+
+
+def token_response(exp, refresh="r1", **extra):
+    return {"access_token": make_jwt(exp), "refresh_token": refresh, "token_type": "bearer", **extra}
+
+
+class TestJwtExpiry:
+    """Tests for jwt_expiry"""
+
+    def test_reads_exp_claim(self):
+        assert jwt_expiry(make_jwt(1700000000)) == 1700000000
+
+    def test_accepts_bearer_prefix(self):
+        assert jwt_expiry(f"Bearer {make_jwt(1700000000)}") == 1700000000
+
+    @pytest.mark.parametrize("token", [None, "", "opaque", "a.!!!.c", "a.e30.c"])
+    def test_invalid_tokens(self, token):
+        assert jwt_expiry(token) is None
+
+
+class TestTokenManager:
+    """Tests for TokenManager"""
+
+    def test_observe_captures_token_response(self):
+        manager = TokenManager()
+        exp = time.time() + 3600
+        response = Mock(url=API_URLS["auth_token"], status=200)
+        response.json.return_value = token_response(exp)
+
+        manager.observe(response)
+        manager.observe(Mock(url=API_URLS["user_data"], status=200))
+
+        assert manager.expires_at == pytest.approx(exp)
+        assert manager.refresh_token == "r1"
+        assert 3590 < manager.seconds_left() <= 3600
+        assert manager.status()["scheduled"] is False  # nothing to refresh with, no client
+
+    def test_expiry_prefers_response_fields(self):
+        manager = TokenManager()
+
+        manager.update(token_response(1, expires_at=2000000000))
+        assert manager.expires_at == 2000000000
+
+        manager.update(token_response(1, expires_in=60))
+        assert 55 < manager.seconds_left() <= 60
+
+    def test_update_sets_client_header_and_schedules(self):
+        client = Mock(headers={})
+        manager = TokenManager(client, margin=120)
+        data = token_response(time.time() + 3600)
+
+        manager.update(data)
+        try:
+            assert client.headers["authorization"] == f"Bearer {data['access_token']}"
+            assert manager.status()["scheduled"] is True
+            assert manager.needs_refresh() is False
+        finally:
+            manager.stop()
+        assert manager.status()["scheduled"] is False
+
+    def test_ignores_responses_without_token(self):
+        manager = TokenManager()
+
+        manager.update({"error": "invalid_grant"})
+
+        assert manager.access_token is None
+        assert manager.seconds_left() is None
+        assert manager.needs_refresh() is False
+
+    def test_refresh_posts_refresh_token(self):
+        client = Mock(headers={})
+        client.post_json.return_value = token_response(time.time() + 3600, refresh="r2")
+        manager = TokenManager(client)
+        manager.refresh_token = "r1"
+        manager.expires_at = time.time() + 30
+
+        try:
+            assert manager.needs_refresh() is True
+            assert manager.refresh() is True
+        finally:
+            manager.stop()
+
+        client.post_json.assert_called_with(API_URLS["auth_refresh"], {"refresh_token": "r1"})
+        assert manager.refresh_token == "r2"
+        assert manager.refreshes == 1
+
+    @pytest.mark.parametrize("outcome", [ApiClientError("401", status=401), {"error": "invalid_grant"}])
+    def test_refresh_failure(self, outcome):
+        client = Mock(headers={})
+        if isinstance(outcome, Exception):
+            client.post_json.side_effect = outcome
+        else:
+            client.post_json.return_value = outcome
+        manager = TokenManager(client)
+        manager.refresh_token = "r1"
+
+        assert manager.refresh() is False
+        assert manager.failures == 1
+
+    def test_refresh_needs_client_and_refresh_token(self):
+        assert TokenManager().refresh() is False
+        assert TokenManager(Mock()).refresh() is False
+
+    def test_scheduled_refresh_runs_before_expiry(self):
+        refreshed = threading.Event()
+        client = Mock(headers={})
+
+        threads = []
+
+        def post_json(url, payload):
+            threads.append(threading.current_thread())
+            refreshed.set()
+            return token_response(time.time() + 3600, refresh="r2")
+        client.post_json.side_effect = post_json
+        manager = TokenManager(client, margin=120)
+
+        manager.update(token_response(time.time() + 120.05))
+        try:
+            assert refreshed.wait(2)
+        finally:
+            manager.stop()
+        threads[0].join(2)  # the refresh thread applies the new token before it exits
+        assert manager.refresh_token == "r2"
+
+    def test_scheduled_refresh_retries_while_token_is_valid(self):
+        calls = []
+        done = threading.Event()
+        client = Mock(headers={})
+
+        def post_json(url, payload):
+            calls.append(threading.current_thread())
+            if len(calls) == 1:
+                raise ApiClientError("502", status=502)
+            done.set()
+            return token_response(time.time() + 3600, refresh="r2")
+        client.post_json.side_effect = post_json
+        manager = TokenManager(client, margin=120, retry_delay=0.01)
+
+        manager.update(token_response(time.time() + 120.05))
+        try:
+            assert done.wait(2)
+        finally:
+            manager.stop()
+        calls[-1].join(2)
+        assert manager.failures == 1
+        assert manager.refreshes == 1
+
+    def test_refreshes_share_one_thread_and_close_its_connection(self):
+        threads = []
+        done = threading.Event()
+        client = Mock(headers={})
+
+        def post_json(url, payload):
+            threads.append(threading.current_thread())
+            if len(threads) == 3:
+                done.set()
+                return token_response(time.time() + 3600, refresh="r2")
+            return token_response(time.time() + 120.02, refresh="r2")
+        client.post_json.side_effect = post_json
+        manager = TokenManager(client, margin=120)
+
+        manager.update(token_response(time.time() + 120.02))
+        try:
+            assert done.wait(2)
+        finally:
+            manager.stop()
+        threads[0].join(2)
+
+        assert len(set(threads)) == 1
+        assert threads[0].name == "cocos-token-refresh"
+        assert not threads[0].is_alive()
+        client.close_thread_connections.assert_called_once_with()
+
+    def test_warns_when_refresh_token_rotates(self, caplog):
+        client = Mock(headers={})
+        client.post_json.return_value = token_response(time.time() + 3600, refresh="r2")
+        manager = TokenManager(client)
+        manager.refresh_token = "r1"
+
+        try:
+            assert manager.refresh() is True
+        finally:
+            manager.stop()
+
+        assert "rotó el refresh token" in caplog.text
+
+    def test_scheduled_refresh_gives_up_after_expiry(self):
+        client = Mock(headers={})
+        client.post_json.side_effect = ApiClientError("401", status=401)
+        manager = TokenManager(client)
+        manager.update(token_response(time.time() - 1))
+
+        manager.stop()
+        manager._scheduled_refresh()
+
+        assert manager.status()["scheduled"] is False
+
+    def test_is_stale(self):
+        manager = TokenManager()
+        assert manager.is_stale(f"Bearer {make_jwt(100)}") is False
+
+        manager.update(token_response(2000))
+
+        assert manager.is_stale(f"Bearer {make_jwt(1000)}") is True
+        assert manager.is_stale(f"Bearer {make_jwt(3000)}") is False
+        assert manager.is_stale("Bearer opaque") is False
+        assert manager.is_stale(None) is False
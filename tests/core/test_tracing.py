@@ -0,0 +1,159 @@
+"""Tests for CocosBot.core.tracing"""
+import asyncio
+import io
+import json
+
+import pytest
+from unittest.mock import Mock
+from CocosBot.core.tracing import Tracer, Histogram, span_of, traced_methods
+
+
+class TestHistogram:
+    """Tests for Histogram"""
+
+    def test_quantiles_interpolate_within_buckets(self):
+        histogram = Histogram((0.1, 0.2, 0.4))
+        for value in [0.05] * 50 + [0.15] * 45 + [0.3] * 5:
+            histogram.observe(value)
+
+        assert histogram.count == 100
+        assert histogram.quantile(0.5) == pytest.approx(0.1)
+        assert 0.1 < histogram.quantile(0.95) <= 0.2
+        assert histogram.quantile(1.0) == pytest.approx(0.3)
+        assert histogram.cumulative()[-1] == (float("inf"), 100)
+
+    def test_overflow_bucket_and_empty(self):
+        histogram = Histogram((0.1,))
+        assert histogram.quantile(0.5) == 0.0
+
+        histogram.observe(5.0)
+
+        assert histogram.counts == [0, 1]
+        assert histogram.quantile(0.95) == 5.0
+
+
+class TestTracer:
+    """Tests for Tracer"""
+
+    def test_nested_spans_are_keyed_by_operation(self):
+        tracer = Tracer()
+
+        with tracer.span("get_orders"):
+            with tracer.span("go_to", url="https://app/orders"):
+                with tracer.span("response.json"):
+                    pass
+            with tracer.span("go_to"):
+                pass
+        with tracer.span("go_to"):
+            pass
+
+        summary = tracer.summary()
+        assert summary["get_orders"]["total"]["count"] == 1
+        assert summary["get_orders"]["go_to"]["count"] == 2
+        assert summary["get_orders"]["response.json"]["count"] == 1
+        assert summary["go_to"]["total"]["count"] == 1
+        assert len(tracer.traces) == 2
+
+    def test_errors_are_recorded_and_propagated(self):
+        tracer = Tracer()
+
+        with pytest.raises(ValueError):
+            with tracer.span("create_order"):
+                raise ValueError("boom")
+
+        assert tracer.traces[0].error == "ValueError"
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer(enabled=False)
+
+        with tracer.span("get_orders") as span:
+            assert span is None
+
+        assert tracer.summary() == {}
+
+    def test_spans_follow_asyncio_tasks(self):
+        tracer = Tracer()
+
+        async def read(name):
+            with tracer.span(name):
+                await asyncio.sleep(0)
+                with tracer.span("go_to"):
+                    await asyncio.sleep(0)
+
+        async def run():
+            await asyncio.gather(read("get_orders"), read("get_portfolio_data"))
+
+        asyncio.run(run())
+
+        summary = tracer.summary()
+        assert summary["get_orders"]["go_to"]["count"] == 1
+        assert summary["get_portfolio_data"]["go_to"]["count"] == 1
+
+    def test_export_jsonl(self, tmp_path):
+        tracer = Tracer(buffer_size=2)
+        for _ in range(3):
+            with tracer.span("get_orders", source="test"):
+                with tracer.span("go_to", url="u"):
+                    with tracer.span("response.json"):
+                        pass
+        path = tmp_path / "traces.jsonl"
+
+        assert tracer.export_jsonl(str(path)) == 2
+        assert tracer.export_jsonl(io.StringIO()) == 0
+
+        lines = [json.loads(line) for line in path.read_text().splitlines()]
+        assert len(lines) == 2
+        assert lines[0]["operation"] == "get_orders"
+        assert lines[0]["source"] == "test"
+        assert [(s["name"], s["parent"]) for s in lines[0]["spans"]] == [("go_to", "get_orders"),
+                                                                        ("response.json", "go_to")]
+        assert lines[0]["spans"][0]["url"] == "u"
+
+    def test_to_prometheus(self):
+        tracer = Tracer(buckets=(0.5,))
+        with tracer.span('we"ird'):
+            pass
+
+        text = tracer.to_prometheus()
+
+        assert "# TYPE cocosbot_span_duration_seconds histogram" in text
+        assert 'cocosbot_span_duration_seconds_bucket{operation="we\\"ird",stage="total",le="0.5"} 1' in text
+        assert 'cocosbot_span_duration_seconds_bucket{operation="we\\"ird",stage="total",le="+Inf"} 1' in text
+        assert 'cocosbot_span_duration_seconds_count{operation="we\\"ird",stage="total"} 1' in text
+
+        tracer.reset()
+        assert tracer.to_prometheus().count("\n") == 2
+
+
+class TestTracedMethods:
+    """Tests for span_of and traced_methods"""
+
+    def test_span_of_without_tracer(self):
+        with span_of(Mock(), "stage") as span:
+            assert span is None
+
+    def test_wraps_public_sync_and_async_methods(self):
+        @traced_methods
+        class Facade:
+            def __init__(self):
+                self.tracer = Tracer()
+
+            def get_orders(self, max_age=None):
+                """Docstring."""
+                with self.tracer.span("go_to"):
+                    return max_age
+
+            async def get_mep_value(self):
+                return 1
+
+            def _private(self):
+                return 2
+
+        facade = Facade()
+
+        assert facade.get_orders(max_age=5) == 5
+        assert asyncio.run(facade.get_mep_value()) == 1
+        assert facade._private() == 2
+        assert Facade.get_orders.__doc__ == "Docstring."
+        assert set(facade.tracer.summary()) == {"get_orders", "get_mep_value"}
+        assert facade.tracer.summary()["get_orders"]["go_to"]["count"] == 1
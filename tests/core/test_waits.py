@@ -0,0 +1,200 @@
+"""Tests for CocosBot.core.waits"""
+import asyncio
+import pytest
+from unittest.mock import Mock, MagicMock, AsyncMock, patch
+from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+from CocosBot.core.response_dispatcher import ResponseDispatcher
+from CocosBot.core.waits import (
+    WaitReport, WaitEngine, AsyncWaitEngine, wait_until, digits_of, timing_report, LEGACY_SLEEPS
+)
+
+
+class TestWaitReport:
+    """Tests for WaitReport"""
+
+    def test_summary_accumulates_per_flow(self):
+        report = WaitReport()
+        report.record("limit_order", 0.5, 3.0)
+        report.record("limit_order", 0.25, 3.0)
+        report.record("two_factor_mail", 6.0, 20.0)
+
+        summary = report.summary()
+
+        assert summary["limit_order"] == {"calls": 2, "waited_s": 0.75, "baseline_s": 6.0, "saved_s": 5.25}
+        assert summary["two_factor_mail"]["saved_s"] == 14.0
+        assert report.total_saved() == 19.25
+
+    def test_reset(self):
+        report = WaitReport()
+        report.record("x", 1.0)
+        report.reset()
+
+        assert report.summary() == {}
+
+    def test_digits_of(self):
+        assert digits_of("1.234,50") == "123450"
+
+
+class TestWaitUntil:
+    """Tests for wait_until"""
+
+    def test_returns_first_truthy_result(self):
+        predicate = Mock(side_effect=[None, [], [b"1"]])
+        report = WaitReport()
+
+        with patch('CocosBot.core.waits.time.sleep') as mock_sleep:
+            result = wait_until(predicate, timeout=1000, interval=10, flow="mail", baseline=20.0, report=report)
+
+        assert result == [b"1"]
+        assert mock_sleep.call_count == 2
+        assert report.summary()["mail"]["calls"] == 1
+
+    def test_timeout_raises(self):
+        with pytest.raises(TimeoutError):
+            wait_until(lambda: False, timeout=20, interval=5)
+
+
+class TestWaitEngine:
+    """Tests for the page-based waits"""
+
+    def test_uses_shared_report_by_default(self):
+        assert WaitEngine(Mock()).report is timing_report
+
+    def test_element_enabled(self):
+        page = Mock()
+        report = WaitReport()
+
+        WaitEngine(page, report=report).element_enabled("p#more", timeout=500, flow="limit_order",
+                                                        baseline=LEGACY_SLEEPS["limit_order"])
+
+        _, kwargs = page.wait_for_function.call_args
+        assert kwargs == {"arg": "p#more", "timeout": 500, "polling": "raf"}
+        assert report.summary()["limit_order"]["baseline_s"] == 3.0
+
+    def test_input_value_compares_digits(self):
+        page = Mock()
+
+        WaitEngine(page).input_value("input#limit", "1.234,5")
+
+        assert page.wait_for_function.call_args[1]["arg"] == ["input#limit", "12345"]
+
+    def test_dom_mutation_polls_on_mutation(self):
+        page = Mock()
+
+        WaitEngine(page).dom_mutation("div#status", "Pendiente")
+
+        _, kwargs = page.wait_for_function.call_args
+        assert kwargs["arg"] == ["div#status", "Pendiente"]
+        assert kwargs["polling"] == "mutation"
+
+    def test_playwright_timeout_becomes_timeout_error(self):
+        page = Mock()
+        page.wait_for_function.side_effect = PlaywrightTimeoutError("slow")
+        report = WaitReport()
+
+        with pytest.raises(TimeoutError):
+            WaitEngine(page, report=report).element_enabled("p#more", flow="limit_order")
+
+        assert report.summary()["limit_order"]["calls"] == 1
+
+    def test_response_waits_for_xhr_triggered_inside_block(self):
+        page = Mock()
+        dispatcher = ResponseDispatcher(page, poll_interval=1)
+        engine = WaitEngine(page, dispatcher, report=WaitReport())
+        response = Mock(url="https://api.cocos.capital/api/v1/orders", status=200)
+
+        with engine.response("/api/v1/orders", timeout=500, flow="order_confirmation") as wait:
+            dispatcher._dispatch(response)
+
+        assert wait.response is response
+        assert dispatcher.pending_count == 0
+        assert "order_confirmation" in engine.report.summary()
+
+    def test_response_timeout(self):
+        page = Mock()
+        dispatcher = ResponseDispatcher(page, poll_interval=1)
+        engine = WaitEngine(page, dispatcher)
+
+        with pytest.raises(TimeoutError):
+            with engine.response("/api/v1/orders", timeout=10):
+                pass
+
+        assert dispatcher.pending_count == 0
+
+    def test_response_skips_wait_when_block_raises(self):
+        page = Mock()
+        dispatcher = ResponseDispatcher(page)
+        engine = WaitEngine(page, dispatcher)
+
+        with pytest.raises(ValueError):
+            with engine.response("/api/v1/orders"):
+                raise ValueError("click failed")
+
+        page.wait_for_timeout.assert_not_called()
+        assert dispatcher.pending_count == 0
+
+
+class TestAsyncWaitEngine:
+    """Tests for AsyncWaitEngine"""
+
+    def test_page_waits(self):
+        page = Mock(wait_for_function=AsyncMock())
+        engine = AsyncWaitEngine(page, report=WaitReport())
+
+        async def run():
+            await engine.element_enabled("p#more", flow="limit_order")
+            await engine.input_value("input#limit", "10,5")
+            await engine.dom_mutation("div#status", "")
+
+        asyncio.run(run())
+
+        assert page.wait_for_function.await_count == 3
+        assert engine.report.summary()["limit_order"]["calls"] == 1
+
+    def test_timeout_translated(self):
+        page = Mock(wait_for_function=AsyncMock(side_effect=PlaywrightTimeoutError("slow")))
+
+        with pytest.raises(TimeoutError):
+            asyncio.run(AsyncWaitEngine(page).element_enabled("p#more"))
+
+    def _page_with_response(self, value):
+        async def enter(*args):
+            info = Mock()
+            future = asyncio.get_running_loop().create_future()
+            if isinstance(value, Exception):
+                future.set_exception(value)
+            else:
+                future.set_result(value)
+            info.value = future
+            return info
+
+        expectation = MagicMock()
+        expectation.__aenter__.side_effect = enter
+        expectation.__aexit__ = AsyncMock(return_value=False)
+        return Mock(expect_response=Mock(return_value=expectation))
+
+    def test_response(self):
+        response = Mock(status=200)
+        page = self._page_with_response(response)
+        engine = AsyncWaitEngine(page, report=WaitReport())
+
+        async def run():
+            async with engine.response("/api/v1/orders", timeout=500, flow="order_confirmation") as wait:
+                pass
+            return wait
+
+        wait = asyncio.run(run())
+
+        assert wait.response is response
+        page.expect_response.assert_called_once_with("/api/v1/orders", timeout=500)
+        assert "order_confirmation" in engine.report.summary()
+
+    def test_response_timeout(self):
+        page = self._page_with_response(PlaywrightTimeoutError("slow"))
+
+        async def run():
+            async with AsyncWaitEngine(page).response("/api/v1/orders"):
+                pass
+
+        with pytest.raises(TimeoutError):
+            asyncio.run(run())
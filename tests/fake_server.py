@@ -0,0 +1,561 @@
+"""
+Local stand-in for the Cocos Capital web app and API.
+
+Serves a small single-page app whose elements match CocosBot/config/selectors.py
+(login + 2FA boxes, dashboard, market search and order ticket, orders table,
+withdraw form) and answers every API_URLS endpoint with canned JSON, with
+configurable latency. Point CocosBot at it by exporting server.environ() before
+importing the package (see scripts/bench_end_to_end.py).
+
+Usage:
+    python -m tests.fake_server [--port 8000] [--latency-ms 80] [--endpoint-latency orders=300]
+"""
+
+import argparse
+import base64
+import json
+import math
+import random
+import re
+import threading
+import time
+import zlib
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from CocosBot.config.enums import MarketType
+from CocosBot.config.urls import API_ROOT, API_URLS
+
+TWO_FACTOR_CODE = "424242"
+TOKEN_TTL = 3600
+
+# Path (and fixed query) of every API_URLS entry, relative to API_ROOT
+API_PATHS = {key: url[len(API_ROOT):] for key, url in API_URLS.items()}
+
+# Tickers listed in each market: (ticker, last price)
+DEFAULT_TICKERS = {
+    MarketType.STOCKS.value: [("GGAL", 1500.0), ("YPFD", 30000.0), ("PAMP", 2500.0), ("ALUA", 900.0)],
+    MarketType.CEDEARS.value: [("AAPL", 15000.0), ("MSFT", 20000.0), ("KO", 9000.0)],
+    MarketType.BONDS_CORP.value: [("YMCHO", 1050.0), ("TLC1O", 980.0)],
+    MarketType.BONDS_PUBLIC.value: [("AL30", 60000.0), ("GD30", 65000.0)],
+    MarketType.LETTERS.value: [("S31O5", 101.5)],
+    MarketType.CAUCION.value: [("PESOS", 1.0)],
+    MarketType.FCI.value: [("COCOSPPA", 1.2)],
+}
+
+_ORDER_ID = re.compile(r"^/orders/([^/?]+)$")
+_TICKER = re.compile(r"^/v1/markets/tickers/([^/?]+)$")
+
+
+def _b64(data: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(data).encode()).rstrip(b"=").decode()
+
+
+def make_token(subject: str, ttl: float = TOKEN_TTL) -> str:
+    """Unsigned JWT with an 'exp' claim, enough for TokenManager to read the expiry."""
+    return f"{_b64({'alg': 'none', 'typ': 'JWT'})}.{_b64({'sub': subject, 'exp': int(time.time() + ttl)})}.fake"
+
+
+class FakeCocosServer:
+    """
+    Threaded HTTP server for the fake web app (any path) and API (under /api).
+
+    Latency is injected before each API answer: latency_ms for every endpoint,
+    endpoint_latency_ms to override it per API_URLS key (e.g. {"orders": 300}),
+    plus a uniform jitter. page_latency_ms delays the HTML pages.
+
+    Example:
+        with FakeCocosServer(latency_ms=50) as server:
+            os.environ.update(server.environ())
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency_ms: float = 0.0,
+                 endpoint_latency_ms: Optional[Dict[str, float]] = None, jitter_ms: float = 0.0,
+                 page_latency_ms: float = 0.0, two_factor_code: str = TWO_FACTOR_CODE,
+                 tickers: Optional[Dict[str, List[Tuple[str, float]]]] = None, seed: Optional[int] = None):
+        unknown = set(endpoint_latency_ms or {}) - set(API_PATHS)
+        if unknown:
+            raise ValueError(f"Unknown API_URLS keys: {sorted(unknown)}")
+        self.latency_ms = latency_ms
+        self.endpoint_latency_ms = dict(endpoint_latency_ms or {})
+        self.jitter_ms = jitter_ms
+        self.page_latency_ms = page_latency_ms
+        self.two_factor_code = two_factor_code
+        self.tickers = tickers or DEFAULT_TICKERS
+        self.hits: Counter = Counter()
+        self.orders: Dict[str, Dict[str, Any]] = {}
+        self._tokens: Dict[str, float] = {}
+        self._refresh_tokens: Dict[str, str] = {}
+        self._next_id = 1000
+        self._lock = threading.Lock()
+        self._random = random.Random(seed)
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def web_app_root(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def api_root(self) -> str:
+        return f"{self.web_app_root}/api"
+
+    def environ(self) -> Dict[str, str]:
+        """Environment variables that make CocosBot.config.urls point at this server."""
+        return {"COCOSBOT_WEB_APP_ROOT": self.web_app_root, "COCOSBOT_API_ROOT": self.api_root}
+
+    def start(self) -> "FakeCocosServer":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="fake-cocos", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    # Account state
+
+    def find_ticker(self, ticker: str) -> Optional[Dict[str, Any]]:
+        """Market list item of a ticker, from any market."""
+        for market, tickers in self.tickers.items():
+            for symbol, price in tickers:
+                if symbol == ticker.upper():
+                    return _ticker_item(market, symbol, price)
+        return None
+
+    def add_order(self, ticker: str, side: str = "BUY", amount: Optional[float] = None,
+                  quantity: Optional[int] = None, price: Optional[float] = None,
+                  order_type: str = "LIMIT", segment: str = "C") -> Dict[str, Any]:
+        """
+        Records a pending order as if it had been sent from the web app.
+
+        The quantity of an order placed by amount is derived from the price.
+        """
+        item = self.find_ticker(ticker)
+        price = price if price is not None else (item["last"] if item else 1.0)
+        if quantity is None:
+            quantity = max(1, math.floor((amount or 0) / price))
+        if amount is None:
+            amount = quantity * price
+        with self._lock:
+            self._next_id += 1
+            order = {
+                "id": self._next_id, "ticker": ticker.upper(), "side": side, "type": order_type,
+                "segment": segment, "amount": amount, "quantity": quantity, "price": price,
+                "status": "PENDIENTE", "executed_quantity": 0, "created_at": time.time(),
+            }
+            self.orders[str(order["id"])] = order
+        return order
+
+    def cancel(self, order_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            order = self.orders.get(str(order_id))
+            if order is None or order["status"] != "PENDIENTE":
+                return None
+            order["status"] = "CANCELADA"
+            return order
+
+    def issue_token(self, subject: str) -> Dict[str, Any]:
+        access_token = make_token(subject)
+        refresh_token = f"refresh-{self._random.getrandbits(64):x}"
+        with self._lock:
+            self._tokens[access_token] = time.time() + TOKEN_TTL
+            self._refresh_tokens[refresh_token] = subject
+        return {"access_token": access_token, "refresh_token": refresh_token, "token_type": "bearer",
+                "expires_in": TOKEN_TTL, "expires_at": int(time.time() + TOKEN_TTL)}
+
+    def is_authorized(self, authorization: Optional[str]) -> bool:
+        token = (authorization or "").split(" ", 1)[-1]
+        with self._lock:
+            return self._tokens.get(token, 0) > time.time()
+
+    def delay(self, key: Optional[str]) -> float:
+        """Seconds to wait before answering an API_URLS endpoint (None for pages)."""
+        if key is None:
+            base = self.page_latency_ms
+        else:
+            base = self.endpoint_latency_ms.get(key, self.latency_ms)
+        jitter = self._random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0
+        return (base + jitter) / 1000
+
+    # API
+
+    def route(self, method: str, path: str, query: Dict[str, List[str]],
+              body: Any, authorization: Optional[str]) -> Tuple[Optional[str], int, Any]:
+        """
+        Answers an API request.
+
+        Returns:
+            Tuple[Optional[str], int, Any]: API_URLS key (None if unknown), status and JSON body.
+        """
+        param = lambda name, default="": query.get(name, [default])[0]
+        if path == "/auth/v1/token" and method == "POST":
+            body = body or {}
+            if param("grant_type") == "refresh_token":
+                subject = self._refresh_tokens.get(body.get("refresh_token"))
+                if subject is None:
+                    return "auth_refresh", 401, {"error": "invalid_grant"}
+                return "auth_refresh", 200, self.issue_token(subject)
+            if not body.get("email") or not body.get("password"):
+                return "auth_token", 400, {"error": "missing_credentials"}
+            if body.get("code") != self.two_factor_code:
+                return "auth_token", 401, {"error": "invalid_2fa_code"}
+            return "auth_token", 200, self.issue_token(body["email"])
+
+        key = self._api_key(method, path, query)
+        if key is None:
+            return None, 404, {"error": "not_found"}
+        if not self.is_authorized(authorization):
+            return key, 401, {"error": "unauthorized"}
+
+        if key == "orders":
+            match = _ORDER_ID.match(path)
+            if method == "DELETE" and match:
+                order = self.cancel(match.group(1))
+                return (key, 200, order) if order else (key, 404, {"error": "order_not_found"})
+            if method == "POST":
+                return key, 201, self._create_order(body or {})
+            with self._lock:
+                return key, 200, sorted(self.orders.values(), key=lambda o: -o["id"])
+        if key == "markets_list":
+            market = param("instrument_type")
+            return key, 200, [_ticker_item(market, symbol, price) for symbol, price in self.tickers.get(market, [])]
+        if key == "markets_tickers":
+            item = self.find_ticker(_TICKER.match(path).group(1))
+            if item is None:
+                return key, 404, {"error": "ticker_not_found"}
+            return key, 200, {**item, "segment": param("segment", "C")}
+        if key == "user_accounts":
+            return key, 200, _CANNED[key](param("currency", "ARS"))
+        return key, 200, _CANNED[key]
+
+    def _api_key(self, method: str, path: str, query: Dict[str, List[str]]) -> Optional[str]:
+        if _ORDER_ID.match(path) and method == "DELETE":
+            return "orders"
+        if path.rstrip("/") == API_PATHS["orders"]:
+            return "orders"
+        if method != "GET":
+            return None
+        if path == "/v1/markets/tickers/" and "instrument_type" in query:
+            return "markets_list"
+        if _TICKER.match(path):
+            return "markets_tickers"
+        for key, api_path in API_PATHS.items():
+            if key not in ("auth_token", "auth_refresh") and api_path.split("?", 1)[0] == path:
+                return key
+        return None
+
+    def _create_order(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+        return self.add_order(
+            payload.get("ticker", ""), side=payload.get("side", "BUY"),
+            amount=payload.get("amount"), quantity=payload.get("quantity"), price=payload.get("price"),
+            order_type=payload.get("type", "MARKET"), segment=payload.get("segment", "C"),
+        )
+
+    def page(self) -> str:
+        config = json.dumps({"api": self.api_root, "paths": API_PATHS, "codeLength": len(self.two_factor_code)})
+        return _PAGE.replace("__CONFIG__", config)
+
+
+def _ticker_item(market: str, symbol: str, price: float) -> Dict[str, Any]:
+    return {
+        "instrument_code": symbol, "short_ticker": symbol, "instrument_type": market,
+        "id_tick": zlib.crc32(symbol.encode()) % 100000, "lot_size": 1, "segment": "C", "currency": "ARS",
+        "last": price, "bid": round(price * 0.999, 2), "ask": round(price * 1.001, 2), "volume": 1000,
+    }
+
+
+_CANNED: Dict[str, Any] = {
+    "user_data": {"id": 1, "first_name": "Bench", "last_name": "Local", "email": "bench@example.com",
+                  "id_accounts": [1]},
+    "account_tier": {"tier": "Standard", "limits": {"daily": 1_000_000}},
+    "academy": {"items": [{"id": 1, "title": "Primeros pasos"}]},
+    "markets_schedule": {"is_open": True, "open": "11:00", "close": "17:00"},
+    "mep_prices": {"open": {"bid": 1180.0, "ask": 1200.0}, "overnight": {"bid": 1175.0, "ask": 1205.0}},
+    "portfolio_data": {"tickers": [{"short_ticker": "GGAL", "quantity": 10, "last": 1500.0}],
+                       "cash": {"ARS": 100000.0, "USD": 50.0}},
+    "portfolio_balance": {"totalBalance": 115000.0, "items": []},
+    "user_accounts": lambda currency: [{"cbu_cvu": "0000003100000000000001", "currency": currency,
+                                        "bank": "Banco Local"}],
+}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def do_DELETE(self):
+        self._handle("DELETE")
+
+    def _handle(self, method: str) -> None:
+        fake: FakeCocosServer = self.server.fake
+        parts = urlsplit(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        if not parts.path.startswith("/api/"):
+            fake.hits["page"] += 1
+            time.sleep(fake.delay(None))
+            self._send(200, fake.page().encode(), "text/html; charset=utf-8")
+            return
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            self._send(400, b'{"error": "invalid_json"}', "application/json")
+            return
+        key, status, data = fake.route(method, parts.path[len("/api"):], parse_qs(parts.query),
+                                       body, self.headers.get("Authorization"))
+        fake.hits[key or "unknown"] += 1
+        time.sleep(fake.delay(key))
+        self._send(status, json.dumps(data).encode(), "application/json")
+
+    def _send(self, status: int, payload: bytes, content_type: str) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+_PAGE = """<!DOCTYPE html>
+<html lang="es"><head><meta charset="utf-8"><title>Cocos (local)</title>
+<style>svg.lucide-log-out{width:24px;height:24px;cursor:pointer} [hidden]{display:none!important}</style>
+</head><body><div id="app"></div><script>
+const CONFIG = __CONFIG__;
+const PATHS = CONFIG.paths;
+const app = document.getElementById("app");
+const $ = (selector) => document.querySelector(selector);
+const escape = (value) => String(value).replace(/[&<>"']/g, (c) => "&#" + c.charCodeAt(0) + ";");
+const formatAmount = (value) => "AR$" + String(value).replace(".", ",");
+
+async function api(path, options = {}) {
+  const headers = {"Content-Type": "application/json"};
+  const token = localStorage.getItem("access_token");
+  if (token) headers["Authorization"] = "Bearer " + token;
+  const response = await fetch(CONFIG.api + path, {...options, headers});
+  if (response.status === 401) {
+    localStorage.removeItem("access_token");
+    location.assign("/login");
+    throw new Error("unauthorized");
+  }
+  const text = await response.text();
+  return text ? JSON.parse(text) : null;
+}
+
+function loginPage() {
+  app.innerHTML = `<form id="login-form"><input type="email" name="email"><input type="password" name="password">
+    <button type="submit">Ingresar</button></form>`;
+  $("#login-form").addEventListener("submit", (event) => {
+    event.preventDefault();
+    twoFactorPage(event.target.email.value, event.target.password.value);
+  });
+}
+
+function twoFactorPage(email, password) {
+  const boxes = Array.from({length: CONFIG.codeLength}, (_, i) => `<input id="input${i}" maxlength="1">`);
+  app.innerHTML = `<div class="two-factor">${boxes.join("")}</div><p class="error-message" hidden></p>`;
+  const inputs = [...document.querySelectorAll(".two-factor input")];
+  let sent = false;
+  inputs.forEach((input, i) => input.addEventListener("input", async () => {
+    if (input.value && i < inputs.length - 1) inputs[i + 1].focus();
+    const code = inputs.map((box) => box.value).join("");
+    if (sent || code.length !== inputs.length) return;
+    sent = true;
+    const response = await fetch(CONFIG.api + PATHS.auth_token, {
+      method: "POST", headers: {"Content-Type": "application/json"},
+      body: JSON.stringify({email, password, code}),
+    });
+    if (!response.ok) {
+      sent = false;
+      $(".error-message").hidden = false;
+      $(".error-message").textContent = "Código incorrecto";
+      return;
+    }
+    const tokens = await response.json();
+    localStorage.setItem("access_token", tokens.access_token);
+    app.innerHTML = `<button id="save-device">Sí, guardar como dispositivo seguro</button>`;
+    $("#save-device").addEventListener("click", () => location.assign("/"));
+  }));
+}
+
+function shell(content) {
+  app.innerHTML = `<header><svg class="lucide lucide-log-out" viewBox="0 0 24 24"><path d="M9 21H5V3h4"/></svg></header>
+    <main>${content}</main>`;
+  $("svg.lucide-log-out").addEventListener("click", () => {
+    localStorage.removeItem("access_token");
+    location.assign("/login");
+  });
+}
+
+async function dashboardPage() {
+  shell(`<h1 id="greeting">Hola</h1>
+    <div class="extraer clickable-xl">Extraer</div>
+    <section id="withdraw" hidden>
+      <input type="radio" id="radio-1" name="currency" value="ARS" checked><label for="radio-1">ARS</label>
+      <input type="radio" id="radio-2" name="currency" value="USD"><label for="radio-2">USD</label>
+      <input type="text" class="_input_vr7b7_23">
+      <div class="_wrapper_289lu_23"><button id="withdraw-continue" disabled>Continuar</button></div>
+      <ul id="accounts"></ul>
+    </section>`);
+  $("div.extraer").addEventListener("click", () => { $("#withdraw").hidden = false; });
+  $("input._input_vr7b7_23").addEventListener("input", (event) => {
+    $("#withdraw-continue").disabled = !(Number(event.target.value.replace(",", ".")) > 0);
+  });
+  $("#withdraw-continue").addEventListener("click", async () => {
+    const currency = $("input[name=currency]:checked").value;
+    const accounts = await api(PATHS.user_accounts + currency);
+    $("#accounts").innerHTML = accounts.map((a) => `<li>${escape(a.bank)} ${escape(a.cbu_cvu)}</li>`).join("");
+  });
+  const [user] = await Promise.all(
+    ["user_data", "account_tier", "markets_schedule", "academy"].map((key) => api(PATHS[key])));
+  $("#greeting").textContent = `Hola ${user.first_name}`;
+}
+
+async function portfolioPage() {
+  shell(`<div class="total-balance"></div><table class="portfolio-table"><tbody></tbody></table>`);
+  const [portfolio, balance] = await Promise.all(
+    ["portfolio_data", "portfolio_balance", "mep_prices"].map((key) => api(PATHS[key])));
+  $(".total-balance").textContent = formatAmount(balance.totalBalance);
+  $("table.portfolio-table tbody").innerHTML = portfolio.tickers.map((t) =>
+    `<tr data-ticker="${escape(t.short_ticker)}"><td>${escape(t.short_ticker)}</td><td>${t.quantity}</td></tr>`).join("");
+}
+
+async function ordersPage() {
+  shell(`<div class="_movementsRows_umu6l_29"></div>
+    <section id="order-detail" hidden><button id="cancel-order">Cancelar orden</button></section>`);
+  let selected = null;
+  const load = async () => {
+    const orders = (await api(PATHS.orders)).filter((o) => o.status === "PENDIENTE");
+    $("._movementsRows_umu6l_29").innerHTML = orders.map((o) =>
+      `<div class="_rowContainer_1m8d2_23" data-order-id="${o.id}">
+        <div><span>${escape(o.ticker)}</span></div><div><span>${escape(o.side)}</span></div>
+        <div><span>${formatAmount(o.amount)}</span></div><div><span>${o.quantity}</span></div></div>`).join("");
+    document.querySelectorAll("._rowContainer_1m8d2_23").forEach((row) => row.addEventListener("click", () => {
+      selected = row.dataset.orderId;
+      $("#order-detail").hidden = false;
+    }));
+  };
+  $("#cancel-order").addEventListener("click", async () => {
+    await api(`${PATHS.orders}/${selected}`, {method: "DELETE"});
+    $("#order-detail").hidden = true;
+    await load();
+  });
+  await load();
+}
+
+async function marketPage(market) {
+  shell(`<input id="input-search" autocomplete="off"><ul class="MuiList-root search-list" hidden></ul>
+    <section id="ticker"></section>`);
+  const items = api(PATHS.markets_list + market);
+  $("#input-search").addEventListener("input", async (event) => {
+    const term = event.target.value.trim().toUpperCase();
+    const matches = term ? (await items).filter((item) => item.short_ticker.startsWith(term)) : [];
+    const list = $("ul.search-list");
+    list.innerHTML = matches.map((item) =>
+      `<li data-ticker="${escape(item.short_ticker)}"><div><p>${escape(item.short_ticker)}</p>
+        <span>${item.last}</span></div></li>`).join("");
+    list.hidden = !matches.length;
+    list.querySelectorAll("li").forEach((li) => li.addEventListener("click", () => {
+      list.hidden = true;
+      tickerPanel(li.dataset.ticker);
+    }));
+  });
+}
+
+async function tickerPanel(ticker) {
+  const info = await api(`${PATHS.markets_tickers}/${ticker}?segment=C`);
+  $("#ticker").innerHTML = `<h2>${escape(info.short_ticker)} ${info.last}</h2>
+    <span id="expand-layout">Operar</span>
+    <div id="ticket" hidden>
+      <button id="BUY">Comprar</button><button id="SELL">Vender</button>
+      <p id="view-more-less-options">Más opciones</p>
+      <div id="more-options" hidden><button value="mercado">Mercado</button><button value="limite">Límite</button></div>
+      <input id="limit-input" hidden>
+      <input id="investment-amount-buy"><input id="investment-amount-sell" hidden>
+      <button id="review-buy-button">Revisar</button>
+      <div id="review" hidden><button id="order-confirm-button">Confirmar</button></div>
+    </div>`;
+  let side = "BUY";
+  let limit = false;
+  const show = (selector, visible) => { $(selector).hidden = !visible; };
+  const parse = (value) => Number(String(value).replace(/\\./g, "").replace(",", "."));
+  $("#expand-layout").addEventListener("click", () => show("#ticket", true));
+  ["BUY", "SELL"].forEach((id) => $("#" + id).addEventListener("click", () => {
+    side = id;
+    show("#investment-amount-buy", id === "BUY");
+    show("#investment-amount-sell", id === "SELL");
+  }));
+  $("#view-more-less-options").addEventListener("click", () => show("#more-options", true));
+  $("button[value='limite']").addEventListener("click", () => { limit = true; show("#limit-input", true); });
+  $("#review-buy-button").addEventListener("click", () => show("#review", true));
+  $("#order-confirm-button").addEventListener("click", async () => {
+    const value = parse($(side === "BUY" ? "#investment-amount-buy" : "#investment-amount-sell").value);
+    const order = {ticker, segment: "C", side, type: limit ? "LIMIT" : "MARKET"};
+    order[side === "BUY" ? "amount" : "quantity"] = value;
+    if (limit) order.price = parse($("#limit-input").value);
+    const created = await api(PATHS.orders, {method: "POST", body: JSON.stringify(order)});
+    $("#ticker").insertAdjacentHTML("beforeend", `<p class="success-message">Orden ${created.id} enviada</p>`);
+  });
+}
+
+const path = location.pathname;
+if (path === "/login") {
+  loginPage();
+} else if (!localStorage.getItem("access_token")) {
+  location.replace("/login");
+} else if (path.startsWith("/market/")) {
+  marketPage(decodeURIComponent(path.slice("/market/".length)));
+} else if (path === "/orders") {
+  ordersPage();
+} else if (path === "/capital-portfolio") {
+  portfolioPage();
+} else {
+  dashboardPage();
+}
+</script></body></html>
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Local fake of the Cocos Capital web app and API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="Latency of every API endpoint.")
+    parser.add_argument("--jitter-ms", type=float, default=0.0, help="Uniform jitter added to the latency.")
+    parser.add_argument("--endpoint-latency", action="append", default=[], metavar="KEY=MS",
+                        help="Latency of one API_URLS entry (repeatable).")
+    args = parser.parse_args()
+    overrides = {key: float(ms) for key, ms in (item.split("=", 1) for item in args.endpoint_latency)}
+    server = FakeCocosServer(args.host, args.port, args.latency_ms, overrides, args.jitter_ms).start()
+    print(f"Fake Cocos at {server.web_app_root} (2FA code {server.two_factor_code})")
+    for name, value in server.environ().items():
+        print(f"  export {name}={value}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""Tests for CocosBot.services.async_auth, async_market and async_user"""
+import asyncio
+import threading
+import pytest
+from unittest.mock import Mock, AsyncMock, MagicMock, patch
+from CocosBot.core.async_browser import AsyncPlaywrightBrowser
+from CocosBot.core.instruments import InstrumentMaster
+from CocosBot.services.async_auth import AsyncAuthService
+from CocosBot.services.async_market import AsyncMarketService
+from CocosBot.services.async_user import AsyncUserService
+from CocosBot.services.auth import AuthenticationError
+from CocosBot.services.market import OrderCreationError
+from CocosBot.config.enums import Currency, MarketType, OrderOperation
+from CocosBot.config.urls import WEB_APP_URLS, API_URLS
+from CocosBot.config.selectors import LOGIN_SELECTORS
+
+
+@pytest.fixture
+def async_browser():
+    browser = AsyncMock()
+    browser.page = Mock()
+    browser.page.locator = Mock(return_value=AsyncMock())
+    browser.waits = MagicMock()
+    browser.waits.element_enabled = AsyncMock()
+    browser.page_pool = None
+    browser.instruments = None
+    browser.page_slot = lambda: AsyncPlaywrightBrowser.page_slot(browser)
+    return browser
+
+
+def _expect_response_cm(response):
+    info = Mock()
+    cm = MagicMock()
+
+    async def enter(*args):
+        future = asyncio.get_running_loop().create_future()
+        future.set_result(response)
+        info.value = future
+        return info
+    cm.__aenter__.side_effect = enter
+    cm.__aexit__.return_value = False
+    return cm
+
+
+class TestAsyncAuthService:
+    """Tests for AsyncAuthService"""
+
+    @patch('CocosBot.services.async_auth.obtener_codigo_2FA', return_value="123456")
+    def test_login_success(self, mock_2fa, async_browser):
+        result = asyncio.run(AsyncAuthService(async_browser).login("u@test.com", "pw", "g@test.com", "app"))
+
+        assert result is True
+        async_browser.go_to.assert_awaited_once_with(WEB_APP_URLS["login"])
+        assert async_browser.fill_input.await_count == 2
+        async_browser.type_code.assert_awaited_once_with(
+            "input#input0", "123456", "input#input5", "Ingresando el código 2FA..."
+        )
+        async_browser.capture_api_session.assert_awaited_once()
+
+    @patch('CocosBot.services.async_auth.obtener_codigo_2FA', return_value="123456")
+    def test_login_types_digits_when_sequence_not_reflected(self, mock_2fa, async_browser):
+        async_browser.type_code.side_effect = TimeoutError
+        service = AsyncAuthService(async_browser)
+
+        assert asyncio.run(service.login("u@test.com", "pw", "g@test.com", "app")) is True
+        assert async_browser.fill_input.await_count == 8
+        assert service.login_timings["total"] >= service.login_timings["code_entry"]
+
+    @patch('CocosBot.services.async_auth.MAIL_WATCHER_TIMEOUT', 10)
+    @patch('CocosBot.services.async_auth.obtener_codigo_2FA', return_value="123456")
+    def test_login_does_not_wait_for_slow_watcher(self, mock_2fa, async_browser, mail_watcher):
+        release = threading.Event()
+        mail_watcher.return_value.start.side_effect = lambda: release.wait(5)
+        mock_2fa.side_effect = lambda *args, **kwargs: release.set() or "123456"
+
+        try:
+            assert asyncio.run(AsyncAuthService(async_browser).login("u@test.com", "pw", "g@test.com", "app")) is True
+        finally:
+            release.set()
+        assert "watcher" not in mock_2fa.call_args.kwargs
+
+    @patch('CocosBot.services.async_auth.obtener_codigo_2FA', return_value="123")
+    def test_login_invalid_code(self, mock_2fa, async_browser):
+        with pytest.raises(AuthenticationError):
+            asyncio.run(AsyncAuthService(async_browser).login("u@test.com", "pw", "g@test.com", "app"))
+
+        async_browser.take_screenshot.assert_awaited_once_with("debug_login_failure.png")
+
+    @patch('CocosBot.services.async_auth.obtener_codigo_2FA', return_value="123456")
+    def test_save_device_prompt_missing(self, mock_2fa, async_browser):
+        async def click(selector, *args, **kwargs):
+            if selector == LOGIN_SELECTORS["save_device_button"]:
+                raise Exception("not shown")
+        async_browser.click_element.side_effect = click
+
+        assert asyncio.run(AsyncAuthService(async_browser).login("u@test.com", "pw", "g@test.com", "app")) is True
+
+    def test_session_helpers(self, async_browser):
+        service = AsyncAuthService(async_browser)
+        async_browser.fetch_data.return_value = {"id": 1}
+
+        assert asyncio.run(service.is_session_valid()) is True
+        asyncio.run(service.save_session("s.json"))
+        async_browser.save_storage_state.assert_awaited_once_with("s.json")
+
+    def test_session_expiry_and_refresh(self, async_browser):
+        async_browser.tokens = Mock()
+        async_browser.tokens.seconds_left.return_value = 900.0
+        async_browser.tokens.refresh.return_value = True
+        service = AsyncAuthService(async_browser)
+
+        assert service.session_expires_in() == 900.0
+        assert asyncio.run(service.refresh_session()) is True
+
+    def test_logout(self, async_browser):
+        assert asyncio.run(AsyncAuthService(async_browser).logout()) is True
+        async_browser.go_to.side_effect = Exception("boom")
+        assert asyncio.run(AsyncAuthService(async_browser).logout()) is False
+
+    @patch('CocosBot.services.async_auth.obtener_codigo_2FA', return_value="123456")
+    def test_login_without_mail_watcher(self, mock_2fa, async_browser, mail_watcher):
+        mail_watcher.return_value.start.side_effect = OSError("imap down")
+
+        assert asyncio.run(AsyncAuthService(async_browser).login("u@test.com", "pw", "g@test.com", "app")) is True
+        assert "watcher" not in mock_2fa.call_args.kwargs
+
+    def test_failed_login_closes_mail_watcher(self, async_browser, mail_watcher):
+        async_browser.fill_input.side_effect = TimeoutError("selector")
+        service = AsyncAuthService(async_browser)
+
+        with pytest.raises(AuthenticationError):
+            asyncio.run(service.login("u@test.com", "pw", "g@test.com", "app"))
+
+        mail_watcher.return_value.close.assert_called_once()
+        assert service._mail_watcher is None
+
+    @patch('CocosBot.services.async_auth.obtener_codigo_2FA', return_value="123456")
+    def test_logout_closes_mail_watcher(self, mock_2fa, async_browser, mail_watcher):
+        service = AsyncAuthService(async_browser)
+        asyncio.run(service.login("u@test.com", "pw", "g@test.com", "app"))
+
+        assert asyncio.run(service.logout()) is True
+        mail_watcher.return_value.close.assert_called_once()
+        assert service._mail_watcher is None
+
+
+class TestAsyncMarketService:
+    """Tests for AsyncMarketService"""
+
+    def test_create_order_with_limit(self, async_browser):
+        result = asyncio.run(AsyncMarketService(async_browser).create_order("GGAL", OrderOperation.BUY, 1000, 10.5))
+
+        assert result is True
+        async_browser.waits.element_enabled.assert_awaited_once_with(
+            "p#view-more-less-options", flow="limit_order", baseline=3.0
+        )
+        async_browser.waits.response.assert_called_once_with(
+            API_URLS["orders"], flow="order_confirmation", baseline=4.0
+        )
+        async_browser.go_to.assert_awaited_once_with(WEB_APP_URLS["market_stocks"])
+        async_browser.fill_input_with_delay.assert_awaited_once()
+        async_browser.fill_input.assert_awaited_once_with("input#investment-amount-buy", "1000")
+
+    def test_create_order_error(self, async_browser):
+        async_browser.go_to.side_effect = Exception("nav")
+
+        with pytest.raises(OrderCreationError):
+            asyncio.run(AsyncMarketService(async_browser).create_order("GGAL", "BUY", 1000))
+
+    def test_get_ticker_info_and_refresh_use_instrument_master(self, async_browser):
+        master = InstrumentMaster(path=None)
+        async_browser.enable_instrument_master = Mock(return_value=master)
+        service = AsyncMarketService(async_browser)
+        async_browser.fetch_data.side_effect = lambda request_url, navigation_url: (
+            [{"short_ticker": "AAPL"}] if request_url.endswith("CEDEARS") else None)
+
+        with pytest.raises(ValueError):
+            asyncio.run(service.get_ticker_info("AAPL"))
+        refreshed = asyncio.run(service.refresh_instruments())
+        async_browser.instruments = master
+
+        assert refreshed == ["CEDEARS"]
+        assert async_browser.fetch_data.await_count == len(MarketType)
+        assert service.lookup_instrument("AAPL").market_type == "CEDEARS"
+        assert [i.ticker for i in service.search_instruments("AA")] == ["AAPL"]
+
+    def test_get_market_snapshot(self, async_browser):
+        async_browser.fetch_data.side_effect = lambda url, nav, process: process([{"short_ticker": "GGAL", "last": 1}])
+
+        snapshot = asyncio.run(AsyncMarketService(async_browser).get_market_snapshot(MarketType.STOCKS))
+
+        assert snapshot.tickers == ["GGAL"]
+        assert async_browser.fetch_data.call_args[0][1] == WEB_APP_URLS["market_stocks"]
+
+    def test_watch_orders(self, async_browser):
+        async_browser.fetch_data = AsyncMock(return_value=[{"id": 1, "status": "PENDIENTE"}])
+        async_browser.context = Mock()
+
+        watcher = asyncio.run(AsyncMarketService(async_browser).watch_orders())
+
+        async_browser.fetch_data.assert_awaited_once_with(request_url=API_URLS["orders"],
+                                                          navigation_url=WEB_APP_URLS["orders"])
+        async_browser.context.on.assert_called_once_with("response", watcher._observe)
+        assert watcher.primed
+
+    def test_stream_quotes_uses_own_page(self, async_browser):
+        page = AsyncMock()
+        page.on = Mock()
+        page.remove_listener = Mock()
+        async_browser.context.new_page = AsyncMock(return_value=page)
+        service = AsyncMarketService(async_browser)
+
+        async def run():
+            stream = await service.stream_quotes(["GGAL"], MarketType.STOCKS)
+            await stream.stop()
+            page.goto.side_effect = Exception("nav")
+            with pytest.raises(Exception, match="nav"):
+                await service.stream_quotes(["GGAL"], MarketType.STOCKS)
+            with pytest.raises(ValueError):
+                await service.stream_quotes([])
+            return stream
+
+        stream = asyncio.run(run())
+
+        assert stream.page is page
+        page.goto.assert_awaited_with(WEB_APP_URLS["market_stocks"])
+        assert page.close.await_count == 2
+
+    def test_submit_order_through_api(self, async_browser):
+        async_browser.api_client = Mock(is_authenticated=True)
+        async_browser.api_client.post_json.return_value = {"id": 3}
+
+        result = asyncio.run(AsyncMarketService(async_browser).submit_order("GGAL", "BUY", 1000))
+
+        assert result["order_id"] == 3
+        assert result["via"] == "api"
+        async_browser.go_to.assert_not_awaited()
+
+    def test_submit_order_falls_back_to_ui(self, async_browser):
+        async_browser.api_client = None
+
+        result = asyncio.run(AsyncMarketService(async_browser).submit_order("GGAL", OrderOperation.SELL, 10))
+
+        assert result["via"] == "ui"
+        async_browser.go_to.assert_awaited_once_with(WEB_APP_URLS["market_stocks"])
+
+    def test_submit_order_invalid_params(self, async_browser):
+        with pytest.raises(OrderCreationError):
+            asyncio.run(AsyncMarketService(async_browser).submit_order("GGAL", "HOLD", 1000))
+
+    def test_confirm_operation_tolerates_missing_response(self, async_browser):
+        async_browser.waits.response.return_value.__aexit__.side_effect = TimeoutError("no response")
+
+        asyncio.run(AsyncMarketService(async_browser).confirm_operation())
+
+        assert async_browser.click_element.await_count == 2
+
+    def test_confirm_operation_error(self, async_browser):
+        async_browser.click_element.side_effect = Exception("missing")
+
+        with pytest.raises(OrderCreationError):
+            asyncio.run(AsyncMarketService(async_browser).confirm_operation())
+
+    def test_get_ticker_info_uses_temporary_page(self, async_browser):
+        response = Mock(status=200)
+        page = AsyncMock()
+        page.expect_response = Mock(return_value=_expect_response_cm(response))
+        async_browser.context.new_page.return_value = page
+        async_browser.process_response.return_value = {"ticker": "GGAL"}
+
+        result = asyncio.run(AsyncMarketService(async_browser).get_ticker_info("GGAL", MarketType.STOCKS))
+
+        assert result == {"ticker": "GGAL"}
+        page.goto.assert_awaited_once_with(WEB_APP_URLS["market_stocks"])
+        page.expect_response.assert_called_once_with(f"{API_URLS['markets_tickers']}/GGAL?segment=C")
+        page.close.assert_awaited_once()
+
+    def test_get_ticker_info_error(self, async_browser):
+        page = AsyncMock()
+        page.goto.side_effect = Exception("nav")
+        async_browser.context.new_page.return_value = page
+
+        assert asyncio.run(AsyncMarketService(async_browser).get_ticker_info("GGAL", "STOCKS")) is None
+        page.close.assert_awaited_once()
+
+    def test_fetch_based_getters(self, async_browser):
+        service = AsyncMarketService(async_browser)
+        async_browser.fetch_data.return_value = None
+
+        asyncio.run(service.get_market_schedule())
+        assert asyncio.run(service.get_orders()) is None
+        asyncio.run(service.get_mep_value())
+
+        assert async_browser.fetch_data.await_count == 3
+
+    def test_cancel_order(self, async_browser):
+        service = AsyncMarketService(async_browser)
+
+        assert asyncio.run(service.cancel_order(1000.5, 10)) is True
+        async_browser.go_to.side_effect = Exception("nav")
+        assert asyncio.run(service.cancel_order(1000.5, 10)) is False
+
+    def test_cancel_by_id_and_cancel_all(self, async_browser):
+        async_browser.api_client = Mock(is_authenticated=True)
+        async_browser.fetch_data = AsyncMock(return_value={"orders": [
+            {"id": 1, "ticker": "GGAL", "side": "BUY", "status": "PENDIENTE"},
+            {"id": 2, "ticker": "AL30", "side": "SELL", "status": "PENDIENTE"},
+            {"id": 3, "ticker": "GGAL", "side": "BUY", "status": "CANCELADA"},
+        ]})
+        service = AsyncMarketService(async_browser)
+
+        assert asyncio.run(service.cancel_order(7)) is True
+        results = asyncio.run(service.cancel_all(side="BUY"))
+
+        assert [(r["order_id"], r["ticker"], r["cancelled"]) for r in results] == [(1, "GGAL", True)]
+        assert [c.args[0] for c in async_browser.api_client.delete.call_args_list] == [
+            f"{API_URLS['orders']}/7", f"{API_URLS['orders']}/1"]
+        with pytest.raises(ValueError):
+            asyncio.run(service.cancel_order())
+
+    def test_cancel_all_requires_api_session(self, async_browser):
+        async_browser.api_client = None
+
+        with pytest.raises(RuntimeError, match="direct_api"):
+            asyncio.run(AsyncMarketService(async_browser).cancel_all())
+        async_browser.fetch_data.assert_not_called()
+
+
+class TestAsyncUserService:
+    """Tests for AsyncUserService"""
+
+    def test_fetch_based_getters(self, async_browser):
+        service = AsyncUserService(async_browser)
+        async_browser.fetch_data.return_value = {"ok": True}
+
+        for getter in (service.get_user_data, service.get_account_tier,
+                       service.get_portfolio_data, service.get_academy_data):
+            assert asyncio.run(getter()) == {"ok": True}
+
+    def test_portfolio_balance_extracts_total(self, async_browser):
+        async def fetch(request_url, navigation_url, process_response):
+            return process_response({"totalBalance": 10.5})
+        async_browser.fetch_data.side_effect = fetch
+
+        assert asyncio.run(AsyncUserService(async_browser).get_portfolio_balance()) == 10.5
+
+    def test_get_linked_accounts(self, async_browser):
+        async_browser.page.expect_response = Mock(return_value=_expect_response_cm(Mock(status=200)))
+        async_browser.process_response.return_value = [{"bank": "Test"}]
+
+        result = asyncio.run(AsyncUserService(async_browser).get_linked_accounts(1000, Currency.USD))
+
+        assert result == [{"bank": "Test"}]
+        async_browser.page.expect_response.assert_called_once_with(f'{API_URLS["user_accounts"]}USD')
+
+    def test_get_linked_accounts_form_error(self, async_browser):
+        async_browser.click_element.side_effect = Exception("missing")
+
+        assert asyncio.run(AsyncUserService(async_browser).get_linked_accounts()) is None
+
+    def test_navigate_withdraw_form_invalid_currency(self, async_browser):
+        assert asyncio.run(AsyncUserService(async_browser).navigate_withdraw_form(100, "EUR")) is False
+
+    def test_get_linked_accounts_response_error(self, async_browser):
+        async_browser.page.expect_response = Mock(side_effect=Exception("timeout"))
+
+        assert asyncio.run(AsyncUserService(async_browser).get_linked_accounts()) is None
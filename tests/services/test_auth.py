@@ -1,8 +1,9 @@
 """Tests for CocosBot.services.auth"""
+import threading
 import pytest
-from unittest.mock import Mock, patch, call
+from unittest.mock import ANY, Mock, patch, call
 from CocosBot.services.auth import AuthService, AuthenticationError, TwoFactorError
-from CocosBot.config.urls import WEB_APP_URLS
+from CocosBot.config.urls import WEB_APP_URLS, API_URLS
 from CocosBot.config.selectors import LOGIN_SELECTORS
 
 
@@ -41,13 +42,22 @@ class TestAuthService:
         mock_browser.fill_input.assert_any_call(
             LOGIN_SELECTORS["password_input"],
             "password123",
-            "Llenando la contraseña..."
+            "Llenando la contraseña...",
+            sensitive=True
         )
         mock_browser.click_element.assert_any_call(
             LOGIN_SELECTORS["submit_button"],
             "Enviando formulario de login..."
         )
-        assert mock_browser.fill_input.call_count == 8  # 2 login + 6 digits
+        assert mock_browser.fill_input.call_count == 2  # the code is typed in one sequence
+        mock_browser.type_code.assert_called_once_with(
+            LOGIN_SELECTORS["two_factor_container"], "123456", "input#input5", "Ingresando el código 2FA..."
+        )
+        mock_browser.capture_api_session.assert_called_once()
+        assert set(auth_service.login_timings) == {
+            "navigation", "credentials", "imap_ready", "two_factor_screen", "two_factor_mail",
+            "code_entry", "save_device", "session_capture", "total",
+        }
 
     @patch('CocosBot.services.auth.obtener_codigo_2FA')
     def test_login_invalid_2fa_code(self, mock_get_2fa, auth_service, mock_browser):
@@ -93,12 +103,14 @@ class TestAuthService:
 
     @patch('CocosBot.services.auth.obtener_codigo_2FA')
     def test_handle_two_factor_authentication(self, mock_get_2fa, auth_service, mock_browser):
-        """Test 2FA handling fills each digit in the correct input"""
+        """Test 2FA handling falls back to one input per digit when the sequence is not reflected"""
         mock_get_2fa.return_value = "654321"
+        mock_browser.type_code.side_effect = TimeoutError("input5 empty")
 
         auth_service._handle_two_factor_authentication("gmail@test.com", "app_pass")
 
-        mock_get_2fa.assert_called_once_with("gmail@test.com", "app_pass", "no-reply@cocos.capital")
+        mock_get_2fa.assert_called_once_with("gmail@test.com", "app_pass", "no-reply@cocos.capital",
+                                             submitted_at=None)
         mock_browser.wait_for_element.assert_called_once_with(
             LOGIN_SELECTORS["two_factor_container"],
             log_message="Esperando pantalla de autenticación de dos factores.",
@@ -109,7 +121,8 @@ class TestAuthService:
             mock_browser.fill_input.assert_any_call(
                 f'input#input{i}',
                 digit,
-                f"Ingresando dígito {i + 1} del código 2FA..."
+                f"Ingresando dígito {i + 1} del código 2FA...",
+                sensitive=True
             )
 
     def test_handle_save_device_prompt_success(self, auth_service, mock_browser):
@@ -178,6 +191,92 @@ class TestAuthService:
             auth_service._handle_two_factor_authentication("gmail@test.com", "app_pass")
 
 
+class TestAuthMailWatcher:
+    """Tests for the IMAP watcher started before submitting the login form"""
+
+    @patch('CocosBot.services.auth.obtener_codigo_2FA', return_value="123456")
+    def test_watcher_started_before_submit_and_reused(self, mock_get_2fa, mock_browser, mail_watcher):
+        order = []
+        watcher = mail_watcher.return_value
+        watcher.email_address = "gmail@test.com"
+        watcher.start.side_effect = lambda: order.append("start") or watcher
+        mock_browser.click_element.side_effect = lambda selector, *a, **k: order.append(selector)
+        service = AuthService(mock_browser)
+
+        service.login("user@test.com", "pass", "gmail@test.com", "app_pass")
+        service.login("user@test.com", "pass", "gmail@test.com", "app_pass")
+
+        assert order[:2] == ["start", LOGIN_SELECTORS["submit_button"]]
+        mail_watcher.assert_called_once_with("gmail@test.com", "app_pass", "no-reply@cocos.capital")
+        mock_get_2fa.assert_called_with("gmail@test.com", "app_pass", "no-reply@cocos.capital", watcher=watcher)
+
+    @patch('CocosBot.services.auth.obtener_codigo_2FA', return_value="123456")
+    def test_watcher_connects_in_background_thread(self, mock_get_2fa, mock_browser, mail_watcher):
+        threads = []
+        mail_watcher.return_value.start.side_effect = lambda: threads.append(threading.current_thread().name)
+
+        AuthService(mock_browser).login("user@test.com", "pass", "gmail@test.com", "app_pass")
+
+        assert threads[0].startswith("cocos-imap")
+
+    @patch('CocosBot.services.auth.MAIL_WATCHER_TIMEOUT', 10)
+    @patch('CocosBot.services.auth.obtener_codigo_2FA', return_value="123456")
+    def test_slow_watcher_is_not_waited_for(self, mock_get_2fa, mock_browser, mail_watcher):
+        release = threading.Event()
+        mail_watcher.return_value.start.side_effect = lambda: release.wait(5)
+        mock_get_2fa.side_effect = lambda *args, **kwargs: release.set() or "123456"
+
+        try:
+            assert AuthService(mock_browser).login("user@test.com", "pass", "gmail@test.com", "app_pass") is True
+        finally:
+            release.set()
+        mock_get_2fa.assert_called_once_with("gmail@test.com", "app_pass", "no-reply@cocos.capital",
+                                             submitted_at=ANY)
+
+    @patch('CocosBot.services.auth.obtener_codigo_2FA', return_value="123456")
+    def test_watcher_failure_falls_back_to_full_search(self, mock_get_2fa, mock_browser, mail_watcher):
+        mail_watcher.return_value.start.side_effect = OSError("imap down")
+
+        assert AuthService(mock_browser).login("user@test.com", "pass", "gmail@test.com", "app_pass") is True
+        mock_get_2fa.assert_called_once_with("gmail@test.com", "app_pass", "no-reply@cocos.capital",
+                                             submitted_at=ANY)
+
+    def test_failed_login_closes_watcher(self, mock_browser, mail_watcher):
+        mock_browser.fill_input.side_effect = TimeoutError("selector")
+        service = AuthService(mock_browser)
+
+        with pytest.raises(AuthenticationError):
+            service.login("user@test.com", "pass", "gmail@test.com", "app_pass")
+
+        mail_watcher.return_value.close.assert_called_once()
+        assert service._mail_watcher is None
+
+    def test_failed_login_closes_watcher_once_it_connects(self, mock_browser, mail_watcher):
+        release, closed = threading.Event(), threading.Event()
+        mail_watcher.return_value.start.side_effect = lambda: release.wait(5) and mail_watcher.return_value
+        mail_watcher.return_value.close.side_effect = lambda: closed.set()
+        mock_browser.go_to.side_effect = Exception("net::ERR")
+        service = AuthService(mock_browser)
+
+        with pytest.raises(AuthenticationError):
+            service.login("user@test.com", "pass", "gmail@test.com", "app_pass")
+        assert not closed.is_set()
+        release.set()
+
+        assert closed.wait(2)
+        assert service._mail_watcher is None
+
+    @patch('CocosBot.services.auth.obtener_codigo_2FA', return_value="123456")
+    def test_logout_closes_watcher(self, mock_get_2fa, mock_browser, mail_watcher):
+        service = AuthService(mock_browser)
+        service.login("user@test.com", "pass", "gmail@test.com", "app_pass")
+
+        service.logout()
+
+        mail_watcher.return_value.close.assert_called_once()
+        assert service._mail_watcher is None
+
+
 class TestAuthExceptions:
     """Tests for authentication exception classes"""
 
@@ -193,3 +292,33 @@ class TestAuthExceptions:
         assert isinstance(error, AuthenticationError)
         assert isinstance(error, Exception)
         assert str(error) == "2FA error"
+
+
+class TestAuthSession:
+    """Tests for session validation and persistence"""
+
+    def test_session_expiry_and_refresh_use_token_manager(self, mock_browser):
+        mock_browser.tokens.seconds_left.return_value = 900.0
+        mock_browser.tokens.refresh.return_value = True
+        service = AuthService(mock_browser)
+
+        assert service.session_expires_in() == 900.0
+        assert service.refresh_session() is True
+
+    def test_is_session_valid_probes_user_data(self, mock_browser):
+        mock_browser.fetch_data.return_value = {"id": 1}
+
+        assert AuthService(mock_browser).is_session_valid() is True
+        mock_browser.fetch_data.assert_called_once_with(
+            API_URLS["user_data"], WEB_APP_URLS["dashboard"], timeout=5000
+        )
+
+    def test_is_session_valid_expired(self, mock_browser):
+        mock_browser.fetch_data.return_value = None
+
+        assert AuthService(mock_browser).is_session_valid() is False
+
+    def test_save_session(self, mock_browser):
+        AuthService(mock_browser).save_session("session.json")
+
+        mock_browser.save_storage_state.assert_called_once_with("session.json")
@@ -2,6 +2,10 @@
 import pytest
 from unittest.mock import Mock, MagicMock, patch
 from CocosBot.services.market import MarketService, OrderCreationError
+from CocosBot.core.api_client import ApiClientError
+from CocosBot.core.instruments import InstrumentMaster
+from CocosBot.core.tracing import Tracer
+from CocosBot.config.general import ORDER_WATCH_NAVIGATION_INTERVAL
 from CocosBot.config.enums import OrderOperation, MarketType
 from CocosBot.config.urls import WEB_APP_URLS, API_URLS
 from CocosBot.config.selectors import (
@@ -134,7 +138,8 @@ class TestMarketService:
         assert result == expected_schedule
         mock_browser.fetch_data.assert_called_once_with(
             request_url=API_URLS["markets_schedule"],
-            navigation_url=WEB_APP_URLS["dashboard"]
+            navigation_url=WEB_APP_URLS["dashboard"],
+            max_age=None
         )
 
     def test_get_orders_with_orders(self, market_service, mock_browser):
@@ -147,7 +152,8 @@ class TestMarketService:
         assert result == expected_orders
         mock_browser.fetch_data.assert_called_once_with(
             request_url=API_URLS["orders"],
-            navigation_url=WEB_APP_URLS["orders"]
+            navigation_url=WEB_APP_URLS["orders"],
+            max_age=None
         )
 
     def test_get_orders_no_orders(self, market_service, mock_browser):
@@ -197,7 +203,8 @@ class TestMarketService:
         assert result == expected_mep
         mock_browser.fetch_data.assert_called_once_with(
             API_URLS["mep_prices"],
-            WEB_APP_URLS["portfolio"]
+            WEB_APP_URLS["portfolio"],
+            max_age=None
         )
 
     def test_get_navigation_ticker_url_stocks(self, market_service):
@@ -247,12 +254,15 @@ class TestMarketService:
             f"Seleccionando la operación: {op_config['message']}."
         )
 
-    @patch('time.sleep')
-    def test_configure_limit_order(self, mock_sleep, market_service, mock_browser):
+    def test_configure_limit_order(self, market_service, mock_browser):
         """Test configuring limit order with correct selectors and value"""
         market_service._configure_limit_order("100,50")
 
-        mock_sleep.assert_called_once_with(3)
+        mock_browser.waits.element_enabled.assert_called_once_with(
+            OPERATION_SELECTORS["general"]["more_options"],
+            flow="limit_order",
+            baseline=3.0
+        )
         mock_browser.click_element.assert_any_call(
             OPERATION_SELECTORS["general"]["more_options"],
             "Expandiendo opciones adicionales."
@@ -287,8 +297,7 @@ class TestMarketService:
             f"Ingresando {expected_label}: {amount}"
         )
 
-    @patch('time.sleep')
-    def test_confirm_operation_success(self, mock_sleep, market_service, mock_browser):
+    def test_confirm_operation_success(self, market_service, mock_browser):
         """Test successful operation confirmation clicks review and confirm"""
         market_service.confirm_operation()
 
@@ -300,10 +309,21 @@ class TestMarketService:
             OPERATION_SELECTORS["confirm_buttons"]["confirm"],
             "Haciendo clic en 'Confirmar'."
         )
-        mock_sleep.assert_called_once_with(4)
+        mock_browser.waits.response.assert_called_once_with(
+            API_URLS["orders"],
+            flow="order_confirmation",
+            baseline=4.0
+        )
+
+    def test_confirm_operation_tolerates_missing_response(self, market_service, mock_browser):
+        """Test a confirmation without an observed order response still succeeds"""
+        mock_browser.waits.response.return_value.__exit__.side_effect = TimeoutError("no response")
+
+        market_service.confirm_operation()
+
+        assert mock_browser.click_element.call_count == 2
 
-    @patch('time.sleep')
-    def test_confirm_operation_error(self, mock_sleep, market_service, mock_browser):
+    def test_confirm_operation_error(self, market_service, mock_browser):
         """Test operation confirmation error"""
         mock_browser.click_element.side_effect = Exception("Click failed")
 
@@ -311,6 +331,75 @@ class TestMarketService:
             market_service.confirm_operation()
 
 
+class TestSubmitOrder:
+    """Tests for MarketService.submit_order"""
+
+    @pytest.fixture
+    def market_service(self, mock_browser):
+        return MarketService(mock_browser)
+
+    @pytest.fixture
+    def api_browser(self, mock_browser):
+        mock_browser.api_client = Mock(is_authenticated=True)
+        return mock_browser
+
+    def test_submits_through_api(self, market_service, api_browser):
+        api_browser.api_client.post_json.return_value = {"id": 99, "status": "PENDING"}
+
+        result = market_service.submit_order("ggal", OrderOperation.BUY, 1000, limit=1500.0)
+
+        api_browser.api_client.post_json.assert_called_once_with(API_URLS["orders"], {
+            "ticker": "ggal", "segment": "C", "side": "BUY", "type": "LIMIT", "amount": 1000, "price": 1500.0,
+        })
+        assert result["order_id"] == 99
+        assert result["via"] == "api"
+        assert result["latency_ms"] >= 0
+        api_browser.go_to.assert_not_called()
+
+    @pytest.mark.parametrize("status", [401, 404, 405])
+    def test_falls_back_to_ui_when_endpoint_unusable(self, status, market_service, api_browser):
+        api_browser.api_client.post_json.side_effect = ApiClientError("nope", status=status)
+
+        result = market_service.submit_order("GGAL", "SELL", 10)
+
+        assert result["via"] == "ui"
+        assert result["order_id"] is None
+        api_browser.go_to.assert_called_once_with(WEB_APP_URLS["market_stocks"])
+
+    @pytest.mark.parametrize("status", [400, 500, None])
+    def test_does_not_resubmit_on_ambiguous_errors(self, status, market_service, api_browser):
+        api_browser.api_client.post_json.side_effect = ApiClientError("boom", status=status)
+
+        with pytest.raises(OrderCreationError, match="por API"):
+            market_service.submit_order("GGAL", "BUY", 1000)
+
+        api_browser.go_to.assert_not_called()
+
+    @pytest.mark.parametrize("error", [TimeoutError("timed out"), ConnectionResetError("reset"), OSError("ssl")])
+    def test_wraps_connection_errors_without_ui_fallback(self, error, market_service, api_browser):
+        api_browser.api_client.post_json.side_effect = error
+
+        with pytest.raises(OrderCreationError, match="por API") as exc:
+            market_service.submit_order("GGAL", "BUY", 1000)
+
+        assert exc.value.__cause__ is error
+        api_browser.go_to.assert_not_called()
+
+    def test_uses_ui_without_api_session(self, market_service, mock_browser):
+        mock_browser.api_client = None
+
+        result = market_service.submit_order("GGAL", "BUY", 1000)
+
+        assert result["via"] == "ui"
+        mock_browser.go_to.assert_called_once_with(WEB_APP_URLS["market_stocks"])
+
+    def test_invalid_params_raise(self, market_service, api_browser):
+        with pytest.raises(OrderCreationError):
+            market_service.submit_order("GGAL", "HOLD", 1000)
+
+        api_browser.api_client.post_json.assert_not_called()
+
+
 class TestOrderCreationError:
     """Tests for OrderCreationError exception"""
 
@@ -319,3 +408,292 @@ class TestOrderCreationError:
         error = OrderCreationError("Test error")
         assert isinstance(error, Exception)
         assert str(error) == "Test error"
+
+
+class TestMarketServiceMaxAge:
+    """Tests for max_age pass-through to fetch_data"""
+
+    def test_getters_forward_max_age(self, mock_browser):
+        service = MarketService(mock_browser)
+
+        for getter in (service.get_market_schedule, service.get_orders, service.get_mep_value):
+            mock_browser.fetch_data.reset_mock()
+            getter(max_age=5)
+            assert mock_browser.fetch_data.call_args.kwargs["max_age"] == 5
+
+
+class TestFetchRequests:
+    """Tests for the fetch_parallel request builders"""
+
+    def test_orders_and_mep_requests(self, mock_browser):
+        service = MarketService(mock_browser)
+
+        assert service.orders_request() == (API_URLS["orders"], WEB_APP_URLS["orders"], None, None)
+        assert service.mep_request()[:2] == (API_URLS["mep_prices"], WEB_APP_URLS["portfolio"])
+
+    def test_ticker_request_selects_ticker(self, mock_browser):
+        service = MarketService(mock_browser)
+        page = Mock()
+
+        request = service.ticker_request("GGAL", MarketType.STOCKS)
+        request.action(page)
+
+        assert request.request_url == f"{API_URLS['markets_tickers']}/GGAL?segment=C"
+        assert request.navigation_url == WEB_APP_URLS["market_stocks"]
+        page.fill.assert_called_once_with(COMMON_SELECTORS["search_input"], "GGAL")
+        page.click.assert_called_once_with(LIST_SELECTORS["list_item"]("GGAL"))
+        mock_browser.fetch_data.assert_not_called()
+
+    def test_ticker_request_invalid_type(self, mock_browser):
+        with pytest.raises(ValueError):
+            MarketService(mock_browser).ticker_request("GGAL", "INVALID")
+
+
+class TestInstrumentMaster:
+    """Tests for the instrument master lookups in MarketService"""
+
+    @pytest.fixture
+    def master_browser(self, mock_browser):
+        mock_browser.instruments = InstrumentMaster(path=None)
+        mock_browser.instruments.update(MarketType.CEDEARS, [{"short_ticker": "AAPL", "segment": "C"},
+                                                            {"short_ticker": "AMZN", "segment": "C"}])
+        return mock_browser
+
+    def test_ticker_request_resolves_type_from_master(self, master_browser):
+        request = MarketService(master_browser).ticker_request("aapl")
+
+        assert request.navigation_url == WEB_APP_URLS["market_cedears"]
+        assert request.request_url.endswith("/aapl?segment=C")
+
+    def test_ticker_request_resolves_market_value(self, master_browser):
+        master_browser.instruments.update(MarketType.BONDS_PUBLIC, [{"short_ticker": "AL30", "segment": "H"}])
+
+        request = MarketService(master_browser).ticker_request("AL30")
+
+        assert request.navigation_url == WEB_APP_URLS["market_bonds_public"]
+        assert request.request_url.endswith("/AL30?segment=H")
+
+    def test_get_ticker_info_without_type_needs_master(self, mock_browser):
+        with pytest.raises(ValueError, match="maestro"):
+            MarketService(mock_browser).get_ticker_info("AAPL")
+        mock_browser.go_to.assert_not_called()
+
+    def test_lookup_and_search(self, master_browser, mock_browser):
+        service = MarketService(master_browser)
+
+        assert service.lookup_instrument("AMZN").market_type == "CEDEARS"
+        assert [i.ticker for i in service.search_instruments("A")] == ["AAPL", "AMZN"]
+
+        master_browser.instruments = None
+        assert service.lookup_instrument("AMZN") is None
+        assert service.search_instruments("A") == []
+
+    def test_refresh_only_stale_markets(self, master_browser):
+        master = master_browser.instruments
+        for market in MarketType:
+            if market is not MarketType.STOCKS:
+                master.update(market, [], refreshed=True)
+        master_browser.fetch_parallel.return_value = {MarketType.STOCKS: [{"short_ticker": "GGAL"}]}
+
+        refreshed = MarketService(master_browser).refresh_instruments()
+
+        requests = master_browser.fetch_parallel.call_args[0][0]
+        assert requests == {MarketType.STOCKS: (f"{API_URLS['markets_list']}ACCIONES",
+                                                WEB_APP_URLS["market_stocks"], None, None)}
+        assert refreshed == ["ACCIONES"]
+        assert master.lookup("GGAL").market_type == "ACCIONES"
+        assert master.stale_markets() == []
+
+    def test_refresh_enables_master_and_skips_failures(self, mock_browser):
+        master = InstrumentMaster(path=None)
+        mock_browser.enable_instrument_master.return_value = master
+        mock_browser.fetch_parallel.side_effect = lambda requests: {market: None for market in requests}
+
+        assert MarketService(mock_browser).refresh_instruments(force=True) == []
+        assert len(mock_browser.fetch_parallel.call_args[0][0]) == len(MarketType)
+        assert master.stale_markets() == list(MarketType)
+
+    def test_refresh_noop_when_fresh(self, master_browser):
+        for market in MarketType:
+            master_browser.instruments.update(market, [], refreshed=True)
+
+        assert MarketService(master_browser).refresh_instruments() == []
+        master_browser.fetch_parallel.assert_not_called()
+
+
+class TestMarketSnapshot:
+    """Tests for MarketService.get_market_snapshot"""
+
+    def test_reads_board_with_one_fetch(self, mock_browser):
+        mock_browser.fetch_data.side_effect = lambda url, nav, process, max_age=None: process(
+            [{"short_ticker": "GGAL", "last": 10, "bid": 9, "ask": 11, "volume": 100}])
+
+        snapshot = MarketService(mock_browser).get_market_snapshot("STOCKS", max_age=5)
+
+        mock_browser.fetch_data.assert_called_once()
+        args, kwargs = mock_browser.fetch_data.call_args
+        assert args[:2] == (f"{API_URLS['markets_list']}ACCIONES", WEB_APP_URLS["market_stocks"])
+        assert kwargs == {"max_age": 5}
+        assert snapshot.row("GGAL") == {"ticker": "GGAL", "last": 10, "bid": 9, "ask": 11, "volume": 100}
+
+    def test_updates_instrument_master(self, mock_browser):
+        mock_browser.instruments = InstrumentMaster(path=None)
+
+        request = MarketService(mock_browser).snapshot_request(MarketType.CEDEARS)
+        snapshot = request.process_response([{"short_ticker": "AAPL", "last": 20}])
+
+        assert snapshot.market_type == "CEDEARS"
+        assert mock_browser.instruments.lookup("AAPL").market_type == "CEDEARS"
+
+    def test_returns_none_on_failure(self, mock_browser):
+        mock_browser.fetch_data.return_value = None
+
+        assert MarketService(mock_browser).get_market_snapshot(MarketType.STOCKS) is None
+
+
+class TestStreamQuotes:
+    """Tests for MarketService.stream_quotes"""
+
+    def test_opens_market_page_with_stream_listening(self, mock_browser):
+        stream = MarketService(mock_browser).stream_quotes(["ggal", "ypfd"], MarketType.STOCKS, queue_size=5)
+
+        assert stream.tickers == {"GGAL", "YPFD"}
+        assert stream.queue_size == 5
+        mock_browser.page.on.assert_called_once_with("websocket", stream._on_websocket)
+        assert mock_browser.go_to.call_args[0][0] == WEB_APP_URLS["market_stocks"]
+        stream.stop()
+
+    def test_resolves_market_from_master(self, mock_browser):
+        mock_browser.instruments = InstrumentMaster(path=None)
+        mock_browser.instruments.update(MarketType.LETTERS, [{"short_ticker": "S31O5"}])
+
+        MarketService(mock_browser).stream_quotes(["S31O5"])
+
+        assert mock_browser.go_to.call_args[0][0] == WEB_APP_URLS["market_letters"]
+
+    def test_errors(self, mock_browser):
+        service = MarketService(mock_browser)
+        with pytest.raises(ValueError):
+            service.stream_quotes([])
+        with pytest.raises(ValueError):
+            service.stream_quotes(["GGAL"])  # no master, no market type
+
+        mock_browser.go_to.side_effect = Exception("nav")
+        with pytest.raises(Exception, match="nav"):
+            service.stream_quotes(["GGAL"], "STOCKS")
+        mock_browser.page.remove_listener.assert_called_once()
+
+
+class TestWatchOrders:
+    """Tests for MarketService.watch_orders"""
+
+    def test_reads_baseline_and_observes_dispatcher(self, mock_browser):
+        mock_browser.fetch_data.return_value = [{"id": 1, "status": "PENDIENTE"}]
+
+        watcher = MarketService(mock_browser).watch_orders(interval=100)
+
+        mock_browser.fetch_data.assert_called_once_with(API_URLS["orders"], WEB_APP_URLS["orders"])
+        mock_browser.dispatcher.add_observer.assert_called_once_with(watcher._observe)
+        assert watcher.primed
+        assert watcher.interval == 100
+        watcher.stop()
+        mock_browser.dispatcher.remove_observer.assert_called_once_with(watcher._observe)
+
+    @pytest.mark.parametrize("kwargs", [{}, {"interval": 500}])
+    def test_navigating_reads_use_long_interval(self, kwargs, mock_browser, caplog):
+        mock_browser.api_client = None
+        mock_browser.fetch_data.return_value = []
+
+        watcher = MarketService(mock_browser).watch_orders(**kwargs)
+
+        assert watcher.interval == ORDER_WATCH_NAVIGATION_INTERVAL
+        assert ("navega" in caplog.text) == bool(kwargs)
+        watcher.stop()
+
+
+class TestCancelOrders:
+    """Tests for cancel_order by id and cancel_all"""
+
+    ORDERS = [
+        {"id": 1, "ticker": "GGAL", "side": "BUY", "status": "PENDIENTE"},
+        {"id": 2, "ticker": "GGAL", "side": "SELL", "status": "PENDIENTE"},
+        {"id": 3, "ticker": "YPFD", "side": "BUY", "status": "Parcialmente ejecutada"},
+        {"id": 4, "ticker": "GGAL", "side": "BUY", "status": "EJECUTADA"},
+    ]
+
+    @pytest.fixture
+    def api_browser(self, mock_browser):
+        mock_browser.api_client = Mock(is_authenticated=True)
+        mock_browser.fetch_data.return_value = self.ORDERS
+        return mock_browser
+
+    def test_cancel_order_by_id(self, api_browser):
+        assert MarketService(api_browser).cancel_order(42) is True
+
+        api_browser.api_client.delete.assert_called_once_with(f"{API_URLS['orders']}/42")
+        api_browser.go_to.assert_not_called()
+
+    def test_cancel_order_by_id_errors(self, api_browser):
+        service = MarketService(api_browser)
+        api_browser.api_client.delete.side_effect = ApiClientError("gone", status=404)
+        assert service.cancel_order(42) is False
+
+        api_browser.api_client.is_authenticated = False
+        assert service._cancel_order_api(42)["error"].startswith("Cancelar por id requiere direct_api")
+        with pytest.raises(ValueError):
+            service.cancel_order()
+
+    def test_cancel_all_filters_open_orders(self, api_browser):
+        results = MarketService(api_browser).cancel_all()
+
+        assert sorted(r["order_id"] for r in results) == [1, 2, 3]
+        assert all(r["cancelled"] and r["error"] is None for r in results)
+        assert api_browser.api_client.delete.call_count == 3
+
+    def test_cancel_all_by_ticker_and_side(self, api_browser):
+        api_browser.api_client.delete.side_effect = lambda url: None
+        service = MarketService(api_browser)
+
+        assert [r["order_id"] for r in service.cancel_all(ticker="ggal")] == [1, 2]
+        assert [r["order_id"] for r in service.cancel_all(side=OrderOperation.BUY)] == [1, 3]
+        assert [(r["order_id"], r["ticker"]) for r in service.cancel_all("GGAL", "sell")] == [(2, "GGAL")]
+
+    def test_cancel_all_reports_failures(self, api_browser):
+        def delete(url):
+            if url.endswith("/2"):
+                raise ApiClientError("rechazada", status=400)
+            if url.endswith("/3"):
+                raise TimeoutError()
+        api_browser.api_client.delete.side_effect = delete
+
+        results = {r["order_id"]: r for r in MarketService(api_browser).cancel_all()}
+
+        assert results[2]["cancelled"] is False
+        assert "rechazada" in results[2]["error"]
+        assert results[3]["cancelled"] is False
+        assert results[3]["error"] == "TimeoutError"
+        assert results[1]["cancelled"]
+
+    def test_cancel_all_requires_api_session_before_navigating(self, mock_browser):
+        mock_browser.api_client = None
+
+        with pytest.raises(RuntimeError, match="direct_api"):
+            MarketService(mock_browser).cancel_all()
+        mock_browser.go_to.assert_not_called()
+        mock_browser.fetch_data.assert_not_called()
+
+    def test_cancel_all_spans_nest_under_caller(self, api_browser):
+        api_browser.tracer = Tracer()
+
+        with api_browser.tracer.span("cancel_all"):
+            MarketService(api_browser).cancel_all()
+
+        summary = api_browser.tracer.summary()
+        assert summary["cancel_all"]["api_cancel"]["count"] == 3
+        assert "api_cancel" not in summary
+
+    def test_cancel_all_without_orders(self, api_browser):
+        api_browser.fetch_data.return_value = None
+
+        assert MarketService(api_browser).cancel_all() == []
+        api_browser.api_client.delete.assert_not_called()
@@ -30,7 +30,8 @@ class TestUserService:
         assert result == expected_data
         mock_browser.fetch_data.assert_called_once_with(
             API_URLS["user_data"],
-            WEB_APP_URLS["dashboard"]
+            WEB_APP_URLS["dashboard"],
+            max_age=None
         )
 
     def test_get_user_data_none(self, user_service, mock_browser):
@@ -51,7 +52,8 @@ class TestUserService:
         assert result == expected_tier
         mock_browser.fetch_data.assert_called_once_with(
             request_url=API_URLS["account_tier"],
-            navigation_url=WEB_APP_URLS["dashboard"]
+            navigation_url=WEB_APP_URLS["dashboard"],
+            max_age=None
         )
 
     def test_navigate_withdraw_form_ars(self, user_service, mock_browser):
@@ -163,7 +165,8 @@ class TestUserService:
         assert result == expected_portfolio
         mock_browser.fetch_data.assert_called_once_with(
             request_url=API_URLS["portfolio_data"],
-            navigation_url=WEB_APP_URLS["portfolio"]
+            navigation_url=WEB_APP_URLS["portfolio"],
+            max_age=None
         )
 
     def test_get_portfolio_balance(self, user_service, mock_browser):
@@ -199,7 +202,8 @@ class TestUserService:
         assert result == expected_academy
         mock_browser.fetch_data.assert_called_once_with(
             request_url=API_URLS["academy"],
-            navigation_url=WEB_APP_URLS["dashboard"]
+            navigation_url=WEB_APP_URLS["dashboard"],
+            max_age=None
         )
 
     def test_get_academy_data_none(self, user_service, mock_browser):
@@ -243,3 +247,26 @@ class TestUserServiceIntegration:
             TRANSFER_SELECTORS["continue_button"],
             "Esperando que el botón 'Continuar' habilitado sea visible dentro del contenedor 'Extraé dinero'."
         )
+
+
+class TestUserServiceMaxAge:
+    """Tests for max_age pass-through to fetch_data"""
+
+    def test_getters_forward_max_age(self, mock_browser):
+        service = UserService(mock_browser)
+
+        for getter in (service.get_user_data, service.get_account_tier, service.get_portfolio_data,
+                       service.get_portfolio_balance, service.get_academy_data):
+            mock_browser.fetch_data.reset_mock()
+            getter(max_age=15)
+            assert mock_browser.fetch_data.call_args.kwargs["max_age"] == 15
+
+
+class TestFetchRequests:
+    """Tests for the fetch_parallel request builders"""
+
+    def test_portfolio_request(self, mock_browser):
+        request = UserService(mock_browser).portfolio_request()
+
+        assert request.request_url == API_URLS["portfolio_data"]
+        assert request.navigation_url == WEB_APP_URLS["portfolio"]
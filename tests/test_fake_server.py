@@ -0,0 +1,123 @@
+"""Tests for the local fake web app and API used by the end-to-end benchmarks."""
+import re
+import time
+
+import pytest
+from CocosBot.config.selectors import (
+    LOGIN_SELECTORS, OPERATION_SELECTORS, COMMON_SELECTORS, LIST_SELECTORS, ORDER_SELECTORS, TRANSFER_SELECTORS,
+)
+from CocosBot.config.urls import API_URLS
+from CocosBot.core.api_client import ApiClient, ApiClientError
+from CocosBot.core.session_tokens import jwt_expiry
+from tests.fake_server import FakeCocosServer, API_PATHS, TWO_FACTOR_CODE
+
+
+@pytest.fixture
+def server():
+    with FakeCocosServer(seed=1) as fake:
+        yield fake
+
+
+def url(server, key, suffix=""):
+    return f"{server.api_root}{API_PATHS[key]}{suffix}"
+
+
+def logged_in_client(server):
+    client = ApiClient()
+    tokens = client.post_json(url(server, "auth_token"),
+                              {"email": "a@b.c", "password": "x", "code": TWO_FACTOR_CODE})
+    client.update_headers({"Authorization": f"Bearer {tokens['access_token']}"})
+    return client, tokens
+
+
+class TestFakeApi:
+    """Tests for the fake API endpoints"""
+
+    def test_every_api_url_is_served(self, server):
+        """Test that each API_URLS entry answers with JSON once logged in."""
+        client, tokens = logged_in_client(server)
+        suffixes = {"markets_list": "ACCIONES", "user_accounts": "ARS", "markets_tickers": "/GGAL?segment=C"}
+
+        for key in API_URLS:
+            if key == "auth_token":
+                continue
+            if key == "auth_refresh":
+                data = client.post_json(url(server, key), {"refresh_token": tokens["refresh_token"]})
+                assert data["access_token"]
+                continue
+            assert client.get_json(url(server, key, suffixes.get(key, ""))) is not None, key
+
+        assert jwt_expiry(tokens["access_token"]) > time.time()
+        assert set(server.hits) == set(API_URLS)
+
+    def test_requires_token_and_two_factor_code(self, server):
+        """Test that the API rejects missing tokens and wrong 2FA codes."""
+        client = ApiClient()
+        with pytest.raises(ApiClientError) as unauthorized:
+            client.get_json(url(server, "user_data"))
+        with pytest.raises(ApiClientError) as wrong_code:
+            client.post_json(url(server, "auth_token"), {"email": "a@b.c", "password": "x", "code": "000000"})
+        with pytest.raises(ApiClientError) as unknown:
+            logged_in_client(server)[0].get_json(f"{server.api_root}/v9/nothing")
+
+        assert (unauthorized.value.status, wrong_code.value.status, unknown.value.status) == (401, 401, 404)
+
+    def test_order_lifecycle(self, server):
+        """Test creating, listing and cancelling orders by id."""
+        client, _ = logged_in_client(server)
+
+        created = client.post_json(url(server, "orders"), {"ticker": "GGAL", "side": "BUY", "amount": 3000})
+        seeded = server.add_order("AL30", side="SELL", quantity=2)
+        listed = client.get_json(url(server, "orders"))
+        client.delete(url(server, "orders", f"/{created['id']}"))
+
+        assert (created["quantity"], created["status"]) == (2, "PENDIENTE")
+        assert [o["id"] for o in listed] == [seeded["id"], created["id"]]
+        assert server.orders[str(created["id"])]["status"] == "CANCELADA"
+        with pytest.raises(ApiClientError) as again:
+            client.delete(url(server, "orders", f"/{created['id']}"))
+        assert again.value.status == 404
+
+    def test_latency_injection(self):
+        """Test that per-endpoint latency overrides the default one."""
+        with FakeCocosServer(latency_ms=5, endpoint_latency_ms={"user_data": 80}) as server:
+            client, _ = logged_in_client(server)
+            start = time.perf_counter()
+            client.get_json(url(server, "user_data"))
+            slow = time.perf_counter() - start
+
+            assert slow >= 0.08
+            assert server.delay("academy") == pytest.approx(0.005)
+        with pytest.raises(ValueError):
+            FakeCocosServer(endpoint_latency_ms={"nope": 1})
+
+    def test_environ_points_at_the_server(self, server):
+        """Test the environment overrides for CocosBot.config.urls."""
+        assert server.environ() == {
+            "COCOSBOT_WEB_APP_ROOT": server.web_app_root,
+            "COCOSBOT_API_ROOT": f"{server.web_app_root}/api",
+        }
+
+
+class TestFakeWebApp:
+    """Tests for the fake web app markup"""
+
+    def test_page_has_the_selector_ids_and_classes(self, server):
+        """Test that the selectors CocosBot clicks exist in the fake pages."""
+        page = server.page()
+        two_factor = (LOGIN_SELECTORS["two_factor_container"], LOGIN_SELECTORS["two_factor_digit"])
+        selectors = [
+            *(value for value in LOGIN_SELECTORS.values() if value not in two_factor),
+            *OPERATION_SELECTORS["general"].values(), *OPERATION_SELECTORS["confirm_buttons"].values(), OPERATION_SELECTORS["BUY"]["amount_input"],
+            OPERATION_SELECTORS["SELL"]["amount_input"], COMMON_SELECTORS["search_input"],
+            LIST_SELECTORS["search_list"], ORDER_SELECTORS["orders_list"], *TRANSFER_SELECTORS.values(),
+        ]
+        tokens = {token for selector in selectors for token in re.findall(r"[#.]([\w-]+)", selector)}
+
+        missing = [token for token in tokens if token not in page]
+
+        assert missing == []
+        assert 'id="input${i}"' in page
+        assert "Sí, guardar como dispositivo seguro" in page
+        assert "Cancelar orden" in page
+        assert server.api_root in page
@@ -2,7 +2,7 @@
 Tests for CocosBot data_transformations module.
 """
 import pytest
-from CocosBot.utils.data_transformations import process_mep_data
+from CocosBot.utils.data_transformations import process_mep_data, build_order_payload, extract_order_id
 
 
 class TestProcessMepData:
@@ -332,3 +332,36 @@ class TestProcessMepData:
         assert result["open"]["bid"] == 101.891
         assert isinstance(result["open"]["ask"], float)
         assert isinstance(result["open"]["bid"], float)
+
+
+class TestBuildOrderPayload:
+    """Tests for build_order_payload function."""
+
+    def test_market_buy_uses_amount(self):
+        assert build_order_payload("GGAL", "BUY", 1000) == {
+            "ticker": "GGAL", "segment": "C", "side": "BUY", "type": "MARKET", "amount": 1000,
+        }
+
+    def test_limit_sell_uses_quantity_and_price(self):
+        payload = build_order_payload("GGAL", "SELL", 10, limit=1500.5, segment="CT")
+
+        assert payload["type"] == "LIMIT"
+        assert payload["quantity"] == 10
+        assert payload["price"] == 1500.5
+        assert payload["segment"] == "CT"
+        assert "amount" not in payload
+
+
+class TestExtractOrderId:
+    """Tests for extract_order_id function."""
+
+    @pytest.mark.parametrize("response,expected", [
+        ({"id": 12}, 12),
+        ({"order_id": "abc"}, "abc"),
+        ({"orderId": 5}, 5),
+        ({"status": "ok"}, None),
+        (None, None),
+        ([1, 2], None),
+    ])
+    def test_extract(self, response, expected):
+        assert extract_order_id(response) == expected
@@ -1,6 +1,11 @@
 """Tests for CocosBot.utils.gmail_2fa"""
+import base64
+import imaplib
+import subprocess
+import sys
+import time
 import pytest
-from unittest.mock import Mock, patch, MagicMock
+from unittest.mock import ANY, Mock, patch, MagicMock
 from CocosBot.utils.gmail_2fa import (
     conectar_imap,
     buscar_correos,
@@ -8,6 +13,10 @@ from CocosBot.utils.gmail_2fa import (
     extraer_y_eliminar_codigo_2fa,
     eliminar_correo,
     obtener_codigo_2FA,
+    parsear_lista_imap,
+    buscar_parte_html,
+    decodificar_parte,
+    TwoFactorMailWatcher,
 )
 
 
@@ -57,6 +66,28 @@ class TestBuscarCorreos:
         # b''.split() returns []
         assert result == []
 
+    def test_buscar_correos_since_skips_older_mail(self):
+        submitted_at = time.mktime((2026, 10, 17, 12, 0, 0, 0, 0, -1))
+        before = imaplib.Time2Internaldate(submitted_at - 120).encode()
+        after = imaplib.Time2Internaldate(submitted_at + 3).encode()
+        mock_mail = Mock()
+        mock_mail.search.return_value = ('OK', [b'1 2'])
+        mock_mail.fetch.return_value = ('OK', [b'1 (INTERNALDATE ' + before + b')',
+                                               b'2 (INTERNALDATE ' + after + b')'])
+
+        result = buscar_correos(mock_mail, "no-reply@cocos.capital", since=submitted_at)
+
+        mock_mail.search.assert_called_once_with(None, '(FROM "no-reply@cocos.capital" SINCE 16-Oct-2026)')
+        mock_mail.fetch.assert_called_once_with(b'1,2', '(INTERNALDATE)')
+        assert result == [b'2']
+
+    def test_buscar_correos_since_without_matches(self):
+        mock_mail = Mock()
+        mock_mail.search.return_value = ('OK', [b''])
+
+        assert buscar_correos(mock_mail, "no-reply@cocos.capital", since=1700000000.0) == []
+        mock_mail.fetch.assert_not_called()
+
 
 class TestProcesarHtml:
     """Tests for procesar_html"""
@@ -79,6 +110,32 @@ class TestProcesarHtml:
 
         assert result == "654321"
 
+    def test_procesar_html_str_and_entities(self):
+        html = "<SPAN class='c' style='font-size:32px'>12&#51;456</SPAN >"
+
+        assert procesar_html(html) == "123456"
+
+    @patch('CocosBot.utils.gmail_2fa._procesar_html_bs4', return_value="999999")
+    def test_procesar_html_falls_back_to_bs4_for_nested_markup(self, mock_bs4):
+        html = b'<span style="font-size: 32px"><b>999999</b></span>'
+
+        assert procesar_html(html) == "999999"
+        mock_bs4.assert_called_once_with(html)
+
+    @patch('CocosBot.utils.gmail_2fa._procesar_html_bs4')
+    def test_procesar_html_skips_bs4_without_code_style(self, mock_bs4):
+        assert procesar_html(b'<html><body><p>Hola</p></body></html>') is None
+        mock_bs4.assert_not_called()
+
+    def test_bs4_fallback_reads_nested_text(self):
+        assert procesar_html(b'<span style="font-size: 32px"><b>999</b>999</span>') == "999999"
+
+    def test_auth_import_does_not_load_bs4(self):
+        code = "import sys, CocosBot.services.auth; print('bs4' in sys.modules)"
+        out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+
+        assert out.stdout.strip() == "False"
+
 
 class TestExtraerYEliminarCodigo:
     """Tests for extraer_y_eliminar_codigo_2fa"""
@@ -163,7 +220,7 @@ class TestEliminarCorreo:
 class TestObtenerCodigo2FA:
     """Tests for obtener_codigo_2FA"""
 
-    @patch('CocosBot.utils.gmail_2fa.time.sleep')
+    @patch('CocosBot.core.waits.time.sleep')
     @patch('CocosBot.utils.gmail_2fa.extraer_y_eliminar_codigo_2fa')
     @patch('CocosBot.utils.gmail_2fa.buscar_correos')
     @patch('CocosBot.utils.gmail_2fa.conectar_imap')
@@ -176,29 +233,54 @@ class TestObtenerCodigo2FA:
         result = obtener_codigo_2FA("test@gmail.com", "app_pass", "sender@example.com")
 
         assert result == "123456"
-        mock_sleep.assert_called_once_with(20)
+        mock_sleep.assert_not_called()
         mock_connect.assert_called_once_with("test@gmail.com", "app_pass")
-        mock_search.assert_called_once_with(mock_mail, "sender@example.com")
+        mock_search.assert_called_once_with(mock_mail, "sender@example.com", since=ANY)
         # Should use the last email
         mock_extract.assert_called_once_with(mock_mail, b'3')
+        mock_mail.logout.assert_called_once()
 
-    @patch('CocosBot.utils.gmail_2fa.time.sleep')
+    @patch('CocosBot.core.waits.time.sleep')
+    @patch('CocosBot.utils.gmail_2fa.extraer_y_eliminar_codigo_2fa')
     @patch('CocosBot.utils.gmail_2fa.buscar_correos')
     @patch('CocosBot.utils.gmail_2fa.conectar_imap')
-    def test_obtener_codigo_no_emails(self, mock_connect, mock_search, mock_sleep):
+    def test_obtener_codigo_polls_until_mail_arrives(self, mock_connect, mock_search, mock_extract, mock_sleep):
+        mock_search.side_effect = [[], [], [b'7']]
+        mock_extract.return_value = "111111"
+
+        result = obtener_codigo_2FA("test@gmail.com", "app_pass", "sender@example.com", poll_interval=10)
+
+        assert result == "111111"
+        assert mock_search.call_count == 3
+        assert mock_sleep.call_count == 2
+
+    @patch('CocosBot.utils.gmail_2fa.buscar_correos')
+    @patch('CocosBot.utils.gmail_2fa.conectar_imap')
+    def test_obtener_codigo_no_emails(self, mock_connect, mock_search):
         mock_mail = Mock()
         mock_connect.return_value = mock_mail
         mock_search.return_value = []
 
-        result = obtener_codigo_2FA("test@gmail.com", "app_pass", "sender@example.com")
+        result = obtener_codigo_2FA("test@gmail.com", "app_pass", "sender@example.com", timeout=30, poll_interval=10)
 
         assert result is None
+        mock_mail.logout.assert_called_once()
+
+    @patch('CocosBot.utils.gmail_2fa.extraer_y_eliminar_codigo_2fa', return_value="222222")
+    @patch('CocosBot.utils.gmail_2fa.buscar_correos', return_value=[b'4'])
+    @patch('CocosBot.utils.gmail_2fa.conectar_imap')
+    def test_obtener_codigo_only_accepts_mail_after_submit(self, mock_connect, mock_search, mock_extract):
+        mock_connect.return_value.logout.side_effect = OSError("already closed")
+
+        result = obtener_codigo_2FA("test@gmail.com", "app_pass", "sender@example.com", submitted_at=1700000000.0)
+
+        assert result == "222222"
+        mock_search.assert_called_once_with(mock_connect.return_value, "sender@example.com", since=1700000000.0)
 
-    @patch('CocosBot.utils.gmail_2fa.time.sleep')
     @patch('CocosBot.utils.gmail_2fa.extraer_y_eliminar_codigo_2fa')
     @patch('CocosBot.utils.gmail_2fa.buscar_correos')
     @patch('CocosBot.utils.gmail_2fa.conectar_imap')
-    def test_obtener_codigo_uses_latest_email(self, mock_connect, mock_search, mock_extract, mock_sleep):
+    def test_obtener_codigo_uses_latest_email(self, mock_connect, mock_search, mock_extract):
         mock_mail = Mock()
         mock_connect.return_value = mock_mail
         mock_search.return_value = [b'10', b'20', b'30']
@@ -209,3 +291,190 @@ class TestObtenerCodigo2FA:
         # Should pick the last email id
         mock_extract.assert_called_once_with(mock_mail, b'30')
         assert result == "654321"
+
+
+HTML_CODE = b'<html><body><span style="font-size: 32px">482913</span></body></html>'
+
+BODYSTRUCTURE = (
+    b'7 (UID 105 BODYSTRUCTURE (("TEXT" "PLAIN" ("CHARSET" "UTF-8") NIL NIL "7BIT" 10 1 NIL NIL NIL)'
+    b'("TEXT" "HTML" ("CHARSET" "UTF-8") NIL NIL "BASE64" 120 2 NIL NIL NIL) "ALTERNATIVE" NIL NIL NIL))'
+)
+
+
+class TestBodyStructure:
+    """Tests for the BODYSTRUCTURE helpers"""
+
+    def test_parsear_lista_imap(self):
+        assert parsear_lista_imap(b'(A "b \\"c\\"" NIL (1 2))') == [["A", 'b "c"', None, ["1", "2"]]]
+
+    def test_finds_nested_html_part(self):
+        structure = [
+            [["TEXT", "PLAIN", None, None, None, "7BIT", "1"],
+             ["TEXT", "HTML", ["CHARSET", "latin-1"], None, None, "QUOTED-PRINTABLE", "2"], "ALTERNATIVE"],
+            ["IMAGE", "PNG", None, None, None, "BASE64", "3"],
+            "MIXED",
+        ]
+
+        assert buscar_parte_html(structure) == ("1.2", "QUOTED-PRINTABLE", "latin-1")
+
+    def test_single_part_html(self):
+        assert buscar_parte_html(["TEXT", "HTML", None, None, None, "7BIT", "5"]) == ("1", "7BIT", "utf-8")
+
+    def test_no_html_part(self):
+        assert buscar_parte_html([["TEXT", "PLAIN", None, None, None, "7BIT", "1"], "MIXED"]) is None
+
+    @pytest.mark.parametrize("payload,encoding", [
+        (base64.b64encode(HTML_CODE), "BASE64"),
+        (b'<span style=3D"x">1</span>', "QUOTED-PRINTABLE"),
+        (HTML_CODE, "7BIT"),
+    ])
+    def test_decodificar_parte(self, payload, encoding):
+        assert decodificar_parte(payload, encoding, "utf-8").startswith("<")
+
+
+def _fake_mail(searches, capabilities=("IMAP4REV1",), fetch_structure=BODYSTRUCTURE):
+    mail = Mock()
+    mail.capabilities = capabilities
+    mail.status.return_value = ("OK", [b'"INBOX" (UIDNEXT 100)'])
+    results = iter(searches)
+
+    def uid(command, *args):
+        if command == "SEARCH":
+            return "OK", [next(results)]
+        if command == "FETCH" and args[1] == "(BODYSTRUCTURE)":
+            return "OK", [fetch_structure]
+        if command == "FETCH":
+            return "OK", [(b'7 (UID 105 BODY[2] {120}', base64.b64encode(HTML_CODE)), b')']
+        return "OK", [None]
+
+    mail.uid.side_effect = uid
+    return mail
+
+
+class TestTwoFactorMailWatcher:
+    """Tests for TwoFactorMailWatcher"""
+
+    @patch('CocosBot.utils.gmail_2fa.conectar_imap')
+    def test_start_takes_uidnext_baseline(self, mock_connect):
+        mock_connect.return_value = _fake_mail([])
+
+        watcher = TwoFactorMailWatcher("g@test.com", "pass", "no-reply@cocos.capital").start()
+
+        assert watcher.uid_baseline == 100
+
+    @patch('CocosBot.utils.gmail_2fa.conectar_imap')
+    def test_connection_is_reused(self, mock_connect):
+        mail = _fake_mail([])
+        mock_connect.return_value = mail
+        watcher = TwoFactorMailWatcher("g@test.com", "pass", "no-reply@cocos.capital")
+
+        watcher.start()
+        watcher.start()
+
+        mock_connect.assert_called_once()
+        mail.noop.assert_called_once()
+
+    @patch('CocosBot.utils.gmail_2fa.conectar_imap')
+    def test_reconnects_when_session_expired(self, mock_connect):
+        stale = _fake_mail([])
+        stale.noop.side_effect = OSError("closed")
+        mock_connect.side_effect = [stale, _fake_mail([])]
+        watcher = TwoFactorMailWatcher("g@test.com", "pass", "no-reply@cocos.capital")
+
+        watcher.start()
+        watcher.start()
+
+        assert mock_connect.call_count == 2
+
+    @patch('CocosBot.utils.gmail_2fa.time.sleep')
+    @patch('CocosBot.utils.gmail_2fa.conectar_imap')
+    def test_polls_for_new_uid_and_fetches_only_html_part(self, mock_connect, mock_sleep):
+        # UID 99 predates the login and must be ignored ('100:*' always returns the last message)
+        mail = _fake_mail([b'99', b'99 105'])
+        mock_connect.return_value = mail
+        watcher = TwoFactorMailWatcher("g@test.com", "pass", "no-reply@cocos.capital").start()
+
+        assert watcher.wait_for_code(timeout=5000) == "482913"
+
+        search = mail.uid.call_args_list[0][0]
+        assert search[:3] == ("SEARCH", "UID", "100:*")
+        assert "SINCE" in search
+        mail.uid.assert_any_call("FETCH", "105", "(BODY.PEEK[2])")
+        mail.uid.assert_any_call("STORE", "105", "+FLAGS", "(\\Deleted)")
+        assert mock_sleep.call_count == 1
+
+    @patch('CocosBot.utils.gmail_2fa.conectar_imap')
+    def test_unknown_structure_fetches_whole_message(self, mock_connect):
+        message = b"Content-Type: text/html\r\n\r\n" + HTML_CODE
+        mail = _fake_mail([b'105'], fetch_structure=(b'7 (UID 105 BODYSTRUCTURE {10}', b'...'))
+        mail.uid.side_effect = lambda command, *args: (
+            ("OK", [b'105']) if command == "SEARCH"
+            else ("OK", [(b'7 (UID 105 BODY[] {99}', message)]) if args[1:] == ("(BODY.PEEK[])",)
+            else ("OK", [(b'7 (UID 105 BODYSTRUCTURE {10}', b'...')]) if command == "FETCH"
+            else ("OK", [None])
+        )
+        mock_connect.return_value = mail
+        watcher = TwoFactorMailWatcher("g@test.com", "pass", "no-reply@cocos.capital").start()
+
+        assert watcher.wait_for_code(timeout=1000) == "482913"
+
+    @patch('CocosBot.utils.gmail_2fa.conectar_imap')
+    def test_timeout(self, mock_connect):
+        mock_connect.return_value = _fake_mail([b''] * 100)
+        watcher = TwoFactorMailWatcher("g@test.com", "pass", "no-reply@cocos.capital", poll_interval=5).start()
+
+        with pytest.raises(TimeoutError):
+            watcher.wait_for_code(timeout=20)
+
+    @patch('CocosBot.utils.gmail_2fa.select.select')
+    @patch('CocosBot.utils.gmail_2fa.conectar_imap')
+    def test_waits_with_idle(self, mock_connect, mock_select):
+        mail = _fake_mail([b'', b'105'], capabilities=("IMAP4REV1", "IDLE"))
+        mail._new_tag.return_value = b'A001'
+        mail.tagged_commands = {b'A001': None}
+        mail.sock.pending.return_value = 0
+        mail.readline.side_effect = [b'+ idling\r\n', b'* 105 EXISTS\r\n', b'A001 OK IDLE terminated\r\n']
+        mock_select.return_value = ([mail.sock], [], [])
+        mock_connect.return_value = mail
+        watcher = TwoFactorMailWatcher("g@test.com", "pass", "no-reply@cocos.capital").start()
+
+        assert watcher.wait_for_code(timeout=5000) == "482913"
+
+        mail.send.assert_any_call(b'A001 IDLE\r\n')
+        mail.send.assert_any_call(b'DONE\r\n')
+        assert b'A001' not in mail.tagged_commands
+
+    @patch('CocosBot.utils.gmail_2fa.time.sleep')
+    @patch('CocosBot.utils.gmail_2fa.conectar_imap')
+    def test_idle_rejected_falls_back_to_sleep(self, mock_connect, mock_sleep):
+        mail = _fake_mail([b'', b'105'], capabilities=("IDLE",))
+        mail._new_tag.return_value = b'A001'
+        mail.tagged_commands = {}
+        mail.readline.return_value = b'A001 BAD\r\n'
+        mock_connect.return_value = mail
+        watcher = TwoFactorMailWatcher("g@test.com", "pass", "no-reply@cocos.capital").start()
+
+        assert watcher.wait_for_code(timeout=5000) == "482913"
+        mock_sleep.assert_called_once()
+
+    def test_close(self):
+        watcher = TwoFactorMailWatcher("g@test.com", "pass", "no-reply@cocos.capital")
+        mail = watcher.mail = Mock()
+        mail.logout.side_effect = OSError("gone")
+
+        watcher.close()
+
+        assert watcher.mail is None
+
+    def test_obtener_codigo_uses_watcher(self):
+        watcher = Mock()
+        watcher.wait_for_code.return_value = "123456"
+
+        assert obtener_codigo_2FA("g@test.com", "pass", "s@test.com", timeout=100, watcher=watcher) == "123456"
+        watcher.wait_for_code.assert_called_once_with(100)
+
+    def test_obtener_codigo_watcher_timeout(self):
+        watcher = Mock()
+        watcher.wait_for_code.side_effect = TimeoutError
+
+        assert obtener_codigo_2FA("g@test.com", "pass", "s@test.com", watcher=watcher) is None